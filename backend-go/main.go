@@ -66,6 +66,7 @@ func main() {
 	r.Route("/{resourceType}", func(r chi.Router) {
 		r.Get("/", listResourcesHandler)
 		r.Post("/", createResourceHandler)
+		r.Post("/batch", batchResourcesHandler)
 		r.Route("/{resourceID}", func(r chi.Router) {
 			r.Get("/", getResourceHandler)
 			r.Put("/", updateResourceHandler)
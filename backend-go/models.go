@@ -34,12 +34,24 @@ type Resource struct {
 }
 
 type CreateResource struct {
+	ID         string                 `json:"id,omitempty"` // Optional client-chosen ID, so imports can be retried safely
 	Name       string                 `json:"name"`
 	Type       string                 `json:"type"`
 	Data       map[string]interface{} `json:"data"`
 	Visibility string                 `json:"visibility"`
 }
 
+type BatchResources struct {
+	Items []CreateResource `json:"items"`
+}
+
+type BatchResult struct {
+	ID     string `json:"id,omitempty"`
+	Status string `json:"status"` // created, updated, failed
+	Code   int    `json:"code"`
+	Error  string `json:"error,omitempty"`
+}
+
 type ShareResource struct {
 	GranteeID   string `json:"grantee_id"`
 	GranteeType string `json:"grantee_type"` // user, group, app
@@ -1,11 +1,16 @@
 package main
 
 import (
+	"crypto/sha256"
 	"database/sql"
+	"encoding/base64"
+	"encoding/hex"
 	"encoding/json"
 	"fmt"
 	"log"
 	"net/http"
+	"strconv"
+	"strings"
 	"time"
 
 	"github.com/go-chi/chi/v5"
@@ -19,7 +24,83 @@ func getBasePath(resourceType string) string {
 	return "/" + resourceType
 }
 
-// listResourcesHandler
+const (
+	defaultPageSize = 100
+	maxPageSize     = 500
+)
+
+// listFields are the properties a list request can select with ?fields=
+var listFields = map[string]bool{
+	"id": true, "owner_id": true, "name": true, "type": true, "data": true,
+	"visibility": true, "created_at": true, "updated_at": true, "_links": true,
+}
+
+// listParams reads ?limit=, ?cursor= and ?fields=. fields is nil when every field is wanted.
+func listParams(r *http.Request) (limit int, after string, fields map[string]bool, err error) {
+	q := r.URL.Query()
+	limit = defaultPageSize
+	if v := q.Get("limit"); v != "" {
+		limit, err = strconv.Atoi(v)
+		if err != nil || limit < 1 {
+			return 0, "", nil, fmt.Errorf("limit must be a positive integer")
+		}
+		if limit > maxPageSize {
+			limit = maxPageSize
+		}
+	}
+	if v := q.Get("cursor"); v != "" {
+		raw, decodeErr := base64.RawURLEncoding.DecodeString(v)
+		if decodeErr != nil || len(raw) == 0 {
+			return 0, "", nil, fmt.Errorf("invalid cursor")
+		}
+		after = string(raw)
+	}
+	if v := q.Get("fields"); v != "" {
+		fields = map[string]bool{}
+		for _, f := range strings.Split(v, ",") {
+			f = strings.TrimSpace(f)
+			if !listFields[f] {
+				return 0, "", nil, fmt.Errorf("unknown field %q", f)
+			}
+			fields[f] = true
+		}
+	}
+	return limit, after, fields, nil
+}
+
+func encodeCursor(resourceID string) string {
+	return base64.RawURLEncoding.EncodeToString([]byte(resourceID))
+}
+
+// projectResource keeps only the requested fields of a resource
+func projectResource(s Resource, fields map[string]bool) map[string]interface{} {
+	all := map[string]interface{}{
+		"id": s.ID, "owner_id": s.OwnerID, "name": s.Name, "type": s.Type, "data": s.Data,
+		"visibility": s.Visibility, "created_at": s.CreatedAt, "updated_at": s.UpdatedAt, "_links": s.Links,
+	}
+	out := make(map[string]interface{}, len(fields))
+	for f := range fields {
+		out[f] = all[f]
+	}
+	return out
+}
+
+// etagMatches reports whether an If-None-Match header names etag (weak comparison, as for GET)
+func etagMatches(header, etag string) bool {
+	for _, candidate := range strings.Split(header, ",") {
+		candidate = strings.TrimPrefix(strings.TrimSpace(candidate), "W/")
+		if candidate == etag || candidate == "*" {
+			return true
+		}
+	}
+	return false
+}
+
+// listResourcesHandler returns one page of the visible resources of a type, ordered by ID.
+// Pages are keyset-paginated: the Link header (rel="next") and X-Next-Cursor carry the cursor
+// for the next page and are absent on the last one. ?fields= trims each resource, and leaving
+// out "data" also keeps the blobs out of the query. Responses carry an ETag, so an unchanged
+// page costs a 304 instead of a body.
 func listResourcesHandler(w http.ResponseWriter, r *http.Request) {
 	resourceType := chi.URLParam(r, "resourceType")
 	if resourceType == "" {
@@ -27,6 +108,16 @@ func listResourcesHandler(w http.ResponseWriter, r *http.Request) {
 		return
 	}
 
+	limit, after, fields, err := listParams(r)
+	if err != nil {
+		http.Error(w, err.Error(), http.StatusBadRequest)
+		return
+	}
+	dataColumn := "s.data"
+	if fields != nil && !fields["data"] {
+		dataColumn = "'{}'"
+	}
+
 	user := GetCurrentUser(r)
 	var userID string
 	if user != nil {
@@ -34,11 +125,11 @@ func listResourcesHandler(w http.ResponseWriter, r *http.Request) {
 	}
 
 	var rows *sql.Rows
-	var err error
 
+	// One extra row tells us whether there is a next page
 	if userID != "" {
 		query := `
-            SELECT s.id, s.owner_id, s.name, s.type, s.data, s.visibility, s.created_at, s.updated_at,
+            SELECT s.id, s.owner_id, s.name, s.type, ` + dataColumn + `, s.visibility, s.created_at, s.updated_at,
             MAX(CASE
                 WHEN s.owner_id = ? THEN 3
                 WHEN p.access_level = 'admin' THEN 3
@@ -49,18 +140,21 @@ func listResourcesHandler(w http.ResponseWriter, r *http.Request) {
             FROM resources s
             LEFT JOIN permissions p ON s.id = p.target_id
             LEFT JOIN group_members gm ON p.grantee_id = gm.group_id AND p.grantee_type = 'group'
-            WHERE s.type = ? AND (
+            WHERE s.type = ? AND s.id > ? AND (
                s.visibility = 'public'
                OR s.owner_id = ?
                OR (p.grantee_id = ? AND p.grantee_type = 'user')
                OR (gm.user_id = ?)
             )
             GROUP BY s.id
+            ORDER BY s.id
+            LIMIT ?
             `
-		rows, err = db.Query(query, userID, resourceType, userID, userID, userID)
+		rows, err = db.Query(query, userID, resourceType, after, userID, userID, userID, limit+1)
 	} else {
-		query := `SELECT id, owner_id, name, type, data, visibility, created_at, updated_at, 0 as access_rank FROM resources WHERE type = ? AND visibility = 'public'`
-		rows, err = db.Query(query, resourceType)
+		query := `SELECT s.id, s.owner_id, s.name, s.type, ` + dataColumn + `, s.visibility, s.created_at, s.updated_at, 0 as access_rank
+            FROM resources s WHERE s.type = ? AND s.visibility = 'public' AND s.id > ? ORDER BY s.id LIMIT ?`
+		rows, err = db.Query(query, resourceType, after, limit+1)
 	}
 
 	if err != nil {
@@ -96,8 +190,38 @@ func listResourcesHandler(w http.ResponseWriter, r *http.Request) {
 		resources = append(resources, s)
 	}
 
+	if len(resources) > limit {
+		resources = resources[:limit]
+		next := r.URL.Query()
+		next.Set("cursor", encodeCursor(resources[limit-1].ID))
+		next.Set("limit", strconv.Itoa(limit))
+		w.Header().Set("X-Next-Cursor", next.Get("cursor"))
+		w.Header().Set("Link", fmt.Sprintf("<%s?%s>; rel=\"next\"", getBasePath(resourceType), next.Encode()))
+	}
+
+	var body interface{} = resources
+	if fields != nil {
+		projected := make([]map[string]interface{}, len(resources))
+		for i, s := range resources {
+			projected[i] = projectResource(s, fields)
+		}
+		body = projected
+	}
+	payload, _ := json.Marshal(body)
+	sum := sha256.Sum256(payload)
+	etag := `"` + hex.EncodeToString(sum[:16]) + `"`
+
+	// The page depends on who is asking, so only the caller may cache it, and must revalidate
+	w.Header().Set("ETag", etag)
+	w.Header().Set("Cache-Control", "private, no-cache")
+	w.Header().Set("Vary", "Authorization")
+	if match := r.Header.Get("If-None-Match"); match != "" && etagMatches(match, etag) {
+		w.WriteHeader(http.StatusNotModified)
+		return
+	}
+
 	w.Header().Set("Content-Type", "application/json")
-	json.NewEncoder(w).Encode(resources)
+	w.Write(append(payload, '\n'))
 }
 
 // createResourceHandler
@@ -128,14 +252,31 @@ func createResourceHandler(w http.ResponseWriter, r *http.Request) {
 		http.Error(w, err.Error(), http.StatusBadRequest)
 		return
 	}
+	visibility, err := normalizeVisibility(req.Visibility)
+	if err != nil {
+		http.Error(w, err.Error(), http.StatusBadRequest)
+		return
+	}
+	req.Visibility = visibility
 
-	resourceID := generateUUID()
+	// A client-chosen ID makes the create idempotent: a retried POST gets 409 instead of a duplicate
+	resourceID := req.ID
+	if resourceID == "" {
+		resourceID = generateUUID()
+	} else if err := validateResourceID(resourceID); err != nil {
+		http.Error(w, err.Error(), http.StatusBadRequest)
+		return
+	}
 	dataBytes, _ := json.Marshal(req.Data)
 
-	_, err := db.Exec("INSERT INTO resources (id, owner_id, name, type, data, visibility) VALUES (?, ?, ?, ?, ?, ?)",
+	_, err = db.Exec("INSERT INTO resources (id, owner_id, name, type, data, visibility) VALUES (?, ?, ?, ?, ?, ?)",
 		resourceID, user.ID, req.Name, req.Type, string(dataBytes), req.Visibility)
 
 	if err != nil {
+		if req.ID != "" && resourceExists(resourceID) {
+			http.Error(w, "Resource already exists", http.StatusConflict)
+			return
+		}
 		log.Printf("Insert resource error: %v", err)
 		http.Error(w, "Database error", http.StatusInternalServerError)
 		return
@@ -250,6 +391,12 @@ func updateResourceHandler(w http.ResponseWriter, r *http.Request) {
 		http.Error(w, "Invalid request", http.StatusBadRequest)
 		return
 	}
+	visibility, err := normalizeVisibility(req.Visibility)
+	if err != nil {
+		http.Error(w, err.Error(), http.StatusBadRequest)
+		return
+	}
+	req.Visibility = visibility
 
 	// Check permissions and get type
 	var accessRank int
@@ -273,7 +420,7 @@ func updateResourceHandler(w http.ResponseWriter, r *http.Request) {
         )
         GROUP BY s.id
     `
-	err := db.QueryRow(query, user.ID, resourceID, user.ID, user.ID, user.ID).Scan(&resourceType, &accessRank)
+	err = db.QueryRow(query, user.ID, resourceID, user.ID, user.ID, user.ID).Scan(&resourceType, &accessRank)
 	if err == sql.ErrNoRows || accessRank < 2 {
 		http.Error(w, "Not authorized", http.StatusForbidden)
 		return
@@ -436,3 +583,121 @@ func deleteResourceHandler(w http.ResponseWriter, r *http.Request) {
 
     w.WriteHeader(http.StatusNoContent)
 }
+
+// maxBatchItems caps one batch request, keeping it well inside request size and time limits
+const maxBatchItems = 500
+
+func resourceExists(resourceID string) bool {
+	var exists int
+	return db.QueryRow("SELECT 1 FROM resources WHERE id = ?", resourceID).Scan(&exists) == nil
+}
+
+// batchResourcesHandler creates or updates up to maxBatchItems resources of one type in a single request.
+// Items with an ID are upserted: created under that ID if it is new, updated if the caller may write it.
+// Each item gets its own result, so one bad item does not fail the rest.
+func batchResourcesHandler(w http.ResponseWriter, r *http.Request) {
+	resourceType := chi.URLParam(r, "resourceType")
+	if resourceType == "" {
+		http.Error(w, "Resource type required", http.StatusBadRequest)
+		return
+	}
+
+	user := GetCurrentUser(r)
+	if user == nil {
+		http.Error(w, "Authentication required", http.StatusUnauthorized)
+		return
+	}
+
+	var req BatchResources
+	if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
+		http.Error(w, "Invalid request", http.StatusBadRequest)
+		return
+	}
+	if len(req.Items) > maxBatchItems {
+		http.Error(w, fmt.Sprintf("Too many items (max %d)", maxBatchItems), http.StatusRequestEntityTooLarge)
+		return
+	}
+
+	results := make([]BatchResult, len(req.Items))
+	for i, item := range req.Items {
+		results[i] = upsertResource(user.ID, resourceType, item)
+	}
+
+	w.Header().Set("Content-Type", "application/json")
+	json.NewEncoder(w).Encode(map[string][]BatchResult{"results": results})
+}
+
+func upsertResource(userID, resourceType string, item CreateResource) BatchResult {
+	fail := func(code int, message string) BatchResult {
+		return BatchResult{ID: item.ID, Status: "failed", Code: code, Error: message}
+	}
+
+	if item.ID == "" {
+		item.ID = generateUUID()
+	} else if err := validateResourceID(item.ID); err != nil {
+		return fail(http.StatusBadRequest, err.Error())
+	}
+	if err := validateResourceData(resourceType, item.Data); err != nil {
+		return fail(http.StatusBadRequest, err.Error())
+	}
+	visibility, err := normalizeVisibility(item.Visibility)
+	if err != nil {
+		return fail(http.StatusBadRequest, err.Error())
+	}
+	item.Visibility = visibility
+	dataBytes, _ := json.Marshal(item.Data)
+
+	// Same write check as updateResourceHandler
+	var accessRank int
+	var existingType string
+	query := `
+        SELECT
+        s.type,
+        MAX(CASE
+            WHEN s.owner_id = ? THEN 3
+            WHEN p.access_level = 'admin' THEN 3
+            WHEN p.access_level = 'write' THEN 2
+            ELSE 0
+        END) as access_rank
+        FROM resources s
+        LEFT JOIN permissions p ON s.id = p.target_id
+        LEFT JOIN group_members gm ON p.grantee_id = gm.group_id AND p.grantee_type = 'group'
+        WHERE s.id = ? AND (
+           s.owner_id = ?
+           OR (p.grantee_id = ? AND p.grantee_type = 'user')
+           OR (gm.user_id = ?)
+        )
+        GROUP BY s.id
+    `
+	err = db.QueryRow(query, userID, item.ID, userID, userID, userID).Scan(&existingType, &accessRank)
+	if err == sql.ErrNoRows {
+		if resourceExists(item.ID) {
+			return fail(http.StatusForbidden, "Not authorized")
+		}
+		_, err = db.Exec("INSERT INTO resources (id, owner_id, name, type, data, visibility) VALUES (?, ?, ?, ?, ?, ?)",
+			item.ID, userID, item.Name, resourceType, string(dataBytes), item.Visibility)
+		if err != nil {
+			log.Printf("Batch insert error: %v", err)
+			return fail(http.StatusInternalServerError, "Database error")
+		}
+		return BatchResult{ID: item.ID, Status: "created", Code: http.StatusCreated}
+	}
+	if err != nil {
+		log.Printf("Batch lookup error: %v", err)
+		return fail(http.StatusInternalServerError, "Database error")
+	}
+	if accessRank < 2 {
+		return fail(http.StatusForbidden, "Not authorized")
+	}
+	if existingType != resourceType {
+		return fail(http.StatusConflict, fmt.Sprintf("Resource exists with type %s", existingType))
+	}
+
+	_, err = db.Exec("UPDATE resources SET name = ?, data = ?, visibility = ?, updated_at = unixepoch() WHERE id = ?",
+		item.Name, string(dataBytes), item.Visibility, item.ID)
+	if err != nil {
+		log.Printf("Batch update error: %v", err)
+		return fail(http.StatusInternalServerError, "Database error")
+	}
+	return BatchResult{ID: item.ID, Status: "updated", Code: http.StatusOK}
+}
@@ -0,0 +1,164 @@
+package main
+
+import (
+	"context"
+	"database/sql"
+	"encoding/json"
+	"fmt"
+	"net/http"
+	"net/http/httptest"
+	"os"
+	"testing"
+
+	"github.com/go-chi/chi/v5"
+	_ "modernc.org/sqlite"
+)
+
+func setupResourcesDB(t *testing.T) {
+	var err error
+	db, err = sql.Open("sqlite", ":memory:")
+	if err != nil {
+		t.Fatalf("Failed to open db: %v", err)
+	}
+	// Every connection to :memory: is a new database
+	db.SetMaxOpenConns(1)
+	t.Cleanup(func() { db.Close() })
+
+	schema, err := os.ReadFile("schema.sql")
+	if err != nil {
+		t.Fatalf("Failed to read schema: %v", err)
+	}
+	if _, err := db.Exec(string(schema)); err != nil {
+		t.Fatalf("Failed to apply schema: %v", err)
+	}
+	schemaCache.Delete("ships")
+	initTypes(db)
+}
+
+func TestUpsertResource(t *testing.T) {
+	setupResourcesDB(t)
+	ship := map[string]interface{}{"configuration": map[string]interface{}{}, "manifest": []interface{}{}}
+	item := CreateResource{ID: "ship-1", Name: "Falcon", Data: ship, Visibility: "private"}
+
+	tests := []struct {
+		name       string
+		userID     string
+		resource   string
+		item       CreateResource
+		wantStatus string
+		wantCode   int
+	}{
+		{"New ID is created", "owner", "ships", item, "created", 201},
+		{"Same ID again is updated", "owner", "ships", item, "updated", 200},
+		{"Other users cannot overwrite it", "other", "ships", item, "failed", 403},
+		{"Type cannot change", "owner", "hangars", CreateResource{ID: "ship-1", Data: map[string]interface{}{"ships": []interface{}{}}, Visibility: "private"}, "failed", 409},
+		{"Invalid ID", "owner", "ships", CreateResource{ID: "../x", Data: ship, Visibility: "private"}, "failed", 400},
+		{"Invalid data", "owner", "ships", CreateResource{ID: "ship-2", Data: map[string]interface{}{}, Visibility: "private"}, "failed", 400},
+		{"Missing ID gets a new one", "owner", "ships", CreateResource{Name: "Wing", Data: ship, Visibility: "private"}, "created", 201},
+		{"Missing visibility is private", "owner", "ships", CreateResource{ID: "ship-3", Data: ship}, "created", 201},
+		{"Invalid visibility", "owner", "ships", CreateResource{ID: "ship-4", Data: ship, Visibility: "secret"}, "failed", 400},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			got := upsertResource(tt.userID, tt.resource, tt.item)
+			if got.Status != tt.wantStatus || got.Code != tt.wantCode {
+				t.Errorf("upsertResource() = %+v, want %s %d", got, tt.wantStatus, tt.wantCode)
+			}
+			if got.ID == "" {
+				t.Error("Expected the result to carry the resource ID")
+			}
+		})
+	}
+
+	var count int
+	db.QueryRow("SELECT count(*) FROM resources").Scan(&count)
+	if count != 3 {
+		t.Errorf("Expected 3 resources, got %d", count)
+	}
+	var visibility string
+	db.QueryRow("SELECT visibility FROM resources WHERE id = 'ship-3'").Scan(&visibility)
+	if visibility != "private" {
+		t.Errorf("Expected an omitted visibility to be stored as private, got %q", visibility)
+	}
+}
+
+func listRequest(t *testing.T, query string, header http.Header) *httptest.ResponseRecorder {
+	req := httptest.NewRequest("GET", "/ships"+query, nil)
+	for k, v := range header {
+		req.Header[k] = v
+	}
+	rctx := chi.NewRouteContext()
+	rctx.URLParams.Add("resourceType", "ships")
+	req = req.WithContext(context.WithValue(req.Context(), chi.RouteCtxKey, rctx))
+	w := httptest.NewRecorder()
+	listResourcesHandler(w, req)
+	return w
+}
+
+func TestListResourcesPagination(t *testing.T) {
+	setupResourcesDB(t)
+	for i := 0; i < 25; i++ {
+		_, err := db.Exec("INSERT INTO resources (id, owner_id, name, type, data, visibility) VALUES (?, 'owner', ?, 'ships', '{\"manifest\": []}', ?)",
+			fmt.Sprintf("ship-%02d", i), fmt.Sprintf("Ship %d", i), map[bool]string{true: "public", false: "private"}[i%5 != 0])
+		if err != nil {
+			t.Fatalf("Failed to insert: %v", err)
+		}
+	}
+
+	// Anonymous callers page through the 20 public ships in ID order
+	var ids []string
+	query := "?limit=8"
+	for pages := 0; query != ""; pages++ {
+		if pages > 5 {
+			t.Fatal("Pagination did not terminate")
+		}
+		w := listRequest(t, query, nil)
+		if w.Code != http.StatusOK {
+			t.Fatalf("Expected 200, got %d: %s", w.Code, w.Body.String())
+		}
+		var page []Resource
+		json.Unmarshal(w.Body.Bytes(), &page)
+		for _, s := range page {
+			ids = append(ids, s.ID)
+		}
+		query = ""
+		if cursor := w.Header().Get("X-Next-Cursor"); cursor != "" {
+			query = "?limit=8&cursor=" + cursor
+		}
+	}
+	if len(ids) != 20 || ids[0] != "ship-01" || ids[19] != "ship-24" {
+		t.Errorf("Unexpected pages: %v", ids)
+	}
+
+	if w := listRequest(t, "?cursor=!!", nil); w.Code != http.StatusBadRequest {
+		t.Errorf("Expected 400 for a bad cursor, got %d", w.Code)
+	}
+	if w := listRequest(t, "?fields=id,secret", nil); w.Code != http.StatusBadRequest {
+		t.Errorf("Expected 400 for an unknown field, got %d", w.Code)
+	}
+}
+
+func TestListResourcesFieldsAndETag(t *testing.T) {
+	setupResourcesDB(t)
+	db.Exec("INSERT INTO resources (id, owner_id, name, type, data, visibility) VALUES ('a', 'owner', 'A', 'ships', '{\"manifest\": [1]}', 'public')")
+
+	w := listRequest(t, "?fields=id,name", nil)
+	var page []map[string]interface{}
+	json.Unmarshal(w.Body.Bytes(), &page)
+	if len(page) != 1 || len(page[0]) != 2 || page[0]["name"] != "A" {
+		t.Errorf("Expected only id and name, got %v", page)
+	}
+
+	etag := w.Header().Get("ETag")
+	if etag == "" {
+		t.Fatal("Expected an ETag")
+	}
+	if w := listRequest(t, "?fields=id,name", http.Header{"If-None-Match": {etag}}); w.Code != http.StatusNotModified || w.Body.Len() != 0 {
+		t.Errorf("Expected an empty 304, got %d", w.Code)
+	}
+	// A different projection is a different representation
+	if w := listRequest(t, "", http.Header{"If-None-Match": {etag}}); w.Code != http.StatusOK {
+		t.Errorf("Expected 200 for the full listing, got %d", w.Code)
+	}
+}
@@ -3,6 +3,7 @@ package main
 import (
 	"database/sql"
 	"fmt"
+	"regexp"
 	"strings"
 	"sync"
 
@@ -11,6 +12,27 @@ import (
 
 var schemaCache sync.Map
 
+var resourceIDPattern = regexp.MustCompile(`^[A-Za-z0-9_-]{1,64}$`)
+
+// validateResourceID checks a client-supplied resource ID (UUIDs and similar slugs).
+func validateResourceID(id string) error {
+	if !resourceIDPattern.MatchString(id) {
+		return fmt.Errorf("invalid resource id %q: use 1-64 letters, digits, '-' or '_'", id)
+	}
+	return nil
+}
+
+// normalizeVisibility defaults an omitted visibility to private and rejects values the resources CHECK constraint would.
+func normalizeVisibility(visibility string) (string, error) {
+	switch visibility {
+	case "":
+		return "private", nil
+	case "private", "group", "public":
+		return visibility, nil
+	}
+	return "", fmt.Errorf("invalid visibility %q: use private, group or public", visibility)
+}
+
 // validateResourceData checks if the provided data map conforms to the schema for the given resource type.
 func validateResourceData(resourceType string, data map[string]interface{}) error {
 	// Check cache
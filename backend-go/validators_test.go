@@ -2,6 +2,7 @@ package main
 
 import (
 	"database/sql"
+	"strings"
 	"testing"
 
 	_ "modernc.org/sqlite"
@@ -46,3 +47,29 @@ func TestValidateResourceData(t *testing.T) {
 		t.Error("Expected error for unknown type, got nil")
 	}
 }
+
+func TestNormalizeVisibility(t *testing.T) {
+	for in, want := range map[string]string{"": "private", "private": "private", "group": "group", "public": "public"} {
+		if got, err := normalizeVisibility(in); err != nil || got != want {
+			t.Errorf("normalizeVisibility(%q) = %q, %v; want %q", in, got, err, want)
+		}
+	}
+	for _, in := range []string{"Public", "secret"} {
+		if _, err := normalizeVisibility(in); err == nil {
+			t.Errorf("Expected %q to be rejected", in)
+		}
+	}
+}
+
+func TestValidateResourceID(t *testing.T) {
+	for _, id := range []string{"3f2b8c1e-9a4d-4c2f-8e1a-0b6d5c7e9f10", "my_ship-1"} {
+		if err := validateResourceID(id); err != nil {
+			t.Errorf("Expected %q to be valid, got %v", id, err)
+		}
+	}
+	for _, id := range []string{"", "../etc", "a b", strings.Repeat("x", 65)} {
+		if err := validateResourceID(id); err == nil {
+			t.Errorf("Expected %q to be rejected", id)
+		}
+	}
+}
@@ -0,0 +1,98 @@
+"""Startup cost of data.json versus the build_bundle.py core file.
+
+Compares what the browser must fetch and parse before initDb() can run:
+bytes on the wire (raw and gzip) and parse time, both with Python's json
+module and, when node is installed, with JSON.parse plus bundle.js's
+decodeCore (the code path the app actually runs).
+
+    python benchmarks/bench_bundle.py --repeat 200
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import build_bundle  # noqa: E402
+
+NODE_BENCH = r"""
+import { readFileSync } from 'node:fs';
+const [bundleJs, dataPath, corePath, repeat] = process.argv.slice(1);
+const { decodeCore } = await import('data:text/javascript;base64,' + Buffer.from(readFileSync(bundleJs)).toString('base64'));
+const dataText = readFileSync(dataPath, 'utf8');
+const coreText = readFileSync(corePath, 'utf8');
+const time = (fn) => {
+    for (let i = 0; i < 20; i++) fn();
+    const start = process.hrtime.bigint();
+    for (let i = 0; i < repeat; i++) fn();
+    return Number(process.hrtime.bigint() - start) / 1e6 / repeat;
+};
+console.log(JSON.stringify({
+    data: time(() => JSON.parse(dataText)),
+    core: time(() => decodeCore(JSON.parse(coreText))),
+}));
+"""
+
+
+def sizes(path):
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return len(raw), len(gzip.compress(raw, 9))
+
+
+def python_parse_ms(path, repeat, decode=False):
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if decode:
+        stmt = lambda: build_bundle.decode_core(json.loads(raw))  # noqa: E731
+    else:
+        stmt = lambda: json.loads(raw)  # noqa: E731
+    return min(timeit.repeat(stmt, number=repeat, repeat=3)) / repeat * 1000
+
+
+def node_parse_ms(data_path, core_path, repeat):
+    if shutil.which('node') is None:
+        return None
+    bundle_js = os.path.join(ROOT, 'public', 'swse', 'js', 'bundle.js')
+    proc = subprocess.run(['node', '--input-type=module', '-e', NODE_BENCH, bundle_js, data_path, core_path, str(repeat)],
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=os.path.join(ROOT, build_bundle.DATA_FILE))
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as out:
+        manifest = build_bundle.build(args.data, out)
+        core_path = os.path.join(out, manifest['core'])
+
+        print(f"{'file':<32} {'bytes':>9} {'gzip':>8}")
+        rows = [('data.json', args.data), (manifest['core'], core_path)]
+        rows += [(filename, os.path.join(out, filename)) for filename in manifest['parts'].values()]
+        for name, path in rows:
+            raw, gz = sizes(path)
+            print(f"{name:<32} {raw:>9,} {gz:>8,}")
+
+        print()
+        print(f"{'parse (ms)':<32} {'data.json':>9} {'core':>8}")
+        print(f"{'python json + decode':<32} {python_parse_ms(args.data, args.repeat):>9.3f} "
+              f"{python_parse_ms(core_path, args.repeat, decode=True):>8.3f}")
+        node = node_parse_ms(args.data, core_path, args.repeat)
+        if node:
+            print(f"{'node JSON.parse + decode':<32} {node['data']:>9.3f} {node['core']:>8.3f}")
+        else:
+            print("node not found; skipped the JavaScript timings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Memory held by Catalog and CompactCatalog at 10k, 100k and 1M components.
+
+Writes a synth_data.py catalog of each size (standing in for a merge of
+many user libraries) and then, for each model, loads it in a fresh
+interpreter and reports the memory the catalog keeps once the parsed JSON
+is gone, plus the peak while building it (tracemalloc) and the build
+time:
+
+    python benchmarks/bench_catalog_memory.py
+    python benchmarks/bench_catalog_memory.py --sizes 10000 100000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import synth_data  # noqa: E402
+
+MODELS = ('Catalog', 'CompactCatalog')
+
+# Run in a child process so every measurement starts from a clean heap
+MEASURE = """
+import gc, json, sys, time, tracemalloc
+sys.path.insert(0, {root!r})
+import catalog
+
+with open({path!r}, 'rb') as f:
+    raw = f.read()
+tracemalloc.start()
+start = time.perf_counter()
+built = catalog.{model}.from_data(json.loads(raw))
+seconds = time.perf_counter() - start
+gc.collect()
+current, peak = tracemalloc.get_traced_memory()
+print(json.dumps({{'items': len(built), 'retained': current, 'peak': peak, 'seconds': seconds}}))
+"""
+
+
+def measure(path, model):
+    code = MEASURE.format(root=ROOT, path=path, model=model)
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--models', nargs='+', choices=MODELS, default=list(MODELS))
+    args = parser.parse_args()
+
+    print(f"{'items':>9} {'model':<15} {'retained MB':>12} {'B/item':>7} {'peak MB':>9} {'build s':>8}")
+    base = synth_data.load_base(synth_data.DATA_FILE)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f'data_{size}.json')
+            synth_data.write_data(path, base, max(0, size - len(base['EQUIPMENT'])))
+            for model in args.models:
+                row = measure(path, model)
+                print(f"{row['items']:>9,} {model:<15} {row['retained'] / 2**20:>12.1f} "
+                      f"{row['retained'] / row['items']:>7.0f} {row['peak'] / 2**20:>9.1f} {row['seconds']:>8.2f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""How loadout search time grows with catalog size.
+
+Grows data.json's EQUIPMENT by cloning every definition with jittered
+prices (clones keep their exclusiveGroup, options and size limits), then
+times building the candidate table and the branch-and-bound search:
+
+    python benchmarks/bench_optimizer.py --scales 1 2 4 8 --hull cruiser --budget 5000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadout_optimizer import LoadoutOptimizer  # noqa: E402
+from ship_engine import ShipEngine  # noqa: E402
+
+
+def scaled_engine(engine, scale, seed=0):
+    rng = random.Random(seed)
+    equipment = list(engine.data['EQUIPMENT'])
+    for copy in range(1, scale):
+        for item in engine.data['EQUIPMENT']:
+            equipment.append({**item, 'id': f"{item['id']}__{copy}",
+                              'baseCost': round(item['baseCost'] * rng.uniform(0.8, 1.2))})
+    return ShipEngine({**engine.data, 'EQUIPMENT': equipment})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--hull', default='cruiser')
+    parser.add_argument('--objective', default='damage')
+    parser.add_argument('--budget', type=float, default=5000000)
+    parser.add_argument('--max-components', type=int, default=8)
+    parser.add_argument('--no-options', action='store_true')
+    args = parser.parse_args()
+
+    base = ShipEngine.load()
+    print(f"{'items':>7} {'variants':>9} {'candidates':>10} {'build s':>8} {'search s':>9} {'nodes':>9} {'value':>8}")
+    for scale in args.scales:
+        engine = scaled_engine(base, scale)
+
+        start = time.perf_counter()
+        optimizer = LoadoutOptimizer(engine, args.hull, objective=args.objective, options=not args.no_options)
+        built = time.perf_counter()
+        result = optimizer.search(args.budget, args.max_components)
+        searched = time.perf_counter()
+
+        candidates = len(optimizer.pool) + sum(len(options) for options in optimizer.groups)
+        print(f"{len(engine.equipment):>7} {len(optimizer.encoder.variants):>9} {candidates:>10} "
+              f"{built - start:>8.2f} {searched - built:>9.3f} {result['nodes']:>9,} {result['value']:>8g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Benchmark regression suite.
+
+Times the hot paths of the Python tooling and compares them with the stored
+baselines in benchmarks/baselines.json:
+
+    report      generate_report.py, full and incremental render of data.json
+    data        json.loads of data.json, validate_data.validate
+    engine      ShipEngine summary of every STOCK_SHIPS x (no template + TEMPLATES)
+    impact      impact_analyzer on a one-component edit, for data.json and a 100k item synth_data catalog
+    dice        dice.damage_table, every weapon x modifier x template, from empty caches
+    combat      combat_sim.simulate, one 20k-combat chunk of a fighter duel in-process
+    api         p50/p95 latency per endpoint against a running backend
+                (only with --api-url, e.g. the docker compose stack)
+
+    python benchmarks/run.py                    compare with the baselines, warn on a regression
+    python benchmarks/run.py --strict           the same, but exit 1 on a regression
+    python benchmarks/run.py --update           record the current numbers as the new baselines
+    python benchmarks/run.py --only engine data --output results.json
+
+Every metric is in milliseconds (lower is better) and is the fastest of
+--repeat runs (at least DICE_REPEAT for the dice table): noise only ever
+adds time, so the minimum is the most stable figure on a shared machine.
+A metric regresses when it exceeds its baseline by more than its
+threshold (THRESHOLDS, or --threshold for the rest) and by more than
+--min-delta milliseconds, so sub-millisecond jitter on the short metrics
+is never a regression on its own. Benchmarks with a regression are run
+once more and keep the faster figure before anything is reported.
+
+Baselines are machine specific and the file records the machine they
+were taken on (a mismatch is printed as a warning). Even on the same
+machine, background load can slow a whole run by 2x, so the gate is
+advisory: regressions are printed but the exit status is 0 unless
+--strict is given. Refresh the baselines with --update on a quiet
+machine when the reference machine changes.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import combat_sim  # noqa: E402
+import dice  # noqa: E402
+import generate_report  # noqa: E402
+import impact_analyzer  # noqa: E402
+import synth_data  # noqa: E402
+import validate_data  # noqa: E402
+from ship_engine import ShipEngine  # noqa: E402
+
+DATA_FILE = os.path.join(ROOT, 'public', 'swse', 'data.json')
+BASELINE_FILE = os.path.join(ROOT, 'benchmarks', 'baselines.json')
+
+DEFAULT_THRESHOLD = 0.25
+# Noisier metrics get more slack than the default
+THRESHOLDS = {
+    'report.incremental': 0.5,
+    'data.parse': 0.5,
+    'impact.analyze': 0.5,
+}
+DICE_REPEAT = 40
+API_THRESHOLD = 0.5
+# Slowdowns smaller than this many milliseconds are timer and scheduler noise
+DEFAULT_MIN_DELTA = 1.0
+
+
+def measure(fn, repeat, stat=min):
+    """Fastest (or stat) wall time of fn() in milliseconds, after one warm-up call."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return stat(times)
+
+
+def bench_report(args):
+    catalog = generate_report.load_catalog(args.data, ())
+    with tempfile.TemporaryDirectory() as tmp:
+        report = os.path.join(tmp, 'REPORT.md')
+        full = measure(lambda: generate_report.write_report(catalog, report, incremental=False), args.repeat)
+        generate_report.write_report(catalog, report)
+        incremental = measure(lambda: generate_report.write_report(catalog, report), args.repeat)
+    return {'report.full': full, 'report.incremental': incremental}
+
+
+def bench_data(args):
+    with open(args.data, encoding='utf-8') as f:
+        text = f.read()
+    data = json.loads(text)
+    return {
+        'data.parse': measure(lambda: json.loads(text), args.repeat),
+        'data.validate': measure(lambda: validate_data.validate(data, text), args.repeat),
+    }
+
+
+def bench_engine(args):
+    engine = ShipEngine.load(args.data)
+    templates = [None] + [t['id'] for t in engine.data['TEMPLATES']]
+    states = [engine.new_ship(ship['id'], template) for ship in engine.data['STOCK_SHIPS'] for template in templates]
+    return {'engine.stock_x_templates': measure(lambda: engine.evaluate_many(states), args.repeat)}
+
+
+def bench_impact(args):
+    with open(args.data, encoding='utf-8') as f:
+        data = json.load(f)
+    stock_id = next(m if isinstance(m, str) else m['id']
+                    for ship in data['STOCK_SHIPS'] for m in ship.get('defaultMods') or [])
+
+    def edited(base):
+        equipment = [dict(item, baseCost=item['baseCost'] * 2) if item['id'] == stock_id else item
+                     for item in base['EQUIPMENT']]
+        return {**base, 'EQUIPMENT': equipment}
+
+    large = synth_data.synthesize(data, 100_000 - len(data['EQUIPMENT']))
+    small_new, large_new = edited(data), edited(large)
+    return {
+        'impact.analyze': measure(lambda: impact_analyzer.analyze(data, small_new), args.repeat),
+        'impact.analyze_100k': measure(lambda: impact_analyzer.analyze(large, large_new), args.repeat),
+    }
+
+
+def bench_dice(args):
+    engine = ShipEngine.load(args.data)
+
+    # What one report pays; the memo only has to pay off within the table
+    def table():
+        for cached in (dice._sum_pmf, dice.distribution, dice.summary):
+            cached.cache_clear()
+        dice.damage_table(engine)
+
+    return {'dice.table': measure(table, max(args.repeat, DICE_REPEAT))}
+
+
+def bench_combat(args):
+    engine = ShipEngine.load(args.data)
+    a = combat_sim.combatant(engine, 'light_fighter:advanced+laser_light+laser_light/quad')
+    b = combat_sim.combatant(engine, 'gozanti')
+    return {'combat.chunk_20k': measure(lambda: combat_sim.simulate(a, b, 20_000, 0), args.repeat)}
+
+
+def bench_api(args):
+    if not args.api_url:
+        return {}
+    sys.path.insert(0, os.path.join(ROOT, 'tests'))
+    import asyncio
+    import random
+
+    import load_test
+
+    users, resources = load_test.seed(args.api_url, 5, 40, 20, 8, random.Random(0))
+    stats, elapsed = asyncio.run(load_test.drive(args.api_url, users, resources, load_test.parse_mix(load_test.DEFAULT_MIX),
+                                                 concurrency=8, requests=args.api_requests))
+    metrics = {}
+    for endpoint, row in stats.summary(elapsed).items():
+        metrics[f"api.{endpoint}.p50"] = row['p50_ms']
+        metrics[f"api.{endpoint}.p95"] = row['p95_ms']
+    return metrics
+
+
+BENCHMARKS = {
+    'report': bench_report,
+    'data': bench_data,
+    'engine': bench_engine,
+    'impact': bench_impact,
+    'dice': bench_dice,
+    'combat': bench_combat,
+    'api': bench_api,
+}
+
+
+def threshold_for(metric, default=DEFAULT_THRESHOLD):
+    if metric.startswith('api.'):
+        return max(default, API_THRESHOLD)
+    return THRESHOLDS.get(metric, default)
+
+
+def machine():
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'system': platform.system(),
+            'processor': platform.processor() or None}
+
+
+def compare(results, baselines, default_threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """Return [(metric, value, baseline, change, regressed)] for every measured metric."""
+    rows = []
+    for metric, value in sorted(results.items()):
+        baseline = baselines.get(metric)
+        if baseline is None:
+            rows.append((metric, value, None, None, False))
+            continue
+        change = value / baseline - 1 if baseline else 0.0
+        regressed = change > threshold_for(metric, default_threshold) and value - baseline > min_delta
+        rows.append((metric, value, baseline, change, regressed))
+    return rows
+
+
+def load_baselines(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'machine': None, 'metrics': {}}
+
+
+def save_baselines(path, results, previous):
+    metrics = {**previous.get('metrics', {}), **{k: round(v, 4) for k, v in results.items()}}
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'machine': machine(), 'metrics': dict(sorted(metrics.items()))}, f, indent=2)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare it with stored baselines.")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="Benchmarks to run (default: all)")
+    parser.add_argument('--data', default=DATA_FILE)
+    parser.add_argument('--repeat', type=int, default=15)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown for metrics without their own threshold (0.25 = 25%%)")
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help="Slowdowns under this many ms never count as regressions (default: %(default)s)")
+    parser.add_argument('--strict', action='store_true', help="Exit 1 when a metric regressed")
+    parser.add_argument('--update', action='store_true', help="Write the results as the new baselines")
+    parser.add_argument('--output', help="Also write this run's results to a JSON file")
+    parser.add_argument('--api-url', help="Backend to measure, e.g. http://localhost:8787 (skipped when unset)")
+    parser.add_argument('--api-requests', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    results = {}
+    for name in names:
+        results.update(BENCHMARKS[name](args))
+
+    stored = load_baselines(args.baseline)
+    if stored.get('machine') and stored['machine'] != machine():
+        print(f"warning: baselines were recorded on {stored['machine']}, this is {machine()}", file=sys.stderr)
+
+    rows = compare(results, stored.get('metrics', {}), args.threshold, args.min_delta)
+    # A slow phase of the machine can cover a whole benchmark, so confirm before reporting
+    regressed = {row[0] for row in rows if row[4]}
+    if regressed and not args.update:
+        for name in names:
+            rerun = BENCHMARKS[name](args) if any(m.startswith(name + '.') for m in regressed) else {}
+            for metric, value in rerun.items():
+                results[metric] = min(results[metric], value)
+        rows = compare(results, stored.get('metrics', {}), args.threshold, args.min_delta)
+    print(f"{'metric':<40} {'ms':>10} {'baseline':>10} {'change':>8}")
+    for metric, value, baseline, change, regressed in rows:
+        base = f"{baseline:>10.3f}" if baseline is not None else f"{'-':>10}"
+        delta = f"{change:>+8.0%}" if change is not None else f"{'new':>8}"
+        print(f"{metric:<40} {value:>10.3f} {base} {delta}{'  REGRESSION' if regressed else ''}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'machine': machine(), 'metrics': results}, f, indent=2)
+    if args.update:
+        save_baselines(args.baseline, results, stored)
+        print(f"Baselines written to {args.baseline}")
+        return 0
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed: {', '.join(regressions)}", file=sys.stderr)
+        if args.strict:
+            return 1
+        print("warning: advisory only (pass --strict to fail on regressions)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
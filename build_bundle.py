@@ -0,0 +1,180 @@
+"""Build the minified, pre-indexed data bundle the front end loads at startup.
+
+public/swse/data.json stays the source of truth (migrate_urls.py and the
+dev-mode editor write it pretty-printed). This writes public/swse/bundle/:
+
+    manifest.json               which files make up the current bundle (serve no-cache)
+    core.<hash>.json            everything initDb() needs, minified, without the strings below
+    names.es.<hash>.json        name_es for every EQUIPMENT / STOCK_SHIPS / TEMPLATES id
+    descriptions.<hash>.json    description for every id, fetched when a view needs it
+
+Each hashed name is the sha256 prefix of the file's own bytes, so those
+files can be cached forever and a rebuild only changes the manifest and
+the parts whose content changed.
+
+In core, ids and the other repeated enum-like fields (category, group,
+availability, ...) are interned: the value is an index into core['strings'].
+public/swse/js/bundle.js decodes it back into the data.json shape; when no
+bundle has been built the app falls back to fetching data.json itself.
+
+Only the GitHub Pages workflow ships a bundle. Nothing rebuilds it when
+data.json changes, so the docker compose nginx answers 404 for bundle/
+and local edits are never hidden behind a stale one.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+
+DATA_FILE = os.path.join('public', 'swse', 'data.json')
+BUNDLE_DIR = os.path.join('public', 'swse', 'bundle')
+
+# Bump when the core layout changes; bundle.js refuses formats it doesn't know
+FORMAT_VERSION = 1
+HASH_LENGTH = 12
+
+LISTS = ('EQUIPMENT', 'STOCK_SHIPS', 'TEMPLATES')
+INTERNED_FIELDS = ('id', 'category', 'group', 'availability', 'exclusiveGroup', 'location', 'damageType', 'size')
+
+# Bundle part name -> item field moved out of core into that part
+LAZY_FIELDS = {
+    'names.es': 'name_es',
+    'descriptions': 'description',
+}
+
+
+def minify(obj):
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def content_hash(raw):
+    return hashlib.sha256(raw).hexdigest()[:HASH_LENGTH]
+
+
+class StringTable:
+    def __init__(self):
+        self.strings = []
+        self.index = {}
+
+    def intern(self, value):
+        key = json.dumps(value)
+        if key not in self.index:
+            self.index[key] = len(self.strings)
+            self.strings.append(value)
+        return self.index[key]
+
+
+def split_data(data):
+    """Return (core, {part name: {'field', 'values'}}) for a data.json dict."""
+    strings = StringTable()
+    parts = {name: {'field': field, 'values': {key: {} for key in LISTS}} for name, field in LAZY_FIELDS.items()}
+    lazy = {field: name for name, field in LAZY_FIELDS.items()}
+
+    core = {'format': FORMAT_VERSION, 'strings': strings.strings,
+            'tables': {k: v for k, v in data.items() if k not in LISTS}}
+    for key in LISTS:
+        items = []
+        for item in data.get(key, []):
+            encoded = {}
+            for field, value in item.items():
+                if field in lazy:
+                    parts[lazy[field]]['values'][key][item['id']] = value
+                elif field in INTERNED_FIELDS:
+                    encoded[field] = strings.intern(value)
+                elif field == 'defaultMods':
+                    encoded[field] = [strings.intern(m) if isinstance(m, str) else {**m, 'id': strings.intern(m['id'])}
+                                      for m in value]
+                else:
+                    encoded[field] = value
+            items.append(encoded)
+        core[key] = items
+    return core, parts
+
+
+def decode_core(core):
+    """Inverse of split_data for core alone (lazy fields missing); mirrors decodeCore in bundle.js."""
+    if core.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format: {core.get('format')}")
+    strings = core['strings']
+    data = dict(core['tables'])
+    for key in LISTS:
+        items = []
+        for encoded in core[key]:
+            item = {}
+            for field, value in encoded.items():
+                if field in INTERNED_FIELDS:
+                    value = strings[value]
+                elif field == 'defaultMods':
+                    value = [strings[m] if isinstance(m, int) else {**m, 'id': strings[m['id']]} for m in value]
+                item[field] = value
+            items.append(item)
+        data[key] = items
+    return data
+
+
+def merge_part(data, part):
+    """Copy a lazy part's values onto the matching items; mirrors mergePart in bundle.js."""
+    field = part['field']
+    for key, values in part['values'].items():
+        for item in data.get(key, []):
+            if item['id'] in values and field not in item:
+                item[field] = values[item['id']]
+    return data
+
+
+def build(data_path=DATA_FILE, out_dir=BUNDLE_DIR):
+    """Write the bundle for data_path into out_dir and return the manifest."""
+    with open(data_path, 'rb') as f:
+        source = f.read()
+    core, parts = split_data(json.loads(source))
+
+    os.makedirs(out_dir, exist_ok=True)
+    files = {}
+    for name, obj in [('core', core), *parts.items()]:
+        raw = minify(obj)
+        filename = f"{name}.{content_hash(raw)}.json"
+        path = os.path.join(out_dir, filename)
+        if not os.path.exists(path):
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp, path)
+        files[name] = filename
+
+    manifest = {
+        'format': FORMAT_VERSION,
+        'source': hashlib.sha256(source).hexdigest(),
+        'core': files.pop('core'),
+        'parts': files,
+    }
+    tmp = os.path.join(out_dir, 'manifest.json.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(minify(manifest))
+    os.replace(tmp, os.path.join(out_dir, 'manifest.json'))
+
+    # Older builds: anything hashed that the new manifest doesn't reference
+    keep = {manifest['core'], *manifest['parts'].values()}
+    for path in glob.glob(os.path.join(out_dir, '*.*.json')):
+        if os.path.basename(path) not in keep:
+            os.remove(path)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the minified front-end data bundle from data.json.")
+    parser.add_argument('--data', default=DATA_FILE)
+    parser.add_argument('--out', default=BUNDLE_DIR)
+    args = parser.parse_args()
+
+    manifest = build(args.data, args.out)
+    source_size = os.path.getsize(args.data)
+    core_size = os.path.getsize(os.path.join(args.out, manifest['core']))
+    print(f"Bundle written to {args.out}: {manifest['core']} ({core_size:,} bytes, "
+          f"{core_size / source_size:.0%} of data.json)")
+    for name, filename in manifest['parts'].items():
+        print(f"  {name}: {filename} ({os.path.getsize(os.path.join(args.out, filename)):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
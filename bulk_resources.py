@@ -0,0 +1,436 @@
+"""Bulk export and import of API resources (ships, libraries, hangars, configurations) as NDJSON.
+
+    python bulk_resources.py export -o backup.ndjson                       every type the token can read
+    python bulk_resources.py export --types ships hangars -o - | gzip > ships.ndjson.gz
+    python bulk_resources.py import backup.ndjson --workers 8 --batch 200
+    python bulk_resources.py import backup.ndjson --new-ids          a copy owned by this token's account
+
+One resource per line: {"id", "type", "name", "visibility", "data"}.
+Export walks the list endpoints page by page and parses each page
+incrementally, so memory stays bounded by one resource rather than the
+whole list. Import reads lines lazily and
+keeps at most a few requests per worker in flight.
+
+Imports are idempotent, so re-running after a failure never creates
+duplicates. Every resource is written under its ID. A line without an ID
+gets one derived from its content and the token's account (uuid5), so two
+users importing the same line get two resources. A create that hits an
+existing ID becomes an update.
+
+Resource IDs are global on a backend. An export restored into a different
+account on the same backend would address the original owner's
+resources, and every line fails with 403. Import it with --new-ids
+instead. That derives a fresh ID for every line from its exported ID and
+the importing account, so the copy can still be re-run safely. With --batch, items go to POST /{type}/batch in
+chunks. If the backend predates that endpoint, the import falls back to
+one request per resource. Connection errors, 429 and 5xx responses are
+retried with exponential backoff.
+
+The token comes from --token or $SWSE_TOKEN (the access_token from /auth/login).
+"""
+import argparse
+import base64
+import codecs
+import http.client
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+RESOURCE_TYPES = ['ships', 'libraries', 'hangars', 'configurations']
+FIELDS = ['id', 'type', 'name', 'visibility', 'data']
+PAGE_SIZE = 500
+DEFAULT_URL = os.environ.get('API_URL', 'http://localhost:8787')
+# Stable namespace for IDs derived from content, so every import of a line by one account agrees on its ID
+ID_NAMESPACE = uuid.UUID('5b0f6a52-8c1e-4d36-9a57-2f4e0c9d1b83')
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        self.status = status
+        super().__init__(f"HTTP {status}: {message}" if status else message)
+
+
+class ApiClient:
+    """Minimal JSON client with one keep-alive connection per thread."""
+
+    def __init__(self, base_url=DEFAULT_URL, token=None, timeout=30):
+        parts = urllib.parse.urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        if token:
+            self.headers['Authorization'] = f"Bearer {token}"
+        self._local = threading.local()
+
+    def connect(self):
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return cls(self.netloc, timeout=self.timeout)
+
+    def request(self, method, path, body=None):
+        """Return (status, response bytes). Connection failures are status 0."""
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        for attempt in range(2):
+            conn = getattr(self._local, 'conn', None)
+            if conn is None:
+                conn = self._local.conn = self.connect()
+            try:
+                conn.request(method, self.prefix + path, body=payload, headers=self.headers)
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                self._local.conn = None
+                # A kept-alive connection the server already closed fails once; retry on a fresh one
+                if attempt:
+                    return 0, str(e).encode('utf-8')
+
+    def stream(self, path):
+        """GET path on a dedicated connection and return the open response."""
+        conn = self.connect()
+        conn.request('GET', self.prefix + path, headers=self.headers)
+        response = conn.getresponse()
+        if response.status != 200:
+            body = response.read()
+            conn.close()
+            raise ApiError(response.status, body.decode('utf-8', 'replace').strip())
+        return response
+
+
+def iter_json_array(fp, chunk_size=1 << 16):
+    """Yield the elements of a JSON array read from fp without loading the whole array."""
+    decoder = json.JSONDecoder()
+    buf = ''
+    started = False
+    eof = False
+    while True:
+        buf = buf.lstrip()
+        if not started:
+            if buf:
+                if buf[0] != '[':
+                    raise ValueError(f"expected a JSON array, got {buf[:40]!r}")
+                buf = buf[1:]
+                started = True
+                continue
+        elif buf.startswith(']'):
+            return
+        elif buf.startswith(','):
+            buf = buf[1:]
+            continue
+        elif buf:
+            try:
+                item, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A number is only complete once a delimiter follows it; it may continue in the next chunk
+                if eof or not isinstance(item, (int, float)) or buf[end:end + 1] in tuple(' \t\r\n,]'):
+                    yield item
+                    buf = buf[end:]
+                    continue
+        if eof:
+            raise ValueError("unexpected end of JSON array")
+        chunk = fp.read(chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode('utf-8')
+        eof = not chunk
+        buf += chunk
+
+
+def export_resources(client, types, out, log=None, page_size=PAGE_SIZE):
+    """Write every readable resource of the given types to out as NDJSON; return counts per type."""
+    counts = {}
+    for resource_type in types:
+        n = 0
+        cursor = None
+        while True:
+            params = {'limit': page_size, 'fields': ','.join(FIELDS)}
+            if cursor:
+                params['cursor'] = cursor
+            response = client.stream(f"/{resource_type}?{urllib.parse.urlencode(params)}")
+            try:
+                for resource in iter_json_array(_Utf8Reader(response)):
+                    record = {field: resource.get(field) for field in FIELDS}
+                    record['type'] = record['type'] or resource_type
+                    out.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+                    n += 1
+            finally:
+                response.close()
+            cursor = response.getheader('X-Next-Cursor')
+            if not cursor:
+                break
+        counts[resource_type] = n
+        if log:
+            log(f"Exported {n} {resource_type}")
+    return counts
+
+
+class _Utf8Reader:
+    """Text reads from a byte stream that never split a UTF-8 sequence."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def read(self, size):
+        while True:
+            chunk = self.raw.read(size)
+            text = self.decoder.decode(chunk, final=not chunk)
+            if text or not chunk:
+                return text
+
+
+def token_subject(token):
+    """The account a bearer token belongs to (its JWT 'sub' claim), or None.
+
+    The claim is read without checking the signature; the server does that.
+    """
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return str(claims['sub'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def record_id(record, owner=None, new_ids=False):
+    """The record's ID, or a stable one derived from its type, content and owner.
+
+    With new_ids the record's own ID only feeds the derived one, so a copy
+    gets its own ID per owner.
+    """
+    if record.get('id') and not new_ids:
+        return record['id']
+    parts = [record.get('type'), record.get('name'), record.get('data')]
+    if new_ids:
+        parts.append(record.get('id'))
+    namespace = uuid.uuid5(ID_NAMESPACE, owner) if owner else ID_NAMESPACE
+    return str(uuid.uuid5(namespace, json.dumps(parts, sort_keys=True)))
+
+
+def iter_ndjson(fp):
+    """Yield (line number, record) for every non-blank line."""
+    for lineno, line in enumerate(fp, 1):
+        line = line.strip()
+        if line:
+            yield lineno, json.loads(line)
+
+
+def is_retryable(status):
+    return status == 0 or status == 429 or status >= 500
+
+
+def with_retries(call, retries=3, backoff=0.2, rng=random, sleep=time.sleep):
+    """Run call() -> (status, body) until it succeeds, fails for good, or retries run out."""
+    for attempt in itertools.count():
+        status, body = call()
+        if not is_retryable(status) or attempt >= retries:
+            return status, body
+        delay = backoff * 2 ** attempt
+        sleep(delay / 2 + rng.uniform(0, delay / 2))
+
+
+class ImportStats:
+    def __init__(self):
+        self.counts = {'created': 0, 'updated': 0, 'failed': 0}
+        self.failures = []
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def add(self, outcome, record=None, error=None, lineno=None):
+        with self._lock:
+            self.counts[outcome] += 1
+            if outcome == 'failed':
+                self.failures.append((lineno, record and record.get('id'), error))
+
+    def request(self, n=1):
+        with self._lock:
+            self.requests += n
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+
+class Importer:
+    def __init__(self, client, retries=3, backoff=0.2, batch_size=0, rng=None, owner=None, new_ids=False):
+        self.client = client
+        self.owner = owner
+        self.new_ids = new_ids
+        self.retries = retries
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.rng = rng or random.Random()
+        self.stats = ImportStats()
+        self._batch_unsupported = set()
+
+    def call(self, method, path, body=None):
+        def attempt():
+            self.stats.request()
+            return self.client.request(method, path, body)
+        return with_retries(attempt, self.retries, self.backoff, self.rng)
+
+    def put_one(self, lineno, record):
+        """Create the record under its ID, or update it when the ID already exists."""
+        resource_type = record['type']
+        body = {'id': record['id'], 'name': record.get('name'), 'visibility': record.get('visibility') or 'private',
+                'data': record.get('data') or {}}
+        status, payload = self.call('POST', f"/{resource_type}", body)
+        if status == 409:
+            status, payload = self.call('PUT', f"/{resource_type}/{urllib.parse.quote(record['id'])}", body)
+            outcome = 'updated'
+        else:
+            outcome = 'created'
+        if status == 200:
+            self.stats.add(outcome)
+        else:
+            self.stats.add('failed', record, f"HTTP {status}: {_message(payload)}", lineno)
+
+    def put_batch(self, resource_type, chunk):
+        if resource_type in self._batch_unsupported:
+            for lineno, record in chunk:
+                self.put_one(lineno, record)
+            return
+        items = [{'id': r['id'], 'name': r.get('name'), 'visibility': r.get('visibility') or 'private',
+                  'data': r.get('data') or {}} for _, r in chunk]
+        status, payload = self.call('POST', f"/{resource_type}/batch", {'items': items})
+        if status in (404, 405):
+            # Backend without the batch endpoint
+            self._batch_unsupported.add(resource_type)
+            for lineno, record in chunk:
+                self.put_one(lineno, record)
+            return
+        if status != 200:
+            for lineno, record in chunk:
+                self.stats.add('failed', record, f"HTTP {status}: {_message(payload)}", lineno)
+            return
+        for (lineno, record), result in zip(chunk, json.loads(payload)['results']):
+            if result['status'] == 'failed':
+                self.stats.add('failed', record, f"HTTP {result.get('code')}: {result.get('error')}", lineno)
+            else:
+                self.stats.add(result['status'])
+
+    def tasks(self, records):
+        """Turn (lineno, record) pairs into callables, chunking consecutive same-type records in batch mode."""
+        def prepared():
+            for lineno, record in records:
+                if not record.get('type'):
+                    self.stats.add('failed', record, "missing type", lineno)
+                    continue
+                yield lineno, dict(record, id=record_id(record, self.owner, self.new_ids))
+
+        if not self.batch_size:
+            for lineno, record in prepared():
+                yield lambda lineno=lineno, record=record: self.put_one(lineno, record)
+            return
+        chunk, chunk_type = [], None
+        for lineno, record in prepared():
+            if chunk and (record['type'] != chunk_type or len(chunk) >= self.batch_size):
+                yield lambda t=chunk_type, c=chunk: self.put_batch(t, c)
+                chunk = []
+            chunk_type = record['type']
+            chunk.append((lineno, record))
+        if chunk:
+            yield lambda t=chunk_type, c=chunk: self.put_batch(t, c)
+
+    def run(self, records, workers=8, on_progress=None):
+        """Run every task on a pool of workers with at most 2 * workers queued, so input is read lazily."""
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for task in self.tasks(records):
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                    if on_progress:
+                        on_progress(self.stats)
+                pending.add(pool.submit(task))
+            for future in pending:
+                future.result()
+        return self.stats
+
+
+def _message(payload):
+    return payload.decode('utf-8', 'replace').strip()[:200] if isinstance(payload, bytes) else str(payload)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk export/import of API resources as NDJSON.")
+    parser.add_argument('--base-url', default=DEFAULT_URL, help="API root (default: $API_URL or %(default)s)")
+    parser.add_argument('--token', default=os.environ.get('SWSE_TOKEN'), help="Bearer token (default: $SWSE_TOKEN)")
+    parser.add_argument('--timeout', type=float, default=30)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('export', help="Stream resources to NDJSON")
+    p.add_argument('--types', nargs='+', default=RESOURCE_TYPES)
+    p.add_argument('-o', '--output', default='-', help="Output file ('-' for stdout)")
+
+    p = sub.add_parser('import', help="Create or update resources from NDJSON")
+    p.add_argument('input', help="NDJSON file ('-' for stdin)")
+    p.add_argument('--workers', type=int, default=8)
+    p.add_argument('--batch', type=int, default=0, metavar='N', help="Send N resources per batch request (max 500)")
+    p.add_argument('--retries', type=int, default=3, help="Retries for connection errors, 429 and 5xx")
+    p.add_argument('--backoff', type=float, default=0.2, help="First retry delay in seconds, doubling each time")
+    p.add_argument('--new-ids', action='store_true',
+                   help="Give every resource a new ID for this account, e.g. to copy an export into another account")
+    args = parser.parse_args(argv)
+
+    client = ApiClient(args.base_url, args.token, args.timeout)
+    log = lambda message: print(message, file=sys.stderr)
+    start = time.perf_counter()
+
+    if args.command == 'export':
+        out = sys.stdout if args.output == '-' else open(args.output + '.tmp', 'w', encoding='utf-8')
+        try:
+            counts = export_resources(client, args.types, out, log)
+        except ApiError as e:
+            log(f"Export failed: {e}")
+            return 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        if out is not sys.stdout:
+            os.replace(args.output + '.tmp', args.output)
+        total = sum(counts.values())
+        elapsed = time.perf_counter() - start
+        log(f"{total} resources in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f}/s)")
+        return 0
+
+    importer = Importer(client, args.retries, args.backoff, min(args.batch, 500), owner=token_subject(args.token),
+                        new_ids=args.new_ids)
+    last = [start]
+
+    def progress(stats):
+        now = time.perf_counter()
+        if now - last[0] >= 5:
+            last[0] = now
+            log(f"{stats.total} imported ({stats.total / (now - start):.0f}/s)")
+
+    fp = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    try:
+        stats = importer.run(iter_ndjson(fp), args.workers, progress)
+    finally:
+        if fp is not sys.stdin:
+            fp.close()
+    elapsed = time.perf_counter() - start
+    c = stats.counts
+    log(f"{stats.total} resources ({c['created']} created, {c['updated']} updated, {c['failed']} failed) "
+        f"in {elapsed:.1f}s: {stats.total / elapsed if elapsed else 0:.0f} resources/s, {stats.requests} requests")
+    for lineno, resource_id, error in stats.failures[:20]:
+        log(f"  line {lineno} ({resource_id}): {error}")
+    if any(error.startswith('HTTP 403') for _, _, error in stats.failures):
+        log("IDs that answer 403 belong to another account; re-run with --new-ids to import a copy")
+    return 1 if c['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""Indexed view of the EQUIPMENT list in data.json.
+
+Mirrors `equipmentCatalog` in public/swse/js/store.js: one pass builds
+id -> definition, category -> group -> items and exclusiveGroup -> items,
+so tooling never scans the whole list per lookup. Catalog.load() caches
+one catalog per data.json version.
+
+CompactCatalog has the same interface for very large merged libraries.
+Each item becomes a Component with __slots__ instead of a dict: category,
+group, availability, exclusiveGroup and the other low-variety strings are
+interned, stats and other nested values are shared between items with
+equal content, baseCost and baseEp live in array columns, and description
+text is kept UTF-8 encoded in one buffer and only decoded when read. A
+Component answers get(), [] and `in` with the data.json keys, so code
+written against dict items works on either catalog; it is read-only.
+"""
+import hashlib
+import json
+import math
+import os
+import sys
+from array import array
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public', 'swse', 'data.json')
+
+
+class Catalog:
+    def __init__(self, equipment, version=None):
+        # Later entries with the same id override earlier ones but keep their
+        # position, like the Map in store.js
+        self.by_id = {}
+        for item in equipment:
+            self.by_id[item['id']] = item
+        self.version = version
+
+        self.categories = {}
+        self.exclusive_groups = {}
+        for item in self.by_id.values():
+            groups = self.categories.setdefault(item.get('category', 'Uncategorized'), {})
+            groups.setdefault(item.get('group', 'Uncategorized'), []).append(item)
+            if item.get('exclusiveGroup'):
+                self.exclusive_groups.setdefault(item['exclusiveGroup'], []).append(item)
+
+    @classmethod
+    def from_data(cls, data, libraries=None, version=None):
+        """Build from a data.json dict plus any active custom libraries (allEquipment)."""
+        equipment = list(data.get('EQUIPMENT', []))
+        for lib in libraries or []:
+            if lib.get('active'):
+                equipment.extend(lib.get('components', []))
+        return cls(equipment, version=version)
+
+    @classmethod
+    def load(cls, path=DATA_FILE):
+        """Return the catalog for path, rebuilding only when its contents change."""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        version = hashlib.sha256(raw).hexdigest()
+        if (cls, version) not in _loaded:
+            _loaded[cls, version] = cls.from_data(json.loads(raw), version=version)
+        return _loaded[cls, version]
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+    def __contains__(self, def_id):
+        return def_id in self.by_id
+
+    def get(self, def_id, default=None):
+        return self.by_id.get(def_id, default)
+
+    def items_in(self, category, group=None):
+        groups = self.categories.get(category, {})
+        if group is not None:
+            return groups.get(group, [])
+        return [item for items in groups.values() for item in items]
+
+    def exclusive_with(self, def_id):
+        """Other components that replace def_id when installed (same exclusiveGroup)."""
+        item = self.by_id.get(def_id)
+        if not item or not item.get('exclusiveGroup'):
+            return []
+        return [other for other in self.exclusive_groups[item['exclusiveGroup']] if other['id'] != def_id]
+
+
+# data.json key -> Component slot, for the keys most items have
+SLOTS = {'id': 'id', 'name': 'name', 'name_es': 'name_es', 'category': 'category', 'group': 'group',
+         'availability': 'availability', 'exclusiveGroup': 'exclusive_group', 'location': 'location',
+         'sizeMult': 'size_mult', 'wiki': 'wiki', 'damage': 'damage', 'stats': 'stats'}
+INTERNED = frozenset(['category', 'group', 'availability', 'exclusiveGroup', 'location', 'damage'])
+# Keys held in CompactCatalog columns
+COLUMNS = ('baseCost', 'baseEp', 'description')
+
+
+class Component:
+    """One EQUIPMENT entry of a CompactCatalog; read it like the data.json dict.
+
+    Keys without a slot or column (upgradeSpecs, minShipSize, ...) are kept
+    in `extra`, as is a baseCost/baseEp that is not a number (the column can
+    only hold numbers). A key whose value is null counts as missing.
+    """
+    __slots__ = ('_catalog', '_row', *SLOTS.values(), 'extra')
+
+    def __init__(self, catalog, row, item):
+        self._catalog = catalog
+        self._row = row
+        extra = None
+        for slot in SLOTS.values():
+            setattr(self, slot, None)
+        for key, value in item.items():
+            if isinstance(value, str):
+                if key in INTERNED:
+                    value = sys.intern(value)
+            elif isinstance(value, (dict, list)):
+                value = catalog.shared(value)
+            if key in SLOTS:
+                setattr(self, SLOTS[key], value)
+            elif key not in COLUMNS or (key != 'description' and value is not None and not _is_number(value)):
+                if extra is None:
+                    extra = {}
+                extra[sys.intern(key)] = value
+        self.extra = extra
+
+    def __repr__(self):
+        return f"Component({self.id!r})"
+
+    @property
+    def base_cost(self):
+        return _number(self._catalog.costs[self._row])
+
+    @property
+    def base_ep(self):
+        return _number(self._catalog.eps[self._row])
+
+    @property
+    def description(self):
+        return self._catalog.description(self._row)
+
+    def get(self, key, default=None):
+        if key in SLOTS:
+            value = getattr(self, SLOTS[key])
+        elif key == 'baseCost':
+            value = self.base_cost
+            if value is None and self.extra:
+                value = self.extra.get(key)
+        elif key == 'baseEp':
+            value = self.base_ep
+            if value is None and self.extra:
+                value = self.extra.get(key)
+        elif key == 'description':
+            value = self.description
+        else:
+            value = self.extra.get(key) if self.extra else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def keys(self):
+        extra = [key for key in self.extra or () if key not in COLUMNS]
+        return [key for key in (*SLOTS, *COLUMNS, *extra) if key in self]
+
+    def to_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+
+def _number(value):
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+class CompactCatalog(Catalog):
+    """Catalog of Component records over shared columns; see the module docstring."""
+
+    def __init__(self, equipment, version=None):
+        self.costs = array('d')
+        self.eps = array('d')
+        # description of row n is text[text_start[n]:text_start[n] + text_length[n]]; length -1 means none
+        self.text = bytearray()
+        self.text_start = array('Q')
+        self.text_length = array('q')
+        # Canonical JSON -> the first dict/list seen with that content
+        self._shared = {}
+        super().__init__((self.add(item) for item in equipment), version)
+        # Only needed while building; later add() calls just share less
+        self._shared.clear()
+
+    def add(self, item):
+        """Append one data.json item to the columns and return its Component."""
+        row = len(self.costs)
+        self.costs.append(_column_value(item.get('baseCost')))
+        self.eps.append(_column_value(item.get('baseEp')))
+        description = item.get('description')
+        self.text_start.append(len(self.text))
+        if description is None:
+            self.text_length.append(-1)
+        else:
+            encoded = description.encode('utf-8')
+            self.text.extend(encoded)
+            self.text_length.append(len(encoded))
+        return Component(self, row, item)
+
+    def shared(self, value):
+        """One object per distinct nested value (stats, upgradeSpecs, ...)."""
+        return self._shared.setdefault(json.dumps(value, sort_keys=True), value)
+
+    def description(self, row):
+        length = self.text_length[row]
+        if length < 0:
+            return None
+        start = self.text_start[row]
+        return self.text[start:start + length].decode('utf-8')
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value)
+
+
+def _column_value(value):
+    return float(value) if _is_number(value) else math.nan
+
+
+# (catalog class, data.json version (sha256)) -> catalog
+_loaded = {}
@@ -0,0 +1,291 @@
+"""Monte Carlo ship-vs-ship combat between two builds.
+
+Each ship is a STOCK_SHIPS hull with an optional template and extra
+weapons, priced and statted by ShipEngine. Every round both ships fire
+every weapon at each other at the same time:
+
+    attack  d20 + gunner bonus + ship Int modifier against the target's
+            Reflex Defense; a natural 1 misses, a natural 20 hits for
+            double damage
+    damage  the weapon's dice after enhancement, mount, fireLink and
+            template bonuses (Ship.component_damage), drawn from the exact
+            distribution in dice.py
+    shields damage is reduced by the current SR, and a hit that reaches the
+            SR knocks it down by 5
+    hull    what gets through is reduced by DR and comes off HP
+
+A fight ends when either ship reaches 0 HP (both at once is a draw) or
+after --max-rounds (also a draw). The damage threshold / condition track is
+not modelled.
+
+Combats are simulated in chunks of vectorized NumPy arrays, one array slot
+per combat, spread over a process pool. Every chunk draws from its own
+child of one SeedSequence, so a seed gives the same result whatever the
+worker count:
+
+    python combat_sim.py light_fighter:advanced+laser_light+laser_light/quad gozanti -n 1000000
+    python combat_sim.py saved_ship.json corvette+turbolaser_light --seed 7 --json
+
+Weapon options follow the id after slashes: normal/enhanced/advanced,
+single/twin/quad, link2/link4, and xN for N of that weapon.
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import time
+
+import numpy as np
+
+import dice
+from ship_engine import DATA_FILE, DEFAULT_MODIFICATIONS, ShipEngine, js_floor
+
+DEFAULT_COMBATS = 100_000
+DEFAULT_MAX_ROUNDS = 100
+CHUNK_SIZE = 20_000
+# Attack bonus of the gunner (a trained crew's base attack bonus) before the ship's Int modifier
+GUNNER_BONUS = 5
+SHIELD_LOSS = 5
+# simulate() outcome key -> result key
+OUTCOMES = {'a': 'a_win', 'b': 'b_win', 'draw': 'draw'}
+
+
+class Combatant:
+    """The numbers a build fights with; plain data so it pickles to worker processes."""
+
+    def __init__(self, name, hp, dr, sr, reflex, attack, weapons):
+        self.name = name
+        self.hp = hp
+        self.dr = dr
+        self.sr = sr
+        self.reflex = reflex
+        self.attack = attack
+        # (dice, die, multiplier) per attack each round
+        self.weapons = weapons
+
+    def __repr__(self):
+        return f"Combatant({self.name!r})"
+
+    @classmethod
+    def from_ship(cls, ship, name=None, gunner=GUNNER_BONUS):
+        stats = ship.current_stats
+        weapons = []
+        for instance in ship.installed:
+            parsed = dice.parse_damage(ship.component_damage(instance))
+            if parsed:
+                quantity = (instance.get('modifications') or {}).get('quantity') or 1
+                weapons.extend([parsed] * quantity)
+        int_mod = js_floor(((stats.get('int') or 10) - 10) / 2)
+        return cls(name or ship.chassis_id, stats.get('hp') or 0, stats.get('dr') or 0, stats.get('sr') or 0,
+                   ship.reflex_defense, gunner + int_mod, weapons)
+
+    def summary(self):
+        return {'name': self.name, 'hp': self.hp, 'dr': self.dr, 'sr': self.sr, 'reflex': self.reflex,
+                'attack': self.attack, 'weapons': [dice.distribution(*w).notation for w in self.weapons]}
+
+
+def parse_weapon(text):
+    """'laser_light/advanced/quad/link2/x2' -> (def id, modifications, quantity)."""
+    def_id, *options = text.split('/')
+    mods = {}
+    quantity = 1
+    for option in options:
+        if option in dice.ENHANCEMENTS:
+            mods['enhancement'] = option
+        elif option in dice.MOUNTS:
+            mods['mount'] = option
+        elif option.startswith('link') and option[4:].isdigit():
+            mods['fireLink'] = int(option[4:])
+        elif option.startswith('x') and option[1:].isdigit():
+            quantity = int(option[1:])
+        else:
+            raise ValueError(f"unknown weapon option {option!r} in {text!r}")
+    return def_id, mods, quantity
+
+
+def build_state(engine, spec):
+    """Saved ship state for 'hull[:template][+weapon...]', or the contents of a ship JSON file."""
+    if spec.endswith('.json') and os.path.exists(spec):
+        with open(spec, encoding='utf-8') as f:
+            return json.load(f)
+    hull, *weapons = spec.split('+')
+    hull, _, template = hull.partition(':')
+    if hull not in engine.ships:
+        raise ValueError(f"unknown hull {hull!r}")
+    if template and template not in engine.templates:
+        raise ValueError(f"unknown template {template!r}")
+    state = engine.new_ship(hull, template or None, name=spec)
+    for text in weapons:
+        def_id, mods, quantity = parse_weapon(text)
+        definition = engine.equipment.get(def_id)
+        if not definition or not dice.parse_damage(definition.get('damage')):
+            raise ValueError(f"{def_id!r} is not a weapon with damage dice")
+        for _ in range(quantity):
+            state['manifest'].append({
+                'id': f"sim-{len(state['manifest'])}", 'defId': def_id, 'location': definition.get('location', ''),
+                'miniaturizationRank': 0, 'isStock': False, 'isNonStandard': False,
+                'modifications': {**DEFAULT_MODIFICATIONS, 'weaponUser': 'Pilot', **mods}})
+    return state
+
+
+def combatant(engine, spec, gunner=GUNNER_BONUS):
+    state = build_state(engine, spec)
+    return Combatant.from_ship(engine.ship(state), name=spec, gunner=gunner)
+
+
+def _volley(rng, attacker, defender, hp, sr):
+    """Fire every weapon of attacker at defender in place; hp and sr hold one slot per combat."""
+    for weapon in attacker.weapons:
+        dist = dice.distribution(*weapon)
+        n = len(hp)
+        d20 = rng.integers(1, 21, n)
+        hit = (d20 != 1) & ((d20 == 20) | (d20 + attacker.attack >= defender.reflex))
+        # Inverse-CDF draw: one uniform per attack whatever the number of dice
+        rolls = dist.values[np.minimum(np.searchsorted(dist.cdf, rng.random(n)), len(dist.values) - 1)]
+        damage = np.where(hit, rolls * np.where(d20 == 20, 2, 1), 0)
+        through = np.maximum(damage - sr, 0)
+        sr -= np.where(hit & (sr > 0) & (damage >= sr), np.minimum(sr, SHIELD_LOSS), 0)
+        hp -= np.maximum(through - defender.dr, 0)
+
+
+def simulate(a, b, combats, seed, max_rounds=DEFAULT_MAX_ROUNDS):
+    """Fight combats independent duels; counts of each outcome by the round it ended in.
+
+    Returns {'a': wins of a, 'b': wins of b, 'draw': draws} as arrays of
+    length max_rounds + 1 indexed by round, plus the total rounds fought.
+    """
+    rng = np.random.default_rng(seed)
+    # One slot per combat still running; finished combats are dropped after each round
+    hp_a, hp_b = np.full(combats, a.hp, dtype=np.int64), np.full(combats, b.hp, dtype=np.int64)
+    sr_a, sr_b = np.full(combats, a.sr, dtype=np.int64), np.full(combats, b.sr, dtype=np.int64)
+    outcome = {key: np.zeros(max_rounds + 1, dtype=np.int64) for key in OUTCOMES}
+    total_rounds = 0
+    for round_no in range(1, max_rounds + 1):
+        if not hp_a.size:
+            break
+        total_rounds += hp_a.size
+        # Simultaneous: neither volley depends on the other's damage
+        _volley(rng, a, b, hp_b, sr_b)
+        _volley(rng, b, a, hp_a, sr_a)
+
+        a_down, b_down = hp_a <= 0, hp_b <= 0
+        outcome['a'][round_no] += np.count_nonzero(b_down & ~a_down)
+        outcome['b'][round_no] += np.count_nonzero(a_down & ~b_down)
+        outcome['draw'][round_no] += np.count_nonzero(a_down & b_down)
+        live = ~(a_down | b_down)
+        hp_a, hp_b, sr_a, sr_b = hp_a[live], hp_b[live], sr_a[live], sr_b[live]
+    outcome['draw'][max_rounds] += hp_a.size
+    return outcome, total_rounds
+
+
+def _simulate_chunk(job):
+    return simulate(*job)
+
+
+def chunks(combats, chunk_size=CHUNK_SIZE):
+    sizes = [chunk_size] * (combats // chunk_size)
+    if combats % chunk_size:
+        sizes.append(combats % chunk_size)
+    return sizes
+
+
+def run(a, b, combats=DEFAULT_COMBATS, seed=None, workers=None, max_rounds=DEFAULT_MAX_ROUNDS,
+        chunk_size=CHUNK_SIZE):
+    """Simulate combats duels of a against b over a process pool and summarise them.
+
+    Chunks are seeded from SeedSequence(seed).spawn(), so the result depends
+    on seed and chunk_size but not on workers. workers=1 runs in-process.
+    """
+    sizes = chunks(combats, chunk_size)
+    sequence = np.random.SeedSequence(seed)
+    seeds = sequence.spawn(len(sizes))
+    jobs = [(a, b, size, child, max_rounds) for size, child in zip(sizes, seeds)]
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) or 1
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_simulate_chunk(job) for job in jobs]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_simulate_chunk, jobs))
+    elapsed = time.perf_counter() - start
+
+    outcome = {key: sum(r[0][key] for r in results) for key in OUTCOMES}
+    rounds = sum(r[1] for r in results)
+    return summarize(a, b, outcome, rounds, elapsed, workers, sequence.entropy)
+
+
+def _rounds_stats(histogram):
+    count = int(histogram.sum())
+    if not count:
+        return None
+    cumulative = np.cumsum(histogram)
+    rounds = np.arange(len(histogram))
+    return {'mean': float(rounds @ histogram / count),
+            **{f'p{p}': int(np.searchsorted(cumulative, p / 100 * count)) for p in (50, 90, 99)}}
+
+
+def summarize(a, b, outcome, rounds, elapsed, workers, seed):
+    combats = int(sum(h.sum() for h in outcome.values()))
+    result = {'a': a.summary(), 'b': b.summary(), 'combats': combats, 'seed': seed}
+    for key, name in OUTCOMES.items():
+        p = outcome[key].sum() / combats if combats else 0.0
+        result[name] = {
+            'probability': float(p),
+            # 95% normal-approximation interval half-width
+            'margin': float(1.96 * (p * (1 - p) / combats) ** 0.5) if combats else 0.0,
+            'rounds': _rounds_stats(outcome[key]),
+        }
+    result.update(rounds=int(rounds), seconds=elapsed, workers=workers,
+                  rounds_per_second=rounds / elapsed if elapsed else 0.0)
+    return result
+
+
+def format_result(result):
+    lines = []
+    for side in ('a', 'b'):
+        s = result[side]
+        lines.append(f"{side.upper()}: {s['name']}  HP {s['hp']}, DR {s['dr']}, SR {s['sr']}, Reflex {s['reflex']}, "
+                     f"attack +{s['attack']}, weapons {', '.join(s['weapons']) or 'none'}")
+    lines.append("")
+    for key, label in (('a_win', "A wins"), ('b_win', "B wins"), ('draw', "Draws")):
+        row = result[key]
+        text = f"{label:<7} {row['probability']:7.2%} ± {row['margin']:.2%}"
+        if row['rounds'] and key != 'draw':
+            r = row['rounds']
+            text += f"   rounds to kill: mean {r['mean']:.2f}, p50 {r['p50']}, p90 {r['p90']}, p99 {r['p99']}"
+        lines.append(text)
+    lines.append("")
+    lines.append(f"{result['combats']:,} combats, {result['rounds']:,} rounds in {result['seconds']:.2f} s "
+                 f"({result['rounds_per_second']:,.0f} rounds/s, workers: {result['workers']}, seed {result['seed']})")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo combat between two ship builds.")
+    parser.add_argument('a', help="hull[:template][+weapon[/options]]... or a saved ship JSON file")
+    parser.add_argument('b', help="The opponent, in the same form")
+    parser.add_argument('-n', '--combats', type=int, default=DEFAULT_COMBATS)
+    parser.add_argument('--seed', type=int, help="Reproducible run (default: fresh entropy, printed with the result)")
+    parser.add_argument('--workers', type=int, help="Processes (default: CPU count)")
+    parser.add_argument('--max-rounds', type=int, default=DEFAULT_MAX_ROUNDS, help="Rounds before a fight counts as a draw")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Combats per vectorized batch")
+    parser.add_argument('--gunner', type=int, default=GUNNER_BONUS, help="Gunner attack bonus before the ship's Int modifier")
+    parser.add_argument('--data', default=DATA_FILE)
+    parser.add_argument('--json', action='store_true', help="Print the result as JSON")
+    args = parser.parse_args(argv)
+
+    engine = ShipEngine.load(args.data)
+    try:
+        a = combatant(engine, args.a, args.gunner)
+        b = combatant(engine, args.b, args.gunner)
+    except ValueError as e:
+        parser.error(str(e))
+    if not a.weapons and not b.weapons:
+        parser.error("neither ship has a weapon; add some with +weapon_id")
+
+    result = run(a, b, args.combats, args.seed, args.workers, args.max_rounds, args.chunk_size)
+    print(json.dumps(result, indent=2) if args.json else format_result(result))
+
+
+if __name__ == "__main__":
+    main()
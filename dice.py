@@ -0,0 +1,230 @@
+"""Exact damage distributions for EQUIPMENT damage strings.
+
+A damage string like '3d10x2' is the sum of three d10 times two. Its exact
+distribution is the uniform die convolved with itself, built by repeated
+halving so NdS takes O(log N) NumPy convolutions. Distributions are
+memoized per (dice, die, multiplier), and a sum of N dice is shared by
+every multiplier, so the fleet-wide table of every weapon x enhancement x
+mount x fireLink x template only computes the few dozen distinct rolls the
+catalog can produce. The memo pays off within a single table (about 12x
+over convolving every row); a second table costs the same as the first,
+since row building then dominates:
+
+    python dice.py 3d10x2 5d10           mean, std and percentiles of a roll
+    python dice.py --table                every weapon x modifier combination (Markdown)
+    python dice.py --table --csv out.csv  the same as CSV
+
+Dice counts after modifiers come from Ship.component_damage, the port of
+store.js getComponentDamage, so the table follows the same rules as the UI.
+"""
+import argparse
+import csv
+import functools
+import itertools
+import sys
+import time
+
+import numpy as np
+
+from fleet_batch import ENHANCEMENT_COST, MOUNT_COST
+from ship_engine import DAMAGE_RE, DATA_FILE, ShipEngine
+
+ENHANCEMENTS = ('normal', *ENHANCEMENT_COST)
+MOUNTS = ('single', *MOUNT_COST)
+FIRE_LINKS = (1, 2, 4)
+PERCENTILES = (10, 50, 90)
+
+TABLE_FIELDS = ['id', 'name', 'template', 'enhancement', 'mount', 'fire_link', 'dice',
+                'mean', 'std', 'min', 'max', *(f'p{p}' for p in PERCENTILES)]
+
+
+def parse_damage(text):
+    """(dice, die, multiplier) of a damage string, or None for e.g. 'Varies'.
+
+    Like getComponentDamage this looks for the first NdS[xM] anywhere in the
+    string, so '2d10/turn' rolls as 2d10.
+    """
+    match = DAMAGE_RE.search(text or '')
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2)), int(match.group(3)[1:]) if match.group(3) else 1
+
+
+@functools.lru_cache(maxsize=None)
+def _sum_pmf(dice, die):
+    """Probabilities of every total dice..dice*die of dice rolls of a die-sided die."""
+    if dice == 1:
+        pmf = np.full(die, 1 / die)
+    else:
+        half = dice // 2
+        pmf = np.convolve(_sum_pmf(half, die), _sum_pmf(dice - half, die))
+    pmf.setflags(write=False)
+    return pmf
+
+
+class Distribution:
+    """Exact distribution of (dice)d(die) x multiplier. Shared between callers, so read-only."""
+
+    def __init__(self, dice, die, multiplier=1):
+        self.dice = dice
+        self.die = die
+        self.multiplier = multiplier
+        self.pmf = _sum_pmf(dice, die) if dice else np.ones(1)
+        self.values = (np.arange(len(self.pmf)) + dice) * multiplier
+        self.values.setflags(write=False)
+        self.cdf = np.cumsum(self.pmf)
+        self.cdf.setflags(write=False)
+        self.mean = float(self.pmf @ self.values)
+        self.variance = float(self.pmf @ (self.values - self.mean) ** 2)
+
+    def __repr__(self):
+        return f"Distribution({self.notation!r})"
+
+    @property
+    def notation(self):
+        return f"{self.dice}d{self.die}" + (f"x{self.multiplier}" if self.multiplier != 1 else '')
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    @property
+    def min(self):
+        return int(self.values[0])
+
+    @property
+    def max(self):
+        return int(self.values[-1])
+
+    def percentile(self, p):
+        """Smallest damage that at least p percent of rolls don't exceed."""
+        if not 0 <= p <= 100:
+            raise ValueError(f"percentile must be in [0, 100], not {p}")
+        # Rounding in the cumulative sum must not push an exact boundary (the median of 1d2) one step up
+        index = np.searchsorted(self.cdf, p / 100 - 1e-12)
+        return int(self.values[min(index, len(self.values) - 1)])
+
+    def probability_at_least(self, damage):
+        """Chance a roll deals damage or more."""
+        index = np.searchsorted(self.values, damage)
+        return float(1 - self.cdf[index - 1]) if index else 1.0
+
+    def summary(self):
+        return {'dice': self.notation, 'mean': self.mean, 'std': self.std, 'min': self.min, 'max': self.max,
+                **{f'p{p}': self.percentile(p) for p in PERCENTILES}}
+
+
+@functools.lru_cache(maxsize=None)
+def distribution(dice, die, multiplier=1):
+    return Distribution(dice, die, multiplier)
+
+
+@functools.lru_cache(maxsize=None)
+def summary(dice, die, multiplier=1):
+    return distribution(dice, die, multiplier).summary()
+
+
+def damage_distribution(text):
+    """Distribution of a damage string, or None if it has no dice."""
+    parsed = parse_damage(text)
+    return distribution(*parsed) if parsed else None
+
+
+def damage_summary(text):
+    parsed = parse_damage(text)
+    return summary(*parsed) if parsed else None
+
+
+def weapons(engine):
+    """EQUIPMENT definitions with a rollable damage string, in data order."""
+    return [item for item in engine.equipment.values() if parse_damage(item.get('damage'))]
+
+
+def template_ships(engine, hull_id=None, templates=None):
+    """{template id or None: empty Ship} on one hull, for component_damage's template bonus."""
+    hull_id = hull_id or next(iter(engine.ships))
+    if templates is None:
+        templates = [None, *engine.templates]
+    ships = {}
+    for template in templates:
+        state = engine.new_ship(hull_id, template)
+        state['manifest'] = []
+        ships[template] = engine.ship(state)
+    return ships
+
+
+def damage_table(engine, templates=None, hull_id=None):
+    """One row per weapon x template x enhancement x mount x fireLink with the exact roll statistics."""
+    rows = []
+    ships = template_ships(engine, hull_id, templates)
+    for item in weapons(engine):
+        for template, ship in ships.items():
+            for enhancement, mount, fire_link in itertools.product(ENHANCEMENTS, MOUNTS, FIRE_LINKS):
+                instance = {'defId': item['id'], 'modifications': {
+                    'enhancement': enhancement, 'mount': mount, 'fireLink': fire_link}}
+                stats = damage_summary(ship.component_damage(instance))
+                rows.append({'id': item['id'], 'name': item.get('name', item['id']), 'template': template or '',
+                             'enhancement': enhancement, 'mount': mount, 'fire_link': fire_link, **stats})
+    return rows
+
+
+def report_rows(engine):
+    """Per weapon and template: the unmodified roll and the best one (advanced, quad, fireLink 4)."""
+    rows = []
+    ships = template_ships(engine)
+    for item in weapons(engine):
+        for template, ship in ships.items():
+            cells = [item.get('name', item['id']), template or '-']
+            for mods in ({}, {'enhancement': 'advanced', 'mount': 'quad', 'fireLink': 4}):
+                stats = damage_summary(ship.component_damage({'defId': item['id'], 'modifications': mods}))
+                cells += [stats['dice'], f"{stats['mean']:g}", f"{stats['p10']}-{stats['p90']}"]
+            rows.append(cells)
+    return rows
+
+
+REPORT_COLUMNS = ["Weapon", "Template", "Dice", "Mean", "10-90%", "Max Dice", "Max Mean", "Max 10-90%"]
+
+
+def format_table(rows):
+    lines = ["| " + " | ".join(TABLE_FIELDS) + " |", "|" + "---|" * len(TABLE_FIELDS)]
+    for row in rows:
+        cells = [f"{row[f]:.2f}" if isinstance(row[f], float) else str(row[f]) for f in TABLE_FIELDS]
+        lines.append("| " + " | ".join(cells) + " |")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact damage distributions of weapon dice.")
+    parser.add_argument('dice', nargs='*', help="Damage strings to describe, e.g. 3d10x2")
+    parser.add_argument('--data', default=DATA_FILE)
+    parser.add_argument('--table', action='store_true', help="Every weapon x modifier x template combination")
+    parser.add_argument('--csv', metavar='PATH', help="Write the table as CSV instead of printing Markdown")
+    args = parser.parse_args(argv)
+
+    for text in args.dice:
+        stats = damage_summary(text)
+        if stats is None:
+            print(f"{text}: no dice")
+            continue
+        print(f"{text}: mean {stats['mean']:g}, std {stats['std']:.2f}, range {stats['min']}-{stats['max']}, "
+              + ", ".join(f"p{p} {stats[f'p{p}']}" for p in PERCENTILES))
+
+    if args.table or not args.dice:
+        engine = ShipEngine.load(args.data)
+        start = time.perf_counter()
+        rows = damage_table(engine)
+        elapsed = (time.perf_counter() - start) * 1000
+        if args.csv:
+            with open(args.csv, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=TABLE_FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+            print(f"Wrote {len(rows)} rows to {args.csv}")
+        else:
+            print(format_table(rows))
+        print(f"{len(rows)} combinations, {summary.cache_info().currsize} distinct rolls in {elapsed:.1f} ms",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""Vectorized fleet-wide cost/EP evaluation with NumPy.
+
+ShipEngine prices one ship at a time. For balance tables we need every
+STOCK_SHIPS hull x TEMPLATES x loadout, so this module encodes component
+variants (a definition plus its modifications) as flat arrays and prices
+millions of loadouts per hull/template pair with array operations:
+
+    encoder = FleetEncoder(ShipEngine.load())
+    picks = encoder.random_loadouts(1_000_000, max_components=6, seed=1)
+    for hull_id, template_id, result in encoder.iter_fleet(picks):
+        ...
+
+A loadout is a row of variant indices padded with -1 (no component). The
+rules mirror ShipEngine.calculate_component_cost / calculate_ep for
+non-stock installs; installing a component with an exclusiveGroup replaces
+the stock component of the same group, as store.addComponent does.
+"""
+import argparse
+import csv
+import sys
+import time
+
+import numpy as np
+
+from ship_engine import ShipEngine
+
+ENHANCEMENT_COST = {'enhanced': 2, 'advanced': 5}
+ENHANCEMENT_EP = {'enhanced': 1, 'advanced': 2}
+MOUNT_COST = {'twin': 3, 'quad': 5}
+MINIATURIZATION_COST = {1: 2, 2: 5}
+
+
+def option_cost_terms(definition, key, default_option_costs):
+    """Split resolveCost(key, base) into (fixed, per_size_mult, base_multiplier)."""
+    specs = definition.get('upgradeSpecs') or {}
+    cost_def = None
+    if key in (specs.get('optionCosts') or {}):
+        cost_def = specs['optionCosts'][key]
+    elif isinstance(specs.get(key), dict) and 'cost' in specs[key]:
+        cost_def = specs[key]['cost']
+    if cost_def is None and key in default_option_costs:
+        cost_def = default_option_costs[key]
+
+    if isinstance(cost_def, (int, float)) and not isinstance(cost_def, bool):
+        return cost_def, 0, 0
+    if isinstance(cost_def, dict):
+        if cost_def.get('multiplier'):
+            return 0, 0, cost_def['multiplier']
+        if cost_def.get('cost'):
+            if cost_def.get('sizeMult'):
+                return 0, cost_def['cost'], 0
+            return cost_def['cost'], 0, 0
+    return 0, 0, 0
+
+
+class FleetEncoder:
+    """Column arrays for hulls, templates and component variants."""
+
+    def __init__(self, engine=None, hull_ids=None, template_ids=None):
+        self.engine = engine or ShipEngine.load()
+        self.hull_ids = list(hull_ids or self.engine.ships)
+        self.template_ids = list(template_ids) if template_ids is not None else [None, *self.engine.templates]
+        self.size_rank = self.engine.size_rank
+        self.availability_rank = self.engine.availability_rank
+
+        self.variants = []
+        self._variant_index = {}
+        self._group_ids = {}
+        self._columns = None
+
+        hulls = [self.engine.ships[h] for h in self.hull_ids]
+        self.hull_cost = np.array([h['cost'] for h in hulls], dtype=np.float64)
+        self.hull_base_ep = np.array([h['baseEp'] for h in hulls], dtype=np.float64)
+        self.size_mult = np.array([self.engine.size_cost_multipliers.get(h['size']) or 1 for h in hulls], dtype=np.float64)
+        self.hull_size_rank = np.array([self._rank(self.size_rank, h['size']) for h in hulls])
+
+        templates = [self.engine.templates[t] if t else None for t in self.template_ids]
+        self.template_cost_mult = np.array([t['costMult'] if t else 1 for t in templates], dtype=np.float64)
+        self.template_ep_mod = np.array([(t.get('epMod') or 0) if t else 0 for t in templates], dtype=np.float64)
+
+        # Stock components per hull: (definition, ep, availability rank, exclusive group id)
+        self.stock = []
+        for hull in hulls:
+            ship = self.engine.ship(self.engine.new_ship(hull['id']))
+            items = []
+            replaceable = set()
+            for mod_config in hull.get('defaultMods') or []:
+                def_id, battery, quantity = mod_config, 1, 1
+                if isinstance(mod_config, dict):
+                    def_id = mod_config['id']
+                    battery = mod_config.get('batteryCount') or 1
+                    quantity = mod_config.get('quantity') or 1
+                definition = self.engine.equipment.get(def_id)
+                ep = ship.calculate_ep(def_id, battery_count=battery, quantity=quantity)
+                rank = self._rank(self.availability_rank, definition.get('availability')) if definition else 0
+                group = self._group_id(definition.get('exclusiveGroup')) if definition else -1
+                # addComponent only removes the first installed member of a group
+                if group in replaceable:
+                    group = -1
+                replaceable.add(group)
+                items.append((def_id, ep, max(rank, 0), group))
+            self.stock.append(items)
+
+    @staticmethod
+    def _rank(ranks, value):
+        return ranks.index(value) if value in ranks else -1
+
+    def _group_id(self, name):
+        if not name:
+            return -1
+        return self._group_ids.setdefault(name, len(self._group_ids))
+
+    def add_variant(self, def_id, modifications=None, miniaturization=0, is_non_standard=False):
+        """Intern a component variant and return its index."""
+        mods = dict(modifications or {})
+        key = (def_id, tuple(sorted(mods.items())), miniaturization, bool(is_non_standard))
+        if key not in self._variant_index:
+            if def_id not in self.engine.equipment:
+                raise KeyError(f"Unknown component: {def_id}")
+            self._variant_index[key] = len(self.variants)
+            self.variants.append({'defId': def_id, 'modifications': mods, 'miniaturization': miniaturization,
+                                  'isNonStandard': bool(is_non_standard)})
+            self._columns = None
+        return self._variant_index[key]
+
+    def add_catalog_variants(self, options=True):
+        """Add every catalog component, plus common option combinations where upgradeSpecs allow them."""
+        for def_id, definition in self.engine.equipment.items():
+            self.add_variant(def_id)
+            if not options:
+                continue
+            component_options = (definition.get('upgradeSpecs') or {}).get('componentOptions') or []
+            if 'weapon.enhancement' in component_options:
+                for enhancement in ENHANCEMENT_COST:
+                    self.add_variant(def_id, {'enhancement': enhancement})
+            if 'weapon.multibarrel' in component_options:
+                for mount in MOUNT_COST:
+                    self.add_variant(def_id, {'mount': mount})
+            if 'weapon.fireLink' in component_options:
+                for fire_link in (2, 4):
+                    self.add_variant(def_id, {'fireLink': fire_link})
+            if 'weapon.battery' in component_options:
+                self.add_variant(def_id, {'batteryCount': 2})
+        return len(self.variants)
+
+    @property
+    def columns(self):
+        """Per-variant arrays; index len(variants) is the empty slot used for padding."""
+        if self._columns is None:
+            self._columns = self._encode()
+        return self._columns
+
+    def _encode(self):
+        n = len(self.variants) + 1
+        cols = {name: np.zeros(n, dtype=np.float64) for name in (
+            'base_cost', 'size_flag', 'cost_dynamic_pct', 'pre_mult', 'payload_add', 'fire_link_option',
+            'flo_fixed', 'flo_size', 'flo_mult', 'option_fixed', 'option_size', 'post_mult',
+            'base_ep', 'ep_dynamic_pct', 'ep_add', 'ep_mult', 'non_standard', 'miniaturization', 'license_fee')}
+        cols['availability'] = np.zeros(n, dtype=np.int64)
+        cols['group'] = np.full(n, -1, dtype=np.int64)
+        cols['min_size'] = np.full(n, -1, dtype=np.int64)
+        cols['max_size'] = np.full(n, len(self.size_rank), dtype=np.int64)
+        cols['pre_mult'][-1] = cols['post_mult'][-1] = cols['ep_mult'][-1] = 1
+        defaults = self.engine.default_option_costs
+
+        for i, variant in enumerate(self.variants):
+            definition = self.engine.equipment[variant['defId']]
+            mods = variant['modifications']
+            stats = definition.get('stats') or {}
+            specs = definition.get('upgradeSpecs') or {}
+
+            cols['base_cost'][i] = definition['baseCost']
+            cols['size_flag'][i] = 1 if definition.get('sizeMult') else 0
+            cols['cost_dynamic_pct'][i] = stats.get('cost_dynamic_pct') or 0
+
+            enhancement = mods.get('enhancement') or 'normal'
+            mount = mods.get('mount') or 'single'
+            fire_link = mods.get('fireLink') or 1
+            cols['pre_mult'][i] = ENHANCEMENT_COST.get(enhancement, 1) * MOUNT_COST.get(mount, 1) * (fire_link if fire_link > 1 else 1)
+
+            payload = specs.get('payload')
+            if payload:
+                if payload.get('type') == 'capacity' and (mods.get('payloadCount') or 0) > 0:
+                    cols['payload_add'][i] = mods['payloadCount'] * definition['baseCost'] * payload['costFactor']
+                elif mods.get('payloadOption') and payload.get('type') == 'toggle':
+                    cols['payload_add'][i] = payload['cost']
+
+            if mods.get('fireLinkOption'):
+                cols['fire_link_option'][i] = 1
+                cols['flo_fixed'][i], cols['flo_size'][i], cols['flo_mult'][i] = option_cost_terms(definition, 'fireLinkOption', defaults)
+
+            for key, value in mods.items():
+                if value is True and key != 'fireLinkOption':
+                    fixed, size, mult = option_cost_terms(definition, key, defaults)
+                    fixed += mult * definition['baseCost']
+                    # Size multipliers are always positive, so the sign is known up front
+                    if fixed + size > 0:
+                        cols['option_fixed'][i] += fixed
+                        cols['option_size'][i] += size
+
+            post = 1
+            if (mods.get('batteryCount') or 0) > 1:
+                post *= mods['batteryCount']
+            if (mods.get('quantity') or 0) > 1:
+                post *= mods['quantity']
+            post *= MINIATURIZATION_COST.get(variant['miniaturization'], 1)
+            if variant['isNonStandard']:
+                post *= 5
+            cols['post_mult'][i] = post
+
+            cols['base_ep'][i] = definition['baseEp']
+            cols['ep_dynamic_pct'][i] = stats.get('ep_dynamic_pct') or 0
+            cols['ep_add'][i] = ENHANCEMENT_EP.get(enhancement, 0) + (1 if mount == 'quad' else 0)
+            ep_mult = 1
+            for factor in (fire_link, mods.get('batteryCount') or 1, mods.get('quantity') or 1):
+                if factor > 1:
+                    ep_mult *= factor
+            cols['ep_mult'][i] = ep_mult
+            cols['non_standard'][i] = 1 if variant['isNonStandard'] else 0
+            cols['miniaturization'][i] = variant['miniaturization'] or 0
+
+            availability = definition.get('availability')
+            cols['availability'][i] = max(self._rank(self.availability_rank, availability), 0)
+            if availability:
+                cols['license_fee'][i] = self.engine.license_fees.get(availability) or 0
+            cols['group'][i] = self._group_id(definition.get('exclusiveGroup'))
+
+            min_size = definition.get('minShipSize')
+            max_size = definition.get('maxShipSize') or definition.get('maxSize')
+            if mods.get('pointBlank') and isinstance(specs.get('pointBlank'), dict):
+                min_size = specs['pointBlank'].get('minShipSize') or min_size
+            if min_size:
+                cols['min_size'][i] = self._rank(self.size_rank, min_size)
+            if max_size:
+                cols['max_size'][i] = self._rank(self.size_rank, max_size)
+        return cols
+
+    # Tables per hull / template
+
+    def cost_table(self, h, t):
+        """Cost of every variant installed on hull h with template t (non-stock)."""
+        c = self.columns
+        smv = self.size_mult[h]
+        hull_cost = np.floor(self.hull_cost[h] * self.template_cost_mult[t])
+        cost = c['base_cost'] * np.where(c['size_flag'] > 0, smv, 1)
+        cost = cost + np.floor(hull_cost * c['cost_dynamic_pct'])
+        cost = cost * c['pre_mult'] + c['payload_add']
+        cost = cost + c['fire_link_option'] * (c['flo_fixed'] + c['flo_size'] * smv + c['flo_mult'] * cost)
+        cost = cost + c['option_fixed'] + c['option_size'] * smv
+        return cost * c['post_mult']
+
+    def ep_table(self, h):
+        c = self.columns
+        ep = np.where(c['ep_dynamic_pct'] > 0, np.floor(self.hull_base_ep[h] * c['ep_dynamic_pct']), c['base_ep'])
+        ep = (ep + c['ep_add']) * c['ep_mult']
+        ep = np.where((c['non_standard'] > 0) & (ep > 0), ep * 2, ep)
+        ep = np.where((c['miniaturization'] == 1) & (ep > 0), np.maximum(1, ep - 1), ep)
+        ep = np.where((c['miniaturization'] == 2) & (ep > 0), np.ceil(ep / 2), ep)
+        ep[-1] = 0
+        return ep
+
+    def size_ok(self, h):
+        c = self.columns
+        rank = self.hull_size_rank[h]
+        ok = (rank >= c['min_size']) & (rank <= c['max_size'])
+        ok[-1] = True
+        return ok
+
+    # Evaluation
+
+    def as_picks(self, loadouts, width=None):
+        """Pack lists of variant indices into a padded (L, K) int array."""
+        width = width or max((len(l) for l in loadouts), default=0)
+        picks = np.full((len(loadouts), width), -1, dtype=np.int64)
+        for row, loadout in enumerate(loadouts):
+            picks[row, :len(loadout)] = loadout
+        return picks
+
+    def evaluate_pair(self, h, t, picks):
+        """Vectorized results for hull index h, template index t over all loadouts in picks."""
+        c = self.columns
+        idx = np.where(picks < 0, len(self.variants), picks)
+
+        cost = self.cost_table(h, t)
+        components_cost = cost[idx].sum(axis=1)
+        licensing_cost = (cost * c['license_fee'])[idx].sum(axis=1)
+        hull_cost = np.floor(self.hull_cost[h] * self.template_cost_mult[t])
+
+        groups = c['group'][idx]
+        sorted_groups = np.sort(groups, axis=1)
+        duplicate_group = ((sorted_groups[:, 1:] == sorted_groups[:, :-1]) & (sorted_groups[:, 1:] >= 0)).any(axis=1)
+
+        # Exclusive installs replace the stock component of the same group
+        refund = np.zeros(len(picks))
+        availability = c['availability'][idx].max(axis=1, initial=0)
+        for _, ep, rank, group in self.stock[h]:
+            replaced = (groups == group).any(axis=1) if group >= 0 else np.zeros(len(picks), dtype=bool)
+            refund += np.where(replaced, ep, 0)
+            availability = np.maximum(availability, np.where(replaced, 0, rank))
+
+        loadout_ep = self.ep_table(h)[idx].sum(axis=1)
+        remaining_ep = self.hull_base_ep[h] + self.template_ep_mod[t] + refund - loadout_ep
+        size_valid = self.size_ok(h)[idx].all(axis=1)
+
+        return {
+            'hull_cost': np.full(len(picks), hull_cost),
+            'components_cost': components_cost,
+            'licensing_cost': licensing_cost,
+            'total_cost': hull_cost + components_cost + licensing_cost,
+            'loadout_ep': loadout_ep,
+            'remaining_ep': remaining_ep,
+            'availability': availability,
+            'valid': size_valid & ~duplicate_group & (remaining_ep >= 0),
+        }
+
+    def iter_fleet(self, picks):
+        """Yield (hull_id, template_id, results) for every hull x template pair."""
+        for h, hull_id in enumerate(self.hull_ids):
+            for t, template_id in enumerate(self.template_ids):
+                yield hull_id, template_id, self.evaluate_pair(h, t, picks)
+
+    def random_loadouts(self, count, max_components=6, seed=None):
+        """Random (count, max_components) picks; each row has 1..max_components variants."""
+        rng = np.random.default_rng(seed)
+        picks = rng.integers(0, len(self.variants), size=(count, max_components))
+        sizes = rng.integers(1, max_components + 1, size=count)
+        picks[np.arange(max_components)[None, :] >= sizes[:, None]] = -1
+        return picks
+
+    def state_for(self, hull_id, template_id, loadout):
+        """Saved ship state equivalent to a loadout, for checking against ShipEngine."""
+        state = self.engine.new_ship(hull_id, template_id)
+        for n, v in enumerate(i for i in loadout if i >= 0):
+            variant = self.variants[v]
+            group = self.engine.equipment[variant['defId']].get('exclusiveGroup')
+            if group:
+                # store.addComponent: the new install replaces the first one in the same group
+                for m in state['manifest']:
+                    if (self.engine.equipment.get(m['defId']) or {}).get('exclusiveGroup') == group:
+                        state['manifest'].remove(m)
+                        break
+            state['manifest'].append({
+                'id': f'loadout-{n}', 'defId': variant['defId'], 'location': '', 'isStock': False,
+                'miniaturizationRank': variant['miniaturization'], 'isNonStandard': variant['isNonStandard'],
+                'modifications': {'payloadCount': 0, 'payloadOption': False, 'batteryCount': 1, 'quantity': 1,
+                                  'fireLinkOption': False, **variant['modifications']},
+            })
+        return state
+
+
+def balance_table(encoder, picks):
+    """One summary row per hull x template over the valid loadouts in picks."""
+    rows = []
+    for hull_id, template_id, result in encoder.iter_fleet(picks):
+        valid = result['valid']
+        costs = result['total_cost'][valid]
+        rows.append({
+            'hull': hull_id,
+            'template': template_id or '',
+            'loadouts': len(picks),
+            'valid': int(valid.sum()),
+            'min_cost': float(costs.min()) if costs.size else '',
+            'median_cost': float(np.median(costs)) if costs.size else '',
+            'max_cost': float(costs.max()) if costs.size else '',
+            'mean_remaining_ep': float(result['remaining_ep'][valid].mean()) if costs.size else '',
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price random loadouts for every hull x template and write a balance table.")
+    parser.add_argument('--loadouts', type=int, default=100000, help="Random loadouts per hull/template (default: 100000)")
+    parser.add_argument('--max-components', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-options', action='store_true', help="Only plain catalog components, no upgrade variants")
+    parser.add_argument('--out', default='-', help="CSV output path (default: stdout)")
+    args = parser.parse_args()
+
+    encoder = FleetEncoder()
+    encoder.add_catalog_variants(options=not args.no_options)
+    picks = encoder.random_loadouts(args.loadouts, args.max_components, args.seed)
+
+    start = time.perf_counter()
+    rows = balance_table(encoder, picks)
+    elapsed = time.perf_counter() - start
+
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', newline='', encoding='utf-8')
+    try:
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    configs = len(picks) * len(encoder.hull_ids) * len(encoder.template_ids)
+    print(f"Priced {configs:,} configurations ({len(encoder.variants)} variants) in {elapsed:.2f}s "
+          f"({configs / elapsed:,.0f}/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,97 +1,429 @@
+"""Write the component report (Markdown, CSV, JSON Lines, HTML) from data.json.
+
+One pass groups and sorts EQUIPMENT into category/group sections and turns
+each item into a row dict; every requested writer consumes those same
+sections, so no format re-reads or re-sorts the data:
+
+    python generate_report.py --format md csv jsonl html
+
+Output is streamed one section at a time. The Markdown writer also keeps a
+manifest next to COMPONENTS_REPORT.md with a hash of each section's source
+items and where its bytes sit in the file, so a regeneration only
+re-renders the sections whose items changed and copies every other
+section straight from the previous report. Pass --full to ignore it.
+
+--damage appends a Weapon Damage table (Markdown and HTML) with the exact
+mean and 10th-90th percentile of every weapon's roll per template, plain
+and fully upgraded, from dice.py.
+"""
+import argparse
+import contextlib
+import csv
+import hashlib
+import html
 import json
-import collections
+import os
 
-def main():
+from catalog import Catalog, CompactCatalog
+
+DATA_FILE = 'public/swse/data.json'
+REPORT_FILE = 'COMPONENTS_REPORT.md'
+
+TITLE = "Starship Components Report"
+INTRO = "This report lists all starship components defined in `data.json`, grouped by category and group."
+
+# Bump whenever the Markdown layout changes so old manifests stop matching
+FORMAT_VERSION = 1
+
+TABLE_HEADER = [
+    "| Name | Cost | EP | Size Mult | Availability | Exclusive Group | Notes |",
+    "|---|---|---|---|---|---|---|",
+]
+
+# Flat columns shared by the CSV and JSON Lines writers
+FIELDS = ['id', 'category', 'group', 'name', 'cost', 'ep', 'size_mult', 'availability',
+          'exclusive_group', 'damage', 'stats', 'description']
+
+
+def sort_items(items):
+    # Sort items by Exclusive Group (treating None as empty string for sorting), then by Name
+    return sorted(items, key=lambda x: (x.get('exclusiveGroup', '') or '', x.get('name', '')))
+
+
+def format_cost(cost):
     try:
-        with open('public/swse/data.json', 'r') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print("Error: public/swse/data.json not found.")
-        return
+        return f"{cost:,}"
+    except ValueError:
+        return str(cost)
+
+
+def build_row(cat, grp, item):
+    """Format-neutral view of one EQUIPMENT entry."""
+    description = item.get('description')
+    return {
+        'id': item.get('id'),
+        'category': cat,
+        'group': grp,
+        'name': item.get('name', 'Unknown'),
+        'cost': item.get('baseCost', 0),
+        'ep': item.get('baseEp', 0),
+        'size_mult': bool(item.get('sizeMult')),
+        'availability': item.get('availability', ''),
+        'exclusive_group': item.get('exclusiveGroup') or None,
+        'damage': item.get('damage'),
+        'stats': item.get('stats') or {},
+        # Tables can't hold line breaks
+        'description': description.replace('\n', ' ') if description is not None else None,
+    }
+
+
+def stats_text(stats):
+    return ", ".join(f"{k}: {v}" for k, v in stats.items())
+
+
+def iter_sections(catalog):
+    """Yield (category, group, sorted items) in report order."""
+    categories = catalog.categories
+    for cat in sorted(categories.keys()):
+        groups = categories[cat]
+        for grp in sorted(groups.keys()):
+            yield cat, grp, sort_items(groups[grp])
 
-    equipment = data.get('EQUIPMENT', [])
 
-    # Organize data
-    # Structure: categories[category_name][group_name] = [items]
-    categories = collections.defaultdict(lambda: collections.defaultdict(list))
+def section_hash(cat, grp, items):
+    # CompactCatalog items hash as the dicts they came from
+    source = json.dumps([FORMAT_VERSION, cat, grp, items], sort_keys=True, ensure_ascii=False,
+                        default=lambda item: item.to_dict())
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
 
-    for item in equipment:
-        category = item.get('category', 'Uncategorized')
-        group = item.get('group', 'Uncategorized')
-        categories[category][group].append(item)
 
-    # Generate Markdown
-    lines = []
-    lines.append("# Starship Components Report")
-    lines.append("")
-    lines.append("This report lists all starship components defined in `data.json`, grouped by category and group.")
-    lines.append("")
+class ReportWriter:
+    """One output format.
 
-    # Sort categories
-    sorted_categories = sorted(categories.keys())
+    The pipeline calls begin(), then category() whenever a new category
+    starts and section() for each group in report order, then appendix()
+    for each extra table after the catalog, then end(). Output
+    goes to a temporary file that replaces path only once end() succeeds.
+    """
+    extension = None
 
-    for cat in sorted_categories:
-        lines.append(f"## {cat}")
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.out = None
+
+    def begin(self):
+        self.out = open(self.tmp_path, 'w', encoding='utf-8', newline='')
+
+    def category(self, cat):
+        pass
+
+    def section(self, cat, grp, rows, digest):
+        raise NotImplementedError
+
+    def appendix(self, title, columns, rows):
+        """A table that isn't part of the component catalog; flat formats skip it."""
+
+    def end(self):
+        self.out.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        if self.out and not self.out.closed:
+            self.out.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.tmp_path)
+
+    def summary(self):
+        return self.path
+
+
+class MarkdownWriter(ReportWriter):
+    """COMPONENTS_REPORT.md, spliced from the previous report where sections are unchanged."""
+    extension = '.md'
+
+    def __init__(self, path, incremental=True):
+        super().__init__(path)
+        self.incremental = incremental
+        self.previous = {}
+        self.old = None
+        self.sections = []
+        self.rendered = self.reused = 0
+
+    @property
+    def manifest_path(self):
+        return manifest_path(self.path)
+
+    def begin(self):
+        self.previous = load_manifest(self.path) if self.incremental else {}
+        self.old = open(self.path, 'rb') if self.previous else None
+        self.out = open(self.tmp_path, 'wb')
+        self.out.write('\n'.join([f"# {TITLE}", "", INTRO, ""]).encode('utf-8'))
+
+    def category(self, cat):
+        self.out.write(b'\n' + '\n'.join([f"## {cat}", ""]).encode('utf-8'))
+
+    def section(self, cat, grp, rows, digest):
+        self.out.write(b'\n')
+        entry = self.previous.get((cat, grp))
+        offset = self.out.tell()
+        if entry and entry['hash'] == digest:
+            self.old.seek(entry['offset'])
+            chunk = self.old.read(entry['length'])
+            self.reused += 1
+        else:
+            chunk = self.render_group(grp, rows).encode('utf-8')
+            self.rendered += 1
+        self.out.write(chunk)
+        self.sections.append({'category': cat, 'group': grp, 'hash': digest, 'offset': offset, 'length': len(chunk)})
+
+    @staticmethod
+    def render_row(row):
+        # Notes: description, damage, special stats
+        notes = []
+        if row['damage'] is not None:
+            notes.append(f"**Damage:** {row['damage']}")
+        if row['stats']:
+            notes.append(f"**Stats:** {stats_text(row['stats'])}")
+        if row['description'] is not None:
+            notes.append(row['description'])
+        notes_str = "<br>".join(notes)
+
+        size_mult = "Yes" if row['size_mult'] else "No"
+        exclusive = row['exclusive_group'] or '-'
+        return (f"| {row['name']} | {format_cost(row['cost'])} | {row['ep']} | {size_mult} | "
+                f"{row['availability']} | {exclusive} | {notes_str} |")
+
+    def render_group(self, grp, rows):
+        lines = [f"### {grp}", ""]
+        lines.extend(TABLE_HEADER)
+        lines.extend(self.render_row(row) for row in rows)
         lines.append("")
+        return '\n'.join(lines)
 
-        # Sort groups within category
-        groups = categories[cat]
-        sorted_groups = sorted(groups.keys())
-
-        for grp in sorted_groups:
-            lines.append(f"### {grp}")
-            lines.append("")
-
-            items = groups[grp]
-            # Sort items by Exclusive Group (treating None as empty string for sorting), then by Name
-            items.sort(key=lambda x: (x.get('exclusiveGroup', '') or '', x.get('name', '')))
-
-            # Create table
-            lines.append("| Name | Cost | EP | Size Mult | Availability | Exclusive Group | Notes |")
-            lines.append("|---|---|---|---|---|---|---|")
-
-            for item in items:
-                name = item.get('name', 'Unknown')
-                base_cost = item.get('baseCost', 0)
-                base_ep = item.get('baseEp', 0)
-                size_mult = "Yes" if item.get('sizeMult') else "No"
-                avail = item.get('availability', '')
-                exclusive = item.get('exclusiveGroup', '-')
-                if exclusive is None:
-                    exclusive = '-'
-
-                # Notes: description, damage, special stats
-                notes = []
-                if 'damage' in item:
-                    notes.append(f"**Damage:** {item['damage']}")
-                if 'stats' in item and item['stats']:
-                    stats_list = []
-                    for k, v in item['stats'].items():
-                        stats_list.append(f"{k}: {v}")
-                    stats_str = ", ".join(stats_list)
-                    notes.append(f"**Stats:** {stats_str}")
-                if 'description' in item:
-                    # Truncate or clean description for table - replace newlines with spaces
-                    desc = item['description'].replace('\n', ' ')
-                    notes.append(desc)
-
-                notes_str = "<br>".join(notes) if notes else ""
-
-                # Format numbers
-                try:
-                    cost_str = f"{base_cost:,}"
-                except ValueError:
-                    cost_str = str(base_cost)
-
-                row = f"| {name} | {cost_str} | {base_ep} | {size_mult} | {avail} | {exclusive} | {notes_str} |"
-                lines.append(row)
-
-            lines.append("")
-
-    with open('COMPONENTS_REPORT.md', 'w') as f:
-        f.write('\n'.join(lines))
-
-    print("Report generated: COMPONENTS_REPORT.md")
+    def appendix(self, title, columns, rows):
+        # Always rendered: it comes after every spliced section, so their offsets still hold
+        lines = ["", f"## {title}", "", "| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+        lines.extend("| " + " | ".join(str(c) for c in row) + " |" for row in rows)
+        lines.append("")
+        self.out.write('\n'.join(lines).encode('utf-8'))
+
+    def end(self):
+        if self.old:
+            self.old.close()
+        super().end()
+        stat = os.stat(self.path)
+        manifest = {'format': FORMAT_VERSION, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                    'sections': self.sections}
+        tmp_manifest = self.manifest_path + '.tmp'
+        with open(tmp_manifest, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_manifest, self.manifest_path)
+
+    def abort(self):
+        if self.old:
+            self.old.close()
+        super().abort()
+
+    def summary(self):
+        return f"{self.path} ({self.rendered} sections rendered, {self.reused} reused)"
+
+
+class CSVWriter(ReportWriter):
+    extension = '.csv'
+
+    def begin(self):
+        super().begin()
+        self.writer = csv.DictWriter(self.out, fieldnames=FIELDS)
+        self.writer.writeheader()
+
+    def section(self, cat, grp, rows, digest):
+        for row in rows:
+            self.writer.writerow({**row, 'stats': stats_text(row['stats']), 'exclusive_group': row['exclusive_group'] or ''})
+
+
+class JSONLWriter(ReportWriter):
+    """One JSON object per component, e.g. for a search index."""
+    extension = '.jsonl'
+
+    def section(self, cat, grp, rows, digest):
+        for row in rows:
+            self.out.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+class HTMLWriter(ReportWriter):
+    """Standalone static page with one table per group."""
+    extension = '.html'
+    COLUMNS = ["Name", "Cost", "EP", "Size Mult", "Availability", "Exclusive Group", "Notes"]
+
+    def begin(self):
+        super().begin()
+        self.out.write(
+            '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{html.escape(TITLE)}</title>\n'
+            '<style>body{font-family:sans-serif}table{border-collapse:collapse;margin-bottom:1.5em}'
+            'th,td{border:1px solid #ccc;padding:4px 8px;text-align:left;vertical-align:top}</style>\n'
+            f'</head>\n<body>\n<h1>{html.escape(TITLE)}</h1>\n'
+            f'<p>{html.escape(INTRO.replace("`", ""))}</p>\n')
+
+    def category(self, cat):
+        self.out.write(f'<h2>{html.escape(cat)}</h2>\n')
+
+    def section(self, cat, grp, rows, digest):
+        self.out.write(f'<h3>{html.escape(grp)}</h3>\n<table>\n<thead><tr>')
+        self.out.write(''.join(f'<th>{c}</th>' for c in self.COLUMNS))
+        self.out.write('</tr></thead>\n<tbody>\n')
+        for row in rows:
+            notes = []
+            if row['damage'] is not None:
+                notes.append(f"<strong>Damage:</strong> {html.escape(str(row['damage']))}")
+            if row['stats']:
+                notes.append(f"<strong>Stats:</strong> {html.escape(stats_text(row['stats']))}")
+            if row['description'] is not None:
+                notes.append(html.escape(row['description']))
+            cells = [row['name'], format_cost(row['cost']), row['ep'], "Yes" if row['size_mult'] else "No",
+                     row['availability'], row['exclusive_group'] or '-']
+            self.out.write('<tr>' + ''.join(f'<td>{html.escape(str(c))}</td>' for c in cells)
+                           + f'<td>{"<br>".join(notes)}</td></tr>\n')
+        self.out.write('</tbody>\n</table>\n')
+
+    def appendix(self, title, columns, rows):
+        self.out.write(f'<h2>{html.escape(title)}</h2>\n<table>\n<thead><tr>')
+        self.out.write(''.join(f'<th>{html.escape(c)}</th>' for c in columns))
+        self.out.write('</tr></thead>\n<tbody>\n')
+        for row in rows:
+            self.out.write('<tr>' + ''.join(f'<td>{html.escape(str(c))}</td>' for c in row) + '</tr>\n')
+        self.out.write('</tbody>\n</table>\n')
+
+    def end(self):
+        self.out.write('</body>\n</html>\n')
+        super().end()
+
+
+# --format name -> writer class
+WRITERS = {
+    'md': MarkdownWriter,
+    'csv': CSVWriter,
+    'jsonl': JSONLWriter,
+    'html': HTMLWriter,
+}
+
+
+def run(catalog, writers, appendices=()):
+    """Group and sort the catalog once and stream every section to all writers.
+
+    appendices are (title, columns, rows) tables written after the catalog.
+    """
+    for writer in writers:
+        writer.begin()
+    try:
+        current_cat = None
+        for cat, grp, items in iter_sections(catalog):
+            if cat != current_cat:
+                for writer in writers:
+                    writer.category(cat)
+                current_cat = cat
+            rows = [build_row(cat, grp, item) for item in items]
+            digest = section_hash(cat, grp, items)
+            for writer in writers:
+                writer.section(cat, grp, rows, digest)
+        for title, columns, rows in appendices:
+            for writer in writers:
+                writer.appendix(title, columns, rows)
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+    for writer in writers:
+        writer.end()
+    return writers
+
+
+def manifest_path(report_path):
+    root, _ = os.path.splitext(report_path)
+    return root + '.manifest.json'
+
+
+def load_manifest(report_path):
+    """Sections of the previous run, keyed by (category, group); empty if the report no longer matches."""
+    try:
+        with open(manifest_path(report_path), encoding='utf-8') as f:
+            manifest = json.load(f)
+        stat = os.stat(report_path)
+    except (OSError, ValueError):
+        return {}
+    # A hand-edited or regenerated-elsewhere report can't be spliced safely
+    if (manifest.get('format') != FORMAT_VERSION or manifest.get('size') != stat.st_size
+            or manifest.get('mtime_ns') != stat.st_mtime_ns):
+        return {}
+    return {(s['category'], s['group']): s for s in manifest.get('sections', [])}
+
+
+def write_report(catalog, report_path=REPORT_FILE, incremental=True):
+    """Write just the Markdown report and return (sections rendered, sections reused)."""
+    writer, = run(catalog, [MarkdownWriter(report_path, incremental)])
+    return writer.rendered, writer.reused
+
+
+def load_libraries(library_paths):
+    """Exported component libraries ({name, components, ships}), all active."""
+    libraries = []
+    for path in library_paths:
+        with open(path, encoding='utf-8') as f:
+            library = json.load(f)
+        libraries.append({**library, 'active': True})
+    return libraries
+
+
+def load_catalog(data_path, library_paths=(), compact=False):
+    """Catalog for data.json plus any exported component libraries; compact for very large merges."""
+    cls = CompactCatalog if compact else Catalog
+    if not library_paths:
+        return cls.load(data_path)
+    with open(data_path, encoding='utf-8') as f:
+        data = json.load(f)
+    return cls.from_data(data, load_libraries(library_paths))
+
+
+def damage_appendix(data_path, library_paths=()):
+    """The --damage table: (title, columns, rows) for run()."""
+    # numpy is only needed for this table
+    import dice
+    from ship_engine import ShipEngine
+
+    engine = ShipEngine.load(data_path)
+    if library_paths:
+        engine = engine.with_libraries(load_libraries(library_paths))
+    return "Weapon Damage", dice.REPORT_COLUMNS, dice.report_rows(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the component report from data.json.")
+    parser.add_argument('--data', default=DATA_FILE)
+    parser.add_argument('--out', default=REPORT_FILE, help="Report path; other formats swap the extension")
+    parser.add_argument('--format', nargs='+', choices=list(WRITERS), default=['md'], dest='formats')
+    parser.add_argument('--library', action='append', default=[], help="Exported component library JSON to merge (repeatable)")
+    parser.add_argument('--full', action='store_true', help="Re-render every Markdown section, ignoring the manifest")
+    parser.add_argument('--compact', action='store_true', help="Hold the catalog as compact records (large libraries)")
+    parser.add_argument('--damage', action='store_true', help="Append exact damage statistics per weapon and template")
+    args = parser.parse_args()
+
+    try:
+        catalog = load_catalog(args.data, args.library, args.compact)
+        appendices = [damage_appendix(args.data, args.library)] if args.damage else []
+    except FileNotFoundError as e:
+        print(f"Error: {e.filename} not found.")
+        return
+
+    base, _ = os.path.splitext(args.out)
+    writers = []
+    for name in dict.fromkeys(args.formats):
+        cls = WRITERS[name]
+        path = base + cls.extension
+        writers.append(cls(path, incremental=not args.full) if cls is MarkdownWriter else cls(path))
+
+    for writer in run(catalog, writers, appendices):
+        print(f"Report generated: {writer.summary()}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,335 @@
+"""Price and EP impact of a data.json edit, without regenerating the report.
+
+Two revisions are diffed by id (EQUIPMENT, STOCK_SHIPS, TEMPLATES) and by
+key (the global tables), not by text. Then only the stock ship x template
+builds the change can reach are re-priced. They are found through a
+reverse index:
+
+    component id    -> hulls whose STOCK_SHIPS.defaultMods install it
+    template id     -> every hull, with that template
+    hull size       -> hulls of that size (SIZE_COST_MULTIPLIERS, REFLEX_SIZE_MODS)
+    exclusiveGroup  -> member components (reported, never priced)
+
+    python impact_analyzer.py                        uncommitted edits: HEAD vs the working data.json
+    python impact_analyzer.py HEAD~3 HEAD            two commits
+    python impact_analyzer.py old.json new.json --json
+
+A build's "stock value" is what its defaultMods would cost if bought. It
+shows baseCost / sizeMult edits that the ship's own total (stock parts are
+free) hides.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from ship_engine import ShipEngine
+
+DATA_FILE = 'public/swse/data.json'
+SECTIONS = ('EQUIPMENT', 'STOCK_SHIPS', 'TEMPLATES')
+# Global tables whose keys are hull sizes: a change reaches only hulls of that size
+SIZE_TABLES = ('SIZE_COST_MULTIPLIERS', 'REFLEX_SIZE_MODS')
+
+COST_METRICS = ('total_cost', 'stock_value')
+EP_METRICS = ('total_ep', 'used_ep', 'remaining_ep')
+LABELS = {'total_cost': "cost", 'stock_value': "stock value", 'total_ep': "EP",
+          'used_ep': "used EP", 'remaining_ep': "free EP"}
+
+
+def load_revision(spec, path=DATA_FILE):
+    """data.json from a file, or from a git revision ('HEAD', 'main~2', ...) when no such file exists."""
+    if os.path.exists(spec):
+        with open(spec, encoding='utf-8') as f:
+            return json.load(f)
+    out = subprocess.run(['git', 'show', f"{spec}:{path}"], capture_output=True, check=True)
+    return json.loads(out.stdout)
+
+
+# Structural diff
+
+def field_changes(old, new, prefix=''):
+    """[(dotted path, old, new)] for every differing leaf; lists compare as a whole."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in list(old) + [k for k in new if k not in old]:
+            if old.get(key) != new.get(key):
+                changes.extend(field_changes(old.get(key), new.get(key), f"{prefix}{key}."))
+        return changes
+    return [(prefix.rstrip('.'), old, new)]
+
+
+def by_id(records):
+    return {r['id']: r for r in records}
+
+
+def diff_section(old_by_id, new_by_id):
+    changed = {}
+    for record_id, record in new_by_id.items():
+        previous = old_by_id.get(record_id)
+        # Whole-record == runs in C; only the rare unequal pair is walked field by field
+        if previous is not None and previous != record:
+            changed[record_id] = field_changes(previous, record)
+    return {
+        'added': [i for i in new_by_id if i not in old_by_id],
+        'removed': [i for i in old_by_id if i not in new_by_id],
+        'changed': changed,
+    }
+
+
+def diff_data(old, new, old_ids=None, new_ids=None):
+    """Per-section added / removed / changed ids plus changed global tables.
+
+    old_ids / new_ids optionally pass in {section: {id: record}} that were already built.
+    """
+    old_ids = old_ids or {s: by_id(old.get(s, [])) for s in SECTIONS}
+    new_ids = new_ids or {s: by_id(new.get(s, [])) for s in SECTIONS}
+    diff = {section: diff_section(old_ids[section], new_ids[section]) for section in SECTIONS}
+    diff['globals'] = {key: field_changes(old.get(key), new.get(key))
+                       for key in sorted(set(old) | set(new))
+                       if key not in SECTIONS and old.get(key) != new.get(key)}
+    return diff
+
+
+# Reverse index
+
+def mod_id(mod_config):
+    return mod_config['id'] if isinstance(mod_config, dict) else mod_config
+
+
+class ReverseIndex:
+    def __init__(self, data, equipment_by_id):
+        self.equipment = equipment_by_id
+        self.hulls = [s['id'] for s in data.get('STOCK_SHIPS', [])]
+        self.templates = [t['id'] for t in data.get('TEMPLATES', [])]
+        self.hulls_using = {}
+        self.hulls_by_size = {}
+        for ship in data.get('STOCK_SHIPS', []):
+            self.hulls_by_size.setdefault(ship.get('size'), set()).add(ship['id'])
+            for mod_config in ship.get('defaultMods') or []:
+                self.hulls_using.setdefault(mod_id(mod_config), set()).add(ship['id'])
+        self._group_members = None
+
+    def group_of(self, def_id):
+        return (self.equipment.get(def_id) or {}).get('exclusiveGroup')
+
+    def group_members(self, group):
+        # Only needed when an exclusiveGroup changed, so the full scan is deferred until then
+        if self._group_members is None:
+            self._group_members = {}
+            for item in self.equipment.values():
+                if item.get('exclusiveGroup'):
+                    self._group_members.setdefault(item['exclusiveGroup'], []).append(item['id'])
+        return self._group_members.get(group, [])
+
+
+def affected_builds(diff, old_index, new_index):
+    """(hull, template) pairs whose price or EP the diff can change; template None is the bare hull."""
+    indexes = (old_index, new_index)
+    all_hulls = set(old_index.hulls) | set(new_index.hulls)
+    all_templates = [None] + sorted(set(old_index.templates) | set(new_index.templates))
+
+    hulls = set()
+    equipment = diff['EQUIPMENT']
+    for def_id in [*equipment['added'], *equipment['removed'], *equipment['changed']]:
+        for index in indexes:
+            hulls |= index.hulls_using.get(def_id, set())
+    ships = diff['STOCK_SHIPS']
+    hulls.update(ships['added'], ships['removed'], ships['changed'])
+    for key, changes in diff['globals'].items():
+        if key in SIZE_TABLES:
+            for path, _, _ in changes:
+                size = path.split('.')[0]
+                for index in indexes:
+                    hulls |= index.hulls_by_size.get(size, set())
+        else:
+            # LICENSE_FEES, AVAILABILITY_RANK, DEFAULT_OPTION_COSTS...: can reach any build
+            hulls |= all_hulls
+
+    builds = {(hull, template) for hull in hulls for template in all_templates}
+    templates = diff['TEMPLATES']
+    for template in [*templates['added'], *templates['removed'], *templates['changed']]:
+        builds.update((hull, template) for hull in all_hulls)
+    return builds
+
+
+# Pricing
+
+def price(engine, hull, template):
+    """Cost and EP of a fresh stock build, or None if the hull or template does not exist in this revision."""
+    if hull not in engine.ships or (template is not None and template not in engine.templates):
+        return None
+    ship = engine.ship(engine.new_ship(hull, template))
+    values = {metric: getattr(ship, metric) for metric in ('total_cost', *EP_METRICS)}
+    values['stock_value'] = sum(ship.calculate_component_cost(i, ignore_stock=True) for i in ship.installed)
+    return values
+
+
+def component_price_range(engine, def_id, hulls):
+    """(min cost, max cost, EP) of one plain instance of def_id across the given hulls."""
+    if def_id not in engine.equipment:
+        return None
+    instance = {'defId': def_id, 'modifications': {'quantity': 1}, 'miniaturization': 0, 'isNonStandard': False}
+    costs, eps = [], set()
+    for hull in hulls:
+        ship = engine.ship({'configuration': {'baseChassis': hull}, 'manifest': []})
+        costs.append(ship.calculate_component_cost(instance))
+        eps.add(ship.calculate_ep(def_id))
+    if not costs:
+        return None
+    return min(costs), max(costs), (min(eps), max(eps))
+
+
+def pricing_engine(data, equipment_by_id, hulls, def_ids):
+    """A ShipEngine that only indexes the equipment the given hulls and components need."""
+    needed = set(def_ids)
+    ships = {s['id']: s for s in data.get('STOCK_SHIPS', [])}
+    for hull in hulls:
+        needed.update(mod_id(m) for m in (ships.get(hull) or {}).get('defaultMods') or [])
+    equipment = [equipment_by_id[i] for i in needed if i in equipment_by_id]
+    return ShipEngine({**data, 'EQUIPMENT': equipment})
+
+
+def analyze(old_data, new_data):
+    start = time.perf_counter()
+    old_ids = {s: by_id(old_data.get(s, [])) for s in SECTIONS}
+    new_ids = {s: by_id(new_data.get(s, [])) for s in SECTIONS}
+    diff = diff_data(old_data, new_data, old_ids, new_ids)
+    old_index = ReverseIndex(old_data, old_ids['EQUIPMENT'])
+    new_index = ReverseIndex(new_data, new_ids['EQUIPMENT'])
+    builds = affected_builds(diff, old_index, new_index)
+
+    equipment = diff['EQUIPMENT']
+    touched = [*equipment['changed'], *equipment['added'], *equipment['removed']]
+    # One hull per size is enough to show a component's price range
+    representative = {}
+    for index in (new_index, old_index):
+        for size, hulls in index.hulls_by_size.items():
+            representative.setdefault(size, min(hulls))
+    sample_hulls = sorted(representative.values())
+    hulls = {hull for hull, _ in builds} | set(sample_hulls)
+    old_engine = pricing_engine(old_data, old_ids['EQUIPMENT'], hulls, touched)
+    new_engine = pricing_engine(new_data, new_ids['EQUIPMENT'], hulls, touched)
+
+    repriced = []
+    for hull, template in sorted(builds, key=lambda b: (b[0], b[1] or '')):
+        before, after = price(old_engine, hull, template), price(new_engine, hull, template)
+        if before != after:
+            repriced.append({'hull': hull, 'template': template, 'old': before, 'new': after})
+
+    components = []
+    for def_id in touched:
+        before = component_price_range(old_engine, def_id, [h for h in sample_hulls if h in old_engine.ships])
+        after = component_price_range(new_engine, def_id, [h for h in sample_hulls if h in new_engine.ships])
+        group = new_index.group_of(def_id) or old_index.group_of(def_id)
+        components.append({
+            'id': def_id, 'old': before, 'new': after,
+            'changes': equipment['changed'].get(def_id, []),
+            'stock_on': sorted(old_index.hulls_using.get(def_id, set()) | new_index.hulls_using.get(def_id, set())),
+            'group': group,
+        })
+    for c in components:
+        if c['group'] and any(path == 'exclusiveGroup' for path, _, _ in c['changes']):
+            c['exclusive_with'] = [i for i in new_index.group_members(c['group']) if i != c['id']]
+
+    total = len(set(old_index.hulls) | set(new_index.hulls)) * (
+        1 + len(set(old_index.templates) | set(new_index.templates)))
+    return {'diff': diff, 'components': components, 'builds': repriced, 'checked': len(builds),
+            'total_builds': total, 'seconds': time.perf_counter() - start}
+
+
+# Output
+
+def fmt(value):
+    if isinstance(value, float) and not value.is_integer():
+        return f"{value:,.2f}"
+    return f"{int(value):,}"
+
+
+def fmt_delta(label, old, new):
+    delta = new - old
+    sign = '+' if delta > 0 else '-'
+    return f"{label} {fmt(old)} -> {fmt(new)} ({sign}{fmt(abs(delta))})"
+
+
+def fmt_value(value):
+    text = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return text if len(text) <= 40 else text[:37] + '...'
+
+
+def format_changelog(report):
+    diff = report['diff']
+    lines = []
+    counts = {s: sum(len(diff[s][k]) for k in ('added', 'removed', 'changed')) for s in SECTIONS}
+    if not any(counts.values()) and not diff['globals']:
+        return ["No structural changes."]
+
+    for section in SECTIONS:
+        d = diff[section]
+        if not counts[section]:
+            continue
+        lines.append(f"{section}: {len(d['changed'])} changed, {len(d['added'])} added, {len(d['removed'])} removed")
+        for record_id, changes in d['changed'].items():
+            fields = "; ".join(f"{path} {fmt_value(old)} -> {fmt_value(new)}" for path, old, new in changes)
+            lines.append(f"  ~ {record_id}: {fields}")
+        lines.extend(f"  + {record_id}" for record_id in d['added'])
+        lines.extend(f"  - {record_id}" for record_id in d['removed'])
+    for key, changes in diff['globals'].items():
+        fields = "; ".join(f"{path or key} {fmt_value(old)} -> {fmt_value(new)}" for path, old, new in changes)
+        lines.append(f"{key}: {fields}")
+
+    priced = [c for c in report['components'] if c['old'] != c['new']]
+    if priced:
+        lines.append("")
+        lines.append("Component prices (one plain instance, cheapest to dearest hull):")
+        for c in priced:
+            def show(p):
+                if p is None:
+                    return "absent"
+                low, high, (ep_low, ep_high) = p
+                ep = str(ep_low) if ep_low == ep_high else f"{ep_low}-{ep_high}"
+                return f"{fmt(low)}-{fmt(high)} cr, {ep} EP"
+            extra = f"  [stock on {', '.join(c['stock_on'])}]" if c['stock_on'] else ""
+            lines.append(f"  {c['id']}: {show(c['old'])} -> {show(c['new'])}{extra}")
+    for c in report['components']:
+        if c.get('exclusive_with'):
+            lines.append(f"  {c['id']} is now exclusive with {', '.join(c['exclusive_with'])}")
+
+    lines.append("")
+    lines.append(f"Builds: re-priced {report['checked']} of {report['total_builds']}, "
+                 f"{len(report['builds'])} changed ({report['seconds'] * 1000:.0f} ms)")
+    for build in report['builds']:
+        name = build['hull'] + (f"/{build['template']}" if build['template'] else "")
+        old, new = build['old'], build['new']
+        if old is None or new is None:
+            lines.append(f"  {name:<32} {'added' if old is None else 'removed'}")
+            continue
+        deltas = [fmt_delta(LABELS[m], old[m], new[m]) for m in (*COST_METRICS, *EP_METRICS) if old[m] != new[m]]
+        lines.append(f"  {name:<32} {'; '.join(deltas)}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show which builds a data.json change re-prices, and by how much.")
+    parser.add_argument('old', nargs='?', default='HEAD', help="File or git revision (default: %(default)s)")
+    parser.add_argument('new', nargs='?', default=DATA_FILE, help="File or git revision (default: %(default)s)")
+    parser.add_argument('--json', action='store_true', help="Print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        old, new = load_revision(args.old), load_revision(args.new)
+    except (OSError, subprocess.CalledProcessError, json.JSONDecodeError) as e:
+        print(f"Error: cannot load data.json: {e}", file=sys.stderr)
+        return 2
+    report = analyze(old, new)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2, default=list)
+        print()
+    else:
+        print("\n".join(format_changelog(report)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Use a comprehensive set of headers to mimic a real browser
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'identity', # We don't want to handle compression manually if urllib doesn't
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0'
+}
+
+
+def fetch_status(url, extra_headers=None, timeout=10):
+    """Return (status, reason, response_headers) for url.
+
+    HEAD is tried first, falling back to GET on 405. Any extra_headers (e.g.
+    conditional If-None-Match) are sent with both requests.
+    """
+    headers = {**DEFAULT_HEADERS, **(extra_headers or {})}
+    try:
+        req = urllib.request.Request(url, method='HEAD', headers=headers)
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return response.status, "OK", dict(response.headers)
+    except urllib.error.HTTPError as e:
+        if e.code == 405: # Method Not Allowed, try GET
+            try:
+                req = urllib.request.Request(url, method='GET', headers=headers)
+                with urllib.request.urlopen(req, timeout=timeout) as response:
+                    return response.status, "OK", dict(response.headers)
+            except urllib.error.HTTPError as e2:
+                return e2.code, e2.reason, dict(e2.headers or {})
+            except Exception as e2:
+                return 0, str(e2), {}
+        return e.code, e.reason, dict(e.headers or {})
+    except Exception as e:
+        return 0, str(e), {}
+
+
+def check_url(url, timeout=10):
+    """Return (status, reason) for url, trying HEAD first and falling back to GET on 405."""
+    status, reason, _ = fetch_status(url, timeout=timeout)
+    return status, reason
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host by at least `interval` seconds.
+
+    Different hosts never wait on each other, so a pool of workers only
+    serialises where politeness actually requires it.
+    """
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Checkpoint:
+    """On-disk record of finished checks so an interrupted run can resume."""
+
+    def __init__(self, path, save_every=10):
+        self.path = path
+        self.save_every = save_every
+        self.results = {}
+        self._lock = threading.Lock()
+        self._pending = 0
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.results = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                # A half-written checkpoint is not worth aborting over; start fresh
+                self.results = {}
+
+    def __contains__(self, url):
+        return url in self.results
+
+    def get(self, url):
+        entry = self.results.get(url)
+        if entry is None:
+            return None
+        return entry['status'], entry['reason']
+
+    def record(self, url, status, reason, headers=None):
+        with self._lock:
+            self.results[url] = {'status': status, 'reason': str(reason)}
+            self._pending += 1
+            if self._pending >= self.save_every:
+                self._save_locked()
+
+    def save(self):
+        with self._lock:
+            self._save_locked()
+
+    def clear(self):
+        with self._lock:
+            self.results = {}
+            self._pending = 0
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _save_locked(self):
+        self._pending = 0
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.results, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def check_urls(urls, workers=8, interval=0.5, checkpoint=None, checker=check_url, on_result=None):
+    """Check many URLs concurrently and return a {url: (status, reason)} mapping.
+
+    URLs already present in `checkpoint` are not requested again. `checker`
+    returns (status, reason) or (status, reason, response_headers); the full
+    result is passed on to checkpoint.record. `on_result` is called as
+    on_result(url, status, reason, cached) for every URL, in completion order.
+    """
+    if checkpoint is None:
+        checkpoint = Checkpoint(None)
+    limiter = HostRateLimiter(interval)
+    results = {}
+    pending = []
+
+    for url in dict.fromkeys(urls):
+        if url in checkpoint:
+            results[url] = checkpoint.get(url)
+            if on_result:
+                on_result(url, *results[url], True)
+        else:
+            pending.append(url)
+
+    def run(url):
+        limiter.wait(url)
+        return checker(url)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {pool.submit(run, url): url for url in pending}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = (0, str(e))
+            checkpoint.record(url, *result)
+            # Read back through the checkpoint so it can resolve e.g. 304 Not Modified
+            results[url] = checkpoint.get(url)
+            if on_result:
+                on_result(url, *results[url], False)
+    except BaseException:
+        # Ctrl+C: drop queued work, keep what finished for the next run
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    else:
+        pool.shutdown()
+    finally:
+        checkpoint.save()
+
+    return results
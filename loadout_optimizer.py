@@ -0,0 +1,315 @@
+"""Search the equipment catalog for the best loadout on a STOCK_SHIPS hull.
+
+    optimizer = LoadoutOptimizer(ShipEngine.load(), 'light_freighter', objective='damage')
+    result = optimizer.search(budget=50000, max_components=6)
+
+A loadout is a multiset of component variants (a definition plus the
+modifications its upgradeSpecs.componentOptions allow) added to the stock
+build. The search maximizes an objective (expected weapon damage, armor,
+shield rating) subject to:
+
+  * remaining EP >= 0, counting the EP freed by replacing the stock member
+    of an exclusiveGroup (store.addComponent),
+  * at most one install per exclusiveGroup,
+  * an optional credit budget for components plus licensing,
+  * hull size limits (minShipSize / maxShipSize / pointBlank.minShipSize),
+  * an optional availability cap,
+  * at most max_components installs.
+
+Prices and EP come from FleetEncoder columns, so they match ShipEngine.
+The search is a depth-first branch-and-bound: exclusive groups are decided
+first, then each non-exclusive variant gets a copy count. Partial states
+are memoized per (decision, slots left, EP left) as a Pareto list of
+(budget left, value), and a branch is dropped when a previous visit had at
+least as much budget and value, or when a fractional bound says it cannot
+beat the best loadout found so far.
+"""
+import argparse
+import itertools
+import math
+import sys
+import time
+
+from fleet_batch import ENHANCEMENT_COST, MOUNT_COST, FleetEncoder
+from ship_engine import DAMAGE_RE, DEFAULT_MODIFICATIONS, ShipEngine
+
+ENHANCEMENTS = ('normal', *ENHANCEMENT_COST)
+MOUNTS = ('single', *MOUNT_COST)
+FIRE_LINKS = (1, 2, 4)
+MAX_BATTERY = 6
+
+
+def expected_damage(dice):
+    """Average roll of a damage string like '4d10x2'; 0 for anything unparseable."""
+    match = DAMAGE_RE.search(dice or '')
+    if not match:
+        return 0
+    multiplier = int(match.group(3)[1:]) if match.group(3) else 1
+    return int(match.group(1)) * (int(match.group(2)) + 1) / 2 * multiplier
+
+
+def damage_value(ship, definition, instance):
+    return expected_damage(ship.component_damage(instance))
+
+
+def armor_value(ship, definition, instance):
+    return (definition.get('stats') or {}).get('armor_bonus') or 0
+
+
+def shield_value(ship, definition, instance):
+    stats = definition.get('stats') or {}
+    return (stats.get('sr') or 0) + (stats.get('sr_bonus') or 0)
+
+
+# Objective name -> value of one installed instance on a given ship
+OBJECTIVES = {
+    'damage': damage_value,
+    'armor': armor_value,
+    'shields': shield_value,
+}
+
+
+def option_variants(definition):
+    """Modification dicts allowed by upgradeSpecs.componentOptions, plain install first."""
+    options = (definition.get('upgradeSpecs') or {}).get('componentOptions') or []
+    enhancements = ENHANCEMENTS if 'weapon.enhancement' in options else ('normal',)
+    mounts = MOUNTS if 'weapon.multibarrel' in options else ('single',)
+    fire_links = FIRE_LINKS if 'weapon.fireLink' in options else (1,)
+    batteries = range(1, MAX_BATTERY + 1) if 'weapon.battery' in options else (1,)
+    point_blank = (False, True) if 'weapon.pointBlank' in options else (False,)
+
+    for enhancement, mount, fire_link, battery, pb in itertools.product(
+            enhancements, mounts, fire_links, batteries, point_blank):
+        # The config dialog hides the battery slider on fire-linked weapons
+        if fire_link > 1 and battery > 1:
+            continue
+        mods = {}
+        if enhancement != 'normal':
+            mods['enhancement'] = enhancement
+        if mount != 'single':
+            mods['mount'] = mount
+        if fire_link > 1:
+            mods['fireLink'] = fire_link
+        if battery > 1:
+            mods['batteryCount'] = battery
+        if pb:
+            mods['pointBlank'] = True
+        yield mods
+
+
+def pareto(options):
+    """Drop (cost, ep, value, ...) options another option matches or beats on all three."""
+    kept = []
+    for option in sorted(options, key=lambda o: (-o[2], o[0], o[1])):
+        if not any(k[0] <= option[0] and k[1] <= option[1] for k in kept):
+            kept.append(option)
+    return kept
+
+
+class LoadoutOptimizer:
+    """Candidate variants and their cost/EP/value on one hull and template."""
+
+    def __init__(self, engine, hull_id, template_id=None, objective='damage', max_availability=None, options=True):
+        if hull_id not in engine.ships:
+            raise KeyError(f"Unknown hull: {hull_id}")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective} (expected one of {', '.join(OBJECTIVES)})")
+        self.engine = engine
+        self.hull_id = hull_id
+        self.template_id = template_id
+        self.objective = objective
+
+        self.encoder = FleetEncoder(engine, hull_ids=[hull_id], template_ids=[template_id])
+        for def_id, definition in engine.equipment.items():
+            for mods in option_variants(definition) if options else [{}]:
+                self.encoder.add_variant(def_id, mods)
+
+        columns = self.encoder.columns
+        cost = self.encoder.cost_table(0, 0)
+        cost = cost + cost * columns['license_fee']
+        ep = self.encoder.ep_table(0)
+        size_ok = self.encoder.size_ok(0)
+        cap = len(engine.availability_rank)
+        if max_availability is not None:
+            cap = engine.availability_rank.index(max_availability)
+
+        ship = engine.ship(engine.new_ship(hull_id, template_id))
+        value_of = OBJECTIVES[objective]
+        self.available_ep = int(self.encoder.hull_base_ep[0] + self.encoder.template_ep_mod[0])
+
+        # Installing into an exclusiveGroup frees the stock member's EP and loses its value
+        group_ep, group_value = {}, {}
+        for def_id, stock_ep, _, group in self.encoder.stock[0]:
+            if group >= 0:
+                group_ep[group] = int(stock_ep)
+                group_value[group] = value_of(ship, engine.equipment[def_id], {'defId': def_id, 'modifications': {}})
+
+        self.groups = {}
+        self.pool = []
+        for v, variant in enumerate(self.encoder.variants):
+            if not size_ok[v] or columns['availability'][v] > cap:
+                continue
+            definition = engine.equipment[variant['defId']]
+            instance = {'defId': variant['defId'], 'modifications': {**DEFAULT_MODIFICATIONS, **variant['modifications']}}
+            value = value_of(ship, definition, instance)
+            group = int(columns['group'][v])
+            if group >= 0:
+                option = (float(cost[v]), int(ep[v]) - group_ep.get(group, 0), value - group_value.get(group, 0), v)
+                # Worth considering only if it helps the objective or frees EP for something that does
+                if option[2] > 0 or option[1] < 0:
+                    self.groups.setdefault(group, []).append(option)
+            elif value > 0:
+                self.pool.append((float(cost[v]), int(ep[v]), value, v))
+
+        self.groups = [pareto(options) for options in self.groups.values()]
+        # Any loadout using a dominated pool variant can swap it for its dominator
+        self.pool = sorted(pareto(self.pool), key=lambda o: (-o[2] / o[1] if o[1] > 0 else -math.inf, o[0]))
+
+    def search(self, budget=None, max_components=8, max_nodes=None):
+        """Best loadout as a dict; 'optimal' is False if max_nodes cut the search short."""
+        budget = math.inf if budget is None else budget
+        groups, pool = self.groups, self.pool
+
+        # Suffix bounds for the pool: best value per EP, per credit and per slot from index i on
+        n = len(pool)
+        ep_density = [0.0] * (n + 1)
+        cost_density = [0.0] * (n + 1)
+        best_value = [0.0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            cost, ep, value, _ = pool[i]
+            ep_density[i] = max(ep_density[i + 1], value / ep if ep > 0 else math.inf)
+            cost_density[i] = max(cost_density[i + 1], value / cost if cost > 0 else math.inf)
+            best_value[i] = max(best_value[i + 1], value)
+
+        # Suffix bounds for the groups: most value still on offer and most EP they could free
+        g = len(groups)
+        group_value = [0.0] * (g + 1)
+        group_ep = [0] * (g + 1)
+        for j in range(g - 1, -1, -1):
+            group_value[j] = group_value[j + 1] + max(0, max(o[2] for o in groups[j]))
+            group_ep[j] = group_ep[j + 1] + max(0, -min(o[1] for o in groups[j]))
+
+        def pool_bound(i, slots, ep_left, budget_left):
+            bound = best_value[i] * slots
+            if ep_density[i] != math.inf:
+                bound = min(bound, ep_density[i] * ep_left)
+            if cost_density[i] != math.inf and budget_left != math.inf:
+                bound = min(bound, cost_density[i] * budget_left)
+            return bound
+
+        best = {'value': 0.0, 'picks': []}
+        memo = {}
+        nodes = 0
+        picks = []
+
+        def visit(d, slots, ep_left, budget_left, value):
+            nonlocal nodes
+            nodes += 1
+            if max_nodes is not None and nodes > max_nodes:
+                raise _NodeLimit
+            if ep_left >= 0 and value > best['value']:
+                best['value'] = value
+                best['picks'] = list(picks)
+            if d >= g + n or slots == 0:
+                return
+
+            if d < g:
+                bound = group_value[d] + pool_bound(0, slots, ep_left + group_ep[d], budget_left)
+            else:
+                bound = pool_bound(d - g, slots, ep_left, budget_left)
+            if value + bound <= best['value']:
+                return
+
+            seen = memo.setdefault((d, slots, ep_left), [])
+            for seen_budget, seen_value in seen:
+                if seen_budget >= budget_left and seen_value >= value:
+                    return
+            seen.append((budget_left, value))
+
+            if d < g:
+                for cost, ep, option_value, v in groups[d]:
+                    if cost <= budget_left and ep_left - ep + group_ep[d + 1] >= 0:
+                        picks.append((v, 1))
+                        visit(d + 1, slots - 1, ep_left - ep, budget_left - cost, value + option_value)
+                        picks.pop()
+                visit(d + 1, slots, ep_left, budget_left, value)
+                return
+
+            cost, ep, option_value, v = pool[d - g]
+            copies = slots
+            if ep > 0:
+                copies = min(copies, ep_left // ep)
+            if cost > 0 and budget_left != math.inf:
+                copies = min(copies, int(budget_left // cost))
+            for count in range(copies, 0, -1):
+                picks.append((v, count))
+                visit(d + 1, slots - count, ep_left - ep * count, budget_left - cost * count, value + option_value * count)
+                picks.pop()
+            visit(d + 1, slots, ep_left, budget_left, value)
+
+        optimal = True
+        try:
+            visit(0, max_components, self.available_ep, budget, 0.0)
+        except _NodeLimit:
+            optimal = False
+
+        loadout = [(self.encoder.variants[v], count) for v, count in best['picks']]
+        chosen = {o[3]: o for o in self.pool}
+        chosen.update({o[3]: o for options in groups for o in options})
+        return {
+            'value': best['value'],
+            'cost': sum(chosen[v][0] * count for v, count in best['picks']),
+            'ep': sum(chosen[v][1] * count for v, count in best['picks']),
+            'loadout': loadout,
+            'picks': best['picks'],
+            'nodes': nodes,
+            'optimal': optimal,
+        }
+
+    def state_for(self, result):
+        """Saved ship state for a search result, for ShipEngine.evaluate or a YAML export."""
+        loadout = [v for v, count in result['picks'] for _ in range(count)]
+        return self.encoder.state_for(self.hull_id, self.template_id, loadout)
+
+
+class _NodeLimit(Exception):
+    pass
+
+
+def describe(variant):
+    mods = ', '.join(f"{k}={v}" for k, v in variant['modifications'].items())
+    return f"{variant['defId']} ({mods})" if mods else variant['defId']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the best loadout for a stock hull.")
+    parser.add_argument('hull', help="STOCK_SHIPS id, e.g. light_freighter")
+    parser.add_argument('--objective', choices=list(OBJECTIVES), default='damage')
+    parser.add_argument('--template', default=None, help="TEMPLATES id (advanced, prototype, ancient)")
+    parser.add_argument('--budget', type=float, default=None, help="Credits for components plus licensing (default: unlimited)")
+    parser.add_argument('--max-components', type=int, default=8)
+    parser.add_argument('--max-availability', default=None, help="Highest AVAILABILITY_RANK allowed, e.g. Restricted")
+    parser.add_argument('--max-nodes', type=int, default=None, help="Stop after this many search nodes")
+    parser.add_argument('--no-options', action='store_true', help="Only plain catalog components, no upgrade variants")
+    args = parser.parse_args()
+
+    engine = ShipEngine.load()
+    start = time.perf_counter()
+    optimizer = LoadoutOptimizer(engine, args.hull, args.template, args.objective,
+                                 args.max_availability, options=not args.no_options)
+    result = optimizer.search(args.budget, args.max_components, args.max_nodes)
+    elapsed = time.perf_counter() - start
+
+    summary = engine.evaluate(optimizer.state_for(result))
+    for variant, count in result['loadout']:
+        print(f"{count} x {describe(variant)}")
+    print(f"{args.objective}: +{result['value']:g}")
+    print(f"Components + licensing: {result['cost']:,.0f} cr | Total cost: {summary['total_cost']:,.0f} cr")
+    print(f"Remaining EP: {summary['remaining_ep']} | Availability: {summary['availability']}")
+    status = "optimal" if result['optimal'] else "node limit reached, best found"
+    print(f"Searched {result['nodes']:,} nodes over {len(optimizer.pool)} pool variants and "
+          f"{len(optimizer.groups)} exclusive groups in {elapsed:.2f}s ({status})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
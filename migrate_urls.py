@@ -1,48 +1,28 @@
+import argparse
 import json
-import urllib.request
-import urllib.error
-import time
 import os
 
+from link_checker import Checkpoint, check_urls
+from url_cache import CACHE_FILE, DEFAULT_TTL, URLStatusCache
+from wiki_mirror import MIRROR_DIR, NOT_MIRRORED, MirrorStore
+
 DATA_FILE = 'public/swse/data.json'
 REPORT_FILE = 'missing_miraheze_pages.txt'
 
-def check_url(url):
-    try:
-        # Use a comprehensive set of headers to mimic a real browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'identity', # We don't want to handle compression manually if urllib doesn't
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0'
-        }
-
-        # Try HEAD first
-        req = urllib.request.Request(url, method='HEAD', headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return response.status, "OK"
-    except urllib.error.HTTPError as e:
-        if e.code == 405: # Method Not Allowed, try GET
-            try:
-                req = urllib.request.Request(url, method='GET', headers=headers)
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    return response.status, "OK"
-            except urllib.error.HTTPError as e2:
-                return e2.code, e2.reason
-            except Exception as e2:
-                return 0, str(e2)
-        return e.code, e.reason
-    except Exception as e:
-        return 0, str(e)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Migrate and verify component wiki links.")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent requests (default: 8)")
+    parser.add_argument('--interval', type=float, default=0.5, help="Minimum seconds between requests to the same host (default: 0.5)")
+    parser.add_argument('--cache', default=CACHE_FILE, help=f"URL status cache file (default: {CACHE_FILE})")
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL / 3600, help="Hours before a cached status is revalidated (default: %(default)s)")
+    parser.add_argument('--refresh', action='store_true', help="Revalidate every URL regardless of TTL")
+    parser.add_argument('--mirror', nargs='?', const=MIRROR_DIR, help=f"Also save fetched pages into this wiki mirror (default: {MIRROR_DIR}); combine with --refresh to mirror every page")
+    parser.add_argument('--offline', action='store_true', help="Take statuses from the mirror instead of the network; the cache is read but never written")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+
     if not os.path.exists(DATA_FILE):
         print(f"Error: {DATA_FILE} not found.")
         return
@@ -60,68 +40,102 @@ def main():
     unverified_components = []
 
     # Process EQUIPMENT list
-    if 'EQUIPMENT' in data:
-        for item in data['EQUIPMENT']:
-            if 'wiki' in item:
-                old_url = item['wiki']
-                # Check for fandom.com or fandom.org or miraheze.org (to re-verify)
-                # If already migrated, we still want to check? The prompt implies "change them... make a request to make sure... report missing"
-                # If ran multiple times, we should check miraheze URLs too.
-
-                target_url = old_url
-                needs_update = False
-
-                if 'swse.fandom.com' in old_url or 'swse.fandom.org' in old_url:
-                    # Construct new URL
-                    target_url = old_url.replace('swse.fandom.com', 'swse.miraheze.org')
-                    target_url = target_url.replace('swse.fandom.org', 'swse.miraheze.org')
-                    needs_update = True
-                elif 'swse.miraheze.org' in old_url:
-                    # Already migrated, just check
-                    target_url = old_url
-                    needs_update = False # Unless missing? No, we don't revert.
-
-                print(f"Checking {item.get('name', 'Unknown')}: {target_url}...")
-
-                status, reason = check_url(target_url)
-
-                if status == 200:
-                    if needs_update:
-                        item['wiki'] = target_url
-                        updated_count += 1
-                        print(f"  -> VALID (200). Updated.")
-                    else:
-                        print(f"  -> VALID (200). Already correct.")
-                elif status == 404:
-                     print(f"  -> MISSING (404). Keeping old URL (if any).")
-                     missing_components.append({
-                        'name': item.get('name', 'Unknown'),
-                        'id': item.get('id', 'unknown'),
-                        'old_url': old_url,
-                        'new_url': target_url,
-                        'error': "404 Not Found"
-                    })
-                else:
-                    # 403, 0 (Connection Error), etc.
-                    # We assume these are valid but blocked, or site issues.
-                    # We will MIGRATE them but report as Unverified.
-                    if needs_update:
-                        print(f"  -> UNVERIFIED ({status} {reason}). Updating anyway (assuming network block).")
-                        item['wiki'] = target_url
-                        updated_count += 1
-                    else:
-                        print(f"  -> UNVERIFIED ({status} {reason}). Already updated.")
-
-                    unverified_components.append({
-                        'name': item.get('name', 'Unknown'),
-                        'id': item.get('id', 'unknown'),
-                        'old_url': old_url,
-                        'new_url': target_url,
-                        'error': f"{status} {reason}"
-                    })
-
-                total_checks += 1
-                time.sleep(0.5) # Be polite
+    # First pass: work out which URL each item should point to
+    targets = []
+    for item in data.get('EQUIPMENT', []):
+        if 'wiki' in item:
+            old_url = item['wiki']
+            # Check for fandom.com or fandom.org or miraheze.org (to re-verify)
+            # If ran multiple times, we should check miraheze URLs too.
+
+            target_url = old_url
+            needs_update = False
+
+            if 'swse.fandom.com' in old_url or 'swse.fandom.org' in old_url:
+                # Construct new URL
+                target_url = old_url.replace('swse.fandom.com', 'swse.miraheze.org')
+                target_url = target_url.replace('swse.fandom.org', 'swse.miraheze.org')
+                needs_update = True
+
+            targets.append((item, old_url, target_url, needs_update))
+
+    # Second pass: check every distinct URL that is not fresh in the cache,
+    # concurrently and politely per host. Expired entries are revalidated
+    # with If-None-Match / If-Modified-Since.
+    cache = URLStatusCache(args.cache, ttl=args.ttl * 3600)
+    mirror = MirrorStore(args.mirror or MIRROR_DIR) if args.mirror or args.offline else None
+    if args.offline:
+        # The mirror's answers are not network checks, so they go into a
+        # throwaway checkpoint and never overwrite the cache on disk
+        checkpoint = Checkpoint(None)
+        checker = mirror.offline_checker()
+    else:
+        checkpoint = cache
+        if args.refresh:
+            cache.expire()
+        checker = mirror.checker() if mirror else cache.checker()
+    urls = [t[2] for t in targets]
+    stale = sum(1 for url in dict.fromkeys(urls) if url not in checkpoint)
+    print(f"{stale} of {len(set(urls))} URLs need checking ({mirror.root if args.offline else args.cache}).")
+
+    def report_progress(url, status, reason, cached):
+        if not cached:
+            print(f"Checked {url}: {status} {reason}")
+
+    results = check_urls(urls, workers=args.workers, interval=0 if args.offline else args.interval,
+                         checkpoint=checkpoint, checker=checker, on_result=report_progress)
+    if args.offline:
+        # A page the mirror lacks keeps whatever status the cache last saw for it
+        for url, (status, reason) in results.items():
+            if reason == NOT_MIRRORED and cache.get(url):
+                results[url] = cache.get(url)
+    elif mirror:
+        mirror.save()
+
+    # Third pass: apply the merged results (this run + earlier runs) in data.json order
+    for item, old_url, target_url, needs_update in targets:
+        status, reason = results[target_url]
+        name = item.get('name', 'Unknown')
+
+        if status == 200:
+            if needs_update:
+                item['wiki'] = target_url
+                updated_count += 1
+                print(f"{name}: VALID (200). Updated.")
+            else:
+                print(f"{name}: VALID (200). Already correct.")
+        elif status == 404:
+            print(f"{name}: MISSING (404). Keeping old URL (if any).")
+            missing_components.append({
+                'name': name,
+                'id': item.get('id', 'unknown'),
+                'old_url': old_url,
+                'new_url': target_url,
+                'error': "404 Not Found"
+            })
+        else:
+            # 403, 0 (Connection Error), etc.
+            # We assume these are valid but blocked, or site issues.
+            # We will MIGRATE them but report as Unverified.
+            # A page neither mirrored nor ever checked is not evidence of anything, so offline runs leave it alone.
+            if reason == NOT_MIRRORED:
+                print(f"{name}: UNVERIFIED (not mirrored, never checked). Keeping old URL.")
+            elif needs_update:
+                print(f"{name}: UNVERIFIED ({status} {reason}). Updating anyway (assuming network block).")
+                item['wiki'] = target_url
+                updated_count += 1
+            else:
+                print(f"{name}: UNVERIFIED ({status} {reason}). Already updated.")
+
+            unverified_components.append({
+                'name': name,
+                'id': item.get('id', 'unknown'),
+                'old_url': old_url,
+                'new_url': target_url,
+                'error': f"{status} {reason}"
+            })
+
+        total_checks += 1
 
     # Save updated JSON if changes were made
     if updated_count > 0:
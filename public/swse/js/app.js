@@ -1,7 +1,8 @@
-import { useShipStore } from './store.js?v=2.1';
+import { useShipStore } from './store.js?v=2.3';
 import { i18n, getLocalizedName } from './i18n.js?v=2.1';
-import { StatPanelWrapper, SystemListWrapper, ConfigPanelWrapper, ShipSheetWrapper, HangarDialog, AddModDialog, CustomManagerDialog, CustomComponentDialog, CustomShipDialog } from './components.js?v=2.2';
+import { StatPanelWrapper, SystemListWrapper, ConfigPanelWrapper, ShipSheetWrapper, HangarDialog, AddModDialog, CustomManagerDialog, CustomComponentDialog, CustomShipDialog } from './components.js?v=2.4';
 import { initTutorial } from './tutorial.js?v=2.1';
+import { loadData, loadPart, mergePart } from './bundle.js?v=1.0';
 
 const { createApp, ref, onMounted, watch } = Vue;
 const { createPinia } = Pinia;
@@ -24,6 +25,9 @@ const setup = () => {
     const rightDrawerOpen = ref(false);
     const showSheetDialog = ref(false);
 
+    // Localized names ship as a separate bundle part, fetched on first use
+    watch(locale, lang => shipStore.ensureLocale(lang), { immediate: true });
+
     onMounted(() => {
         shipStore.initHangar();
 
@@ -122,9 +126,8 @@ const setup = () => {
 };
 
 // Fetch Data and Mount
-fetch('data.json')
-    .then(response => response.json())
-    .then(data => {
+loadData()
+    .then(({ data, manifest }) => {
         const app = createApp({
             setup
         });
@@ -163,7 +166,10 @@ fetch('data.json')
 
         // Initialize Store with Data
         const store = useShipStore();
-        store.initDb(data);
+        store.initDb(data, manifest && {
+            parts: Object.keys(manifest.parts),
+            load: name => loadPart(manifest, name).then(part => { mergePart(store.db, part); })
+        });
 
         app.mount('#q-app');
 
@@ -172,4 +178,4 @@ fetch('data.json')
         if (loading) loading.remove();
         document.getElementById('q-app').style.display = 'block';
     })
-    .catch(err => console.error("Failed to load data.json", err));
+    .catch(err => console.error("Failed to load data", err));
@@ -0,0 +1,64 @@
+// Loader for the pre-built data bundle written by build_bundle.py.
+// bundle/manifest.json names a minified core file plus parts (localized
+// names, descriptions) that are fetched only when a view needs them.
+// Without a bundle the app falls back to the pretty-printed data.json; only
+// the Pages build ships one, the compose nginx answers 404 for bundle/.
+
+const BUNDLE_DIR = 'bundle/';
+const FORMAT_VERSION = 1;
+const LISTS = ['EQUIPMENT', 'STOCK_SHIPS', 'TEMPLATES'];
+const INTERNED_FIELDS = ['id', 'category', 'group', 'availability', 'exclusiveGroup', 'location', 'damageType', 'size'];
+
+const fetchJson = async (url, options) => {
+    const response = await fetch(url, options);
+    if (!response.ok) throw new Error(`${url}: HTTP ${response.status}`);
+    return response.json();
+};
+
+// Turn interned indices back into the data.json shape
+export function decodeCore(core) {
+    if (core.format !== FORMAT_VERSION) throw new Error(`Unsupported bundle format: ${core.format}`);
+    const strings = core.strings;
+    const data = { ...core.tables };
+    LISTS.forEach(key => {
+        data[key] = core[key].map(encoded => {
+            const item = { ...encoded };
+            INTERNED_FIELDS.forEach(field => {
+                if (field in item) item[field] = strings[item[field]];
+            });
+            if (Array.isArray(item.defaultMods)) {
+                item.defaultMods = item.defaultMods.map(m => typeof m === 'number' ? strings[m] : { ...m, id: strings[m.id] });
+            }
+            return item;
+        });
+    });
+    return data;
+}
+
+// Copy a lazily loaded part onto the matching items without clobbering local edits
+export function mergePart(data, part) {
+    Object.entries(part.values).forEach(([key, values]) => {
+        (data[key] || []).forEach(item => {
+            if (Object.prototype.hasOwnProperty.call(values, item.id) && !(part.field in item)) {
+                item[part.field] = values[item.id];
+            }
+        });
+    });
+    return data;
+}
+
+// Resolves to { data, manifest }; manifest is null when data.json was loaded directly
+export async function loadData() {
+    try {
+        const manifest = await fetchJson(BUNDLE_DIR + 'manifest.json', { cache: 'no-cache' });
+        const core = await fetchJson(BUNDLE_DIR + manifest.core);
+        return { data: decodeCore(core), manifest };
+    } catch (err) {
+        console.warn('Data bundle unavailable, loading data.json', err);
+        return { data: await fetchJson('data.json'), manifest: null };
+    }
+}
+
+export function loadPart(manifest, name) {
+    return fetchJson(BUNDLE_DIR + manifest.parts[name]);
+}
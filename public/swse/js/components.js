@@ -1,4 +1,4 @@
-import { useShipStore } from './store.js?v=2.1';
+import { useShipStore } from './store.js?v=2.3';
 import { getLocalizedName, i18n } from './i18n.js?v=2.1';
 
 const { computed, ref, reactive, watch } = Vue;
@@ -146,7 +146,7 @@ const SystemList = {
                     </div>
                     <div v-if="getUpgradeSpecs(editingInstance.defId)?.payload" class="q-mb-md">
                         <div v-if="getUpgradeSpecs(editingInstance.defId).payload.type === 'capacity'">
-                            <div class="text-caption">Additional {{ getUpgradeSpecs(editingInstance.defId).payload.unitLabel }} ({{ format(store.allEquipment.find(e => e.id === editingInstance.defId).baseCost * getUpgradeSpecs(editingInstance.defId).payload.costFactor) }} each)</div>
+                            <div class="text-caption">Additional {{ getUpgradeSpecs(editingInstance.defId).payload.unitLabel }} ({{ format(store.getEquipment(editingInstance.defId).baseCost * getUpgradeSpecs(editingInstance.defId).payload.costFactor) }} each)</div>
                             <q-input dark type="number" filled v-model.number="editingInstance.modifications.payloadCount" label="Additional Capacity" min="0" :max="(getUpgradeSpecs(editingInstance.defId).payload.max * (editingInstance.modifications.fireLink || 1)) - (getUpgradeSpecs(editingInstance.defId).payload.base * (editingInstance.modifications.fireLink || 1))" :hint="'Base: ' + (getUpgradeSpecs(editingInstance.defId).payload.base * (editingInstance.modifications.fireLink || 1)) + ' | Max Total: ' + (getUpgradeSpecs(editingInstance.defId).payload.max * (editingInstance.modifications.fireLink || 1))" />
                         </div>
                         <q-checkbox v-else dark v-model="editingInstance.modifications.payloadOption" :label="getUpgradeSpecs(editingInstance.defId).payload.label + ' (' + format(getUpgradeSpecs(editingInstance.defId).payload.cost) + ')'" />
@@ -992,7 +992,7 @@ export const AddModDialog = {
         // 2. Menu Options Logic (Computed)
         // Computes available categories based on all equipment
         const categoryOptions = computed(() => {
-            const cats = [...new Set(store.allEquipment.map(e => e.category))];
+            const cats = [...store.equipmentCatalog.categories.keys()];
             return cats.map(c => {
                 const key = 'cat.' + c.replace(/ /g, '_').toLowerCase();
                 const label = t(key);
@@ -1003,7 +1003,7 @@ export const AddModDialog = {
         // Computes available groups based on selected category
         const groupOptions = computed(() => {
             if (!newComponentCategory.value) return [];
-            const groups = [...new Set(store.allEquipment.filter(e => e.category === newComponentCategory.value).map(e => e.group))];
+            const groups = [...(store.equipmentCatalog.categories.get(newComponentCategory.value)?.keys() || [])];
             return groups.map(g => ({ label: g, value: g })).sort((a, b) => a.label.localeCompare(b.label));
         });
 
@@ -1011,7 +1011,8 @@ export const AddModDialog = {
         // Ensuring strict category check prevents cross-category group pollution
         const itemOptions = computed(() => {
             if (!newComponentGroup.value) return [];
-            return store.allEquipment.filter(e => e.group === newComponentGroup.value && e.category === newComponentCategory.value).map(e => ({
+            const items = store.equipmentCatalog.categories.get(newComponentCategory.value)?.get(newComponentGroup.value) || [];
+            return items.map(e => ({
                 ...e,
                 label: getLocalizedName(e)
             })).sort((a, b) => {
@@ -1023,7 +1024,7 @@ export const AddModDialog = {
 
         const selectedItemDef = computed(() => {
             if (!newComponentSelection.value) return null;
-            return store.allEquipment.find(e => e.id === newComponentSelection.value);
+            return store.getEquipment(newComponentSelection.value);
         });
 
         // 3. Validation Logic
@@ -1125,7 +1126,7 @@ export const AddModDialog = {
 
         const installComponent = () => {
             if(newComponentSelection.value) {
-                const def = store.allEquipment.find(e => e.id === newComponentSelection.value);
+                const def = store.getEquipment(newComponentSelection.value);
 
                 const doInstall = () => {
                     let loc = def.location || '';
@@ -1264,7 +1265,7 @@ export const CustomComponentDialog = {
         ];
 
         const categoryOptions = computed(() => {
-            const cats = [...new Set(store.allEquipment.map(e => e.category))];
+            const cats = [...store.equipmentCatalog.categories.keys()];
             return cats.map(c => {
                 const key = 'cat.' + c.replace(/ /g, '_').toLowerCase();
                 const label = t(key);
@@ -1282,7 +1283,7 @@ export const CustomComponentDialog = {
 
         const filterExclusiveFn = (val, update) => {
             update(() => {
-                const groups = [...new Set(store.allEquipment.map(e => e.exclusiveGroup).filter(g => g))];
+                const groups = [...store.equipmentCatalog.exclusiveGroups.keys()];
                 if (val === '') exclusiveOptionsFiltered.value = groups;
                 else exclusiveOptionsFiltered.value = groups.filter(v => v && v.toLowerCase().indexOf(val.toLowerCase()) > -1);
             });
@@ -1350,11 +1351,13 @@ export const CustomComponentDialog = {
             }
         };
 
-        watch(() => store.customDialogState.visible, (visible) => {
+        watch(() => store.customDialogState.visible, async (visible) => {
             if (visible) {
                 activeProperties.value = [];
                 if (store.customDialogState.componentId) {
-                    const existing = store.allEquipment.find(c => c.id === store.customDialogState.componentId);
+                    // Core components need their description loaded before it can be edited
+                    await store.ensureDescriptions();
+                    const existing = store.getEquipment(store.customDialogState.componentId);
                     if (existing) {
                         Object.assign(newCustomComponent, {
                             name: existing.name, category: existing.category, group: existing.group, location: existing.location,
@@ -1401,7 +1404,7 @@ export const SystemListWrapper = {
 
         const getName = (instance) => {
             const id = instance.defId || instance;
-            const def = store.allEquipment.find(e => e.id === id);
+            const def = store.getEquipment(id);
             let name = getLocalizedName(def);
 
             if (instance && instance.defId) {
@@ -1414,7 +1417,7 @@ export const SystemListWrapper = {
         };
         const getAvailability = (idOrInstance) => {
             const id = idOrInstance.defId || idOrInstance;
-            const def = store.allEquipment.find(e => e.id === id);
+            const def = store.getEquipment(id);
             let avail = def && def.availability ? def.availability : 'Common';
 
             if (idOrInstance.modifications) {
@@ -1446,11 +1449,11 @@ export const SystemListWrapper = {
             return avail;
         }
         const getBaseEp = (id) => {
-            const def = store.allEquipment.find(e => e.id === id);
+            const def = store.getEquipment(id);
             return def ? def.baseEp : 0;
         }
         const getIcon = (id) => {
-            const e = store.allEquipment.find(e => e.id === id);
+            const e = store.getEquipment(id);
             if (!e) return 'memory';
             if (store.isWeapon(e.id)) return 'gps_fixed';
             if (store.isEngine(e.id)) return 'speed';
@@ -1458,23 +1461,23 @@ export const SystemListWrapper = {
             return 'memory';
         }
         const getEpDynamic = (id) => {
-            const def = store.allEquipment.find(e => e.id === id);
+            const def = store.getEquipment(id);
             if (def && def.stats && def.stats.ep_dynamic_pct) return Math.floor(store.chassis.baseEp * def.stats.ep_dynamic_pct);
             return null;
         }
         const isVariableCost = (id) => {
-            const def = store.allEquipment.find(e => e.id === id);
+            const def = store.getEquipment(id);
             return def && def.variableCost;
         }
         const isModification = (id) => {
-            const def = store.allEquipment.find(e => e.id === id);
+            const def = store.getEquipment(id);
             return def && def.category === 'Modifications';
         }
         const isWeapon = (id) => {
             return store.isWeapon(id);
         }
         const isLauncher = (id) => {
-            const def = store.allEquipment.find(e => e.id === id);
+            const def = store.getEquipment(id);
             return def && def.group === 'Launchers';
         }
         const isCustom = (id) => {
@@ -1484,8 +1487,8 @@ export const SystemListWrapper = {
         }
         const format = (n) => n === 0 ? '-' : new Intl.NumberFormat('en-US', { style: 'decimal', maximumFractionDigits: 0 }).format(n) + ' cr';
 
-        const hasUpgrades = (defId) => isWeapon(defId) || !!store.allEquipment.find(e => e.id === defId)?.upgradeSpecs;
-        const getUpgradeSpecs = (defId) => store.allEquipment.find(e => e.id === defId)?.upgradeSpecs;
+        const hasUpgrades = (defId) => isWeapon(defId) || !!store.getEquipment(defId)?.upgradeSpecs;
+        const getUpgradeSpecs = (defId) => store.getEquipment(defId)?.upgradeSpecs;
 
         const canMount = (defId) => {
             const specs = getUpgradeSpecs(defId);
@@ -1559,7 +1562,7 @@ export const SystemListWrapper = {
         const openConfig = (instance) => { editingInstance.value = instance; showConfigDialog.value = true; };
 
         const openWiki = (defId) => {
-             const def = store.allEquipment.find(e => e.id === defId);
+             const def = store.getEquipment(defId);
              if (!def) return;
 
              if (def.wiki) {
@@ -1571,7 +1574,7 @@ export const SystemListWrapper = {
         };
 
         const checkValidity = (instance) => {
-            const def = store.allEquipment.find(e => e.id === instance.defId);
+            const def = store.getEquipment(instance.defId);
             if (!def) return true;
 
             const shipIndex = store.db.SIZE_RANK.indexOf(store.chassis.size);
@@ -1587,7 +1590,7 @@ export const SystemListWrapper = {
         };
 
         const getOptionCost = (defId, key) => {
-             const def = store.allEquipment.find(e => e.id === defId);
+             const def = store.getEquipment(defId);
              if (!def) return 0;
              let costDef = null;
              if (def.upgradeSpecs && def.upgradeSpecs.optionCosts && def.upgradeSpecs.optionCosts[key] !== undefined) {
@@ -1635,7 +1638,7 @@ export const SystemListWrapper = {
                     mods.fireLink = val;
                     if (val > 1) {
                          mods.batteryCount = 1;
-                         const def = store.allEquipment.find(e => e.id === editingInstance.value.defId);
+                         const def = store.getEquipment(editingInstance.value.defId);
                          if (def && def.upgradeSpecs && def.upgradeSpecs.payload && def.upgradeSpecs.payload.type === 'capacity') {
                              mods.fireLinkOption = true;
                          }
@@ -1679,9 +1682,11 @@ export const ShipSheetWrapper = {
     ...ShipSheet,
     setup() {
         const store = useShipStore();
+        // Descriptions aren't part of the core data bundle
+        store.ensureDescriptions();
         const getName = (instance) => {
             const id = instance.defId || instance;
-            const def = store.allEquipment.find(e => e.id === id);
+            const def = store.getEquipment(id);
             let name = getLocalizedName(def);
 
             if (instance.modifications) {
@@ -1695,12 +1700,12 @@ export const ShipSheetWrapper = {
         };
         const getMod = (score) => Math.floor((score - 10) / 2);
         const weapons = computed(() => store.installedComponents.filter(instance => {
-            const def = store.allEquipment.find(e => e.id === instance.defId);
+            const def = store.getEquipment(instance.defId);
             return def && store.isWeapon(def.id);
         }));
         const systemNames = computed(() => {
             const nonWeapons = store.installedComponents.filter(instance => {
-                const def = store.allEquipment.find(e => e.id === instance.defId);
+                const def = store.getEquipment(instance.defId);
                 return def && !store.isWeapon(def.id) && !store.isEngine(def.id);
             });
             if (nonWeapons.length === 0) return i18n.global.t('ui.installed_systems');
@@ -1725,7 +1730,7 @@ export const ShipSheetWrapper = {
 
         const weaponData = computed(() => {
             return weapons.value.map(w => {
-                const def = store.allEquipment.find(e => e.id === w.defId);
+                const def = store.getEquipment(w.defId);
                 const name = getName(w); // Uses the existing getName which handles some mods
                 const damage = getDmg(w);
 
@@ -1761,7 +1766,7 @@ export const ShipSheetWrapper = {
             const seen = new Set();
             const unique = [];
             store.installedComponents.forEach(instance => {
-                const def = store.allEquipment.find(e => e.id === instance.defId);
+                const def = store.getEquipment(instance.defId);
                 if (def && def.description && !seen.has(instance.defId)) {
                     unique.push(instance);
                     seen.add(instance.defId);
@@ -1770,7 +1775,7 @@ export const ShipSheetWrapper = {
             return unique;
         });
         const getDescription = (id) => {
-             const def = store.allEquipment.find(e => e.id === id);
+             const def = store.getEquipment(id);
              return def ? def.description : '';
         };
 
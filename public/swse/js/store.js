@@ -42,26 +42,71 @@ export const useShipStore = defineStore('ship', () => {
     const customShipDialogState = reactive({ visible: false, shipId: null });
     const showCustomManager = ref(false);
 
+    // Data bundle parts not shipped with the core data (localized names,
+    // descriptions): { parts: [names], load(name) } from app.js, or null when
+    // data.json was loaded whole
+    let dataBundle = null;
+    const loadedParts = new Map();
+
     // Initialize DB Action
-    function initDb(data) {
+    function initDb(data, bundle = null) {
         Object.assign(db, data);
+        dataBundle = bundle;
+        loadedParts.clear();
     }
 
-    // Consolidated Equipment List (Base + Libraries with Priority)
-    const allEquipment = computed(() => {
-        const map = new Map();
+    function ensureBundlePart(name) {
+        if (!dataBundle || !dataBundle.parts.includes(name)) return Promise.resolve();
+        if (!loadedParts.has(name)) {
+            loadedParts.set(name, dataBundle.load(name).catch(err => {
+                loadedParts.delete(name);
+                console.error(`Failed to load data bundle part ${name}`, err);
+            }));
+        }
+        return loadedParts.get(name);
+    }
+    const ensureLocale = (lang) => ensureBundlePart(`names.${lang}`);
+    const ensureDescriptions = () => ensureBundlePart('descriptions');
+
+    // Consolidated Equipment Catalog (Base + Libraries with Priority)
+    // Indexed once whenever EQUIPMENT or the libraries change, so per-component
+    // lookups during recomputes are O(1) instead of scanning the whole list.
+    const equipmentCatalog = computed(() => {
+        const byId = new Map();
         // 1. Base
-        db.EQUIPMENT.forEach(e => map.set(e.id, e));
+        db.EQUIPMENT.forEach(e => byId.set(e.id, e));
 
         // 2. Libraries (in order)
         libraries.value.forEach(lib => {
             if (lib.active) {
-                lib.components.forEach(c => map.set(c.id, c));
+                lib.components.forEach(c => byId.set(c.id, c));
             }
         });
-        return Array.from(map.values());
+
+        // category -> group -> items, and exclusiveGroup -> items
+        const categories = new Map();
+        const exclusiveGroups = new Map();
+        byId.forEach(e => {
+            if (!categories.has(e.category)) categories.set(e.category, new Map());
+            const groups = categories.get(e.category);
+            if (!groups.has(e.group)) groups.set(e.group, []);
+            groups.get(e.group).push(e);
+
+            if (e.exclusiveGroup) {
+                if (!exclusiveGroups.has(e.exclusiveGroup)) exclusiveGroups.set(e.exclusiveGroup, []);
+                exclusiveGroups.get(e.exclusiveGroup).push(e);
+            }
+        });
+
+        return { byId, items: Array.from(byId.values()), categories, exclusiveGroups };
     });
 
+    const allEquipment = computed(() => equipmentCatalog.value.items);
+
+    function getEquipment(defId) {
+        return equipmentCatalog.value.byId.get(defId);
+    }
+
     // Consolidated Ship List (Base + Libraries with Priority)
     const allShips = computed(() => {
         const map = new Map();
@@ -89,19 +134,19 @@ export const useShipStore = defineStore('ship', () => {
     });
 
     function isWeapon(defId) {
-        const def = allEquipment.value.find(e => e.id === defId);
+        const def = getEquipment(defId);
         if (!def) return false;
         return def.category === 'Weapon Systems' || def.id === 'sensor_decoy';
     }
 
     function isEngine(defId) {
-        const def = allEquipment.value.find(e => e.id === defId);
+        const def = getEquipment(defId);
         if (!def) return false;
         return def.group === 'Sublight Drives' && def.stats && def.stats.speed !== undefined;
     }
 
     function calculateEp({ defId, batteryCount = 1, isNonStandard = false, miniaturization = 0, quantity = 1, mount = 'single', fireLink = 1, enhancement = 'normal' } = {}) {
-        const def = allEquipment.value.find(e => e.id === defId);
+        const def = getEquipment(defId);
         if (!def) return 0;
 
         let epCost = def.baseEp;
@@ -164,7 +209,7 @@ export const useShipStore = defineStore('ship', () => {
     }
 
     function getComponentDamage(instance) {
-        const def = allEquipment.value.find(e => e.id === instance.defId);
+        const def = getEquipment(instance.defId);
         if (!def || !def.damage) return null;
 
         const match = def.damage.match(/(\d+)d(\d+)(x\d+)?/);
@@ -201,7 +246,7 @@ export const useShipStore = defineStore('ship', () => {
     }
 
     function calculateComponentCost(instance, ignoreStock = false) {
-        const def = allEquipment.value.find(e => e.id === instance.defId);
+        const def = getEquipment(instance.defId);
         if (!def || (!ignoreStock && instance.isStock)) return 0;
 
         let cost = def.baseCost;
@@ -344,7 +389,7 @@ export const useShipStore = defineStore('ship', () => {
         let hpBonusPct = 0, weaponDice = 0;
 
         installedComponents.value.forEach(instance => {
-            const def = allEquipment.value.find(e => e.id === instance.defId);
+            const def = getEquipment(instance.defId);
             if (def && def.stats) {
                 if (def.stats.sr !== undefined) modSR = def.stats.sr;
                 if (def.stats.hyperdrive !== undefined) {
@@ -421,7 +466,7 @@ export const useShipStore = defineStore('ship', () => {
     const shipAvailability = computed(() => {
         let maxRank = 0;
         installedComponents.value.forEach(instance => {
-            const def = allEquipment.value.find(e => e.id === instance.defId);
+            const def = getEquipment(instance.defId);
             if (def && def.availability) {
                 const rank = db.AVAILABILITY_RANK.indexOf(def.availability);
                 if (rank > maxRank) maxRank = rank;
@@ -457,7 +502,7 @@ export const useShipStore = defineStore('ship', () => {
         let multiplier = 1.0;
         let adder = 0;
         installedComponents.value.forEach(instance => {
-            const def = allEquipment.value.find(e => e.id === instance.defId);
+            const def = getEquipment(instance.defId);
             if (def && def.stats) {
                 if (def.stats.cargo_factor) multiplier = def.stats.cargo_factor;
                 if (def.stats.cargo_bonus_size_mult) adder += (def.stats.cargo_bonus_size_mult * sizeMultVal.value);
@@ -614,7 +659,7 @@ export const useShipStore = defineStore('ship', () => {
     const componentsCost = computed(() => installedComponents.value.reduce((total, instance) => total + getComponentCost(instance), 0));
     const licensingCost = computed(() => installedComponents.value.reduce((total, instance) => {
         if (instance.isStock) return total;
-        const def = allEquipment.value.find(e => e.id === instance.defId);
+        const def = getEquipment(instance.defId);
         if (!def || !def.availability) return total;
         const feePct = db.LICENSE_FEES[def.availability] || 0;
         return total + (getComponentCost(instance) * feePct);
@@ -623,13 +668,10 @@ export const useShipStore = defineStore('ship', () => {
 
     // Actions
     function addComponent(defId, location, isNonStandard = false) {
-        const def = allEquipment.value.find(e => e.id === defId);
+        const def = getEquipment(defId);
         if (!def) return;
         if (def.exclusiveGroup) {
-            const existing = installedComponents.value.find(instance => {
-                const mDef = allEquipment.value.find(e => e.id === instance.defId);
-                return mDef && mDef.exclusiveGroup === def.exclusiveGroup;
-            });
+            const existing = installedComponents.value.find(instance => getEquipment(instance.defId)?.exclusiveGroup === def.exclusiveGroup);
             if (existing) removeComponent(existing.instanceId);
         }
         const mods = { payloadCount: 0, payloadOption: false, batteryCount: 1, quantity: 1, fireLinkOption: false };
@@ -814,7 +856,9 @@ export const useShipStore = defineStore('ship', () => {
             db.EQUIPMENT[idx] = newDef;
         }
     }
-    function downloadDataJson() {
+    async function downloadDataJson() {
+        // The export must be a complete data.json, so pull in every lazy part first
+        await Promise.all((dataBundle ? dataBundle.parts : []).map(ensureBundlePart));
         const jsonStr = JSON.stringify(db, null, 4);
         const blob = new Blob([jsonStr], {type: 'application/json'});
         const url = URL.createObjectURL(blob);
@@ -860,7 +904,7 @@ export const useShipStore = defineStore('ship', () => {
                  defId = modConfig;
             }
 
-            const def = allEquipment.value.find(e => e.id === defId);
+            const def = getEquipment(defId);
             if(def) {
                 let loc = def.location || '';
                 if (isWeapon(def.id) && !mods.weaponUser) mods.weaponUser = 'Pilot';
@@ -897,7 +941,7 @@ export const useShipStore = defineStore('ship', () => {
         installedComponents.value = state.manifest.map(m => {
             const mods = m.modifications || { payloadCount: 0, payloadOption: false, batteryCount: 1, quantity: 1, fireLinkOption: false };
             if (!mods.quantity) mods.quantity = 1;
-            const def = allEquipment.value.find(e => e.id === m.defId);
+            const def = getEquipment(m.defId);
             if (def && isWeapon(def.id) && !mods.weaponUser) mods.weaponUser = 'Pilot';
             return { instanceId: m.id, defId: m.defId, location: m.location, miniaturization: m.miniaturizationRank, isStock: m.isStock || false, isNonStandard: m.isNonStandard || false, modifications: mods };
         });
@@ -1091,14 +1135,14 @@ export const useShipStore = defineStore('ship', () => {
     }
 
     return {
-        db, initDb,
+        db, initDb, ensureLocale, ensureDescriptions,
         meta, chassisId, activeTemplate, installedComponents, engineering, showAddComponentDialog, cargoToEpAmount, escapePodsToEpPct, crewQuality, crewStats, CREW_QUALITY_STATS,
-        libraries, allEquipment, allShips, customComponents, // Exported for components.js
+        libraries, allEquipment, equipmentCatalog, getEquipment, allShips, customComponents, // Exported for components.js
         customDialogState, customShipDialogState, showCustomManager,
         hangar, activeShipId, initHangar, loadFromHangar, removeFromHangar, unloadShip, // Hangar Exports
         isTemplateEditMode, startTemplateEdit, saveTemplateEdit, cancelTemplateEdit, // Template Exports
         chassis, template, currentStats, currentCargo, maxCargoCapacity, reflexDefense, totalEP, usedEP, remainingEP, epUsagePct, totalCost, hullCost, componentsCost, licensingCost, shipAvailability, sizeMultVal, hasEscapePods, escapePodsEpGain, currentCrew, currentPassengers, currentConsumables, totalPopulation, escapePodCapacity,
-        addComponent, addCustomComponent, updateCustomComponent, openCustomDialog, removeComponent, removeCustomComponent, isCustomComponentInstalled, addCustomShip, updateCustomShip, removeCustomShip, openCustomShipDialog, addEquipment, removeEquipment, updateEquipment, downloadDataJson, reset, createNew, loadState, getComponentCost, getComponentEp, getComponentDamage,
+        addComponent, addCustomComponent, updateCustomComponent, openCustomDialog, removeComponent, removeCustomComponent, isCustomComponentInstalled, addCustomShip, updateCustomShip, removeCustomShip, openCustomShipDialog, addEquipment, removeEquipment, updateEquipment, downloadDataJson, reset, createNew, loadState, getComponentCost, getComponentEp, getComponentDamage, calculateEp,
         addLibrary, removeLibrary, toggleLibrary, moveLibrary, importLibrary, updateLibrary, damageThreshold, fortitudeDefense, DT_SIZE_MODS,
         isDev, factoryReset, isWeapon, isEngine
     };
@@ -0,0 +1,663 @@
+"""Pure-Python port of the ship rules in public/swse/js/store.js.
+
+The engine loads data.json once and evaluates ship states in the same
+shape the front end saves them (localStorage / hangar snapshots / YAML
+exports), so a verifier can price thousands of builds without a browser:
+
+    engine = ShipEngine.load()
+    state = engine.new_ship('light_fighter', template='advanced')
+    engine.evaluate(state)['total_cost']
+
+Function and property names follow store.js in snake_case; keep the two
+in step when the rules change (tests/test_ship_engine.py checks parity).
+"""
+import json
+import math
+import os
+import re
+from functools import cached_property, lru_cache
+
+from catalog import Catalog
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public', 'swse', 'data.json')
+
+DT_SIZE_MODS = {
+    'Fine': -10, 'Diminutive': -5, 'Tiny': -2, 'Small': -1, 'Medium': 0,
+    'Large': 5, 'Huge': 10, 'Gargantuan': 20, 'Colossal': 50,
+    'Colossal (Frigate)': 100, 'Colossal (Cruiser)': 200, 'Colossal (Station)': 500
+}
+
+DEFAULT_MODIFICATIONS = {'payloadCount': 0, 'payloadOption': False, 'batteryCount': 1, 'quantity': 1, 'fireLinkOption': False}
+
+# Keys copied from a STOCK_SHIPS defaultMods entry onto the installed instance (createNew)
+DEFAULT_MOD_KEYS = ('batteryCount', 'quantity', 'mount', 'fireLink', 'enhancement', 'payloadCount',
+                    'payloadOption', 'fireLinkOption', 'pointBlank', 'weaponUser')
+
+DAMAGE_RE = re.compile(r'(\d+)d(\d+)(x\d+)?')
+CARGO_RE = re.compile(r'([\d,]+)\s*(tons|kg)', re.IGNORECASE)
+
+
+def js_floor(value):
+    """Math.floor, returning an int."""
+    return int(math.floor(value))
+
+
+def _is_true(value):
+    # JS `val === true`: only a real boolean counts, not 1
+    return value is True
+
+
+class ShipEngine:
+    """Rules database: data.json plus any active custom libraries."""
+
+    def __init__(self, data, libraries=None):
+        self.data = data
+        self.size_cost_multipliers = data.get('SIZE_COST_MULTIPLIERS', {})
+        self.reflex_size_mods = data.get('REFLEX_SIZE_MODS', {})
+        self.license_fees = data.get('LICENSE_FEES', {})
+        self.availability_rank = data.get('AVAILABILITY_RANK', [])
+        self.size_rank = data.get('SIZE_RANK', [])
+        self.default_option_costs = data.get('DEFAULT_OPTION_COSTS', {})
+        self.templates = {t['id']: t for t in data.get('TEMPLATES', [])}
+
+        # allEquipment / allShips: base first, then active libraries in order
+        self.catalog = Catalog.from_data(data, libraries)
+        self.equipment = self.catalog.by_id
+        self.ships = {s['id']: s for s in data.get('STOCK_SHIPS', [])}
+        for lib in libraries or []:
+            if lib.get('active'):
+                self.ships.update((s['id'], s) for s in lib.get('ships', []))
+
+    @classmethod
+    def load(cls, path=DATA_FILE):
+        """Return a shared engine for path, re-reading only when the file changes."""
+        stat = os.stat(path)
+        return _load_engine(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    def with_libraries(self, libraries):
+        return ShipEngine(self.data, libraries)
+
+    def is_weapon(self, def_id):
+        definition = self.equipment.get(def_id)
+        if not definition:
+            return False
+        return definition.get('category') == 'Weapon Systems' or definition['id'] == 'sensor_decoy'
+
+    def new_ship(self, chassis_id, template=None, name=''):
+        """Return the saved state of a fresh stock build (store.createNew)."""
+        ship = self.ships[chassis_id]
+        manifest = []
+        for index, mod_config in enumerate(ship.get('defaultMods') or []):
+            mods = dict(DEFAULT_MODIFICATIONS)
+            def_id = mod_config
+            if isinstance(mod_config, dict):
+                def_id = mod_config['id']
+                for key in DEFAULT_MOD_KEYS:
+                    if mod_config.get(key):
+                        mods[key] = mod_config[key]
+
+            definition = self.equipment.get(def_id)
+            if definition:
+                if self.is_weapon(def_id) and not mods.get('weaponUser'):
+                    mods['weaponUser'] = 'Pilot'
+                manifest.append({'id': f'stock-{index}', 'defId': def_id, 'location': definition.get('location', ''),
+                                 'miniaturizationRank': 0, 'isStock': True, 'isNonStandard': False,
+                                 'modifications': mods})
+        return {
+            'apiVersion': '2.0',
+            'meta': {'name': name, 'model': chassis_id, 'version': '1.0', 'notes': ''},
+            'configuration': {'baseChassis': chassis_id, 'template': template, 'feats': {'starshipDesigner': False},
+                              'cargoToEpAmount': 0, 'escapePodsToEpPct': 0, 'crewQuality': 'Normal'},
+            'manifest': manifest,
+        }
+
+    def ship(self, state, template_edit_mode=False):
+        engine = self.with_libraries(state['libraries']) if state.get('libraries') else self
+        return Ship(engine, state, template_edit_mode)
+
+    def evaluate(self, state, template_edit_mode=False):
+        return self.ship(state, template_edit_mode).summary()
+
+    def evaluate_many(self, states):
+        return [self.evaluate(state) for state in states]
+
+
+@lru_cache(maxsize=8)
+def _load_engine(path, mtime_ns, size):
+    with open(path, 'r', encoding='utf-8') as f:
+        return ShipEngine(json.load(f))
+
+
+class Ship:
+    """Derived values for one ship state, mirroring the computed properties in store.js."""
+
+    def __init__(self, engine, state, template_edit_mode=False):
+        self.engine = engine
+        config = state['configuration']
+        self.chassis_id = config.get('baseChassis')
+        templates = config.get('templates')
+        self.template_id = (templates[0] if templates else None) if isinstance(templates, list) else config.get('template')
+        self.cargo_to_ep_amount = config.get('cargoToEpAmount') or 0
+        self.escape_pods_to_ep_pct = config.get('escapePodsToEpPct') or 0
+        self.template_edit_mode = template_edit_mode
+
+        # store.loadState
+        self.installed = []
+        for m in state.get('manifest', []):
+            mods = dict(m['modifications'] if m.get('modifications') is not None else DEFAULT_MODIFICATIONS)
+            if not mods.get('quantity'):
+                mods['quantity'] = 1
+            if self.engine.is_weapon(m['defId']) and not mods.get('weaponUser'):
+                mods['weaponUser'] = 'Pilot'
+            self.installed.append({'instanceId': m.get('id'), 'defId': m['defId'], 'location': m.get('location'),
+                                   'miniaturization': m.get('miniaturizationRank'), 'isStock': m.get('isStock') or False,
+                                   'isNonStandard': m.get('isNonStandard') or False, 'modifications': mods})
+
+    # Chassis / template
+
+    @cached_property
+    def chassis(self):
+        if self.chassis_id in self.engine.ships:
+            return self.engine.ships[self.chassis_id]
+        if self.engine.ships:
+            return next(iter(self.engine.ships.values()))
+        return {'size': 'Huge', 'baseEp': 0, 'cost': 0, 'stats': {}, 'logistics': {}}
+
+    @cached_property
+    def template(self):
+        return self.engine.templates.get(self.template_id) if self.template_id else None
+
+    @cached_property
+    def template_cost_mult(self):
+        return self.template['costMult'] if self.template else 1
+
+    @cached_property
+    def size_mult_val(self):
+        return self.engine.size_cost_multipliers.get(self.chassis.get('size')) or 1
+
+    def _def(self, def_id):
+        return self.engine.equipment.get(def_id)
+
+    # Per-component rules
+
+    def calculate_ep(self, def_id, battery_count=1, is_non_standard=False, miniaturization=0, quantity=1,
+                     mount='single', fire_link=1, enhancement='normal'):
+        definition = self._def(def_id)
+        if not definition:
+            return 0
+
+        ep_cost = definition['baseEp']
+        stats = definition.get('stats') or {}
+        # Dynamic EP (Gain)
+        if stats.get('ep_dynamic_pct'):
+            ep_cost = js_floor(self.chassis['baseEp'] * stats['ep_dynamic_pct'])
+
+        if enhancement == 'enhanced':
+            ep_cost += 1
+        if enhancement == 'advanced':
+            ep_cost += 2
+        if mount == 'quad':
+            ep_cost += 1
+        if fire_link > 1:
+            ep_cost *= fire_link
+        if battery_count > 1:
+            ep_cost *= battery_count
+        if quantity > 1:
+            ep_cost *= quantity
+        if is_non_standard and ep_cost > 0:
+            ep_cost *= 2
+
+        if ep_cost > 0:
+            if miniaturization == 1:
+                ep_cost = max(1, ep_cost - 1)
+            elif miniaturization == 2:
+                ep_cost = math.ceil(ep_cost / 2)
+        return ep_cost
+
+    def component_ep(self, instance):
+        mods = instance.get('modifications') or {}
+        return self.calculate_ep(
+            instance['defId'],
+            battery_count=mods.get('batteryCount') or 1,
+            is_non_standard=instance.get('isNonStandard'),
+            miniaturization=instance.get('miniaturization'),
+            quantity=mods.get('quantity') or 1,
+            mount=mods.get('mount') or 'single',
+            fire_link=mods.get('fireLink') or 1,
+            enhancement=mods.get('enhancement') or 'normal',
+        )
+
+    def component_damage(self, instance):
+        definition = self._def(instance['defId'])
+        if not definition or not definition.get('damage'):
+            return None
+
+        match = DAMAGE_RE.search(definition['damage'])
+        if not match:
+            return definition['damage']
+
+        dice_count = int(match.group(1))
+        die_type = int(match.group(2))
+        multiplier = match.group(3) or ''
+
+        mods = instance.get('modifications')
+        if mods is not None:
+            mount = mods.get('mount') or 'single'
+            fire_link = mods.get('fireLink') or 1
+            enhancement = mods.get('enhancement') or 'normal'
+            if enhancement == 'enhanced':
+                dice_count += 1
+            if enhancement == 'advanced':
+                dice_count += 2
+            if mount == 'twin':
+                dice_count += 1
+            if mount == 'quad':
+                dice_count += 2
+            if fire_link == 2:
+                dice_count += 1
+            if fire_link == 4:
+                dice_count += 2
+
+        if self.current_stats.get('weapon_damage_dice'):
+            dice_count += self.current_stats['weapon_damage_dice']
+
+        return f"{dice_count}d{die_type}{multiplier}"
+
+    def _resolve_option_cost(self, definition, key, base_cost):
+        specs = definition.get('upgradeSpecs') or {}
+        cost_def = None
+        if key in (specs.get('optionCosts') or {}):
+            cost_def = specs['optionCosts'][key]
+        elif isinstance(specs.get(key), dict) and 'cost' in specs[key]:
+            # Legacy/direct object structure (e.g. fireLinkOption.cost)
+            cost_def = specs[key]['cost']
+
+        if cost_def is None and key in self.engine.default_option_costs:
+            cost_def = self.engine.default_option_costs[key]
+
+        if cost_def is None:
+            return 0
+        if isinstance(cost_def, (int, float)) and not isinstance(cost_def, bool):
+            return cost_def
+        if isinstance(cost_def, dict):
+            if cost_def.get('multiplier'):
+                return base_cost * cost_def['multiplier']
+            if cost_def.get('cost'):
+                value = cost_def['cost']
+                if cost_def.get('sizeMult'):
+                    value *= self.size_mult_val
+                return value
+        return 0
+
+    def calculate_component_cost(self, instance, ignore_stock=False):
+        definition = self._def(instance['defId'])
+        if not definition or (not ignore_stock and instance.get('isStock')):
+            return 0
+
+        cost = definition['baseCost']
+        if definition.get('sizeMult'):
+            cost *= self.size_mult_val
+
+        stats = definition.get('stats') or {}
+        # Dynamic Cost (Percentage of Hull)
+        if stats.get('cost_dynamic_pct'):
+            cost += js_floor(self.hull_cost * stats['cost_dynamic_pct'])
+
+        mods = instance.get('modifications')
+        if mods is not None:
+            mount = mods.get('mount') or 'single'
+            fire_link = mods.get('fireLink') or 1
+            enhancement = mods.get('enhancement') or 'normal'
+
+            if enhancement == 'enhanced':
+                cost *= 2
+            if enhancement == 'advanced':
+                cost *= 5
+
+            mount_mult = 1
+            if mount == 'twin':
+                mount_mult = 3
+            if mount == 'quad':
+                mount_mult = 5
+            cost *= mount_mult
+
+            if fire_link > 1:
+                cost *= fire_link
+
+            payload = (definition.get('upgradeSpecs') or {}).get('payload')
+            if payload:
+                if payload.get('type') == 'capacity' and (mods.get('payloadCount') or 0) > 0:
+                    cost += mods['payloadCount'] * (definition['baseCost'] * payload['costFactor'])
+                elif mods.get('payloadOption') and payload.get('type') == 'toggle':
+                    cost += payload['cost']
+
+            # Selective Fire
+            if mods.get('fireLinkOption'):
+                cost += self._resolve_option_cost(definition, 'fireLinkOption', cost)
+
+            # Generic Option Costs
+            for key, value in mods.items():
+                if _is_true(value) and key != 'fireLinkOption':
+                    added_cost = self._resolve_option_cost(definition, key, definition['baseCost'])
+                    if added_cost > 0:
+                        cost += added_cost
+
+            if (mods.get('batteryCount') or 0) > 1:
+                cost *= mods['batteryCount']
+            if (mods.get('quantity') or 0) > 1:
+                cost *= mods['quantity']
+
+        if instance.get('miniaturization') == 1:
+            cost *= 2
+        elif instance.get('miniaturization') == 2:
+            cost *= 5
+
+        if instance.get('isNonStandard'):
+            cost *= 5
+        return cost
+
+    def component_cost(self, instance):
+        if self.template_edit_mode:
+            return 0
+        return self.calculate_component_cost(instance, False)
+
+    # Ship-wide computed values
+
+    @cached_property
+    def current_stats(self):
+        s = {**(self.chassis.get('stats') or {}), 'speed': 0}
+        if 'sr' not in s:
+            s['sr'] = 0
+
+        if self.template and self.template.get('stats'):
+            for key, value in self.template['stats'].items():
+                s[key] = s[key] + value if key in s else value
+
+        mod_sr = best_hyperdrive = None
+        bonus_sr = bonus_armor = bonus_hp = 0
+        bonus_dex = bonus_str = bonus_per = speed_factor = hyperdrive_shift = 0
+        hp_bonus_pct = weapon_dice = 0
+
+        for instance in self.installed:
+            definition = self._def(instance['defId'])
+            stats = definition.get('stats') if definition else None
+            if not stats:
+                continue
+            if 'sr' in stats:
+                mod_sr = stats['sr']
+            if 'hyperdrive' in stats:
+                if best_hyperdrive is None or stats['hyperdrive'] < best_hyperdrive:
+                    best_hyperdrive = stats['hyperdrive']
+            if 'speed' in stats:
+                s['speed'] = stats['speed']
+
+            bonus_sr += stats.get('sr_bonus') or 0
+            bonus_armor += stats.get('armor_bonus') or 0
+            bonus_dex += stats.get('dex_bonus') or 0
+            if stats.get('int_bonus'):
+                s['int'] = s.get('int', 0) + stats['int_bonus']
+            bonus_str += stats.get('str_bonus') or 0
+            bonus_per += stats.get('perception_bonus') or 0
+            speed_factor += stats.get('speed_factor') or 0
+            hyperdrive_shift += stats.get('hyperdrive_bonus') or 0
+            if stats.get('hp_dynamic_str'):
+                bonus_hp += js_floor(js_floor((s.get('str') or 0) / 2) / 10) * 10
+            hp_bonus_pct += stats.get('hp_bonus_pct') or 0
+            weapon_dice += stats.get('weapon_damage_dice') or 0
+
+        if mod_sr is not None:
+            s['sr'] = mod_sr
+        if best_hyperdrive is not None:
+            s['hyperdrive'] = best_hyperdrive
+
+        s['sr'] = (s.get('sr') or 0) + bonus_sr
+        s['armor'] = (s.get('armor') or 0) + bonus_armor
+        s['hp'] = (s.get('hp') or 0) + bonus_hp
+        s['dex'] = (s.get('dex') or 0) + bonus_dex
+        s['str'] = (s.get('str') or 0) + bonus_str
+        s['perception_bonus'] = bonus_per
+
+        if s['dex'] < 0:
+            s['dex'] = 0
+
+        if hp_bonus_pct > 0:
+            s['hp'] += js_floor(s['hp'] * hp_bonus_pct)
+        if s['speed'] > 0 and speed_factor > 0:
+            s['speed'] += max(1, js_floor(s['speed'] * speed_factor))
+        if s.get('hyperdrive'):
+            s['hyperdrive'] += hyperdrive_shift
+        s['weapon_damage_dice'] = (s.get('weapon_damage_dice') or 0) + weapon_dice
+        return s
+
+    @cached_property
+    def fortitude_defense(self):
+        strength = self.current_stats.get('str') or 10
+        return 10 + js_floor((strength - 10) / 2)
+
+    @cached_property
+    def damage_threshold(self):
+        size = self.chassis.get('size', '')
+        size_key = size
+        if size_key not in DT_SIZE_MODS and size.startswith('Colossal'):
+            if 'Frigate' in size:
+                size_key = 'Colossal (Frigate)'
+            elif 'Cruiser' in size:
+                size_key = 'Colossal (Cruiser)'
+            elif 'Station' in size:
+                size_key = 'Colossal (Station)'
+            else:
+                size_key = 'Colossal'
+        return self.fortitude_defense + DT_SIZE_MODS.get(size_key, 0)
+
+    @cached_property
+    def ship_availability(self):
+        rank = self.engine.availability_rank
+        max_rank = 0
+        for instance in self.installed:
+            definition = self._def(instance['defId'])
+            if definition and definition.get('availability') in rank:
+                max_rank = max(max_rank, rank.index(definition['availability']))
+
+        # Escape Pod Rule
+        if self.escape_pods_to_ep_pct > 0:
+            military_index = rank.index('Military') if 'Military' in rank else -1
+            if max_rank < military_index:
+                return 'Illegal'
+        return rank[max_rank] if rank else None
+
+    @cached_property
+    def reflex_defense(self):
+        dex_mod = js_floor(((self.current_stats.get('dex') or 10) - 10) / 2)
+        armor = self.current_stats.get('armor') or 0
+        size_mod = self.engine.reflex_size_mods.get(self.chassis.get('size')) or 0
+        return 10 + dex_mod + armor + size_mod
+
+    @cached_property
+    def max_cargo_capacity(self):
+        base = (self.chassis.get('logistics') or {}).get('cargo')
+        if not base:
+            return 0
+        match = CARGO_RE.search(base)
+        if not match:
+            return 0
+        value = float(match.group(1).replace(',', ''))
+        if match.group(2).lower() == 'kg':
+            value /= 1000
+
+        multiplier = 1.0
+        adder = 0
+        for instance in self.installed:
+            definition = self._def(instance['defId'])
+            stats = definition.get('stats') if definition else None
+            if stats:
+                if stats.get('cargo_factor'):
+                    multiplier = stats['cargo_factor']
+                if stats.get('cargo_bonus_size_mult'):
+                    adder += stats['cargo_bonus_size_mult'] * self.size_mult_val
+        return value * multiplier + adder
+
+    @cached_property
+    def stock_configuration_ep(self):
+        total = 0
+        for mod_config in self.chassis.get('defaultMods') or []:
+            def_id, battery_count, quantity = mod_config, 1, 1
+            if isinstance(mod_config, dict):
+                def_id = mod_config['id']
+                battery_count = mod_config.get('batteryCount') or 1
+                quantity = mod_config.get('quantity') or 1
+            total += self.calculate_ep(def_id, battery_count=battery_count, quantity=quantity)
+        return total
+
+    @cached_property
+    def current_crew(self):
+        base_crew = (self.chassis.get('logistics') or {}).get('crew') or 0
+        factor = 1.0
+        for instance in self.installed:
+            if instance['defId'] == 'slave_circuits':
+                factor = min(factor, 0.666)
+            if instance['defId'] in ('slave_circuits_adv', 'slave_circuits_recall'):
+                factor = min(factor, 0.333)
+        crew = math.ceil(base_crew * factor)
+        if crew < 1 and base_crew > 0:
+            crew = 1
+        return crew
+
+    @cached_property
+    def current_passengers(self):
+        passengers = (self.chassis.get('logistics') or {}).get('pass') or 0
+        for instance in self.installed:
+            if instance['defId'] == 'passenger_conversion':
+                passengers += self.size_mult_val * ((instance.get('modifications') or {}).get('quantity') or 1)
+        return passengers
+
+    @cached_property
+    def consumables_days(self):
+        cons = (self.chassis.get('logistics') or {}).get('cons') or '1 day'
+        base_days = parse_days(cons)
+        extended_range_count = sum((i.get('modifications') or {}).get('quantity') or 1
+                                   for i in self.installed if i['defId'] == 'extended_range')
+        bonus_per_instance = max(js_floor(base_days * 0.10), 1)
+        return base_days + bonus_per_instance * extended_range_count
+
+    @cached_property
+    def current_consumables(self):
+        return format_days(self.consumables_days)
+
+    @cached_property
+    def total_population(self):
+        return self.current_crew + self.current_passengers
+
+    @cached_property
+    def has_escape_pods(self):
+        return bool(self.chassis.get('size')) and self.chassis['size'].startswith('Colossal')
+
+    @cached_property
+    def escape_pods_ep_gain(self):
+        return js_floor(self.escape_pods_to_ep_pct / 10)
+
+    @cached_property
+    def total_ep(self):
+        ep = self.chassis['baseEp'] + self.stock_configuration_ep
+        if self.template:
+            ep += self.template.get('epMod') or 0
+        cargo_ep = min(self.cargo_to_ep_amount, self.max_cargo_capacity)
+        ep += js_floor(cargo_ep / self.size_mult_val)
+        if self.has_escape_pods:
+            ep += self.escape_pods_ep_gain
+        return ep
+
+    @cached_property
+    def used_ep(self):
+        return sum(self.component_ep(instance) for instance in self.installed)
+
+    @cached_property
+    def remaining_ep(self):
+        return self.total_ep - self.used_ep
+
+    @cached_property
+    def hull_cost(self):
+        base = js_floor(self.chassis['cost'] * self.template_cost_mult)
+        # In Template Mode, add cost of "Stock" components to Hull Base
+        if self.template_edit_mode:
+            base += sum(self.calculate_component_cost(instance, True) for instance in self.installed)
+        return base
+
+    @cached_property
+    def components_cost(self):
+        return sum(self.component_cost(instance) for instance in self.installed)
+
+    @cached_property
+    def licensing_cost(self):
+        total = 0
+        for instance in self.installed:
+            if instance.get('isStock'):
+                continue
+            definition = self._def(instance['defId'])
+            if not definition or not definition.get('availability'):
+                continue
+            fee_pct = self.engine.license_fees.get(definition['availability']) or 0
+            total += self.component_cost(instance) * fee_pct
+        return total
+
+    @cached_property
+    def total_cost(self):
+        return self.hull_cost + self.components_cost + self.licensing_cost
+
+    def summary(self):
+        return {
+            'chassis': self.chassis.get('id'),
+            'template': self.template_id,
+            'total_cost': self.total_cost,
+            'hull_cost': self.hull_cost,
+            'components_cost': self.components_cost,
+            'licensing_cost': self.licensing_cost,
+            'total_ep': self.total_ep,
+            'used_ep': self.used_ep,
+            'remaining_ep': self.remaining_ep,
+            'availability': self.ship_availability,
+            'reflex_defense': self.reflex_defense,
+            'damage_threshold': self.damage_threshold,
+            'max_cargo_capacity': self.max_cargo_capacity,
+            'current_crew': self.current_crew,
+            'current_passengers': self.current_passengers,
+            'current_consumables': self.current_consumables,
+            'current_stats': self.current_stats,
+            'components': [{
+                'defId': instance['defId'],
+                'cost': self.component_cost(instance),
+                'ep': self.component_ep(instance),
+                'damage': self.component_damage(instance),
+            } for instance in self.installed],
+        }
+
+
+def parse_days(text):
+    """Parse a logistics.cons string ('2 days', '1 year 2 months') into days (360-day years)."""
+    total = 0
+    years = re.search(r'(\d+)\s*years?', text)
+    months = re.search(r'(\d+)\s*months?', text)
+    days = re.search(r'(\d+)\s*days?', text)
+    if years:
+        total += int(years.group(1)) * 360
+    if months:
+        total += int(months.group(1)) * 30
+    if days:
+        total += int(days.group(1))
+    if total == 0 and 'day' in text and not days:
+        simple = re.search(r'(\d+)\s*day', text)
+        if simple:
+            total += int(simple.group(1))
+    return total or 1
+
+
+def format_days(total_days):
+    years, rem_year = divmod(total_days, 360)
+    months, days = divmod(rem_year, 30)
+    parts = []
+    if years > 0:
+        parts.append(f"{years} year{'s' if years > 1 else ''}")
+    if months > 0:
+        parts.append(f"{months} month{'s' if months > 1 else ''}")
+    if days > 0:
+        parts.append(f"{days} day{'s' if days > 1 else ''}")
+    return ' '.join(parts) if parts else '0 days'
@@ -0,0 +1,257 @@
+"""Seeded synthetic data for scale testing.
+
+Generates data.json variants with any number of components and ships, and
+API resource payloads (libraries, hangars, ships) as NDJSON. Every
+synthetic record is modelled on a real one from data.json. A component
+keeps its prototype's category, location, size limits, stats, damage and
+upgradeSpecs. It gets a new id and name, a jittered cost and EP, and a
+description made of words from the real descriptions. Large catalogs
+also spread over more groups and exclusiveGroups ("Shield Generators
+Mk 3"), about one series per SERIES_SIZE components, so the number of
+report sections grows with the catalog.
+
+    python synth_data.py data --components 100000 -o synth/data.json
+    python synth_data.py resources --libraries 200 --library-components 500 \\
+        --hangars 50 --hangar-ships 20 --ships 1000 -o synth/resources.ndjson
+
+The same --seed and sizes always give byte-identical files. Output is
+written one record at a time, so a million components never sit in
+memory. The files work with the rest of the tooling:
+
+    python generate_report.py --data synth/data.json --compact
+    python validate_data.py synth/data.json
+    python bulk_resources.py import synth/resources.ndjson
+    python tests/load_test.py --payloads synth/resources.ndjson
+    UI_DATA_FILE=synth/data.json pytest tests/test_ui.py
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+from ship_engine import DATA_FILE, DEFAULT_MODIFICATIONS, ShipEngine
+
+SERIES_SIZE = 1000
+MAKERS = ['Kuat', 'Sienar', 'Incom', 'Corellian', 'Taim & Bak', 'Borstel', 'Koensayr', 'Cygnus', 'Rendili',
+          'Mon Calamari', 'Hoersch-Kessel', 'SoroSuub', 'Loronar', 'Slayn & Korpil', 'Kuat Vehicle', 'Rothana']
+# Weight of keeping the prototype's availability rather than drawing another
+KEEP_AVAILABILITY = 0.7
+VISIBILITIES = ['private'] * 8 + ['public'] * 2
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z'-]+")
+
+
+class Synthesizer:
+    """Draws synthetic records from one seeded random stream."""
+
+    def __init__(self, base, seed=0):
+        self.base = base
+        self.rng = random.Random(seed)
+        self.prototypes = base['EQUIPMENT']
+        self.hulls = base['STOCK_SHIPS']
+        self.availability = base.get('AVAILABILITY_RANK') or []
+        self.equipment_ids = {item['id'] for item in self.prototypes}
+        self.words = sorted({word for item in self.prototypes for word in WORD_RE.findall(item.get('description') or '')})
+
+    def description(self, length):
+        rng = self.rng
+        words = []
+        size = 0
+        while size < length:
+            word = rng.choice(self.words)
+            words.append(word)
+            size += len(word) + 1
+        text = ' '.join(words)
+        return text[0].upper() + text[1:] + '.'
+
+    def component(self, n, prefix='synth', series=1):
+        """Component number n, spread over series variants of every group."""
+        rng = self.rng
+        proto = rng.choice(self.prototypes)
+        # Nested values (stats, upgradeSpecs) are shared with the prototype and never modified
+        item = dict(proto)
+        maker = rng.choice(MAKERS)
+        model = f"{rng.choice('ABCDEFGHJKLMNPRSTVXYZ')}{rng.choice('ABCDEFGHJKLMNPRSTVXYZ')}-{n}"
+        item['id'] = f"{prefix}_{proto['id']}_{n}"
+        item['name'] = f"{maker} {proto['name']} {model}"
+        if 'name_es' in proto:
+            item['name_es'] = f"{proto['name_es']} {model} ({maker})"
+
+        mark = rng.randrange(series)
+        if mark:
+            item['group'] = f"{proto['group']} Mk {mark + 1}"
+            if proto.get('exclusiveGroup'):
+                item['exclusiveGroup'] = f"{proto['exclusiveGroup']}_mk{mark + 1}"
+
+        cost = proto.get('baseCost') or 0
+        item['baseCost'] = int(round(cost * rng.uniform(0.7, 1.4), -1 if cost >= 100 else 0))
+        ep = proto.get('baseEp') or 0
+        if ep > 0:
+            item['baseEp'] = max(1, ep + rng.choice((-1, 0, 0, 0, 1)))
+        if self.availability and rng.random() > KEEP_AVAILABILITY:
+            item['availability'] = rng.choice(self.availability)
+        if 'description' in proto:
+            item['description'] = self.description(max(20, int(len(proto['description']) * rng.uniform(0.5, 1.5))))
+        if 'wiki' in proto:
+            item['wiki'] = 'https://swse.miraheze.org/wiki/' + item['name'].replace(' ', '_')
+        return item
+
+    def hull(self, n, prefix='synth'):
+        """A STOCK_SHIPS entry cloned from a real hull with jittered stats.
+
+        defaultMods that don't name a real component are dropped, so clones
+        don't repeat a broken reference.
+        """
+        rng = self.rng
+        proto = rng.choice(self.hulls)
+        ship = {**proto, 'stats': dict(proto['stats'])}
+        ship['id'] = f"{prefix}_{proto['id']}_{n}"
+        ship['name'] = f"{rng.choice(MAKERS)} {proto['name']} {n}"
+        if 'name_es' in proto:
+            ship['name_es'] = f"{proto['name_es']} {n}"
+        ship['cost'] = int(round(proto['cost'] * rng.uniform(0.8, 1.25), -2))
+        if 'defaultMods' in proto:
+            ship['defaultMods'] = [m for m in proto['defaultMods']
+                                   if (m if isinstance(m, str) else m.get('id')) in self.equipment_ids]
+        for key in ('hp', 'dr', 'sr', 'armor'):
+            if ship['stats'].get(key):
+                ship['stats'][key] = max(1, round(ship['stats'][key] * rng.uniform(0.8, 1.25)))
+        return ship
+
+    def components(self, count, prefix='synth'):
+        series = max(1, count // SERIES_SIZE)
+        for n in range(count):
+            yield self.component(n, prefix, series)
+
+    def build(self, engine, name, parts, component_ids=None):
+        """Saved ship state: a random hull and template plus parts random components from engine."""
+        rng = self.rng
+        component_ids = component_ids or sorted(engine.equipment)
+        hull = rng.choice(sorted(engine.ships))
+        template = rng.choice([None, *sorted(engine.templates)])
+        state = engine.new_ship(hull, template, name=name)
+        for def_id in rng.sample(component_ids, min(parts, len(component_ids))):
+            definition = engine.equipment[def_id]
+            mods = dict(DEFAULT_MODIFICATIONS)
+            if engine.is_weapon(def_id):
+                mods.update(weaponUser='Pilot', enhancement=rng.choice(['normal', 'enhanced', 'advanced']),
+                            mount=rng.choice(['single', 'twin', 'quad']), fireLink=rng.choice([1, 2, 4]))
+            state['manifest'].append({'id': f"synth-{len(state['manifest'])}", 'defId': def_id,
+                                      'location': definition.get('location', ''), 'miniaturizationRank': 0,
+                                      'isStock': False, 'isNonStandard': False, 'modifications': mods})
+        return state
+
+    def resources(self, engine, libraries=0, library_components=0, hangars=0, hangar_ships=0, ships=0,
+                  library_ships=2, parts=4):
+        """Yield NDJSON resource records ({id, type, name, visibility, data}) as bulk_resources uses them."""
+        rng = self.rng
+        component_ids = sorted(engine.equipment)
+        for i in range(libraries):
+            name = f"Synthetic Library {i}"
+            data = {'name': name, 'components': list(self.components(library_components, prefix=f"lib{i}")),
+                    'ships': [self.hull(n, prefix=f"lib{i}") for n in range(library_ships)]}
+            yield {'id': f"synth-library-{i}", 'type': 'libraries', 'name': name,
+                   'visibility': rng.choice(VISIBILITIES), 'data': data}
+        for i in range(hangars):
+            name = f"Synthetic Hangar {i}"
+            fleet = []
+            for n in range(hangar_ships):
+                state = self.build(engine, f"{name} Ship {n}", parts, component_ids)
+                # Hangar entries are store.js snapshots: the state plus an id and a timestamp
+                fleet.append({'id': f"synth-hangar-{i}-{n}", 'lastModified': 1_700_000_000_000 + n, **state})
+            yield {'id': f"synth-hangar-{i}", 'type': 'hangars', 'name': name,
+                   'visibility': rng.choice(VISIBILITIES), 'data': {'ships': fleet}}
+        for i in range(ships):
+            name = f"Synthetic Ship {i}"
+            yield {'id': f"synth-ship-{i}", 'type': 'ships', 'name': name,
+                   'visibility': rng.choice(VISIBILITIES), 'data': self.build(engine, name, parts, component_ids)}
+
+
+def synthesize(base, components, ships=0, seed=0):
+    """In-memory data.json dict: the real records plus components (and ships) synthetic ones."""
+    synth = Synthesizer(base, seed)
+    return {**base, 'STOCK_SHIPS': base['STOCK_SHIPS'] + [synth.hull(n) for n in range(ships)],
+            'EQUIPMENT': base['EQUIPMENT'] + list(synth.components(components))}
+
+
+def write_data(path, base, components, ships=0, seed=0):
+    """Stream a data.json variant to path; returns the number of components written."""
+    synth = Synthesizer(base, seed)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write('{\n')
+        for key, value in base.items():
+            if key not in ('STOCK_SHIPS', 'EQUIPMENT'):
+                f.write(f"{json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+        for key, records in (('STOCK_SHIPS', [*base['STOCK_SHIPS'], *(synth.hull(n) for n in range(ships))]),
+                             ('EQUIPMENT', _chain(base['EQUIPMENT'], synth.components(components)))):
+            f.write(f"{json.dumps(key)}: [")
+            for n, record in enumerate(records):
+                f.write((',\n' if n else '\n') + json.dumps(record, ensure_ascii=False))
+            f.write('\n]' + (',\n' if key == 'STOCK_SHIPS' else '\n'))
+        f.write('}\n')
+    os.replace(tmp, path)
+    return len(base['EQUIPMENT']) + components
+
+
+def _chain(first, rest):
+    yield from first
+    yield from rest
+
+
+def write_resources(path, records):
+    """Write resource records as NDJSON; returns how many."""
+    count = 0
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    os.replace(tmp, path)
+    return count
+
+
+def load_base(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic data for scale testing.")
+    parser.add_argument('--base', default=DATA_FILE, help="Real data.json the records are modelled on")
+    parser.add_argument('--seed', type=int, default=0)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    data = commands.add_parser('data', help="A data.json variant")
+    data.add_argument('--components', type=int, default=10_000, help="Synthetic components on top of the real ones")
+    data.add_argument('--ships', type=int, default=0, help="Synthetic STOCK_SHIPS on top of the real ones")
+    data.add_argument('-o', '--output', required=True)
+
+    resources = commands.add_parser('resources', help="API resources as NDJSON (bulk_resources.py import)")
+    resources.add_argument('--libraries', type=int, default=10)
+    resources.add_argument('--library-components', type=int, default=100, help="Components per library")
+    resources.add_argument('--hangars', type=int, default=10)
+    resources.add_argument('--hangar-ships', type=int, default=10, help="Ships per hangar")
+    resources.add_argument('--ships', type=int, default=100, help="Standalone ship resources")
+    resources.add_argument('--parts', type=int, default=4, help="Random components installed per ship")
+    resources.add_argument('-o', '--output', required=True)
+    args = parser.parse_args(argv)
+
+    base = load_base(args.base)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    start = time.perf_counter()
+    if args.command == 'data':
+        count = write_data(args.output, base, args.components, args.ships, args.seed)
+        what = f"{count:,} components"
+    else:
+        synth = Synthesizer(base, args.seed)
+        records = synth.resources(ShipEngine.load(args.base), args.libraries, args.library_components,
+                                  args.hangars, args.hangar_ships, args.ships, parts=args.parts)
+        what = f"{write_resources(args.output, records):,} resources"
+    print(f"Wrote {what} to {args.output} in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,42 @@
 import pytest
+import hashlib
+import http.server
+import json
 import os
-from playwright.sync_api import Page
+import re
+import sys
+import threading
+
+from hypothesis import HealthCheck, settings
+
+# Make the repo-level tooling (migrate_urls.py, link_checker.py, ...) importable.
+# Inside the tests container the repo is mounted at REPO_ROOT.
+REPO_ROOT = os.environ.get("REPO_ROOT", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Hypothesis profiles for the whole session: "dev" keeps a plain pytest run quick,
+# `make fuzz` picks "ci" through HYPOTHESIS_PROFILE
+settings.register_profile("dev", max_examples=20, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+settings.register_profile("ci", max_examples=200, deadline=None, suppress_health_check=[HealthCheck.too_slow],
+                          print_blob=True)
+settings.load_profile(os.environ.get("HYPOTHESIS_PROFILE", "dev"))
+
+@pytest.fixture(scope="session")
+def api_ready():
+    """Block until the backend answers /health; returns how long that took.
+
+    Immediate when wait_for_api.py already ran (the compose entry point);
+    otherwise waits up to READY_TIMEOUT seconds and fails the dependent
+    tests with the last probe error.
+    """
+    from readiness import BASE_URL, NotReady, Probe, wait_until_ready
+
+    timeout = float(os.environ.get("READY_TIMEOUT", "30"))
+    try:
+        return wait_until_ready([Probe("backend", f"{BASE_URL}/health")], timeout)["backend"]
+    except NotReady as e:
+        pytest.fail(f"API not ready after {timeout:.0f}s: {e}", pytrace=False)
 
 @pytest.fixture(scope="session")
 def browser_type_launch_args(browser_type_launch_args):
@@ -10,14 +46,177 @@ def browser_type_launch_args(browser_type_launch_args):
         "headless": headless,
     }
 
-@pytest.fixture(scope="function", autouse=True)
-def disable_tutorial(page: Page):
-    # Block driver.js to prevent tour from starting
-    page.route("**/*driver.js*", lambda route: route.abort())
-
-    # Disable tutorial by setting localStorage keys
-    # We use add_init_script so it runs before any script on the page
-    page.add_init_script("""
-        window.localStorage.setItem('swse_tutorial_completed', 'true');
-        window.localStorage.setItem('swse_tutorial_part1_completed', 'true');
-    """)
+def pytest_configure(config):
+    config.addinivalue_line("markers", "seed_ship(chassis_id, template=None): start the UI with this stock build loaded")
+
+# CDN assets (Vue, Quasar, Pinia, fonts, ...) are fetched once and then served
+# from disk, shared by every xdist worker and kept between runs.
+ASSET_CACHE_DIR = os.environ.get("UI_ASSET_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".asset-cache"))
+CACHED_HOSTS = re.compile(r"^https://(cdn\.jsdelivr\.net|cdnjs\.cloudflare\.com|fonts\.googleapis\.com|fonts\.gstatic\.com)/")
+# The guided tour is never wanted in tests
+BLOCKED = re.compile(r"driver\.js")
+# Serve this data.json (e.g. from synth_data.py) instead of the app's own; the bundle is skipped so it gets loaded
+UI_DATA_FILE = os.environ.get("UI_DATA_FILE")
+
+class AssetCache:
+    def __init__(self, directory):
+        self.directory = directory
+        self.memory = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def get(self, url):
+        if url not in self.memory:
+            try:
+                with open(self._path(url) + ".json", encoding="utf-8") as f:
+                    headers = json.load(f)
+                with open(self._path(url), "rb") as f:
+                    self.memory[url] = (headers, f.read())
+            except (OSError, ValueError):
+                return None
+        return self.memory[url]
+
+    def put(self, url, headers, body):
+        path = self._path(url)
+        for target, payload in ((path, body), (path + ".json", json.dumps(headers).encode("utf-8"))):
+            tmp = f"{target}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, target)
+        self.memory[url] = (headers, body)
+
+    def handle(self, route):
+        url = route.request.url
+        cached = self.get(url)
+        if cached is None:
+            response = route.fetch()
+            if response.status != 200:
+                route.fulfill(response=response)
+                return
+            headers = {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "access-control-allow-origin")}
+            cached = (headers, response.body())
+            self.put(url, *cached)
+        route.fulfill(status=200, headers=cached[0], body=cached[1])
+
+@pytest.fixture(scope="session")
+def asset_cache():
+    return AssetCache(ASSET_CACHE_DIR)
+
+SEED_SCRIPT = """
+(() => {
+    // Once per tab: later navigations in the same test keep their state
+    if (location.protocol === 'about:' || sessionStorage.getItem('swse_test_seeded')) return;
+    sessionStorage.setItem('swse_test_seeded', 'true');
+    localStorage.clear();
+    localStorage.setItem('swse_tutorial_completed', 'true');
+    localStorage.setItem('swse_tutorial_part1_completed', 'true');
+    const build = %s;
+    if (build) localStorage.setItem('swse_architect_current_build', JSON.stringify(build));
+})();
+"""
+
+def seed_build(chassis_id, template=None):
+    """Saved state of a stock build, exactly as the app writes it to localStorage."""
+    from ship_engine import ShipEngine
+
+    engine = ShipEngine.load(UI_DATA_FILE or os.path.join(REPO_ROOT, "public", "swse", "data.json"))
+    return engine.new_ship(chassis_id, template, name=engine.ships[chassis_id]["name"])
+
+@pytest.fixture(scope="session")
+def shared_context(browser, browser_context_args, asset_cache):
+    """One browser context per worker, routes installed and the asset cache warmed once."""
+    context = browser.new_context(**browser_context_args)
+    context.route(BLOCKED, lambda route: route.abort())
+    context.route(CACHED_HOSTS, asset_cache.handle)
+    if UI_DATA_FILE:
+        context.route("**/swse/bundle/manifest.json", lambda route: route.fulfill(status=404))
+        context.route("**/swse/data.json", lambda route: route.fulfill(path=UI_DATA_FILE, content_type="application/json"))
+    if browser_context_args.get("base_url"):
+        warm = context.new_page()
+        warm.goto("/swse/")
+        warm.wait_for_selector("#q-app", state="visible", timeout=60000)
+        warm.close()
+    yield context
+    context.close()
+
+@pytest.fixture
+def page(shared_context, request):
+    """A fresh tab in the shared context with clean localStorage.
+
+    Tests marked @pytest.mark.seed_ship("light_fighter") start with that
+    stock build already loaded instead of walking through the hangar.
+    """
+    marker = request.node.get_closest_marker("seed_ship")
+    build = seed_build(*marker.args, **marker.kwargs) if marker else None
+    page = shared_context.new_page()
+    page.add_init_script(SEED_SCRIPT % json.dumps(build))
+    yield page
+    page.close()
+
+class StubWiki:
+    """Local stand-in for swse.miraheze.org, served from a background thread."""
+
+    def __init__(self):
+        self.pages = {}
+        self.head_not_allowed = set()
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _respond(self, send_body):
+                with stub._lock:
+                    stub.requests.append((self.command, self.path, dict(self.headers)))
+                if self.command == "HEAD" and self.path in stub.head_not_allowed:
+                    self.send_response(405)
+                    self.end_headers()
+                    return
+                body = stub.pages.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                payload = body.encode("utf-8")
+                etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(payload)
+
+            def do_HEAD(self):
+                self._respond(False)
+
+            def do_GET(self):
+                self._respond(True)
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path):
+        return f"{self.base_url}{path}"
+
+    def hits(self, path):
+        with self._lock:
+            return sum(1 for _, p, _ in self.requests if p == path)
+
+@pytest.fixture
+def stub_wiki():
+    stub = StubWiki()
+    stub._thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
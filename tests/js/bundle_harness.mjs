@@ -0,0 +1,18 @@
+// Runs the decoder in public/swse/js/bundle.js outside the browser.
+//
+// Reads {"core": <core bundle file>, "parts": [<part file>, ...]} on stdin and
+// writes the decoded data, with every part merged in, to stdout.
+import { readFileSync } from 'node:fs';
+import { fileURLToPath } from 'node:url';
+import path from 'node:path';
+
+const here = path.dirname(fileURLToPath(import.meta.url));
+const repoRoot = process.env.REPO_ROOT || path.resolve(here, '..', '..');
+const bundleSource = readFileSync(path.join(repoRoot, 'public', 'swse', 'js', 'bundle.js'), 'utf8');
+
+const { decodeCore, mergePart } = await import('data:text/javascript;base64,' + Buffer.from(bundleSource).toString('base64'));
+
+const input = JSON.parse(readFileSync(0, 'utf8'));
+const data = decodeCore(input.core);
+input.parts.forEach(part => mergePart(data, part));
+process.stdout.write(JSON.stringify(data));
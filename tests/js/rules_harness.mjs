@@ -0,0 +1,29 @@
+// Evaluates store.js rule functions for many cases with one store instance,
+// for the table-driven tests in tests/test_rules.py.
+//
+// Reads {"data": <data.json>, "cases": [...]} on stdin and writes one result
+// per case to stdout. Each case sets the chassis and installed components,
+// then reads a single rule:
+//   {"rule": "ep", "chassis": id, "args": {<calculateEp arguments>}}
+//   {"rule": "consumables", "chassis": id, "extendedRange": n}
+import { readInput, useShipStore } from './store_shim.mjs';
+
+const input = readInput();
+const store = useShipStore();
+store.initDb(input.data);
+
+const results = input.cases.map((c) => {
+    store.chassisId.value = c.chassis;
+    if (c.rule === 'ep') {
+        store.installedComponents.value = [];
+        return store.calculateEp(c.args);
+    }
+    if (c.rule === 'consumables') {
+        store.installedComponents.value = c.extendedRange
+            ? [{ instanceId: 'er', defId: 'extended_range', modifications: { quantity: c.extendedRange } }]
+            : [];
+        return store.currentConsumables.value;
+    }
+    throw new Error(`Unknown rule: ${c.rule}`);
+});
+process.stdout.write(JSON.stringify(results));
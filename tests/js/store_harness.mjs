@@ -0,0 +1,38 @@
+// Runs public/swse/js/store.js outside the browser for parity tests.
+//
+// Reads {"data": <data.json>, "states": [<saved ship state>, ...]} on stdin and
+// writes one summary per state (same keys as ShipEngine.evaluate) to stdout.
+import { readInput, useShipStore } from './store_shim.mjs';
+
+const input = readInput();
+const results = input.states.map((state) => {
+    const store = useShipStore();
+    store.initDb(structuredClone(input.data));
+    store.loadState(structuredClone(state));
+    return {
+        chassis: store.chassis.value.id ?? null,
+        template: store.activeTemplate.value ?? null,
+        total_cost: store.totalCost.value,
+        hull_cost: store.hullCost.value,
+        components_cost: store.componentsCost.value,
+        licensing_cost: store.licensingCost.value,
+        total_ep: store.totalEP.value,
+        used_ep: store.usedEP.value,
+        remaining_ep: store.remainingEP.value,
+        availability: store.shipAvailability.value,
+        reflex_defense: store.reflexDefense.value,
+        damage_threshold: store.damageThreshold.value,
+        max_cargo_capacity: store.maxCargoCapacity.value,
+        current_crew: store.currentCrew.value,
+        current_passengers: store.currentPassengers.value,
+        current_consumables: store.currentConsumables.value,
+        current_stats: store.currentStats.value,
+        components: store.installedComponents.value.map((instance) => ({
+            defId: instance.defId,
+            cost: store.getComponentCost(instance),
+            ep: store.getComponentEp(instance),
+            damage: store.getComponentDamage(instance),
+        })),
+    };
+});
+process.stdout.write(JSON.stringify(results));
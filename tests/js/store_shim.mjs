@@ -0,0 +1,30 @@
+// Loads public/swse/js/store.js outside the browser for the node harnesses.
+// Vue/Pinia are replaced with minimal non-reactive shims: refs are plain
+// boxes and computeds re-evaluate on every read.
+import { readFileSync } from 'node:fs';
+import { fileURLToPath } from 'node:url';
+import path from 'node:path';
+
+const here = path.dirname(fileURLToPath(import.meta.url));
+const repoRoot = process.env.REPO_ROOT || path.resolve(here, '..', '..');
+const storeSource = readFileSync(path.join(repoRoot, 'public', 'swse', 'js', 'store.js'), 'utf8');
+
+globalThis.window = { location: { search: '' } };
+const storage = new Map();
+globalThis.localStorage = {
+    getItem: (k) => (storage.has(k) ? storage.get(k) : null),
+    setItem: (k, v) => storage.set(k, String(v)),
+    removeItem: (k) => storage.delete(k),
+    clear: () => storage.clear(),
+};
+globalThis.Vue = {
+    reactive: (obj) => obj,
+    ref: (value) => ({ value }),
+    computed: (fn) => ({ get value() { return fn(); } }),
+    watch: () => {},
+};
+globalThis.Pinia = { defineStore: (id, setup) => () => setup() };
+
+export const { useShipStore } = await import('data:text/javascript;base64,' + Buffer.from(storeSource).toString('base64'));
+
+export const readInput = () => JSON.parse(readFileSync(0, 'utf8'));
@@ -0,0 +1,284 @@
+"""Load generator for the resources API.
+
+Seeds users, resources and shares through the same request shapes the
+integration tests use, then drives a weighted mix of list (first page) /
+walk (every page) / get / put / share calls from concurrent asyncio
+workers and prints latency percentiles and throughput per endpoint.
+
+    docker compose --profile load run --rm load
+    python tests/load_test.py --base-url http://localhost:8787 --users 20 \\
+        --resources 200 --shares 100 --mix list=55,walk=5,get=25,put=10,share=5 --duration 30
+
+By default every resource gets a tiny placeholder body. --payloads seeds
+them from an NDJSON file written by `synth_data.py resources`, so lists,
+gets and puts move realistic library, hangar and ship documents.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from paging import aiter_pages  # noqa: E402
+from test_integration import BASE_URL, RESOURCE_TYPES, create_user  # noqa: E402
+
+DEFAULT_MIX = 'list=55,walk=5,get=25,put=10,share=5'
+PERCENTILES = (50, 95, 99)
+WALK_PAGE_SIZE = 50
+
+
+def parse_mix(text):
+    """'list=60,get=25' -> {'list': 60.0, 'get': 25.0}"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation '{name}' (expected one of {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("mix needs at least one positive weight")
+    return mix
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, endpoint, seconds, ok):
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, elapsed):
+        rows = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            row = {'requests': len(values), 'errors': self.errors.get(endpoint, 0),
+                   'throughput': len(values) / elapsed if elapsed else 0.0}
+            for p in PERCENTILES:
+                row[f"p{p}_ms"] = percentile(values, p) * 1000
+            rows[endpoint] = row
+        return rows
+
+
+def load_payloads(path):
+    """[(type, data)] from an NDJSON resource file (synth_data.py resources, bulk_resources.py export)."""
+    payloads = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                payloads.append((record['type'], record['data']))
+    if not payloads:
+        raise ValueError(f"{path} has no resources")
+    return payloads
+
+
+def seed(base_url, users, resources, shares, concurrency, rng, payloads=None):
+    """Create the data set with plain blocking calls; returns (users, resources).
+
+    Resource i is payloads[i] (cycling), or a placeholder of each RESOURCE_TYPES in turn.
+    """
+    payloads = payloads or RESOURCE_TYPES
+    with httpx.Client(base_url=base_url, timeout=30.0,
+                      limits=httpx.Limits(max_connections=concurrency)) as client:
+        with ThreadPoolExecutor(concurrency) as pool:
+            seeded = list(pool.map(lambda i: create_user(client, name=f"Load User {i}", namespace='load'),
+                                   range(users)))
+
+            def create(i):
+                resource_type, data = payloads[i % len(payloads)]
+                owner = seeded[i % len(seeded)]
+                resp = client.post(f"/{resource_type}", json={
+                    "name": f"Load {resource_type} {i}",
+                    "data": data,
+                    "visibility": "private"
+                }, headers=owner["headers"])
+                resp.raise_for_status()
+                return {'type': resource_type, 'id': resp.json()["id"], 'owner': owner, 'data': data}
+
+            created = list(pool.map(create, range(resources)))
+
+            def share(pair):
+                resource, grantee = pair
+                resp = client.patch(f"/{resource['type']}/{resource['id']}/share", json={
+                    "grantee_id": grantee["id"],
+                    "grantee_type": "user",
+                    "access_level": "read"
+                }, headers=resource['owner']["headers"])
+                resp.raise_for_status()
+
+            if len(seeded) > 1 and created:
+                # Draw on this thread so --seed picks the same pairs however the pool schedules
+                pairs = []
+                for _ in range(shares):
+                    resource = rng.choice(created)
+                    pairs.append((resource, rng.choice([u for u in seeded if u is not resource['owner']])))
+                list(pool.map(share, pairs))
+    return seeded, created
+
+
+# Each operation returns (endpoint label, awaitable response, expected status)
+
+def op_list(client, users, resources, rng):
+    resource_type, _ = rng.choice(RESOURCE_TYPES)
+    user = rng.choice(users)
+    return 'GET /{type}', client.get(f"/{resource_type}", headers=user["headers"]), 200
+
+
+def op_walk(client, users, resources, rng):
+    """Every page of a listing, ids and names only; timed as one call."""
+    resource_type, _ = rng.choice(RESOURCE_TYPES)
+    user = rng.choice(users)
+
+    async def walk():
+        async for resp in aiter_pages(client, resource_type, user["headers"], limit=WALK_PAGE_SIZE, fields="id,name"):
+            pass
+        return resp
+    return 'GET /{type} (all pages)', walk(), 200
+
+
+def op_get(client, users, resources, rng):
+    resource = rng.choice(resources)
+    return 'GET /{type}/{id}', client.get(f"/{resource['type']}/{resource['id']}",
+                                          headers=resource['owner']["headers"]), 200
+
+
+def op_put(client, users, resources, rng):
+    resource = rng.choice(resources)
+    return 'PUT /{type}/{id}', client.put(f"/{resource['type']}/{resource['id']}", json={
+        "name": f"Load {resource['type']} {rng.randrange(1 << 30)}",
+        "data": resource['data'],
+        "visibility": "private"
+    }, headers=resource['owner']["headers"]), 200
+
+
+def op_share(client, users, resources, rng):
+    resource = rng.choice(resources)
+    grantee = rng.choice(users)
+    return 'PATCH /{type}/{id}/share', client.patch(f"/{resource['type']}/{resource['id']}/share", json={
+        "grantee_id": grantee["id"],
+        "grantee_type": "user",
+        "access_level": rng.choice(["read", "write"])
+    }, headers=resource['owner']["headers"]), 200
+
+
+OPERATIONS = {
+    'list': op_list,
+    'walk': op_walk,
+    'get': op_get,
+    'put': op_put,
+    'share': op_share,
+}
+
+
+async def drive(base_url, users, resources, mix, concurrency, duration=None, requests=None, seed=0):
+    """Run the mix until duration seconds pass or requests calls were made; returns (Stats, elapsed)."""
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    stats = Stats()
+    remaining = [requests]
+    deadline = time.perf_counter() + duration if duration else None
+
+    def more():
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if remaining[0] is not None:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+        return True
+
+    async def worker(rng):
+        while more():
+            op = OPERATIONS[rng.choices(names, weights)[0]]
+            endpoint, call, expected = op(client, users, resources, rng)
+            start = time.perf_counter()
+            try:
+                resp = await call
+                ok = resp.status_code == expected
+            except httpx.HTTPError:
+                ok = False
+            stats.record(endpoint, time.perf_counter() - start, ok)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(random.Random(seed * 1000 + i)) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return stats, elapsed
+
+
+def print_summary(rows, elapsed):
+    header = f"{'endpoint':<26} {'requests':>9} {'errors':>7} {'req/s':>9}" + ''.join(f" {f'p{p} ms':>9}" for p in PERCENTILES)
+    print(header)
+    print('-' * len(header))
+    for endpoint, row in rows.items():
+        print(f"{endpoint:<26} {row['requests']:>9} {row['errors']:>7} {row['throughput']:>9.1f}"
+              + ''.join(f" {row[f'p{p}_ms']:>9.1f}" for p in PERCENTILES))
+    total = sum(row['requests'] for row in rows.values())
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} req/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the resources API.")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--users', type=int, default=20, help="Users to seed (N)")
+    parser.add_argument('--resources', type=int, default=200, help="Resources to seed (M)")
+    parser.add_argument('--shares', type=int, default=100, help="Read shares to seed (K)")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="Weighted operations, e.g. %(default)s")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds to run (ignored with --requests)")
+    parser.add_argument('--requests', type=int, help="Stop after this many calls instead of a duration")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--payloads', help="NDJSON resources to seed from (synth_data.py resources)")
+    parser.add_argument('--json', help="Also write the per-endpoint summary to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.users < 1 or args.resources < 1:
+        parser.error("--users and --resources must be at least 1")
+    try:
+        payloads = load_payloads(args.payloads) if args.payloads else None
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f"--payloads: {e}")
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    users, resources = seed(args.base_url, args.users, args.resources, args.shares, args.concurrency, rng, payloads)
+    print(f"Seeded {len(users)} users, {len(resources)} resources, {args.shares} shares "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    stats, elapsed = asyncio.run(drive(args.base_url, users, resources, mix, args.concurrency,
+                                       duration=None if args.requests else args.duration,
+                                       requests=args.requests, seed=args.seed))
+    rows = stats.summary(elapsed)
+    print_summary(rows, elapsed)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'elapsed': elapsed, 'mix': mix, 'concurrency': args.concurrency, 'endpoints': rows}, f, indent=2)
+    return 1 if any(row['errors'] for row in rows.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Lazy iteration over the cursor-paginated list endpoints.
+
+Each list response is one page; X-Next-Cursor (also in the Link header)
+names the next one and is absent on the last. These helpers follow it on
+demand, so a caller that stops early never fetches the remaining pages.
+
+    for ship in iter_resources(client, "ships", headers=user["headers"], fields="id,name"):
+        ...
+"""
+
+def page_params(limit=None, fields=None, cursor=None):
+    params = {}
+    if limit:
+        params["limit"] = limit
+    if fields:
+        params["fields"] = fields if isinstance(fields, str) else ",".join(fields)
+    if cursor:
+        params["cursor"] = cursor
+    return params
+
+
+def iter_pages(client, resource_type, headers=None, limit=None, fields=None):
+    """Yield each page's response from an httpx.Client, following cursors until the last page."""
+    cursor = None
+    while True:
+        resp = client.get(f"/{resource_type}", params=page_params(limit, fields, cursor), headers=headers)
+        resp.raise_for_status()
+        yield resp
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            return
+
+
+def iter_resources(client, resource_type, headers=None, limit=None, fields=None):
+    """Yield resources one at a time across all pages."""
+    for resp in iter_pages(client, resource_type, headers, limit, fields):
+        yield from resp.json()
+
+
+async def aiter_pages(client, resource_type, headers=None, limit=None, fields=None):
+    """iter_pages for an httpx.AsyncClient."""
+    cursor = None
+    while True:
+        resp = await client.get(f"/{resource_type}", params=page_params(limit, fields, cursor), headers=headers)
+        resp.raise_for_status()
+        yield resp
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            return
+
+
+async def aiter_resources(client, resource_type, headers=None, limit=None, fields=None):
+    async for resp in aiter_pages(client, resource_type, headers, limit, fields):
+        for resource in resp.json():
+            yield resource
@@ -0,0 +1,139 @@
+"""Wait until HTTP services are up.
+
+Each service is probed concurrently over one keep-alive client. Retries
+back off exponentially with jitter, starting fast (50 ms) so a service
+that is already up costs a single request. A slow one is polled at most
+every couple of seconds. The result is how long each service took to
+answer.
+
+    python readiness.py                                   backend, static site and nginx proxy from the env
+    python readiness.py backend=http://localhost:8787/health site=http://localhost/swse/ --timeout 60
+
+From Python (conftest.py fixtures, scripts):
+
+    timings = wait_until_ready([Probe('backend', 'http://backend:8787/health')], timeout=30)
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+import httpx
+
+BASE_URL = os.environ.get("BASE_URL", "http://backend:8787")
+FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://frontend")
+
+
+class Probe:
+    def __init__(self, name, url, status=200):
+        self.name = name
+        self.url = url
+        self.status = status
+
+    def __repr__(self):
+        return f"Probe({self.name!r}, {self.url!r})"
+
+
+class NotReady(Exception):
+    """Raised when some services are still down at the deadline; .timings has the ones that came up."""
+
+    def __init__(self, failures, timings):
+        self.failures = failures
+        self.timings = timings
+        super().__init__("; ".join(f"{name}: {reason}" for name, reason in failures.items()))
+
+
+def default_probes():
+    return [
+        Probe("backend", f"{BASE_URL}/health"),
+        Probe("site", f"{FRONTEND_URL}/swse/"),
+        Probe("nginx", f"{FRONTEND_URL}/health"),
+    ]
+
+
+def backoff_delays(initial=0.05, factor=2.0, maximum=2.0, rng=random):
+    """Exponential delays with "equal jitter": each is in [d/2, d] for the capped d."""
+    delay = initial
+    while True:
+        yield delay / 2 + rng.uniform(0, delay / 2)
+        delay = min(maximum, delay * factor)
+
+
+async def _probe(client, probe, deadline, rng, log):
+    start = time.perf_counter()
+    last = "no response"
+    attempts = 0
+    for delay in backoff_delays(rng=rng):
+        attempts += 1
+        try:
+            resp = await client.get(probe.url, timeout=max(0.1, min(5.0, deadline - time.perf_counter())))
+            if resp.status_code == probe.status:
+                elapsed = time.perf_counter() - start
+                log(f"{probe.name} ready after {elapsed:.2f}s ({attempts} attempt(s))")
+                return elapsed
+            last = f"HTTP {resp.status_code}"
+        except httpx.HTTPError as e:
+            last = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise TimeoutError(f"{last} after {attempts} attempt(s)")
+        await asyncio.sleep(min(delay, remaining))
+
+
+async def wait_ready(probes, timeout=120.0, log=None, rng=None):
+    """Probe every service concurrently; return {name: seconds until ready}.
+
+    Raises NotReady naming each service that never answered with its
+    expected status, and the last error seen for it.
+    """
+    log = log or (lambda message: None)
+    rng = rng or random.Random()
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=len(probes) or 1)) as client:
+        results = await asyncio.gather(*(_probe(client, p, deadline, rng, log) for p in probes), return_exceptions=True)
+
+    timings, failures = {}, {}
+    for probe, result in zip(probes, results):
+        if isinstance(result, BaseException):
+            failures[probe.name] = str(result) or type(result).__name__
+        else:
+            timings[probe.name] = result
+    if failures:
+        raise NotReady(failures, timings)
+    return timings
+
+
+def wait_until_ready(probes, timeout=120.0, log=None):
+    """Blocking wrapper around wait_ready for fixtures and scripts."""
+    return asyncio.run(wait_ready(probes, timeout, log))
+
+
+def parse_probe(text):
+    name, sep, url = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected name=url, got '{text}'")
+    return Probe(name, url)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wait until HTTP services respond.")
+    parser.add_argument("probes", nargs="*", type=parse_probe, help="name=url (default: backend, site and nginx)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args(argv)
+
+    probes = args.probes or default_probes()
+    print(f"Waiting for {', '.join(f'{p.name} ({p.url})' for p in probes)}...")
+    try:
+        timings = wait_until_ready(probes, args.timeout, log=print)
+    except NotReady as e:
+        for name, reason in e.failures.items():
+            print(f"{name} not ready after {args.timeout:.0f}s: {reason}")
+        return 1
+    print(f"All services ready in {max(timings.values(), default=0):.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="module")
+def bench():
+    spec = importlib.util.spec_from_file_location("bench_run", os.path.join(REPO_ROOT, "benchmarks", "run.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_compare_flags_only_regressions_past_threshold(bench):
+    rows = bench.compare({"engine.a": 12.0, "engine.b": 13.0, "report.incremental": 14.0, "new": 1.0},
+                         {"engine.a": 10.0, "engine.b": 10.0, "report.incremental": 10.0}, 0.25)
+
+    assert [(metric, regressed) for metric, _, _, _, regressed in rows] == [
+        ("engine.a", False), ("engine.b", True), ("new", False), ("report.incremental", False),
+    ]
+
+def test_compare_ignores_small_absolute_changes(bench):
+    rows = bench.compare({"data.parse": 1.6, "engine.a": 3.0}, {"data.parse": 0.8, "engine.a": 1.5}, 0.25)
+
+    # +100% on both, but only engine.a slowed down by more than the 1 ms floor
+    assert [(metric, regressed) for metric, _, _, _, regressed in rows] == [("data.parse", False), ("engine.a", True)]
+    assert not bench.compare({"engine.a": 3.0}, {"engine.a": 1.5}, 0.25, min_delta=2.0)[0][4]
+
+def test_update_then_compare(bench, tmp_path, monkeypatch):
+    baseline = str(tmp_path / "baselines.json")
+    monkeypatch.setitem(bench.BENCHMARKS, "fake", lambda args: {"fake.metric": fake_time[0]})
+    fake_time = [10.0]
+
+    assert bench.main(["--only", "fake", "--baseline", baseline, "--update"]) == 0
+    with open(baseline) as f:
+        assert json.load(f)["metrics"] == {"fake.metric": 10.0}
+    assert bench.main(["--only", "fake", "--baseline", baseline]) == 0
+
+    fake_time[0] = 20.0
+    assert bench.main(["--only", "fake", "--baseline", baseline, "--strict"]) == 1
+    # Without --strict a regression is only reported
+    assert bench.main(["--only", "fake", "--baseline", baseline]) == 0
+
+def test_regressions_are_measured_again(bench, tmp_path, monkeypatch, capsys):
+    baseline = str(tmp_path / "baselines.json")
+    with open(baseline, "w") as f:
+        json.dump({"machine": None, "metrics": {"fake.metric": 10.0}}, f)
+    runs = iter([20.0, 10.5])
+    monkeypatch.setitem(bench.BENCHMARKS, "fake", lambda args: {"fake.metric": next(runs)})
+
+    # A one-off slow run is re-measured and the faster figure is kept
+    assert bench.main(["--only", "fake", "--baseline", baseline, "--strict"]) == 0
+    assert "REGRESSION" not in capsys.readouterr().out
@@ -0,0 +1,71 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import build_bundle
+
+HARNESS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js", "bundle_harness.mjs")
+
+@pytest.fixture(scope="module")
+def data():
+    with open(build_bundle.DATA_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def test_round_trip(data):
+    core, parts = build_bundle.split_data(data)
+
+    assert "name_es" not in json.dumps(core)
+    assert "description" not in json.dumps(core["EQUIPMENT"])
+    decoded = build_bundle.decode_core(core)
+    for part in parts.values():
+        build_bundle.merge_part(decoded, part)
+    assert decoded == data
+
+def test_build_writes_hashed_files(tmp_path, data):
+    out = tmp_path / "bundle"
+    manifest = build_bundle.build(build_bundle.DATA_FILE, str(out))
+
+    assert sorted(os.listdir(out)) == sorted(["manifest.json", manifest["core"], *manifest["parts"].values()])
+    for filename in [manifest["core"], *manifest["parts"].values()]:
+        raw = (out / filename).read_bytes()
+        assert filename.split(".")[-2] == build_bundle.content_hash(raw)
+    assert build_bundle.decode_core(read_json(out / manifest["core"]))["SIZE_RANK"] == data["SIZE_RANK"]
+
+def test_rebuild_replaces_only_changed_parts(tmp_path, data):
+    out = tmp_path / "bundle"
+    source = tmp_path / "data.json"
+    source.write_text(json.dumps(data))
+    first = build_bundle.build(str(source), str(out))
+
+    data["EQUIPMENT"][0]["description"] = "Changed"
+    source.write_text(json.dumps(data))
+    second = build_bundle.build(str(source), str(out))
+
+    assert second["core"] == first["core"]
+    assert second["parts"]["names.es"] == first["parts"]["names.es"]
+    assert second["parts"]["descriptions"] != first["parts"]["descriptions"]
+    assert first["parts"]["descriptions"] not in os.listdir(out)
+
+def test_local_edits_win_over_lazy_parts(data):
+    core, parts = build_bundle.split_data(data)
+    decoded = build_bundle.decode_core(core)
+    decoded["EQUIPMENT"][0]["description"] = "Edited before the part loaded"
+
+    build_bundle.merge_part(decoded, parts["descriptions"])
+
+    assert decoded["EQUIPMENT"][0]["description"] == "Edited before the part loaded"
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is required to run bundle.js")
+def test_js_decoder_matches(data):
+    core, parts = build_bundle.split_data(data)
+    payload = json.dumps({"core": core, "parts": list(parts.values())})
+    proc = subprocess.run(["node", HARNESS], input=payload, capture_output=True, text=True, check=True)
+
+    assert json.loads(proc.stdout) == data
@@ -0,0 +1,205 @@
+import base64
+import http.server
+import io
+import json
+import threading
+import urllib.parse
+
+import pytest
+
+import bulk_resources
+from bulk_resources import ApiClient, Importer, export_resources, iter_json_array, iter_ndjson
+
+class StubResources:
+    """The resources API surface bulk_resources uses, in memory, with fault injection."""
+
+    def __init__(self, batch=True):
+        self.resources = {}
+        self.calls = []
+        self.batch = batch
+        self.fail_next = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=None, headers=None):
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _upsert(self, resource_type, item, create_only):
+                existing = stub.resources.get(item["id"])
+                if existing and create_only:
+                    return 409
+                stub.resources[item["id"]] = dict(item, type=resource_type)
+                return 200 if existing else 201
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                path, _, query = self.path.partition("?")
+                params = dict(urllib.parse.parse_qsl(query))
+                parts = path.strip("/").split("/")
+                with stub._lock:
+                    stub.calls.append((self.command, self.path))
+                    if stub.fail_next:
+                        stub.fail_next -= 1
+                        return self._reply(503, {})
+                    if self.command == "GET" and len(parts) == 1:
+                        limit = int(params.get("limit", 100))
+                        listed = sorted((r for r in stub.resources.values()
+                                         if r["type"] == parts[0] and r["id"] > params.get("cursor", "")),
+                                        key=lambda r: r["id"])
+                        if len(listed) > limit:
+                            listed = listed[:limit]
+                            return self._reply(200, listed, {"X-Next-Cursor": listed[-1]["id"]})
+                        return self._reply(200, listed)
+                    if self.command == "POST" and len(parts) == 1:
+                        status = self._upsert(parts[0], body, create_only=True)
+                        return self._reply(409 if status == 409 else 200, body)
+                    if self.command == "POST" and parts[1:] == ["batch"] and stub.batch:
+                        codes = [self._upsert(parts[0], item, create_only=False) for item in body["items"]]
+                        return self._reply(200, {"results": [
+                            {"id": item["id"], "status": "created" if code == 201 else "updated", "code": code}
+                            for item, code in zip(body["items"], codes)]})
+                    if self.command == "PUT" and len(parts) == 2 and parts[1] in stub.resources:
+                        self._upsert(parts[0], dict(body, id=parts[1]), create_only=False)
+                        return self._reply(200, body)
+                    return self._reply(404, {})
+
+            do_GET = do_POST = do_PUT = _handle
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def count(self, method, suffix=""):
+        return sum(1 for m, path in self.calls if m == method and path.endswith(suffix))
+
+@pytest.fixture
+def stub_resources():
+    stubs = []
+
+    def start(batch=True):
+        stub = StubResources(batch)
+        stub._thread.start()
+        stubs.append(stub)
+        return stub
+    yield start
+    for stub in stubs:
+        stub.server.shutdown()
+        stub.server.server_close()
+
+def ship(i):
+    return {"id": f"ship-{i}", "type": "ships", "name": f"Ship {i} — é", "visibility": "private",
+            "data": {"configuration": {"hull": "light_fighter"}, "manifest": [{"defId": "laser_light", "n": i}]}}
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 16])
+def test_iter_json_array_reads_incrementally(chunk_size):
+    items = [{"a": "x]y,\"z"}, [1, [2]], 12345, -0.5e3, "s", True, None, {}]
+    text = " [ " + " , ".join(json.dumps(i) for i in items) + " ] "
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == items
+    assert list(iter_json_array(io.StringIO("[]"), chunk_size)) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"a": 1}, '), chunk_size))
+
+def test_export_import_round_trip_is_idempotent(stub_resources, tmp_path):
+    source, target = stub_resources(), stub_resources()
+    source.resources = {r["id"]: r for r in map(ship, range(120))}
+
+    out = io.StringIO()
+    counts = export_resources(ApiClient(source.base_url), ["ships", "hangars"], out, page_size=50)
+    assert counts == {"ships": 120, "hangars": 0}
+    assert source.count("GET") == 4
+    lines = out.getvalue().splitlines()
+    assert json.loads(lines[0]) == ship(0)
+
+    importer = Importer(ApiClient(target.base_url))
+    stats = importer.run(iter_ndjson(io.StringIO(out.getvalue())), workers=4)
+    assert stats.counts == {"created": 120, "updated": 0, "failed": 0}
+    assert target.resources == source.resources
+
+    # Running it again updates in place instead of duplicating
+    stats = Importer(ApiClient(target.base_url)).run(iter_ndjson(io.StringIO(out.getvalue())), workers=4)
+    assert stats.counts == {"created": 0, "updated": 120, "failed": 0}
+    assert len(target.resources) == 120
+
+def test_lines_without_ids_get_stable_ids(stub_resources):
+    target = stub_resources()
+    record = {"type": "ships", "name": "Nameless", "data": {"configuration": {}, "manifest": []}}
+    text = json.dumps(record) + "\n\n" + json.dumps(record) + "\n"
+
+    stats = Importer(ApiClient(target.base_url)).run(iter_ndjson(io.StringIO(text)), workers=1)
+
+    assert stats.counts == {"created": 1, "updated": 1, "failed": 0}
+    assert list(target.resources) == [bulk_resources.record_id(record)]
+
+def test_derived_ids_are_per_account():
+    record = {"type": "ships", "name": "Nameless", "data": {"configuration": {}, "manifest": []}}
+    claims = base64.urlsafe_b64encode(json.dumps({"sub": "alice"}).encode()).decode().rstrip("=")
+
+    assert bulk_resources.token_subject(f"header.{claims}.signature") == "alice"
+    assert bulk_resources.token_subject("not-a-jwt") is None
+    assert bulk_resources.record_id(record, "alice") == bulk_resources.record_id(dict(record), "alice")
+    assert bulk_resources.record_id(record, "alice") != bulk_resources.record_id(record, "bob")
+    # An exported ID is kept, unless a copy is asked for
+    assert bulk_resources.record_id(ship(1), "bob") == "ship-1"
+    copies = {bulk_resources.record_id(ship(i), owner, new_ids=True) for i in (1, 2) for owner in ("alice", "bob")}
+    assert len(copies) == 4 and "ship-1" not in copies
+
+def test_new_ids_import_a_copy(stub_resources):
+    target = stub_resources()
+    target.resources = {r["id"]: r for r in map(ship, range(3))}
+    records = [(i, ship(i)) for i in range(3)]
+
+    for outcome in ("created", "updated"):
+        stats = Importer(ApiClient(target.base_url), owner="bob", new_ids=True).run(iter(records), workers=1)
+        assert stats.counts[outcome] == 3
+    assert len(target.resources) == 6
+
+def test_batches_cut_round_trips(stub_resources):
+    target = stub_resources()
+    records = [(i, ship(i)) for i in range(250)] + [(250, {"id": "h1", "type": "hangars", "data": {"ships": []}})]
+
+    stats = Importer(ApiClient(target.base_url), batch_size=100).run(iter(records), workers=2)
+
+    assert stats.counts["created"] == 251
+    assert target.count("POST", "/ships/batch") == 3
+    assert target.count("POST", "/hangars/batch") == 1
+    assert len(target.calls) == 4
+
+def test_falls_back_without_batch_endpoint(stub_resources):
+    target = stub_resources(batch=False)
+    records = [(i, ship(i)) for i in range(10)]
+
+    stats = Importer(ApiClient(target.base_url), batch_size=5).run(iter(records), workers=1)
+
+    assert stats.counts["created"] == 10
+    # One probe of the missing endpoint per type, then single requests
+    assert target.count("POST", "/ships/batch") == 1
+    assert target.count("POST", "/ships") == 10
+
+def test_retries_transient_errors(stub_resources):
+    target = stub_resources()
+    target.fail_next = 2
+    importer = Importer(ApiClient(target.base_url), retries=3, backoff=0.001)
+
+    stats = importer.run(iter([(1, ship(1))]), workers=1)
+
+    assert stats.counts["created"] == 1
+    assert stats.requests == 3
+
+    target.fail_next = 5
+    stats = Importer(ApiClient(target.base_url), retries=1, backoff=0.001).run(iter([(1, ship(2))]), workers=1)
+    assert stats.counts["failed"] == 1
+    assert stats.failures[0][2].startswith("HTTP 503")
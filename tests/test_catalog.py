@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from catalog import Catalog, CompactCatalog, Component
+
+EQUIPMENT = [
+    {"id": "shield_a", "name": "Shield A", "category": "Defense Systems", "group": "Shields", "exclusiveGroup": "shield"},
+    {"id": "shield_b", "name": "Shield B", "category": "Defense Systems", "group": "Shields", "exclusiveGroup": "shield"},
+    {"id": "armor_1", "name": "Armor", "category": "Defense Systems", "group": "Armor"},
+    {"id": "laser", "name": "Laser", "category": "Weapon Systems", "group": "Lasers"},
+]
+
+@pytest.mark.parametrize("cls", [Catalog, CompactCatalog])
+def test_indexes(cls):
+    catalog = cls(EQUIPMENT)
+
+    assert len(catalog) == 4
+    assert catalog.get("laser")["name"] == "Laser"
+    assert catalog.get("missing") is None
+    assert [i["id"] for i in catalog.items_in("Defense Systems", "Shields")] == ["shield_a", "shield_b"]
+    assert [i["id"] for i in catalog.items_in("Defense Systems")] == ["shield_a", "shield_b", "armor_1"]
+    assert [i["id"] for i in catalog.exclusive_with("shield_a")] == ["shield_b"]
+    assert catalog.exclusive_with("laser") == []
+
+@pytest.mark.parametrize("cls", [Catalog, CompactCatalog])
+def test_library_overrides_keep_position(cls):
+    library = {"active": True, "components": [
+        {"id": "shield_a", "name": "Custom Shield", "category": "Defense Systems", "group": "Shields"},
+        {"id": "custom_gun", "name": "Gun", "category": "Weapon Systems", "group": "Lasers"},
+    ]}
+    inactive = {"active": False, "components": [{"id": "laser", "name": "Ignored"}]}
+    catalog = cls.from_data({"EQUIPMENT": EQUIPMENT}, [library, inactive])
+
+    assert list(catalog.by_id) == ["shield_a", "shield_b", "armor_1", "laser", "custom_gun"]
+    assert catalog.get("shield_a")["name"] == "Custom Shield"
+    assert catalog.get("laser")["name"] == "Laser"
+    # The override has no exclusiveGroup any more
+    assert [i["id"] for i in catalog.exclusive_groups["shield"]] == ["shield_b"]
+
+def test_load_is_cached_per_version(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"EQUIPMENT": EQUIPMENT}))
+    first = Catalog.load(str(path))
+
+    assert Catalog.load(str(path)) is first
+
+    path.write_text(json.dumps({"EQUIPMENT": EQUIPMENT[:2]}))
+    second = Catalog.load(str(path))
+
+    assert second is not first
+    assert second.version != first.version
+    assert len(second) == 2
+    compact = CompactCatalog.load(str(path))
+    assert isinstance(compact, CompactCatalog) and compact.version == second.version
+
+def test_compact_items_read_like_dicts():
+    data = json.loads(open("public/swse/data.json", encoding="utf-8").read())
+    compact = CompactCatalog.from_data(data)
+
+    for item in data["EQUIPMENT"]:
+        component = compact.get(item["id"])
+        assert isinstance(component, Component)
+        assert component.to_dict() == item
+        assert component.get("baseCost") == item["baseCost"]
+        assert ("upgradeSpecs" in component) == ("upgradeSpecs" in item)
+        assert component.get("payload", "none") == item.get("payload", "none")
+    with pytest.raises(KeyError):
+        compact.get("laser_light")["no_such_key"]
+
+def test_compact_storage():
+    items = [dict(EQUIPMENT[i], category="".join(["Defense ", "Systems"]) if i < 3 else "Weapon Systems",
+                  baseCost=1000.5 * i, baseEp=i, stats={"sr": 10}, description="ü" * i or None)
+             for i in range(4)]
+    compact = CompactCatalog(items)
+    a, b, _, laser = compact
+
+    # Interned strings and equal nested values are stored once
+    assert a.category is b.category
+    assert a.stats is laser.stats
+    assert len(compact.costs) == len(compact.eps) == 4
+    assert (a.base_cost, b.base_cost, b.base_ep) == (0, 1000.5, 1)
+    assert a.description is None and "description" not in a
+    assert laser.description == "üüü"
+    assert bytes(compact.text) == ("ü" * 6).encode("utf-8")
+    assert not hasattr(a, "__dict__")
+
+def test_compact_keeps_non_numeric_costs():
+    items = [dict(EQUIPMENT[0], baseCost="500", baseEp=True), dict(EQUIPMENT[1], baseCost=250, baseEp="1 per arc")]
+    first, second = CompactCatalog(items)
+
+    assert first.to_dict() == items[0]
+    assert second.to_dict() == items[1]
+    assert first.get("baseCost") == "500" and first["baseEp"] is True
+    assert second.base_cost == 250 and second.get("baseEp") == "1 per arc"
+    assert list(first.keys()).count("baseCost") == 1
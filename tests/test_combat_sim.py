@@ -0,0 +1,69 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import combat_sim  # noqa: E402
+from combat_sim import Combatant, run, simulate  # noqa: E402
+from ship_engine import ShipEngine  # noqa: E402
+
+ENGINE = ShipEngine.load()
+
+def target(hp=1, dr=0, sr=0, reflex=0, weapons=()):
+    return Combatant("target", hp, dr, sr, reflex, 0, list(weapons))
+
+def test_combatant_from_spec():
+    fighter = combat_sim.combatant(ENGINE, "light_fighter:advanced+laser_light/enhanced/quad/link2/x2")
+    ship = ENGINE.ship(ENGINE.new_ship("light_fighter", "advanced"))
+
+    assert fighter.hp == ship.current_stats["hp"]
+    assert fighter.reflex == ship.reflex_defense
+    # 3d10x2 + enhanced 1 + quad 2 + link2 1 + advanced template 1
+    assert fighter.weapons == [(8, 10, 2), (8, 10, 2)]
+    assert fighter.attack == combat_sim.GUNNER_BONUS + 2  # Int 14
+
+    with pytest.raises(ValueError):
+        combat_sim.combatant(ENGINE, "light_fighter+laser_light/huge")
+    with pytest.raises(ValueError):
+        combat_sim.combatant(ENGINE, "no_such_hull")
+
+def test_stock_weapons_are_used():
+    gozanti = combat_sim.combatant(ENGINE, "gozanti")
+    # Light lasers (battery of 2), medium lasers and proton torpedoes
+    assert gozanti.weapons == [(3, 10, 2), (4, 10, 2), (9, 10, 2)]
+
+def test_only_natural_one_misses_a_helpless_target():
+    attacker = Combatant("gun", 10, 0, 0, 10, 0, [(1, 4, 1)])
+    outcome, rounds = simulate(attacker, target(), 200_000, seed=1)
+
+    first_round = outcome["a"][1] / 200_000
+    assert first_round == pytest.approx(0.95, abs=0.005)
+    assert outcome["b"].sum() == outcome["draw"].sum() == 0
+    # Rounds to kill are geometric with p = 0.95
+    assert rounds / 200_000 == pytest.approx(1 / 0.95, abs=0.01)
+
+def test_shields_and_dr_stop_small_weapons():
+    attacker = Combatant("gun", 10, 0, 0, 10, 0, [(1, 4, 1)])
+    # A d4 never reaches SR 50, so the shield never drops and nothing gets through
+    outcome, rounds = simulate(attacker, target(sr=50), 1000, seed=2, max_rounds=20)
+    assert outcome["draw"][20] == 1000 and rounds == 20_000
+    # Without shields, DR 7 absorbs everything but a critical 4 (8 - 7)
+    outcome, _ = simulate(attacker, target(dr=7), 20_000, seed=3, max_rounds=2000)
+    assert outcome["a"].sum() == 20_000
+    mean_rounds = (np.arange(2001) @ outcome["a"]) / 20_000
+    assert mean_rounds == pytest.approx(80, rel=0.05)  # p = 1/20 * 1/4
+
+def test_seeded_runs_are_reproducible_across_workers():
+    a = combat_sim.combatant(ENGINE, "light_fighter+laser_light/quad")
+    b = combat_sim.combatant(ENGINE, "interceptor+laser_light/twin")
+
+    one = run(a, b, 5000, seed=42, workers=1, chunk_size=1000)
+    two = run(a, b, 5000, seed=42, workers=2, chunk_size=1000)
+    other = run(a, b, 5000, seed=43, workers=1, chunk_size=1000)
+
+    for key in ("a_win", "b_win", "draw", "rounds", "combats"):
+        assert one[key] == two[key]
+    assert one["a_win"] != other["a_win"]
+    assert one["combats"] == 5000
+    assert sum(one[k]["probability"] for k in ("a_win", "b_win", "draw")) == pytest.approx(1)
+    assert one["rounds_per_second"] > 0
+    assert one["seed"] == 42
@@ -0,0 +1,169 @@
+"""Property-based fuzzing of the component cost and EP rules.
+
+ShipEngine (a port of store.js, checked against it in test_ship_engine.py
+and test_rules.py) is compared with fleet_batch's independent vectorized
+formulas on random component instances drawn from the real EQUIPMENT
+catalog. Each instance is also checked against invariants of the rules.
+
+Hypothesis draws single instances in test_rules, so failures shrink to a
+minimal case. Drawing is too slow for volume, so test_rules_bulk draws
+only a hull, template and seed per example and prices BATCH plain-random
+instances in one array pass. The "ci" profile (see conftest.py) runs 100k
+bulk instances:
+
+    HYPOTHESIS_PROFILE=ci pytest tests/test_cost_fuzz.py
+"""
+import math
+import random
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+np = pytest.importorskip("numpy")
+
+from fleet_batch import FleetEncoder  # noqa: E402
+from ship_engine import ShipEngine  # noqa: E402
+
+BATCH = 500
+
+ENGINE = ShipEngine.load()
+EQUIPMENT_IDS = sorted(ENGINE.equipment)
+# Boolean options any component may carry; resolveCost prices them from
+# optionCosts / upgradeSpecs / DEFAULT_OPTION_COSTS (or not at all)
+OPTION_KEYS = sorted({key for item in ENGINE.data["EQUIPMENT"]
+                      for key in ((item.get("upgradeSpecs") or {}).get("optionCosts") or {})}
+                     | set(ENGINE.default_option_costs) | {"pointBlank", "slaveCircuits.recall"})
+
+@st.composite
+def instances(draw):
+    def_id = draw(st.sampled_from(EQUIPMENT_IDS))
+    mods = {}
+    if draw(st.booleans()):
+        mods["enhancement"] = draw(st.sampled_from(["normal", "enhanced", "advanced"]))
+    if draw(st.booleans()):
+        mods["mount"] = draw(st.sampled_from(["single", "twin", "quad"]))
+    if draw(st.booleans()):
+        mods["fireLink"] = draw(st.integers(1, 4))
+    if draw(st.booleans()):
+        mods["batteryCount"] = draw(st.integers(1, 6))
+    if draw(st.booleans()):
+        mods["quantity"] = draw(st.integers(1, 10))
+    if draw(st.booleans()):
+        mods["payloadCount"] = draw(st.integers(0, 8))
+    if draw(st.booleans()):
+        mods["payloadOption"] = draw(st.booleans())
+    if draw(st.booleans()):
+        mods["fireLinkOption"] = draw(st.booleans())
+    for key in draw(st.lists(st.sampled_from(OPTION_KEYS), max_size=3, unique=True)):
+        mods[key] = draw(st.booleans())
+    return {"defId": def_id, "modifications": mods,
+            "miniaturization": draw(st.integers(0, 2)), "isNonStandard": draw(st.booleans())}
+
+def random_instance(rng):
+    """Plain-random counterpart of instances(), cheap enough for bulk runs."""
+    mods = {}
+    if rng.random() < 0.5:
+        mods["enhancement"] = rng.choice(["normal", "enhanced", "advanced"])
+    if rng.random() < 0.5:
+        mods["mount"] = rng.choice(["single", "twin", "quad"])
+    if rng.random() < 0.5:
+        mods["fireLink"] = rng.randint(1, 4)
+    if rng.random() < 0.5:
+        mods["batteryCount"] = rng.randint(1, 6)
+    if rng.random() < 0.5:
+        mods["quantity"] = rng.randint(1, 10)
+    if rng.random() < 0.5:
+        mods["payloadCount"] = rng.randint(0, 8)
+    if rng.random() < 0.5:
+        mods["payloadOption"] = rng.random() < 0.5
+    if rng.random() < 0.5:
+        mods["fireLinkOption"] = rng.random() < 0.5
+    for key in rng.sample(OPTION_KEYS, rng.randint(0, 3)):
+        mods[key] = rng.random() < 0.5
+    return {"defId": rng.choice(EQUIPMENT_IDS), "modifications": mods,
+            "miniaturization": rng.randint(0, 2), "isNonStandard": rng.random() < 0.5}
+
+hulls = st.sampled_from(sorted(ENGINE.ships))
+templates = st.sampled_from([None, *sorted(ENGINE.templates)])
+
+def ship_for(hull_id, template_id):
+    state = ENGINE.new_ship(hull_id, template_id)
+    state["manifest"] = []
+    return ENGINE.ship(state)
+
+def oracle(hull_id, template_id, items):
+    """(cost, ep) per instance from fleet_batch's array formulas."""
+    encoder = FleetEncoder(ENGINE, [hull_id], [template_id])
+    rows = [encoder.add_variant(i["defId"], i["modifications"], i["miniaturization"], i["isNonStandard"]) for i in items]
+    cost, ep = encoder.cost_table(0, 0), encoder.ep_table(0)
+    return [(cost[row], ep[row]) for row in rows]
+
+def ep_of(ship, instance, **overrides):
+    mods = instance["modifications"]
+    args = dict(battery_count=mods.get("batteryCount") or 1, is_non_standard=instance["isNonStandard"],
+                miniaturization=instance["miniaturization"], quantity=mods.get("quantity") or 1,
+                mount=mods.get("mount") or "single", fire_link=mods.get("fireLink") or 1,
+                enhancement=mods.get("enhancement") or "normal")
+    args.update(overrides)
+    return ship.calculate_ep(instance["defId"], **args)
+
+def with_mods(instance, **changes):
+    return {**instance, "modifications": {**instance["modifications"], **changes}}
+
+def check(ship, instance, expected_cost, expected_ep):
+    mods = instance["modifications"]
+    cost = ship.calculate_component_cost(instance)
+    ep = ship.component_ep(instance)
+
+    # Differential: the scalar port agrees with the vectorized formulas
+    assert cost == pytest.approx(expected_cost, rel=1e-9, abs=1e-6)
+    assert ep == expected_ep
+
+    # Battery, quantity, miniaturization and non-standard are pure multipliers on the whole cost
+    plain = dict(instance, miniaturization=0, isNonStandard=False)
+    factor = ((mods.get("batteryCount") or 1) * (mods.get("quantity") or 1)
+              * {0: 1, 1: 2, 2: 5}[instance["miniaturization"]] * (5 if instance["isNonStandard"] else 1))
+    single = ship.calculate_component_cost(with_mods(plain, batteryCount=1, quantity=1))
+    assert cost == pytest.approx(single * factor)
+
+    # More of something never costs less
+    if single >= 0:
+        assert ship.calculate_component_cost(with_mods(instance, quantity=(mods.get("quantity") or 1) + 1)) >= cost
+        if (mods.get("enhancement") or "normal") == "normal":
+            for level in ("enhanced", "advanced"):
+                assert ship.calculate_component_cost(with_mods(instance, enhancement=level)) >= cost
+
+    # EP: miniaturization lowers EP but never below 1; non-standard doubles it
+    base_ep = ep_of(ship, instance, miniaturization=0, is_non_standard=False)
+    if base_ep > 0:
+        expected = base_ep * (2 if instance["isNonStandard"] else 1)
+        if instance["miniaturization"] == 1:
+            expected = max(1, expected - 1)
+        elif instance["miniaturization"] == 2:
+            expected = math.ceil(expected / 2)
+        assert ep == expected >= 1
+        assert ep_of(ship, instance, miniaturization=2) <= ep_of(ship, instance, miniaturization=1) \
+            <= ep_of(ship, instance, miniaturization=0)
+    else:
+        # Zero or negative EP (power gains) is left alone by both modifiers
+        assert ep == base_ep
+
+@given(hulls, templates, instances())
+def test_rules(hull_id, template_id, instance):
+    """Shrinkable: a failure is reduced to a minimal hull, template and instance."""
+    ship = ship_for(hull_id, template_id)
+    [(cost, ep)] = oracle(hull_id, template_id, [instance])
+    check(ship, instance, cost, ep)
+
+@given(hulls, templates, st.integers(0, 2 ** 32 - 1))
+def test_rules_bulk(hull_id, template_id, seed):
+    """BATCH plain-random instances per example, priced by the oracle in one array pass."""
+    rng = random.Random(seed)
+    items = [random_instance(rng) for _ in range(BATCH)]
+    ship = ship_for(hull_id, template_id)
+    for instance, (cost, ep) in zip(items, oracle(hull_id, template_id, items)):
+        try:
+            check(ship, instance, cost, ep)
+        except AssertionError as e:
+            raise AssertionError(f"{hull_id} / {template_id}: {instance}") from e
@@ -0,0 +1,82 @@
+import itertools
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import dice  # noqa: E402
+from ship_engine import ShipEngine  # noqa: E402
+
+ENGINE = ShipEngine.load()
+
+def brute_force(count, die, multiplier):
+    totals = [sum(roll) * multiplier for roll in itertools.product(range(1, die + 1), repeat=count)]
+    return sorted(totals)
+
+def test_parse_damage():
+    assert dice.parse_damage("3d10x2") == (3, 10, 2)
+    assert dice.parse_damage("5d10") == (5, 10, 1)
+    assert dice.parse_damage("2d10/turn") == (2, 10, 1)
+    assert dice.parse_damage("Varies") is None
+    assert dice.parse_damage(None) is None
+
+@pytest.mark.parametrize("count, die, multiplier", [(1, 6, 1), (2, 6, 1), (3, 10, 2), (4, 4, 5), (5, 3, 1)])
+def test_matches_enumeration(count, die, multiplier):
+    totals = brute_force(count, die, multiplier)
+    dist = dice.distribution(count, die, multiplier)
+
+    assert dist.mean == pytest.approx(np.mean(totals))
+    assert dist.variance == pytest.approx(np.var(totals))
+    assert (dist.min, dist.max) == (totals[0], totals[-1])
+    assert dist.pmf.sum() == pytest.approx(1)
+    for p in (0, 10, 25, 50, 90, 100):
+        # Smallest total with at least p% of rolls at or below it
+        expected = next(t for t in totals if sum(x <= t for x in totals) >= p / 100 * len(totals))
+        assert dist.percentile(p) == expected
+    assert dist.probability_at_least(totals[-1]) == pytest.approx(totals.count(totals[-1]) / len(totals))
+
+def test_known_values():
+    d = dice.damage_distribution("2d6")
+    assert d.pmf[5] == pytest.approx(6 / 36)  # a total of 7
+    assert d.percentile(50) == 7
+    assert dice.distribution(1, 2).percentile(50) == 1
+    assert dice.damage_summary("4d10x2")["mean"] == pytest.approx(44)
+    with pytest.raises(ValueError):
+        d.percentile(101)
+
+def test_memoized_and_read_only():
+    assert dice.distribution(3, 10, 2) is dice.damage_distribution("3d10x2")
+    assert dice.distribution(3, 10, 5).pmf is dice.distribution(3, 10, 2).pmf
+    with pytest.raises(ValueError):
+        dice.distribution(3, 10, 2).pmf[0] = 1
+
+def test_damage_table_computes_each_roll_once():
+    for cached in (dice._sum_pmf, dice.distribution, dice.summary):
+        cached.cache_clear()
+    rows = dice.damage_table(ENGINE)
+
+    rolls = {row["dice"] for row in rows}
+    assert dice.summary.cache_info().misses == len(rolls) < len(rows) / 10
+    assert dice.distribution.cache_info().misses == len(rolls)
+
+def test_damage_table_follows_component_damage():
+    rows = dice.damage_table(ENGINE)
+    weapons = dice.weapons(ENGINE)
+    assert len(rows) == len(weapons) * (1 + len(ENGINE.templates)) * 27
+
+    by_key = {(r["id"], r["template"], r["enhancement"], r["mount"], r["fire_link"]): r for r in rows}
+    ships = dice.template_ships(ENGINE)
+    for weapon in weapons[:3]:
+        for template, ship in ships.items():
+            mods = {"enhancement": "advanced", "mount": "twin", "fireLink": 2}
+            row = by_key[(weapon["id"], template or "", "advanced", "twin", 2)]
+            assert row["dice"] == ship.component_damage({"defId": weapon["id"], "modifications": mods})
+            count, die, multiplier = dice.parse_damage(row["dice"])
+            assert row["mean"] == pytest.approx(count * (die + 1) / 2 * multiplier)
+
+def test_report_rows():
+    rows = dice.report_rows(ENGINE)
+    assert all(len(row) == len(dice.REPORT_COLUMNS) for row in rows)
+    name, template, base, mean, spread, best, best_mean, best_spread = rows[0]
+    assert template == "-"
+    assert dice.parse_damage(best)[0] == dice.parse_damage(base)[0] + 6
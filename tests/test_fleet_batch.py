@@ -0,0 +1,63 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from fleet_batch import FleetEncoder, balance_table
+
+@pytest.fixture(scope="module")
+def encoder():
+    encoder = FleetEncoder()
+    encoder.add_catalog_variants()
+    # Options that add_catalog_variants does not generate
+    encoder.add_variant("laser_med", {"pointBlank": True, "batteryCount": 2})
+    encoder.add_variant("proton_torp", {"payloadCount": 4, "fireLinkOption": True, "fireLink": 2})
+    encoder.add_variant("slave_circuits_adv", {"slaveCircuits.recall": True})
+    encoder.add_variant("extended_range", {"quantity": 3})
+    encoder.add_variant("armor_3", miniaturization=1, is_non_standard=True)
+    encoder.add_variant("laser_hvy", {"enhancement": "advanced", "mount": "quad"}, miniaturization=2)
+    return encoder
+
+def assert_matches_engine(encoder, picks, rows):
+    for h, hull_id in enumerate(encoder.hull_ids):
+        for t, template_id in enumerate(encoder.template_ids):
+            result = encoder.evaluate_pair(h, t, picks)
+            for row in rows:
+                expected = encoder.engine.evaluate(encoder.state_for(hull_id, template_id, picks[row]))
+                context = (hull_id, template_id, picks[row].tolist())
+                assert result["total_cost"][row] == pytest.approx(expected["total_cost"]), context
+                assert result["licensing_cost"][row] == pytest.approx(expected["licensing_cost"]), context
+                assert result["remaining_ep"][row] == expected["remaining_ep"], context
+                if not result["valid"][row]:
+                    continue
+                assert encoder.availability_rank[result["availability"][row]] == expected["availability"], context
+
+def test_matches_engine_on_random_loadouts(encoder):
+    picks = encoder.random_loadouts(400, max_components=5, seed=7)
+    assert_matches_engine(encoder, picks, range(0, 400, 40))
+
+def test_matches_engine_on_option_variants(encoder):
+    extras = encoder.variants[-6:]
+    loadouts = [[encoder.add_variant(v["defId"], v["modifications"], v["miniaturization"], v["isNonStandard"])]
+                for v in extras]
+    picks = encoder.as_picks(loadouts)
+    assert_matches_engine(encoder, picks, range(len(loadouts)))
+
+def test_validity(encoder):
+    shield_a = encoder.add_variant("shield_gen_15")
+    shield_b = encoder.add_variant("shield_gen_20")
+    turbolaser = encoder.add_variant("turbolaser_light")  # minShipSize Colossal (frigate)
+    picks = encoder.as_picks([[shield_a], [shield_a, shield_b], [turbolaser]])
+
+    fighter = encoder.evaluate_pair(encoder.hull_ids.index("light_fighter"), 0, picks)
+    cruiser = encoder.evaluate_pair(encoder.hull_ids.index("cruiser"), 0, picks)
+
+    assert not fighter["valid"][1] and not cruiser["valid"][1]  # two shields
+    assert not fighter["valid"][2] and cruiser["valid"][2]
+
+def test_balance_table(encoder):
+    picks = encoder.random_loadouts(200, max_components=3, seed=1)
+    rows = balance_table(encoder, picks)
+
+    assert len(rows) == len(encoder.hull_ids) * len(encoder.template_ids)
+    assert all(row["loadouts"] == 200 for row in rows)
+    assert all(row["valid"] <= 200 for row in rows)
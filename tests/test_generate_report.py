@@ -0,0 +1,162 @@
+import csv
+import json
+import os
+
+import pytest
+
+import generate_report
+from catalog import Catalog
+from generate_report import load_catalog, manifest_path, write_report
+
+EQUIPMENT = [
+    {"id": "shield_a", "name": "Shield A", "category": "Defense Systems", "group": "Shields",
+     "baseCost": 1000, "baseEp": 2, "exclusiveGroup": "shield", "stats": {"sr": 10}, "description": "Line one\nline two"},
+    {"id": "armor_1", "name": "Armor", "category": "Defense Systems", "group": "Armor", "baseCost": 2000, "baseEp": 2},
+    {"id": "laser", "name": "Laser", "category": "Weapon Systems", "group": "Lasers",
+     "baseCost": 3500, "baseEp": 1, "sizeMult": True, "damage": "3d10x2"},
+    {"id": "ion", "name": "Ion", "category": "Weapon Systems", "group": "Ion", "baseCost": 5000, "baseEp": 2},
+]
+
+EXPECTED = """# Starship Components Report
+
+This report lists all starship components defined in `data.json`, grouped by category and group.
+
+## Defense Systems
+
+### Armor
+
+| Name | Cost | EP | Size Mult | Availability | Exclusive Group | Notes |
+|---|---|---|---|---|---|---|
+| Armor | 2,000 | 2 | No |  | - |  |
+
+### Shields
+
+| Name | Cost | EP | Size Mult | Availability | Exclusive Group | Notes |
+|---|---|---|---|---|---|---|
+| Shield A | 1,000 | 2 | No |  | shield | **Stats:** sr: 10<br>Line one line two |
+
+## Weapon Systems
+
+### Ion
+
+| Name | Cost | EP | Size Mult | Availability | Exclusive Group | Notes |
+|---|---|---|---|---|---|---|
+| Ion | 5,000 | 2 | No |  | - |  |
+
+### Lasers
+
+| Name | Cost | EP | Size Mult | Availability | Exclusive Group | Notes |
+|---|---|---|---|---|---|---|
+| Laser | 3,500 | 1 | Yes |  | - | **Damage:** 3d10x2 |
+"""
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def test_full_render(tmp_path):
+    report = str(tmp_path / "REPORT.md")
+
+    assert write_report(Catalog(EQUIPMENT), report) == (4, 0)
+    assert read(report) == EXPECTED
+    assert os.path.exists(manifest_path(report))
+
+def test_incremental_rerenders_changed_sections_only(tmp_path):
+    report = str(tmp_path / "REPORT.md")
+    write_report(Catalog(EQUIPMENT), report)
+
+    assert write_report(Catalog(EQUIPMENT), report) == (0, 4)
+    assert read(report) == EXPECTED
+
+    changed = [dict(item, baseCost=9999) if item["id"] == "laser" else item for item in EQUIPMENT]
+    changed.append({"id": "mine", "name": "Mine", "category": "Weapon Systems", "group": "Mines", "baseCost": 1, "baseEp": 1})
+    assert write_report(Catalog(changed), report) == (2, 3)
+
+    full = str(tmp_path / "FULL.md")
+    write_report(Catalog(changed), full, incremental=False)
+    assert read(report) == read(full)
+    assert "| Laser | 9,999 |" in read(report)
+
+def test_edited_report_is_rebuilt(tmp_path):
+    report = str(tmp_path / "REPORT.md")
+    write_report(Catalog(EQUIPMENT), report)
+    with open(report, "a", encoding="utf-8") as f:
+        f.write("hand edit\n")
+
+    assert write_report(Catalog(EQUIPMENT), report) == (4, 0)
+    assert read(report) == EXPECTED
+
+def test_libraries_are_merged(tmp_path):
+    data = tmp_path / "data.json"
+    data.write_text(json.dumps({"EQUIPMENT": EQUIPMENT}))
+    library = tmp_path / "library.json"
+    library.write_text(json.dumps({"name": "Mine", "components": [
+        {"id": "custom", "name": "Custom Gun", "category": "Weapon Systems", "group": "Lasers", "baseCost": 1, "baseEp": 1},
+    ], "ships": []}))
+
+    catalog = load_catalog(str(data), [str(library)])
+
+    assert [i["id"] for i in catalog.items_in("Weapon Systems", "Lasers")] == ["laser", "custom"]
+
+def test_all_formats_share_one_pass(tmp_path, monkeypatch):
+    calls = []
+    build_row = generate_report.build_row
+    monkeypatch.setattr(generate_report, "build_row", lambda *args: calls.append(args) or build_row(*args))
+    items = EQUIPMENT + [{"id": "xss", "name": "<b>Ion & Co</b>", "category": "Weapon Systems", "group": "Ion",
+                          "baseCost": 1, "baseEp": 1, "exclusiveGroup": "ion"}]
+    base = str(tmp_path / "REPORT")
+    writers = [cls(base + cls.extension) for cls in generate_report.WRITERS.values()]
+
+    generate_report.run(Catalog(items), writers)
+
+    assert len(calls) == len(items)
+    with open(base + ".csv", newline="", encoding="utf-8") as f:
+        csv_rows = list(csv.DictReader(f))
+    assert [r["id"] for r in csv_rows] == ["armor_1", "shield_a", "ion", "xss", "laser"]
+    assert csv_rows[1]["stats"] == "sr: 10"
+    with open(base + ".jsonl", encoding="utf-8") as f:
+        json_rows = [json.loads(line) for line in f]
+    assert [r["id"] for r in json_rows] == [r["id"] for r in csv_rows]
+    assert json_rows[1]["stats"] == {"sr": 10}
+    assert json_rows[1]["description"] == "Line one line two"
+    page = read(base + ".html")
+    assert "&lt;b&gt;Ion &amp; Co&lt;/b&gt;" in page
+    assert page.count("<table>") == 4
+    assert read(base + ".md").startswith("# Starship Components Report")
+
+def test_failed_run_keeps_previous_output(tmp_path):
+    report = str(tmp_path / "REPORT.md")
+    write_report(Catalog(EQUIPMENT), report)
+
+    class Broken(generate_report.JSONLWriter):
+        def section(self, *args):
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        generate_report.run(Catalog(EQUIPMENT[:1]), [generate_report.MarkdownWriter(report), Broken(str(tmp_path / "r.jsonl"))])
+    assert read(report) == EXPECTED
+    assert sorted(os.listdir(tmp_path)) == ["REPORT.manifest.json", "REPORT.md"]
+
+def test_appendix_follows_spliced_sections(tmp_path):
+    report = str(tmp_path / "REPORT.md")
+    appendix = ("Weapon Damage", ["Weapon", "Mean"], [["Laser", "33"]])
+    write_report(Catalog(EQUIPMENT), report)
+
+    writer, = generate_report.run(Catalog(EQUIPMENT), [generate_report.MarkdownWriter(report)], [appendix])
+
+    assert writer.reused == 4
+    assert read(report) == EXPECTED + "\n## Weapon Damage\n\n| Weapon | Mean |\n|---|---|\n| Laser | 33 |\n"
+    assert write_report(Catalog(EQUIPMENT), report) == (0, 4)
+    assert read(report) == EXPECTED
+
+def test_compact_catalog_renders_the_same(tmp_path):
+    data = tmp_path / "data.json"
+    data.write_text(json.dumps({"EQUIPMENT": EQUIPMENT}))
+    report = str(tmp_path / "REPORT.md")
+
+    writer, = generate_report.run(load_catalog(str(data), compact=True), [generate_report.MarkdownWriter(report)])
+
+    assert writer.rendered == 4
+    assert read(report) == EXPECTED
+    # Section hashes match the dict catalog's, so either can splice the other's report
+    assert write_report(load_catalog(str(data)), report) == (0, 4)
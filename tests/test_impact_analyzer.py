@@ -0,0 +1,104 @@
+import copy
+import subprocess
+
+import pytest
+
+import impact_analyzer
+from impact_analyzer import analyze, diff_data, format_changelog
+from ship_engine import ShipEngine
+
+@pytest.fixture(scope="module")
+def base():
+    return ShipEngine.load().data
+
+def edit(data, section, record_id, **changes):
+    new = copy.deepcopy(data)
+    record = next(r for r in new[section] if r["id"] == record_id)
+    record.update(changes)
+    return new
+
+def builds(report):
+    return {(b["hull"], b["template"]) for b in report["builds"]}
+
+def test_identical_revisions(base):
+    report = analyze(base, copy.deepcopy(base))
+    assert report["builds"] == []
+    assert report["checked"] == 0
+    assert format_changelog(report) == ["No structural changes."]
+
+def test_diff_is_by_id_not_position(base):
+    shuffled = copy.deepcopy(base)
+    shuffled["EQUIPMENT"].reverse()
+    target = next(i for i in shuffled["EQUIPMENT"] if i.get("stats"))
+    key = next(iter(target["stats"]))
+    target["stats"][key] = 99
+
+    diff = diff_data(base, shuffled)
+    assert diff["EQUIPMENT"]["changed"] == {target["id"]: [(f"stats.{key}", base_value(base, target["id"], key), 99)]}
+    assert diff["EQUIPMENT"]["added"] == diff["EQUIPMENT"]["removed"] == []
+
+def base_value(base, def_id, key):
+    return next(i for i in base["EQUIPMENT"] if i["id"] == def_id)["stats"][key]
+
+def test_stock_component_edit_reprices_only_its_hulls(base):
+    users = {s["id"] for s in base["STOCK_SHIPS"] if "engine_5" in [m if isinstance(m, str) else m["id"]
+                                                                   for m in s.get("defaultMods") or []]}
+    old_cost = next(i for i in base["EQUIPMENT"] if i["id"] == "engine_5")["baseCost"]
+    report = analyze(base, edit(base, "EQUIPMENT", "engine_5", baseCost=old_cost * 2, baseEp=7))
+
+    templates = [None] + [t["id"] for t in base["TEMPLATES"]]
+    assert builds(report) == {(hull, t) for hull in users for t in templates}
+    assert report["checked"] == len(users) * len(templates) < report["total_builds"]
+    for build in report["builds"]:
+        old, new = build["old"], build["new"]
+        assert new["stock_value"] > old["stock_value"]
+        assert new["used_ep"] - old["used_ep"] == new["total_ep"] - old["total_ep"]
+        # Stock parts are free, so only the stock value moves
+        assert new["total_cost"] == old["total_cost"]
+
+    [component] = report["components"]
+    assert component["id"] == "engine_5"
+    assert component["new"][0] == 2 * component["old"][0]
+    assert "engine_5: baseCost" in "\n".join(format_changelog(report))
+
+def test_unused_component_touches_no_build(base):
+    report = analyze(base, edit(base, "EQUIPMENT", "laser_hvy", baseCost=1))
+    assert report["builds"] == []
+    assert report["components"][0]["new"][:2] == (1, 1)
+
+def test_template_and_size_table_changes(base):
+    report = analyze(base, edit(base, "TEMPLATES", "advanced", costMult=2))
+    assert builds(report) == {(s["id"], "advanced") for s in base["STOCK_SHIPS"]}
+
+    new = copy.deepcopy(base)
+    new["SIZE_COST_MULTIPLIERS"]["Huge"] += 1
+    report = analyze(base, new)
+    huge = {s["id"] for s in base["STOCK_SHIPS"] if s["size"] == "Huge"}
+    assert {hull for hull, _ in builds(report)} <= huge
+    assert report["checked"] == len(huge) * (1 + len(base["TEMPLATES"]))
+
+def test_added_and_removed_hulls(base):
+    new = copy.deepcopy(base)
+    removed = new["STOCK_SHIPS"].pop(0)
+    new["STOCK_SHIPS"].append(dict(removed, id="new_hull"))
+    report = analyze(base, new)
+
+    gone = [b for b in report["builds"] if b["hull"] == removed["id"]]
+    added = [b for b in report["builds"] if b["hull"] == "new_hull"]
+    assert gone and all(b["new"] is None for b in gone)
+    assert added and all(b["old"] is None for b in added)
+    text = "\n".join(format_changelog(report))
+    assert f"- {removed['id']}" in text and "+ new_hull" in text
+
+def test_cli_compares_git_revision_with_file(tmp_path, base, capsys):
+    new_file = tmp_path / "data.json"
+    new_file.write_text(impact_analyzer.json.dumps(edit(base, "TEMPLATES", "advanced", epMod=3)))
+    try:
+        impact_analyzer.load_revision("HEAD")
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        pytest.skip("needs the git history")
+
+    assert impact_analyzer.main(["HEAD", str(new_file)]) == 0
+    out = capsys.readouterr().out
+    assert "advanced: epMod 0 -> 3" in out
+    assert "free EP" in out
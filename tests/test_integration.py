@@ -3,15 +3,24 @@ import httpx
 import uuid
 import os
 
+from paging import iter_pages, iter_resources
+
 BASE_URL = os.environ.get("BASE_URL", "http://backend:8787")
 
-@pytest.fixture
-def client():
-    with httpx.Client(base_url=BASE_URL, timeout=10.0) as client:
+# Set by pytest-xdist in each worker process ("gw0", "gw1", ...); users created
+# by a worker carry its name so parallel workers never touch each other's data.
+WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+# One keep-alive pool per worker instead of a fresh TCP connection per test
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+@pytest.fixture(scope="session")
+def client(api_ready):
+    with httpx.Client(base_url=BASE_URL, timeout=10.0, limits=POOL_LIMITS) as client:
         yield client
 
-def create_user(client, name="Test User"):
-    email = f"test_{uuid.uuid4()}@example.com"
+def create_user(client, name="Test User", namespace=WORKER):
+    email = f"test_{namespace}_{uuid.uuid4()}@example.com"
     password = "secretpassword"
 
     resp = client.post("/auth/register", json={
@@ -36,6 +45,28 @@ def create_user(client, name="Test User"):
         "headers": {"Authorization": f"Bearer {token}"}
     }
 
+class UserPool:
+    """Registered, logged-in users for one worker, created on first use.
+
+    Register plus login is the slowest part of most tests, so each role
+    ("owner", "grantee", ...) is created once per worker session and its
+    token reused. Every test creates its own resources, so sharing the
+    accounts doesn't couple tests together.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.users = {}
+
+    def get(self, role):
+        if role not in self.users:
+            self.users[role] = create_user(self.client, name=role.title())
+        return self.users[role]
+
+@pytest.fixture(scope="session")
+def users(client):
+    return UserPool(client)
+
 def test_health(client):
     resp = client.get("/health")
     assert resp.status_code == 200
@@ -43,8 +74,8 @@ def test_health(client):
 
 # Auth Tests
 
-def test_auth_register_duplicate(client):
-    user = create_user(client)
+def test_auth_register_duplicate(client, users):
+    user = users.get("owner")
 
     resp = client.post("/auth/register", json={
         "email": user["email"],
@@ -70,8 +101,8 @@ RESOURCE_TYPES = [
 ]
 
 @pytest.mark.parametrize("resource_type, initial_data", RESOURCE_TYPES)
-def test_resource_lifecycle(client, resource_type, initial_data):
-    user = create_user(client)
+def test_resource_lifecycle(client, users, resource_type, initial_data):
+    user = users.get("owner")
     headers = user["headers"]
 
     # Create
@@ -109,9 +140,9 @@ def test_resource_lifecycle(client, resource_type, initial_data):
     assert resp.status_code == 404
 
 @pytest.mark.parametrize("resource_type, initial_data", RESOURCE_TYPES)
-def test_resource_sharing(client, resource_type, initial_data):
-    owner = create_user(client, name="Owner")
-    grantee = create_user(client, name="Grantee")
+def test_resource_sharing(client, users, resource_type, initial_data):
+    owner = users.get("owner")
+    grantee = users.get("grantee")
 
     # Owner creates private resource
     resp = client.post(f"/{resource_type}", json={
@@ -182,3 +213,65 @@ def test_resource_sharing(client, resource_type, initial_data):
     # Verify Gone for Owner too
     resp = client.get(f"/{resource_type}/{resource_id}", headers=owner["headers"])
     assert resp.status_code == 404
+
+@pytest.mark.parametrize("resource_type, initial_data", RESOURCE_TYPES)
+def test_client_ids_and_batch_upsert(client, users, resource_type, initial_data):
+    owner = users.get("owner")
+    other = users.get("grantee")
+    resource_id = str(uuid.uuid4())
+    body = {"id": resource_id, "name": "Imported", "data": initial_data, "visibility": "private"}
+
+    # A client-chosen ID is kept, and creating it twice conflicts instead of duplicating
+    resp = client.post(f"/{resource_type}", json=body, headers=owner["headers"])
+    assert resp.status_code == 200
+    assert resp.json()["id"] == resource_id
+    resp = client.post(f"/{resource_type}", json=body, headers=owner["headers"])
+    assert resp.status_code == 409
+
+    new_id = str(uuid.uuid4())
+    items = [dict(body, name="Renamed"), dict(body, id=new_id), dict(body, id="not valid!")]
+    resp = client.post(f"/{resource_type}/batch", json={"items": items}, headers=owner["headers"])
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [(r["status"], r["code"]) for r in results] == [("updated", 200), ("created", 201), ("failed", 400)]
+    assert client.get(f"/{resource_type}/{resource_id}", headers=owner["headers"]).json()["name"] == "Renamed"
+
+    # Someone else's ID cannot be taken over through the batch endpoint
+    resp = client.post(f"/{resource_type}/batch", json={"items": [body]}, headers=other["headers"])
+    assert resp.json()["results"][0]["code"] == 403
+
+def test_list_pagination(client, users):
+    owner = users.get("owner")
+    reader = users.get("paging")
+    created = []
+    for i in range(7):
+        resp = client.post("/configurations", json={
+            "name": f"Page {i}",
+            "data": {"i": i},
+            "visibility": "private"
+        }, headers=owner["headers"])
+        created.append(resp.json()["id"])
+        client.patch(f"/configurations/{created[-1]}/share", json={
+            "grantee_id": reader["id"], "grantee_type": "user", "access_level": "read"
+        }, headers=owner["headers"])
+
+    # Public configurations from other tests may show up too; ours must all appear, once, in ID order
+    pages = list(iter_pages(client, "configurations", headers=reader["headers"], limit=3, fields="id,name"))
+    listed = [r["id"] for page in pages for r in page.json()]
+    assert len(pages) >= 3
+    assert listed == sorted(set(listed))
+    assert set(created) <= set(listed)
+    assert all(set(r) == {"id", "name"} for page in pages for r in page.json())
+
+    # Stopping early only fetches what was consumed
+    first = next(iter_resources(client, "configurations", headers=reader["headers"], limit=3))
+    assert "data" in first
+
+    # An unchanged page revalidates to an empty 304
+    resp = client.get("/configurations", params={"limit": 3}, headers=reader["headers"])
+    etag = resp.headers["ETag"]
+    resp = client.get("/configurations", params={"limit": 3}, headers={**reader["headers"], "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    assert client.get("/configurations", params={"cursor": "%%%"}, headers=reader["headers"]).status_code == 400
@@ -0,0 +1,72 @@
+import time
+
+from link_checker import Checkpoint, HostRateLimiter, check_url, check_urls
+
+def test_check_url_statuses(stub_wiki):
+    stub_wiki.pages["/wiki/Laser_Cannon"] = "<html>Laser</html>"
+    stub_wiki.pages["/wiki/Head_Blocked"] = "<html>GET only</html>"
+    stub_wiki.head_not_allowed.add("/wiki/Head_Blocked")
+
+    assert check_url(stub_wiki.url("/wiki/Laser_Cannon")) == (200, "OK")
+    assert check_url(stub_wiki.url("/wiki/Head_Blocked")) == (200, "OK")
+    assert check_url(stub_wiki.url("/wiki/Missing"))[0] == 404
+
+def test_check_urls_concurrent(stub_wiki):
+    paths = [f"/wiki/Page_{i}" for i in range(20)]
+    for path in paths:
+        stub_wiki.pages[path] = "ok"
+    urls = [stub_wiki.url(p) for p in paths] + [stub_wiki.url("/wiki/Missing")]
+
+    # Duplicates are only requested once
+    results = check_urls(urls + urls[:5], workers=8, interval=0)
+
+    assert len(results) == 21
+    assert all(results[stub_wiki.url(p)] == (200, "OK") for p in paths)
+    assert results[stub_wiki.url("/wiki/Missing")][0] == 404
+    assert all(stub_wiki.hits(p) == 1 for p in paths)
+
+def test_check_urls_resumes_from_checkpoint(stub_wiki, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    for i in range(6):
+        stub_wiki.pages[f"/wiki/Page_{i}"] = "ok"
+    urls = [stub_wiki.url(f"/wiki/Page_{i}") for i in range(6)]
+
+    # Simulate an interrupted run that finished the first half
+    first = Checkpoint(path)
+    check_urls(urls[:3], workers=2, interval=0, checkpoint=first)
+
+    seen = []
+    resumed = Checkpoint(path)
+    results = check_urls(urls, workers=2, interval=0, checkpoint=resumed,
+                         on_result=lambda url, status, reason, cached: seen.append((url, cached)))
+
+    assert len(results) == 6
+    assert all(stub_wiki.hits(f"/wiki/Page_{i}") == 1 for i in range(6))
+    assert sorted(url for url, cached in seen if cached) == sorted(urls[:3])
+    assert len(Checkpoint(path).results) == 6
+
+def test_checker_errors_are_recorded(tmp_path):
+    def broken(url):
+        raise RuntimeError("boom")
+
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+    results = check_urls(["http://example.invalid/a"], interval=0, checkpoint=checkpoint, checker=broken)
+
+    assert results["http://example.invalid/a"] == (0, "boom")
+    assert checkpoint.get("http://example.invalid/a") == (0, "boom")
+
+def test_rate_limiter_is_per_host():
+    limiter = HostRateLimiter(interval=0.05)
+
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.wait("http://a.example/wiki/x")
+    same_host = time.monotonic() - start
+
+    start = time.monotonic()
+    for i in range(4):
+        limiter.wait(f"http://host{i}.example/wiki/x")
+    other_hosts = time.monotonic() - start
+
+    assert same_host >= 0.15
+    assert other_hosts < 0.05
@@ -0,0 +1,110 @@
+import http.server
+import itertools
+import json
+import threading
+
+import pytest
+
+import load_test
+
+class StubApi:
+    """Just enough of the resources API for the load generator, in memory."""
+
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.resources = {}
+        self.calls = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=None):
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                parts = self.path.split("?")[0].strip("/").split("/")
+                with stub._lock:
+                    stub.calls.append((self.command, self.path))
+                    if parts == ["auth", "register"]:
+                        return self._reply(200, {"user_id": f"u{next(stub.ids)}"})
+                    if parts == ["auth", "login"]:
+                        return self._reply(200, {"access_token": body["email"]})
+                    if self.command == "POST" and len(parts) == 1:
+                        resource_id = f"r{next(stub.ids)}"
+                        stub.resources[resource_id] = dict(body, id=resource_id, type=parts[0])
+                        return self._reply(200, stub.resources[resource_id])
+                    if self.command == "GET" and len(parts) == 1:
+                        return self._reply(200, [r for r in stub.resources.values() if r["type"] == parts[0]])
+                    if len(parts) >= 2 and parts[1] in stub.resources:
+                        if self.command == "PUT":
+                            stub.resources[parts[1]].update(body)
+                        return self._reply(200, stub.resources[parts[1]])
+                    return self._reply(404, {})
+
+            do_GET = do_POST = do_PUT = do_PATCH = _handle
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+@pytest.fixture
+def stub_api():
+    stub = StubApi()
+    stub._thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+def test_parse_mix():
+    assert load_test.parse_mix("list=3, get=1") == {"list": 3.0, "get": 1.0}
+    with pytest.raises(ValueError):
+        load_test.parse_mix("delete=1")
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert [load_test.percentile(values, p) for p in (50, 95, 99, 100)] == [50, 95, 99, 100]
+    assert load_test.percentile([7], 99) == 7
+    assert load_test.percentile([], 50) is None
+
+def test_seed_and_drive(stub_api, tmp_path, capsys):
+    out = tmp_path / "summary.json"
+
+    status = load_test.main(["--base-url", stub_api.base_url, "--users", "3", "--resources", "8", "--shares", "4",
+                             "--requests", "200", "--concurrency", "4", "--json", str(out)])
+
+    assert status == 0
+    summary = json.loads(out.read_text())
+    assert sum(row["requests"] for row in summary["endpoints"].values()) == 200
+    assert set(summary["endpoints"]) == {"GET /{type}", "GET /{type} (all pages)", "GET /{type}/{id}",
+                                         "PUT /{type}/{id}", "PATCH /{type}/{id}/share"}
+    row = summary["endpoints"]["GET /{type}"]
+    assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
+    assert len(stub_api.resources) == 8
+    assert sum(1 for method, path in stub_api.calls if path == "/auth/register") == 3
+    assert "req/s" in capsys.readouterr().out
+
+def test_seed_from_synthetic_payloads(stub_api, tmp_path):
+    synth_data = pytest.importorskip("synth_data")
+    payloads = tmp_path / "resources.ndjson"
+    synth = synth_data.Synthesizer(synth_data.load_base(synth_data.DATA_FILE), seed=1)
+    records = synth.resources(synth_data.ShipEngine.load(), libraries=1, library_components=5, hangars=1, hangar_ships=2, ships=1)
+    synth_data.write_resources(str(payloads), records)
+
+    status = load_test.main(["--base-url", stub_api.base_url, "--users", "2", "--resources", "6", "--shares", "0",
+                             "--requests", "20", "--concurrency", "2", "--payloads", str(payloads)])
+
+    assert status == 0
+    seeded = list(stub_api.resources.values())
+    assert sorted(r["type"] for r in seeded) == ["hangars"] * 2 + ["libraries"] * 2 + ["ships"] * 2
+    assert all(len(r["data"]["components"]) == 5 for r in seeded if r["type"] == "libraries")
@@ -0,0 +1,98 @@
+import itertools
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from loadout_optimizer import LoadoutOptimizer, expected_damage, option_variants
+from ship_engine import ShipEngine
+
+SMALL_CATALOG = ["laser_light", "laser_med", "ion_cannon_light", "proton_torp", "armor_1", "armor_2",
+                 "armor_3", "shield_gen_15", "shield_gen_20", "shield_gen_30", "engine_1", "engine_2", "engine_3"]
+
+@pytest.fixture(scope="module")
+def engine():
+    return ShipEngine.load()
+
+@pytest.fixture(scope="module")
+def small_engine(engine):
+    data = dict(engine.data)
+    data["EQUIPMENT"] = [item for item in engine.data["EQUIPMENT"] if item["id"] in SMALL_CATALOG]
+    return ShipEngine(data)
+
+OBJECTIVE_STATS = {"armor": "armor", "shields": "sr"}
+
+def objective(summary, objective_name):
+    if objective_name == "damage":
+        return sum(expected_damage(c["damage"]) for c in summary["components"])
+    return summary["current_stats"][OBJECTIVE_STATS[objective_name]]
+
+def brute_force(engine, hull_id, template_id, objective_name, budget, max_components):
+    """Best gain over every multiset of plain catalog components, priced by ShipEngine."""
+    encoder = LoadoutOptimizer(engine, hull_id, template_id, objective_name, options=False).encoder
+    stock = objective(engine.evaluate(engine.new_ship(hull_id, template_id)), objective_name)
+    best = 0
+    for size in range(1, max_components + 1):
+        for loadout in itertools.combinations_with_replacement(range(len(encoder.variants)), size):
+            groups = [encoder.columns["group"][v] for v in loadout if encoder.columns["group"][v] >= 0]
+            if len(groups) != len(set(groups)) or not encoder.size_ok(0)[list(loadout)].all():
+                continue
+            summary = engine.evaluate(encoder.state_for(hull_id, template_id, loadout))
+            if summary["remaining_ep"] < 0 or summary["components_cost"] + summary["licensing_cost"] > budget:
+                continue
+            best = max(best, objective(summary, objective_name) - stock)
+    return best
+
+def test_expected_damage():
+    assert expected_damage("4d10x2") == 44
+    assert expected_damage("5d10") == 27.5
+    assert expected_damage("Varies") == 0
+
+def test_option_variants_follow_component_options(engine):
+    assert list(option_variants(engine.equipment["armor_1"])) == [{}]
+    variants = list(option_variants(engine.equipment["laser_light"]))
+    assert {"pointBlank": True} in variants
+    assert not any(v.get("fireLink", 1) > 1 and v.get("batteryCount", 1) > 1 for v in variants)
+    assert not any("pointBlank" in v for v in option_variants(engine.equipment["proton_torp"]))
+
+@pytest.mark.parametrize("hull_id, template_id, objective, budget, max_components", [
+    ("light_freighter", None, "damage", 60000, 3),
+    ("gunship", "advanced", "damage", 150000, 3),
+    ("frigate", None, "armor", None, 2),
+    ("corvette", "ancient", "shields", 100000, 2),
+])
+def test_search_matches_brute_force(small_engine, hull_id, template_id, objective, budget, max_components):
+    optimizer = LoadoutOptimizer(small_engine, hull_id, template_id, objective, options=False)
+    result = optimizer.search(budget, max_components)
+
+    assert result["optimal"]
+    assert result["value"] == pytest.approx(
+        brute_force(small_engine, hull_id, template_id, objective, budget or float("inf"), max_components))
+
+def test_result_prices_like_ship_engine(engine):
+    optimizer = LoadoutOptimizer(engine, "frigate", "prototype", "damage", max_availability="Restricted")
+    result = optimizer.search(budget=750000, max_components=6)
+    summary = engine.evaluate(optimizer.state_for(result))
+
+    assert result["loadout"]
+    assert summary["components_cost"] + summary["licensing_cost"] == pytest.approx(result["cost"])
+    assert result["cost"] <= 750000
+    assert summary["remaining_ep"] >= 0
+    assert engine.availability_rank.index(summary["availability"]) <= engine.availability_rank.index("Restricted")
+
+def test_point_blank_respects_min_ship_size(engine):
+    # laser_light allows pointBlank only from Colossal (frigate) up
+    fighter = LoadoutOptimizer(engine, "light_fighter").encoder
+    frigate = LoadoutOptimizer(engine, "frigate").encoder
+    v = fighter.add_variant("laser_light", {"pointBlank": True})
+
+    assert not fighter.size_ok(0)[v]
+    assert frigate.size_ok(0)[frigate.add_variant("laser_light", {"pointBlank": True})]
+
+def test_node_limit_returns_best_found(engine):
+    optimizer = LoadoutOptimizer(engine, "cruiser", objective="damage")
+    result = optimizer.search(budget=5000000, max_components=8, max_nodes=50)
+
+    assert not result["optimal"]
+    assert result["nodes"] > 50
+    assert result["value"] > 0
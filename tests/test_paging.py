@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+
+from paging import aiter_resources, iter_pages, iter_resources
+
+IDS = [f"ship-{i:02d}" for i in range(23)]
+
+def handler(seen):
+    """Cursor pagination over IDS, the way listResourcesHandler pages (cursor = last ID of the page)."""
+    def handle(request):
+        seen.append(dict(request.url.params))
+        limit = int(request.url.params.get("limit", 100))
+        after = request.url.params.get("cursor", "")
+        rest = [i for i in IDS if i > after]
+        page, more = rest[:limit], len(rest) > limit
+        fields = request.url.params.get("fields", "id,name,data").split(",")
+        body = [{k: v for k, v in {"id": i, "name": i.title(), "data": {}}.items() if k in fields} for i in page]
+        headers = {"X-Next-Cursor": page[-1]} if more else {}
+        return httpx.Response(200, json=body, headers=headers)
+    return handle
+
+def test_iter_resources_follows_cursors():
+    seen = []
+    with httpx.Client(base_url="http://api", transport=httpx.MockTransport(handler(seen))) as client:
+        resources = list(iter_resources(client, "ships", limit=10, fields=["id", "name"]))
+
+    assert [r["id"] for r in resources] == IDS
+    assert resources[0] == {"id": "ship-00", "name": "Ship-00"}
+    assert seen == [{"limit": "10", "fields": "id,name"},
+                    {"limit": "10", "fields": "id,name", "cursor": "ship-09"},
+                    {"limit": "10", "fields": "id,name", "cursor": "ship-19"}]
+
+def test_pages_are_fetched_lazily():
+    seen = []
+    with httpx.Client(base_url="http://api", transport=httpx.MockTransport(handler(seen))) as client:
+        first = next(iter_pages(client, "ships", limit=5))
+        assert len(first.json()) == 5
+        taken = [r for _, r in zip(range(7), iter_resources(client, "ships", limit=5))]
+
+    assert len(taken) == 7
+    assert len(seen) == 3
+
+def test_async_iteration():
+    async def collect():
+        transport = httpx.MockTransport(handler([]))
+        async with httpx.AsyncClient(base_url="http://api", transport=transport) as client:
+            return [r["id"] async for r in aiter_resources(client, "ships", limit=4)]
+
+    assert asyncio.run(collect()) == IDS
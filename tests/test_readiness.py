@@ -0,0 +1,48 @@
+import random
+import threading
+import time
+
+import pytest
+
+import readiness
+from readiness import NotReady, Probe, wait_until_ready
+
+def test_backoff_grows_with_jitter_and_is_capped():
+    delays = readiness.backoff_delays(initial=0.1, factor=2, maximum=1.0, rng=random.Random(1))
+    first = [next(delays) for _ in range(8)]
+
+    for delay, cap in zip(first, [0.1, 0.2, 0.4, 0.8, 1.0, 1.0, 1.0, 1.0]):
+        assert cap / 2 <= delay <= cap
+    assert len(set(first[4:])) == 4
+
+def test_waits_for_slow_service_concurrently(stub_wiki):
+    stub_wiki.pages["/up"] = "ok"
+    threading.Timer(0.4, lambda: stub_wiki.pages.__setitem__("/late", "ok")).start()
+
+    start = time.perf_counter()
+    timings = wait_until_ready([Probe("up", stub_wiki.url("/up")), Probe("late", stub_wiki.url("/late"))], timeout=10)
+
+    assert set(timings) == {"up", "late"}
+    assert timings["up"] < 0.2
+    assert 0.4 <= timings["late"] < 2.0
+    assert time.perf_counter() - start < 2.0
+    assert stub_wiki.hits("/up") == 1
+
+def test_reports_every_service_still_down(stub_wiki):
+    stub_wiki.pages["/up"] = "ok"
+
+    with pytest.raises(NotReady) as info:
+        wait_until_ready([Probe("up", stub_wiki.url("/up")), Probe("down", stub_wiki.url("/down")),
+                          Probe("refused", "http://127.0.0.1:9/health")], timeout=0.5)
+
+    assert set(info.value.timings) == {"up"}
+    assert set(info.value.failures) == {"down", "refused"}
+    assert "HTTP 404" in info.value.failures["down"]
+    assert "ConnectError" in info.value.failures["refused"]
+
+def test_cli(stub_wiki, capsys):
+    stub_wiki.pages["/health"] = "ok"
+
+    assert readiness.main([f"backend={stub_wiki.url('/health')}", "--timeout", "5"]) == 0
+    assert readiness.main([f"backend={stub_wiki.url('/missing')}", "--timeout", "0.3"]) == 1
+    assert "backend not ready" in capsys.readouterr().out
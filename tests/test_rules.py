@@ -0,0 +1,114 @@
+import itertools
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from ship_engine import ShipEngine
+
+HARNESS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js", "rules_harness.mjs")
+
+# logistics.cons strings the consumables rule has to parse
+CONS = ["1 day", "2 days", "5 days", "1 week", "1 month", "2 months", "3 months", "1 year", "2 years",
+        "1 year 2 months", "5 years", "6 years 1 month 10 days", "None", ""]
+
+@pytest.fixture(scope="module")
+def engine():
+    data = ShipEngine.load().data
+    base = next(s for s in data["STOCK_SHIPS"] if s["id"] == "light_fighter")
+    ships = [dict(base, id=f"cons_{i}", logistics=dict(base["logistics"], cons=cons)) for i, cons in enumerate(CONS)]
+    # No shipped component uses ep_dynamic_pct yet; the rule still has to hold
+    dynamic = {"id": "dynamic_ep", "name": "Dynamic EP", "category": "Starship Accessories", "group": "Test",
+               "baseCost": 0, "baseEp": 0, "stats": {"ep_dynamic_pct": 0.15}}
+    return ShipEngine({**data, "STOCK_SHIPS": data["STOCK_SHIPS"] + ships, "EQUIPMENT": data["EQUIPMENT"] + [dynamic]})
+
+def ship(engine, chassis_id, extended_range=0):
+    state = engine.new_ship(chassis_id)
+    state["manifest"] = []
+    if extended_range:
+        state["manifest"].append({"id": "er", "defId": "extended_range", "miniaturizationRank": 0,
+                                  "modifications": {"quantity": extended_range}})
+    return engine.ship(state)
+
+def consumables(engine, cons, extended_range):
+    return ship(engine, f"cons_{CONS.index(cons)}", extended_range).current_consumables
+
+@pytest.mark.parametrize("cons, extended_range, expected", [
+    ("2 days", 0, "2 days"),
+    # 2 days + max(floor(2 * 0.1), 1) per Extended Range
+    ("2 days", 1, "3 days"),
+    ("2 days", 2, "4 days"),
+    ("1 day", 5, "6 days"),
+    ("1 month", 1, "1 month 3 days"),
+    ("2 months", 3, "2 months 18 days"),
+    ("1 year", 1, "1 year 1 month 6 days"),
+    ("5 years", 2, "6 years"),
+    ("1 year 2 months", 0, "1 year 2 months"),
+    ("6 years 1 month 10 days", 1, "6 years 8 months 20 days"),
+    # Unparseable or missing: one day
+    ("1 week", 0, "1 day"),
+    ("None", 1, "2 days"),
+    ("", 0, "1 day"),
+])
+def test_consumables(engine, cons, extended_range, expected):
+    assert consumables(engine, cons, extended_range) == expected
+
+@pytest.mark.parametrize("args, expected", [
+    ({}, 1),
+    ({"enhancement": "enhanced"}, 2),
+    ({"enhancement": "advanced", "mount": "quad"}, 4),
+    ({"fire_link": 4}, 4),
+    ({"mount": "quad", "fire_link": 2, "battery_count": 3}, 12),
+    ({"quantity": 3, "is_non_standard": True}, 6),
+    ({"enhancement": "advanced", "miniaturization": 1}, 2),
+    ({"fire_link": 2, "battery_count": 2, "miniaturization": 2}, 2),
+    ({"battery_count": 5, "miniaturization": 2}, 3),
+])
+def test_laser_light_ep(engine, args, expected):
+    assert ship(engine, "light_fighter").calculate_ep("laser_light", **args) == expected
+
+@pytest.mark.parametrize("hull, expected", [("light_fighter", 0), ("corvette", 3), ("frigate", 7), ("cruiser", 15)])
+def test_dynamic_ep_scales_with_hull(engine, hull, expected):
+    assert ship(engine, hull).calculate_ep("dynamic_ep") == expected
+
+# Every combination of calculateEp's options, for a spread of components and hulls
+EP_GRID = {
+    "battery_count": [1, 3],
+    "is_non_standard": [False, True],
+    "miniaturization": [0, 1, 2],
+    "quantity": [1, 3],
+    "mount": ["single", "quad"],
+    "fire_link": [1, 2],
+    "enhancement": ["normal", "enhanced", "advanced"],
+}
+JS_ARGS = {"battery_count": "batteryCount", "is_non_standard": "isNonStandard", "fire_link": "fireLink"}
+
+def ep_cases(engine):
+    # One component per distinct baseEp, plus the dynamic one
+    def_ids = list({i["baseEp"]: i["id"] for i in reversed(engine.data["EQUIPMENT"])}.values())
+    for chassis_id in ("light_fighter", "frigate"):
+        for def_id in def_ids:
+            for values in itertools.product(*EP_GRID.values()):
+                yield chassis_id, def_id, dict(zip(EP_GRID, values))
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is required to run store.js")
+def test_rules_match_store_js(engine):
+    ep = list(ep_cases(engine))
+    cons = [(cons, n) for cons in CONS for n in range(0, 12)]
+    cases = [{"rule": "ep", "chassis": chassis_id,
+              "args": {"defId": def_id, **{JS_ARGS.get(k, k): v for k, v in args.items()}}}
+             for chassis_id, def_id, args in ep]
+    cases += [{"rule": "consumables", "chassis": f"cons_{CONS.index(c)}", "extendedRange": n} for c, n in cons]
+    assert len(cases) > 5000
+
+    proc = subprocess.run(["node", HARNESS], input=json.dumps({"data": engine.data, "cases": cases}),
+                          capture_output=True, text=True, check=True)
+    expected = json.loads(proc.stdout)
+
+    ships = {chassis_id: ship(engine, chassis_id) for chassis_id in {c for c, _, _ in ep}}
+    actual = [ships[chassis_id].calculate_ep(def_id, **args) for chassis_id, def_id, args in ep]
+    actual += [consumables(engine, c, n) for c, n in cons]
+    mismatches = [(case, js, py) for case, js, py in zip(cases, expected, actual) if js != py]
+    assert mismatches[:5] == []
@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from ship_engine import ShipEngine
+
+HARNESS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js", "store_harness.mjs")
+
+@pytest.fixture(scope="module")
+def engine():
+    return ShipEngine.load()
+
+def build(engine, chassis_id, template=None, components=(), **configuration):
+    """Stock build of chassis_id plus extra (defId, modifications, miniaturization, isNonStandard) installs."""
+    state = engine.new_ship(chassis_id, template)
+    state["configuration"].update(configuration)
+    for index, (def_id, mods, mini, non_standard) in enumerate(components):
+        state["manifest"].append({
+            "id": f"custom-{index}",
+            "defId": def_id,
+            "location": "",
+            "miniaturizationRank": mini,
+            "isStock": False,
+            "isNonStandard": non_standard,
+            "modifications": {"payloadCount": 0, "payloadOption": False, "batteryCount": 1,
+                              "quantity": 1, "fireLinkOption": False, **mods},
+        })
+    return state
+
+def parity_fixtures(engine):
+    fixtures = [engine.new_ship(ship_id, template)
+                for ship_id in engine.ships for template in [None, *engine.templates]]
+    fixtures += [
+        build(engine, "light_fighter", components=[("extended_range", {"quantity": 2}, 0, False)]),
+        build(engine, "light_fighter", "advanced", components=[
+            ("laser_light", {"enhancement": "advanced", "mount": "quad", "fireLink": 4}, 0, False),
+            ("laser_light", {"mount": "twin", "fireLink": 2, "batteryCount": 3}, 1, False),
+            ("ion_cannon", {"enhancement": "enhanced"}, 2, True),
+        ]),
+        build(engine, "frigate", "prototype", components=[
+            ("laser_med", {"pointBlank": True, "batteryCount": 2}, 0, False),
+            ("proton_torp", {"payloadCount": 4, "fireLinkOption": True, "fireLink": 2}, 0, False),
+            ("bulkheads_20", {}, 0, False),
+            ("armor_3", {}, 1, True),
+        ]),
+        build(engine, "light_freighter", "ancient", components=[
+            ("slave_circuits_adv", {"slaveCircuits.recall": True}, 0, False),
+            ("cargo_pod_med", {}, 0, False),
+            ("ts_speed", {}, 0, False),
+            ("sensor_array_computer_4", {}, 0, False),
+        ], cargoToEpAmount=40),
+        build(engine, "corvette", components=[("tech_spec_sh", {}, 0, False)], escapePodsToEpPct=30),
+    ]
+
+    custom = build(engine, "gunship", components=[("my_gun", {"quantity": 3}, 0, False)])
+    custom["libraries"] = [{"id": "lib", "name": "Custom", "active": True, "ships": [], "components": [{
+        "id": "my_gun", "name": "My Gun", "category": "Weapon Systems", "group": "Custom",
+        "baseCost": 1234, "baseEp": 2, "sizeMult": True, "availability": "Restricted", "damage": "4d8x2",
+    }]}]
+    fixtures.append(custom)
+    return fixtures
+
+def test_light_fighter_stock(engine):
+    result = engine.evaluate(engine.new_ship("light_fighter"))
+
+    assert result["hull_cost"] == 30000
+    assert result["total_cost"] == 30000
+    assert result["remaining_ep"] == 2
+    assert result["current_consumables"] == "2 days"
+
+def test_stock_ships_fit_their_ep(engine):
+    over = {ship_id: result["remaining_ep"] for ship_id in engine.ships
+            if (result := engine.evaluate(engine.new_ship(ship_id)))["remaining_ep"] < 0}
+    assert over == {}
+
+def test_template_and_extended_range(engine):
+    result = engine.evaluate(build(engine, "light_fighter", "advanced",
+                                   components=[("extended_range", {"quantity": 2}, 0, False)]))
+
+    assert result["hull_cost"] == 37500
+    # 2 days + 2 x max(floor(2 * 0.1), 1)
+    assert result["current_consumables"] == "4 days"
+    assert result["current_stats"]["weapon_damage_dice"] == 1
+
+def test_unknown_component_is_ignored(engine):
+    result = engine.evaluate(build(engine, "light_fighter", components=[("no_such_part", {}, 0, False)]))
+
+    assert result["components"][-1] == {"defId": "no_such_part", "cost": 0, "ep": 0, "damage": None}
+
+def test_load_is_cached(engine):
+    assert ShipEngine.load() is engine
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is required to run store.js")
+def test_parity_with_store_js(engine):
+    fixtures = parity_fixtures(engine)
+    proc = subprocess.run(["node", HARNESS], input=json.dumps({"data": engine.data, "states": fixtures}),
+                          capture_output=True, text=True, check=True)
+    expected = json.loads(proc.stdout)
+
+    assert len(expected) == len(fixtures)
+    for state, js_result in zip(fixtures, expected):
+        py_result = engine.evaluate(state)
+        for key, js_value in js_result.items():
+            if isinstance(js_value, float):
+                assert py_result[key] == pytest.approx(js_value), (state["meta"]["model"], key)
+            else:
+                assert py_result[key] == js_value, (state["meta"]["model"], key)
@@ -0,0 +1,62 @@
+import json
+
+import synth_data
+from catalog import Catalog
+from ship_engine import ShipEngine
+from validate_data import validate, validate_file
+
+BASE = synth_data.load_base(synth_data.DATA_FILE)
+
+def test_data_is_seeded_and_valid(tmp_path):
+    first, again, other = (str(tmp_path / name) for name in ("a.json", "b.json", "c.json"))
+
+    assert synth_data.write_data(first, BASE, 3000, ships=5, seed=7) == len(BASE["EQUIPMENT"]) + 3000
+    synth_data.write_data(again, BASE, 3000, ships=5, seed=7)
+    synth_data.write_data(other, BASE, 3000, ships=5, seed=8)
+
+    text = open(first, encoding="utf-8").read()
+    assert text == open(again, encoding="utf-8").read() != open(other, encoding="utf-8").read()
+    data = json.loads(text)
+    assert data == synth_data.synthesize(BASE, 3000, ships=5, seed=7)
+    assert len(data["STOCK_SHIPS"]) == len(BASE["STOCK_SHIPS"]) + 5
+    # The real data.json's own errors may show up, but none from the synthetic records
+    errors = [p for p in validate_file(first) if p.severity == "error"]
+    assert len(errors) == len([p for p in validate(BASE) if p.severity == "error"])
+
+def test_components_follow_their_prototypes():
+    data = synth_data.synthesize(BASE, 4000, seed=3)
+    prototypes = {item["id"]: item for item in BASE["EQUIPMENT"]}
+    synthetic = data["EQUIPMENT"][len(BASE["EQUIPMENT"]):]
+
+    assert len({item["id"] for item in data["EQUIPMENT"]}) == len(data["EQUIPMENT"])
+    for item in synthetic:
+        proto = prototypes[item["id"].split("_", 1)[1].rsplit("_", 1)[0]]
+        assert item["category"] == proto["category"]
+        assert item["group"].startswith(proto["group"])
+        assert item.get("upgradeSpecs") == proto.get("upgradeSpecs")
+        assert item.get("damage") == proto.get("damage")
+        assert isinstance(item["baseCost"], int) and item["baseCost"] >= 0
+        assert item["availability"] in BASE["AVAILABILITY_RANK"]
+    # 4000 components spread over 4 series of every group
+    catalog = Catalog(data["EQUIPMENT"])
+    assert any(group.endswith("Mk 4") for groups in catalog.categories.values() for group in groups)
+    assert any(name.endswith("_mk4") for name in catalog.exclusive_groups)
+
+def test_resources(tmp_path):
+    engine = ShipEngine.load()
+    synth = synth_data.Synthesizer(BASE, seed=5)
+    path = str(tmp_path / "resources.ndjson")
+
+    count = synth_data.write_resources(path, synth.resources(engine, libraries=2, library_components=30, hangars=2,
+                                                             hangar_ships=3, ships=4))
+
+    records = [json.loads(line) for line in open(path, encoding="utf-8")]
+    assert count == len(records) == 8
+    assert [r["type"] for r in records] == ["libraries"] * 2 + ["hangars"] * 2 + ["ships"] * 4
+    assert all(set(r) == {"id", "type", "name", "visibility", "data"} for r in records)
+    library = records[0]["data"]
+    assert len(library["components"]) == 30
+    assert not [p for p in validate(library, base=BASE) if p.severity == "error"]
+    for state in [records[2]["data"]["ships"][0], records[-1]["data"]]:
+        summary = engine.evaluate(state)
+        assert len(summary["components"]) >= 4
@@ -2,27 +2,16 @@ import pytest
 import re
 from playwright.sync_api import Page, expect
 
-def test_hangar_load(page: Page):
-    """Test loading a stock ship from the Hangar."""
+def open_app(page: Page):
     page.goto("/swse/")
-
-    # Increase timeout for initial load
     page.wait_for_selector("#q-app", state="visible", timeout=60000)
 
-    # Handle Hangar Dialog which may auto-open
-    # Wait for either the dialog or the main UI empty state
-    # We check for the dialog first as it's the default behavior on fresh session
-    try:
-        page.wait_for_selector("#hangar-dialog-card", state="visible", timeout=10000)
-        # If visible, ensure we can interact with it
-    except:
-        # If not visible, open it
-        if page.is_visible("button:has-text('Open Hangar')"):
-             page.click("button:has-text('Open Hangar')")
-        else:
-             # Fallback, maybe it's closed but button is not "Open Hangar" (e.g. icon button)
-             page.click("#tour-hangar-btn")
-        page.wait_for_selector("#hangar-dialog-card", state="visible", timeout=10000)
+def test_hangar_load(page: Page):
+    """Test loading a stock ship from the Hangar."""
+    open_app(page)
+
+    # No saved build, so the Hangar opens on its own
+    page.wait_for_selector("#hangar-dialog-card", state="visible", timeout=10000)
 
     page.click("#hangar-tab-stock")
     page.wait_for_selector("text=Light Fighter", state="visible")
@@ -31,28 +20,11 @@ def test_hangar_load(page: Page):
     expect(page.locator("#tour-stats-panel")).to_contain_text("Light Fighter")
     expect(page.locator("#tour-stats-panel")).to_contain_text("Huge Starship")
 
+@pytest.mark.seed_ship("light_fighter")
 def test_systems_add(page: Page):
     """Test adding a component (Laser Cannon) to the ship."""
-    page.goto("/swse/")
-    page.wait_for_selector("#q-app", state="visible", timeout=60000)
-
-    # Ensure a ship is loaded
-    try:
-        page.wait_for_selector("#hangar-dialog-card", state="visible", timeout=5000)
-        page.click("#hangar-tab-stock")
-        page.click("text=Light Fighter")
-    except:
-        if page.is_visible("text=No Ship Loaded") or page.is_visible("button:has-text('Open Hangar')"):
-            page.click("button:has-text('Open Hangar')")
-            page.wait_for_selector("#hangar-dialog-card", state="visible", timeout=10000)
-            page.click("#hangar-tab-stock")
-            page.click("text=Light Fighter")
-        elif not page.is_visible("text=Light Fighter"):
-             # Try to open hangar if not obvious
-             page.click("#tour-hangar-btn")
-             page.wait_for_selector("#hangar-dialog-card", state="visible", timeout=10000)
-             page.click("#hangar-tab-stock")
-             page.click("text=Light Fighter")
+    open_app(page)
+    expect(page.locator("#tour-stats-panel")).to_contain_text("Light Fighter")
 
     page.click("#tour-add-btn")
     page.wait_for_selector("text=Install System", state="visible", timeout=10000)
@@ -78,8 +50,7 @@ def test_systems_add(page: Page):
 
 def test_custom_ship(page: Page):
     """Test creating a custom ship via Library Manager."""
-    page.goto("/swse/")
-    page.wait_for_selector("#q-app", state="visible", timeout=60000)
+    open_app(page)
 
     # Close Hangar Dialog if open
     if page.is_visible("#hangar-dialog-card"):
@@ -121,3 +92,19 @@ def test_custom_ship(page: Page):
     page.click("text=My Custom Ship")
 
     expect(page.locator("#tour-stats-panel")).to_contain_text("My Custom Ship")
+
+@pytest.mark.seed_ship("light_fighter")
+def test_mobile_systems_list(page: Page):
+    """On a phone-sized viewport the Systems tab lists the installed components."""
+    page.set_viewport_size({"width": 375, "height": 667})
+    open_app(page)
+
+    # Drawers may start open over the content on small screens
+    backdrop = page.locator(".q-drawer__backdrop").first
+    if backdrop.is_visible():
+        backdrop.click()
+        expect(backdrop).to_be_hidden()
+
+    page.locator(".q-tabs .q-tab").filter(has_text="Systems").click()
+
+    expect(page.locator(".q-item").first).to_be_visible()
@@ -0,0 +1,93 @@
+from link_checker import check_urls
+from url_cache import URLStatusCache
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_fresh_entries_skip_the_network(stub_wiki, tmp_path):
+    stub_wiki.pages["/wiki/Laser_Cannon"] = "v1"
+    url = stub_wiki.url("/wiki/Laser_Cannon")
+    clock = FakeClock()
+    cache = URLStatusCache(str(tmp_path / "cache.json"), ttl=3600, clock=clock)
+
+    check_urls([url], interval=0, checkpoint=cache, checker=cache.checker())
+    clock.now += 60
+    check_urls([url], interval=0, checkpoint=cache, checker=cache.checker())
+
+    assert stub_wiki.hits("/wiki/Laser_Cannon") == 1
+    assert cache.get(url) == (200, "OK")
+    assert cache.results[url]["etag"]
+
+def test_expired_entries_revalidate_conditionally(stub_wiki, tmp_path):
+    stub_wiki.pages["/wiki/Laser_Cannon"] = "v1"
+    url = stub_wiki.url("/wiki/Laser_Cannon")
+    clock = FakeClock()
+    path = str(tmp_path / "cache.json")
+    cache = URLStatusCache(path, ttl=3600, clock=clock)
+    check_urls([url], interval=0, checkpoint=cache, checker=cache.checker())
+
+    # A later run, after the TTL, loads the cache from disk
+    clock.now += 7200
+    cache = URLStatusCache(path, ttl=3600, clock=clock)
+    assert url not in cache
+    results = check_urls([url], interval=0, checkpoint=cache, checker=cache.checker())
+
+    method, _, headers = stub_wiki.requests[-1]
+    assert method == "HEAD"
+    assert headers["If-None-Match"] == cache.results[url]["etag"]
+    # 304 Not Modified resolves to the previously cached status
+    assert results[url] == (200, "OK")
+    assert cache.results[url]["checked_at"] == clock.now
+    assert url in cache
+
+def test_changed_page_updates_entry(stub_wiki, tmp_path):
+    stub_wiki.pages["/wiki/Laser_Cannon"] = "v1"
+    url = stub_wiki.url("/wiki/Laser_Cannon")
+    clock = FakeClock()
+    cache = URLStatusCache(str(tmp_path / "cache.json"), ttl=3600, clock=clock)
+    check_urls([url], interval=0, checkpoint=cache, checker=cache.checker())
+    first_etag = cache.results[url]["etag"]
+
+    del stub_wiki.pages["/wiki/Laser_Cannon"]
+    cache.expire()
+    results = check_urls([url], interval=0, checkpoint=cache, checker=cache.checker())
+
+    assert results[url][0] == 404
+    assert first_etag
+    # A 404 drops the validators, so the next check is unconditional
+    assert cache.results[url]["etag"] is None
+    assert cache.results[url]["last_modified"] is None
+    assert cache.conditional_headers(url) == {}
+
+def test_restored_page_recovers_from_404(stub_wiki, tmp_path):
+    stub_wiki.pages["/wiki/Laser_Cannon"] = "v1"
+    url = stub_wiki.url("/wiki/Laser_Cannon")
+    cache = URLStatusCache(str(tmp_path / "cache.json"), ttl=3600, clock=FakeClock())
+    check_urls([url], interval=0, checkpoint=cache, checker=cache.checker())
+    del stub_wiki.pages["/wiki/Laser_Cannon"]
+    cache.expire()
+    check_urls([url], interval=0, checkpoint=cache, checker=cache.checker())
+
+    # Same content, so a conditional request would have been answered 304
+    stub_wiki.pages["/wiki/Laser_Cannon"] = "v1"
+    cache.expire()
+    results = check_urls([url], interval=0, checkpoint=cache, checker=cache.checker())
+
+    _, _, headers = stub_wiki.requests[-1]
+    assert "If-None-Match" not in headers
+    assert results[url] == (200, "OK")
+    assert cache.results[url]["etag"]
+
+def test_errors_are_never_fresh(tmp_path):
+    cache = URLStatusCache(str(tmp_path / "cache.json"), ttl=3600, clock=FakeClock())
+    cache.record("http://a.example/x", 0, "timed out")
+    cache.record("http://a.example/y", 503, "Service Unavailable")
+    cache.record("http://a.example/z", 404, "Not Found")
+
+    assert "http://a.example/x" not in cache
+    assert "http://a.example/y" not in cache
+    assert "http://a.example/z" in cache
@@ -0,0 +1,165 @@
+import copy
+import json
+
+import pytest
+
+import validate_data
+from validate_data import compiled, validate, validate_file
+
+DATA = {
+    "SIZE_RANK": ["Huge", "Gargantuan", "Colossal"],
+    "AVAILABILITY_RANK": ["Common", "Licensed", "Military"],
+    "SIZE_COST_MULTIPLIERS": {"Huge": 1, "Gargantuan": 2, "Colossal": 5},
+    "REFLEX_SIZE_MODS": {"Huge": -2, "Gargantuan": -5, "Colossal": -10},
+    "LICENSE_FEES": {"Common": 0, "Licensed": 500, "Military": 5000},
+    "EQUIPMENT": [
+        {"id": "laser_light", "name": "Light Laser", "category": "Weapon Systems", "group": "Lasers",
+         "baseCost": 3000, "baseEp": 1, "damage": "2d10x2", "availability": "Military"},
+        {"id": "shield_a", "name": "Shield A", "category": "Defense Systems", "group": "Shields",
+         "baseCost": 1000, "baseEp": 2, "exclusiveGroup": "shield", "stats": {"sr": 10}},
+        {"id": "shield_b", "name": "Shield B", "category": "Defense Systems", "group": "Shields",
+         "baseCost": 2000, "baseEp": 3, "exclusiveGroup": "shield", "stats": {"sr": 20}},
+    ],
+    "STOCK_SHIPS": [
+        {"id": "hauler", "name": "Hauler", "size": "Colossal", "cost": 100000, "baseEp": 10,
+         "stats": {"str": 30, "hp": 100}, "defaultMods": ["laser_light", {"id": "shield_a"}]},
+    ],
+    "TEMPLATES": [
+        {"id": "military", "name": "Military", "costMult": 2, "stats": {"armor": 2}},
+    ],
+}
+
+def problems(data):
+    text = json.dumps(data, indent=2)
+    return [(p.severity, p.path, p.message) for p in validate(json.loads(text), text)]
+
+def edited(**changes):
+    data = copy.deepcopy(DATA)
+    for path, value in changes.items():
+        key, index, field = path.split("__")
+        data[key][int(index)][field] = value
+    return data
+
+def test_valid_data_has_no_problems():
+    assert problems(DATA) == []
+
+def test_bad_values_are_explained():
+    found = problems(edited(EQUIPMENT__0__availability="Millitary", EQUIPMENT__0__damage="2d10 x2",
+                            STOCK_SHIPS__0__size="Colosal"))
+
+    assert ("error", "EQUIPMENT[0] (laser_light).availability",
+            "'Millitary' is not in AVAILABILITY_RANK (did you mean 'Military'?)") in found
+    assert ("error", "EQUIPMENT[0] (laser_light).damage",
+            "'2d10 x2' does not match " + validate_data.DICE_RE.pattern) in found
+    assert ("error", "STOCK_SHIPS[0] (hauler).size",
+            "'Colosal' is not in SIZE_RANK (did you mean 'Colossal'?)") in found
+    assert len(found) == 3
+
+def test_references_and_duplicates():
+    data = edited(STOCK_SHIPS__0__defaultMods=["laser_lite", {"id": "shield_c", "quantity": 0}])
+    data["EQUIPMENT"].append(dict(DATA["EQUIPMENT"][0]))
+
+    found = problems(data)
+
+    assert ("error", "STOCK_SHIPS[0] (hauler).defaultMods[0]",
+            "unknown EQUIPMENT id 'laser_lite' (did you mean 'laser_light'?)") in found
+    assert ("error", "STOCK_SHIPS[0] (hauler).defaultMods[1].id",
+            "unknown EQUIPMENT id 'shield_c' (did you mean 'shield_b'?)") in found
+    assert ("error", "STOCK_SHIPS[0] (hauler).defaultMods[1].quantity", "0 is below the minimum of 1") in found
+    assert ("error", "EQUIPMENT[3] (laser_light)", "duplicate id 'laser_light' (first defined at EQUIPMENT[0])") in found
+
+def test_warnings():
+    data = edited(EQUIPMENT__1__stats={"sr": 10, "sr_bonnus": 5}, EQUIPMENT__2__exclusiveGroup="shields",
+                  TEMPLATES__0__epMods=3)
+
+    found = problems(data)
+
+    assert ("warning", "EQUIPMENT[1] (shield_a).stats", "unknown key 'sr_bonnus' (did you mean 'sr_bonus'?)") in found
+    assert ("warning", "EQUIPMENT[1] (shield_a)",
+            "exclusiveGroup 'shield' has no other members (did you mean 'shields'?)") in found
+    assert ("warning", "TEMPLATES[0] (military)", "unknown key 'epMods' (did you mean 'epMod'?)") in found
+    assert all(severity == "warning" for severity, _, _ in found)
+
+def test_missing_required_and_wrong_types():
+    data = edited(EQUIPMENT__0__baseCost="3000")
+    del data["EQUIPMENT"][1]["name"]
+    del data["TEMPLATES"]
+
+    found = problems(data)
+
+    assert ("error", "$", "missing required 'TEMPLATES'") in found
+    assert ("error", "EQUIPMENT[1] (shield_a)", "missing required 'name'") in found
+    assert ("error", "EQUIPMENT[0] (laser_light).baseCost", 'expected number, got str "3000"') in found
+
+def test_cli_reports_lines_and_exit_status(tmp_path, capsys):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(edited(STOCK_SHIPS__0__size="Tiny", EQUIPMENT__0__damage="lots"), indent=2))
+    lines = path.read_text().splitlines()
+
+    assert validate_data.main([str(path)]) == 1
+
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == 2
+    laser_line = next(i for i, line in enumerate(lines, 1) if '"laser_light"' in line)
+    hauler_line = next(i for i, line in enumerate(lines, 1) if '"hauler"' in line)
+    assert out[0].startswith(f"{path}:{laser_line}: error: EQUIPMENT[0]")
+    assert out[1].startswith(f"{path}:{hauler_line}: error: STOCK_SHIPS[0]")
+
+def test_lines_belong_to_records_not_nested_ids(tmp_path, capsys):
+    # Ships first, so the defaultMods {"id": "shield_a"} comes before the shield_a record itself
+    data = {"STOCK_SHIPS": DATA["STOCK_SHIPS"], **edited(EQUIPMENT__1__baseCost=-5)}
+    data["TEMPLATES"] = [{"name": "Veteran", "costMult": 1, "id": "veteran"}, *DATA["TEMPLATES"] * 2]
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(data, indent=2))
+    lines = path.read_text().splitlines()
+
+    validate_data.main([str(path)])
+
+    out = capsys.readouterr().out.splitlines()
+    shield_lines = [i for i, line in enumerate(lines, 1) if '"shield_a"' in line]
+    assert len(shield_lines) == 2
+    assert f"{path}:{shield_lines[1]}: error: EQUIPMENT[1] (shield_a).baseCost: -5 is below the minimum of 0" in out
+    # Records are matched by position: an id that is not the first key, and each copy of a repeated id
+    veteran_line = next(i for i, line in enumerate(lines, 1) if '"veteran"' in line)
+    military_lines = [i for i, line in enumerate(lines, 1) if '"military"' in line]
+    assert validate_data.record_lines(path.read_text(), ["TEMPLATES"]) == {"TEMPLATES": [veteran_line, *military_lines]}
+
+def test_strict_fails_on_warnings(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(edited(EQUIPMENT__0__stats={"speeed": 1})))
+
+    assert validate_data.main([str(path)]) == 0
+    assert validate_data.main([str(path), "--strict"]) == 1
+
+def test_library_is_checked_against_base(tmp_path):
+    base = tmp_path / "data.json"
+    base.write_text(json.dumps(DATA))
+    library = tmp_path / "library.json"
+    library.write_text(json.dumps({"name": "Mine", "components": [
+        {"id": "shield_c", "name": "Shield C", "category": "Defense Systems", "group": "Shields",
+         "baseCost": 3000, "baseEp": 4, "exclusiveGroup": "shield", "minShipSize": "Colossal"},
+    ], "ships": [
+        {"id": "custom", "name": "Custom", "size": "Huge", "cost": 1, "baseEp": 1, "stats": {},
+         "defaultMods": ["laser_light", "shield_c", "missing"]},
+    ]}))
+
+    found = [(p.severity, p.message) for p in validate_file(str(library), str(base))]
+
+    assert found == [("error", "unknown EQUIPMENT id 'missing'")]
+
+def test_invalid_json(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('{\n  "SIZE_RANK": [,]\n}')
+
+    [problem] = validate_file(str(path))
+
+    assert problem.severity == "error" and problem.line == 2
+
+def test_schemas_compile_once():
+    assert compiled("equipment") is compiled("equipment")
+
+def test_shipped_data_json():
+    found = [(p.severity, p.message) for p in validate_file(validate_data.DATA_FILE)]
+
+    # The pre-commit hook blocks any data.json commit while this has errors
+    assert [f for f in found if f[0] == "error"] == []
@@ -0,0 +1,163 @@
+import gzip
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import migrate_urls
+from link_checker import check_urls
+from url_cache import URLStatusCache
+from wiki_mirror import MirrorStore, make_server
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def crawl(store, urls):
+    results = check_urls(urls, interval=0, checker=store.checker())
+    store.save()
+    return results
+
+def objects(root):
+    return sorted(name for _, _, names in os.walk(os.path.join(root, "objects")) for name in names)
+
+def test_pages_are_stored_compressed_and_deduplicated(stub_wiki, tmp_path):
+    stub_wiki.pages["/wiki/Laser_Cannon"] = "<p>Laser cannon</p>\n" * 50
+    stub_wiki.pages["/wiki/Laser_Cannons"] = "<p>Laser cannon</p>\n" * 50
+    stub_wiki.pages["/wiki/Ion_Cannon"] = "<p>Ion cannon</p>\n"
+    urls = [stub_wiki.url(p) for p in ("/wiki/Laser_Cannon", "/wiki/Laser_Cannons", "/wiki/Ion_Cannon", "/wiki/Missing")]
+    root = str(tmp_path / "mirror")
+    store = MirrorStore(root)
+
+    results = crawl(store, urls)
+
+    assert results[urls[3]][0] == 404
+    # The missing page is remembered without a body
+    assert store.latest(urls[3])["status"] == 404
+    assert store.get(urls[3]) is None
+    # Two URLs with the same body share one object
+    assert len(objects(root)) == 2
+    stats = store.stats()
+    assert (stats["urls"], stats["snapshots"], stats["objects"]) == (4, 4, 2)
+    assert stats["stored_bytes"] < stats["raw_bytes"]
+
+    digest = store.latest(urls[0])["hash"]
+    with open(os.path.join(root, "objects", digest[:2], digest[2:] + ".gz"), "rb") as f:
+        assert gzip.decompress(f.read()).decode() == stub_wiki.pages["/wiki/Laser_Cannon"]
+
+    # A new process reads the same pages back from disk
+    assert MirrorStore(root).get(urls[2]) == b"<p>Ion cannon</p>\n"
+
+def test_unchanged_pages_revalidate_without_new_snapshots(stub_wiki, tmp_path):
+    stub_wiki.pages["/wiki/Laser_Cannon"] = "v1\n"
+    url = stub_wiki.url("/wiki/Laser_Cannon")
+    clock = FakeClock()
+    store = MirrorStore(str(tmp_path), clock=clock)
+    crawl(store, [url])
+
+    clock.now += 60
+    assert crawl(store, [url])[url] == (200, "OK")
+
+    _, _, headers = stub_wiki.requests[-1]
+    assert headers["If-None-Match"] == store.latest(url)["etag"]
+    [snapshot] = store.history(url)
+    assert snapshot["checked_at"] == 1060.0
+    assert snapshot["fetched_at"] == 1000.0
+
+def test_changed_pages_add_a_snapshot_and_diff(stub_wiki, tmp_path):
+    stub_wiki.pages["/wiki/Laser_Cannon"] = "Damage: 3d10\nCost: 2,000\n"
+    url = stub_wiki.url("/wiki/Laser_Cannon")
+    clock = FakeClock()
+    store = MirrorStore(str(tmp_path), clock=clock)
+    changed = []
+    check_urls([url], interval=0, checker=store.checker(on_change=lambda u, d: changed.append(u)))
+    assert store.diff(url) == ""
+
+    clock.now += 3600
+    stub_wiki.pages["/wiki/Laser_Cannon"] = "Damage: 4d10\nCost: 2,000\n"
+    check_urls([url], interval=0, checker=store.checker(on_change=lambda u, d: changed.append(u)))
+
+    assert changed == [url, url]
+    assert len(store.history(url)) == 2
+    assert store.get(url, 0) == b"Damage: 3d10\nCost: 2,000\n"
+    diff = store.diff(url)
+    assert "-Damage: 3d10\n" in diff
+    assert "+Damage: 4d10\n" in diff
+    assert " Cost: 2,000" in diff
+
+def test_offline_checker_and_server_answer_from_disk(stub_wiki, tmp_path):
+    stub_wiki.pages["/wiki/Ion_Cannon"] = "<p>Ion cannon</p>"
+    url = stub_wiki.url("/wiki/Ion_Cannon")
+    store = MirrorStore(str(tmp_path))
+    crawl(store, [url])
+
+    crawl(store, [stub_wiki.url("/wiki/Gone")])
+    fetched = len(stub_wiki.requests)
+
+    results = check_urls([url, stub_wiki.url("/wiki/Gone"), stub_wiki.url("/wiki/Unknown")], interval=0,
+                         checker=store.offline_checker())
+    assert results[url] == (200, "OK (mirror)")
+    assert results[stub_wiki.url("/wiki/Gone")] == (404, "Not Found (mirror)")
+    assert results[stub_wiki.url("/wiki/Unknown")] == (0, "not mirrored")
+
+    server = make_server(store, base=stub_wiki.base_url, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        local = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(local + "/wiki/Ion_Cannon") as response:
+            assert response.read() == b"<p>Ion cannon</p>"
+            assert response.headers["Content-Type"] == "text/html; charset=utf-8"
+        for path in ("/wiki/Gone", "/wiki/Unknown"):
+            with pytest.raises(urllib.error.HTTPError) as e:
+                urllib.request.urlopen(local + path)
+            assert e.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert len(stub_wiki.requests) == fetched
+
+def test_gc_removes_unreferenced_objects(tmp_path):
+    store = MirrorStore(str(tmp_path))
+    store.put("https://swse.miraheze.org/wiki/A", b"old")
+    store.put("https://swse.miraheze.org/wiki/A", b"new")
+    del store.index["https://swse.miraheze.org/wiki/A"][0]
+
+    assert store.gc() == 1
+    assert store.get("https://swse.miraheze.org/wiki/A") == b"new"
+    assert len(objects(str(tmp_path))) == 1
+
+def test_offline_migration_keeps_cached_statuses(tmp_path, monkeypatch):
+    wiki = "https://swse.miraheze.org/wiki/"
+    store = MirrorStore(str(tmp_path / "mirror"))
+    store.put(wiki + "Laser_Cannon", b"<p>Laser cannon</p>")
+    store.put_status(wiki + "Ion_Cannon", 404, "Not Found")
+    store.save()
+    cache = URLStatusCache(str(tmp_path / "cache.json"))
+    cache.record(wiki + "Tractor_Beam", 404, "Not Found")
+    cache.save()
+    with open(cache.path, "rb") as f:
+        cached = f.read()
+    data = {"EQUIPMENT": [{"id": name.lower(), "name": name, "wiki": "https://swse.fandom.com/wiki/" + name}
+                          for name in ("Laser_Cannon", "Ion_Cannon", "Tractor_Beam", "Hyperdrive")]}
+    (tmp_path / "data.json").write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setattr(migrate_urls, "DATA_FILE", str(tmp_path / "data.json"))
+    monkeypatch.setattr(migrate_urls, "REPORT_FILE", str(tmp_path / "report.txt"))
+    monkeypatch.setattr(sys, "argv", ["migrate_urls.py", "--offline", "--mirror", store.root, "--cache", cache.path])
+
+    migrate_urls.main()
+
+    links = [item["wiki"] for item in json.loads((tmp_path / "data.json").read_text(encoding="utf-8"))["EQUIPMENT"]]
+    # Mirrored 200 is migrated; mirrored 404, cached 404 and never-seen pages are not
+    assert links == [wiki + "Laser_Cannon", "https://swse.fandom.com/wiki/Ion_Cannon",
+                     "https://swse.fandom.com/wiki/Tractor_Beam", "https://swse.fandom.com/wiki/Hyperdrive"]
+    report = (tmp_path / "report.txt").read_text(encoding="utf-8")
+    assert "MISSING COMPONENTS (2)" in report
+    with open(cache.path, "rb") as f:
+        assert f.read() == cached
@@ -1,28 +1,13 @@
-import httpx
-import time
 import sys
 
-def wait_for_api():
-    url = "http://backend:8787/health"
-    print(f"Waiting for API at {url}...")
-
-    timeout = 120
-    start_time = time.time()
+from readiness import main
 
-    while time.time() - start_time < timeout:
-        try:
-            resp = httpx.get(url)
-            if resp.status_code == 200:
-                print("API is up!")
-                return
-            else:
-                print(f"API responded with status {resp.status_code}")
-        except Exception as e:
-            print(f"Connection failed: {e}")
-        time.sleep(1)
-
-    print("Timeout waiting for API")
-    sys.exit(1)
+# Kept as the container entry point; readiness.py probes the backend, the
+# static site and the nginx proxy concurrently with exponential backoff.
+def wait_for_api():
+    status = main(sys.argv[1:])
+    if status:
+        sys.exit(status)
 
 if __name__ == "__main__":
     wait_for_api()
@@ -0,0 +1,87 @@
+import time
+
+from link_checker import Checkpoint, fetch_status
+
+CACHE_FILE = '.url_status_cache.json'
+DEFAULT_TTL = 7 * 24 * 3600 # One week
+
+
+class URLStatusCache(Checkpoint):
+    """Persistent per-URL status cache with TTL and conditional revalidation.
+
+    Entries look like:
+        {"status": 200, "reason": "OK", "checked_at": 1700000000.0,
+         "etag": "\"abc\"", "last_modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+    A URL counts as cached (`url in cache`) only while its entry is younger
+    than `ttl`; expired entries keep their validators so the next check can
+    be a conditional request. Validators are only kept for 2xx answers: a
+    304 for a page last seen as 404 would otherwise pin the link at 404
+    after the page comes back. Because it is a Checkpoint, check_urls records
+    into it as results arrive and an interrupted run resumes for free.
+    """
+
+    def __init__(self, path=CACHE_FILE, ttl=DEFAULT_TTL, save_every=10, clock=time.time):
+        super().__init__(path, save_every=save_every)
+        self.ttl = ttl
+        self.clock = clock
+
+    def is_fresh(self, url):
+        entry = self.results.get(url)
+        if entry is None:
+            return False
+        # Connection failures and server errors are worth retrying on the next run
+        if entry['status'] == 0 or entry['status'] >= 500:
+            return False
+        return self.clock() - entry.get('checked_at', 0) < self.ttl
+
+    def __contains__(self, url):
+        return self.is_fresh(url)
+
+    def expire(self):
+        """Mark every entry stale without dropping its validators."""
+        with self._lock:
+            expired_at = self.clock() - self.ttl
+            for entry in self.results.values():
+                entry['checked_at'] = min(entry.get('checked_at', 0), expired_at)
+
+    def conditional_headers(self, url):
+        entry = self.results.get(url) or {}
+        headers = {}
+        if not _ok(entry.get('status')):
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record(self, url, status, reason, headers=None):
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        with self._lock:
+            previous = self.results.get(url) or {}
+            if status == 304 and _ok(previous.get('status')):
+                # Not Modified: the page still answers with the status we saw last time
+                status, reason = previous['status'], previous['reason']
+            if not _ok(status):
+                previous, headers = {}, {}
+            self.results[url] = {
+                'status': status,
+                'reason': str(reason),
+                'checked_at': self.clock(),
+                'etag': headers.get('etag', previous.get('etag')),
+                'last_modified': headers.get('last-modified', previous.get('last_modified')),
+            }
+            self._pending += 1
+            if self._pending >= self.save_every:
+                self._save_locked()
+
+    def checker(self, fetch=fetch_status):
+        """Return a check_urls checker that revalidates with conditional requests."""
+        def check(url):
+            return fetch(url, self.conditional_headers(url))
+        return check
+
+
+def _ok(status):
+    return status is not None and 200 <= status < 300
@@ -0,0 +1,435 @@
+"""Validate public/swse/data.json (or an exported component library).
+
+    python validate_data.py [--strict] [path ...]
+
+The schemas below are compiled once into plain check functions, cached per
+schema name. Each record is then checked in a single pass over the file.
+Ids are indexed as records go by. References such as STOCK_SHIPS defaultMods
+-> EQUIPMENT are collected and resolved against that index at the end.
+Every problem is reported at once, with the line of the record it belongs
+to, and the exit status is 1 if there were errors (or warnings with --strict).
+Run it from pre-commit (.pre-commit-config.yaml) or by hand before deploying.
+"""
+import argparse
+import difflib
+import json
+import re
+import sys
+from functools import lru_cache
+
+DATA_FILE = 'public/swse/data.json'
+
+DICE_RE = re.compile(r'^\d+d\d+(x\d+)?(/turn)?$')
+# Damage strings that are deliberately not dice
+FREEFORM_DAMAGE = {'Varies'}
+
+COMPONENT_STATS = [
+    'sr', 'sr_bonus', 'armor_bonus', 'dex_bonus', 'int_bonus', 'str_bonus', 'perception_bonus',
+    'speed', 'speed_factor', 'hyperdrive', 'hyperdrive_bonus', 'hp_bonus_pct', 'hp_dynamic_str',
+    'weapon_damage_dice', 'cargo_bonus_size_mult', 'cargo_factor', 'hidden_cargo_pct',
+    'cost_dynamic_pct', 'ep_dynamic_pct', 'regenerating',
+]
+SHIP_STATS = ['str', 'dex', 'int', 'hp', 'dr', 'armor', 'sr', 'speed', 'hyperdrive', 'weapon_damage_dice']
+COMPONENT_OPTIONS = [
+    'weapon.multibarrel', 'weapon.fireLink', 'weapon.enhancement', 'weapon.battery', 'weapon.autofire',
+    'weapon.pointBlank', 'slaveCircuits.recall', 'slave', 'ordnance',
+]
+
+NUMBER = {'type': 'number'}
+STRING = {'type': 'string'}
+SIZE_LIMIT = {'type': 'object', 'properties': {'minShipSize': {'type': 'string', 'enum_ref': 'size'},
+                                              'maxShipSize': {'type': 'string', 'enum_ref': 'size'}}}
+
+# Spec keys: type (str or tuple), required, properties, additional ('allow' | 'warn'),
+# suggest (known keys for typo hints), items, keys / values (for maps), enum,
+# enum_ref ('size' | 'availability': checked against SIZE_RANK / AVAILABILITY_RANK),
+# pattern (plus 'allowed' exceptions), min, unique, ref (collection whose ids the
+# value must name).
+SCHEMAS = {
+    'data': {
+        'type': 'object',
+        'additional': 'warn',
+        'properties': {
+            'SIZE_RANK': {'type': 'array', 'required': True, 'items': STRING, 'unique': True},
+            'AVAILABILITY_RANK': {'type': 'array', 'required': True, 'items': STRING, 'unique': True},
+            'SIZE_COST_MULTIPLIERS': {'type': 'object', 'required': True, 'keys': 'size', 'values': NUMBER},
+            'REFLEX_SIZE_MODS': {'type': 'object', 'required': True, 'keys': 'size', 'values': NUMBER},
+            'LICENSE_FEES': {'type': 'object', 'required': True, 'keys': 'availability', 'values': {'type': 'number', 'min': 0}},
+            'DEFAULT_OPTION_COSTS': {'type': 'object', 'values': NUMBER},
+            'STOCK_SHIPS': {'type': 'array', 'required': True},
+            'TEMPLATES': {'type': 'array', 'required': True},
+            'EQUIPMENT': {'type': 'array', 'required': True},
+        },
+    },
+    'library': {
+        'type': 'object',
+        'properties': {
+            'name': STRING,
+            'components': {'type': 'array', 'required': True},
+            'ships': {'type': 'array'},
+        },
+    },
+    'equipment': {
+        'type': 'object',
+        'additional': 'warn',
+        'properties': {
+            'id': {'type': 'string', 'required': True, 'pattern': re.compile(r'^[A-Za-z0-9_\-]+$')},
+            'name': {'type': 'string', 'required': True},
+            'name_es': STRING,
+            'category': {'type': 'string', 'required': True},
+            'group': {'type': 'string', 'required': True},
+            'location': STRING,
+            'baseCost': {'type': 'number', 'required': True, 'min': 0},
+            'baseEp': {'type': 'number', 'required': True},
+            'sizeMult': {'type': 'boolean'},
+            'availability': {'type': 'string', 'enum_ref': 'availability'},
+            'exclusiveGroup': {'type': ('string', 'null')},
+            'damage': {'type': 'string', 'pattern': DICE_RE, 'allowed': FREEFORM_DAMAGE},
+            'damageType': {'type': 'string', 'enum': ['Energy', 'Ion', 'Physical']},
+            'minShipSize': {'type': 'string', 'enum_ref': 'size'},
+            'maxShipSize': {'type': 'string', 'enum_ref': 'size'},
+            'description': STRING,
+            'wiki': STRING,
+            'variableCost': {'type': 'boolean'},
+            'payload': {'type': 'object'},
+            'stats': {'type': 'object', 'values': {'type': ('number', 'boolean')}, 'additional': 'warn',
+                      'suggest': COMPONENT_STATS},
+            'upgradeSpecs': {
+                'type': 'object',
+                'properties': {
+                    'componentOptions': {'type': 'array', 'items': {'type': 'string', 'enum': COMPONENT_OPTIONS}},
+                    'battery': {'type': ('boolean', 'object'), 'properties': SIZE_LIMIT['properties']},
+                    'pointBlank': {'type': ('boolean', 'object'), 'properties': SIZE_LIMIT['properties']},
+                    'fireLinkOption': {'type': ('boolean', 'object')},
+                    'payload': {'type': 'object'},
+                    'optionCosts': {'type': 'object'},
+                    'quantity': {'type': ('boolean', 'object')},
+                },
+            },
+        },
+    },
+    'ship': {
+        'type': 'object',
+        'additional': 'warn',
+        'properties': {
+            'id': {'type': 'string', 'required': True},
+            'name': {'type': 'string', 'required': True},
+            'name_es': STRING,
+            'description': STRING,
+            'size': {'type': 'string', 'required': True, 'enum_ref': 'size'},
+            'cost': {'type': 'number', 'required': True, 'min': 0},
+            'baseEp': {'type': 'number', 'required': True},
+            'stats': {'type': 'object', 'required': True, 'values': NUMBER, 'additional': 'warn', 'suggest': SHIP_STATS},
+            'logistics': {'type': 'object', 'values': {'type': ('number', 'string')}},
+            'defaultMods': {'type': 'array', 'items': {
+                'type': ('string', 'object'), 'ref': 'EQUIPMENT',
+                'properties': {'id': {'type': 'string', 'required': True, 'ref': 'EQUIPMENT'},
+                               'batteryCount': {'type': 'number', 'min': 1},
+                               'quantity': {'type': 'number', 'min': 1}},
+            }},
+        },
+    },
+    'template': {
+        'type': 'object',
+        'additional': 'warn',
+        'properties': {
+            'id': {'type': 'string', 'required': True},
+            'name': {'type': 'string', 'required': True},
+            'name_es': STRING,
+            'description': STRING,
+            'costMult': {'type': 'number', 'required': True, 'min': 0},
+            'epMod': NUMBER,
+            'stats': {'type': 'object', 'values': NUMBER, 'additional': 'warn', 'suggest': SHIP_STATS},
+        },
+    },
+}
+
+# Record collections: top-level key -> (record schema, key in an exported library)
+COLLECTIONS = {
+    'EQUIPMENT': ('equipment', 'components'),
+    'STOCK_SHIPS': ('ship', 'ships'),
+    'TEMPLATES': ('template', None),
+}
+
+TYPES = {
+    'string': lambda v: isinstance(v, str),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'null': lambda v: v is None,
+}
+
+
+class Problem:
+    def __init__(self, severity, path, message, line=None):
+        self.severity = severity
+        self.path = path
+        self.message = message
+        self.line = line
+
+    def format(self, filename):
+        location = f"{filename}:{self.line}" if self.line else filename
+        return f"{location}: {self.severity}: {self.path}: {self.message}"
+
+
+class Context:
+    """What compiled checks need while a file is being validated."""
+
+    def __init__(self, data):
+        self.ranks = {
+            'size': set(data.get('SIZE_RANK') or []),
+            'availability': set(data.get('AVAILABILITY_RANK') or []),
+        }
+        self.problems = []
+        self.refs = []  # (collection, id, path, line) resolved once every record has been seen
+        self.line = None  # line of the record being checked
+
+    def error(self, path, message, line=None):
+        self.problems.append(Problem('error', path, message, line or self.line))
+
+    def warning(self, path, message, line=None):
+        self.problems.append(Problem('warning', path, message, line or self.line))
+
+
+def _did_you_mean(value, choices):
+    close = difflib.get_close_matches(str(value), list(choices), n=1, cutoff=0.75)
+    return f" (did you mean '{close[0]}'?)" if close else ''
+
+
+def compile_spec(spec):
+    """Turn one spec dict into a check(value, path, ctx) function."""
+    types = spec.get('type')
+    types = (types,) if isinstance(types, str) else tuple(types or ())
+    type_checks = [TYPES[t] for t in types]
+    enum = set(spec['enum']) if 'enum' in spec else None
+    enum_ref = spec.get('enum_ref')
+    pattern = spec.get('pattern')
+    allowed = spec.get('allowed') or set()
+    minimum = spec.get('min')
+    ref = spec.get('ref')
+    unique = spec.get('unique')
+    properties = {k: compile_spec(v) for k, v in (spec.get('properties') or {}).items()}
+    required = [k for k, v in (spec.get('properties') or {}).items() if v.get('required')]
+    additional = spec.get('additional', 'allow')
+    suggest = set(spec.get('suggest') or []) | set(properties)
+    items = compile_spec(spec['items']) if 'items' in spec else None
+    keys = spec.get('keys')
+    values = compile_spec(spec['values']) if 'values' in spec else None
+
+    def check(value, path, ctx):
+        if type_checks and not any(t(value) for t in type_checks):
+            ctx.error(path, f"expected {' or '.join(types)}, got {type(value).__name__} {json.dumps(value)[:40]}")
+            return
+        if enum is not None and value not in enum:
+            ctx.error(path, f"'{value}' is not one of {sorted(enum)}{_did_you_mean(value, enum)}")
+        if enum_ref and isinstance(value, str) and value not in ctx.ranks[enum_ref]:
+            table = 'SIZE_RANK' if enum_ref == 'size' else 'AVAILABILITY_RANK'
+            ctx.error(path, f"'{value}' is not in {table}{_did_you_mean(value, ctx.ranks[enum_ref])}")
+        if pattern is not None and isinstance(value, str) and value not in allowed and not pattern.match(value):
+            ctx.error(path, f"'{value}' does not match {pattern.pattern}")
+        if minimum is not None and TYPES['number'](value) and value < minimum:
+            ctx.error(path, f"{value} is below the minimum of {minimum}")
+        if ref and isinstance(value, str):
+            ctx.refs.append((ref, value, path, ctx.line))
+
+        if isinstance(value, dict):
+            for key in required:
+                if key not in value:
+                    ctx.error(path, f"missing required '{key}'")
+            for key, item in value.items():
+                child = f"{path}.{key}"
+                if keys and key not in ctx.ranks[keys]:
+                    table = 'SIZE_RANK' if keys == 'size' else 'AVAILABILITY_RANK'
+                    ctx.error(child, f"'{key}' is not in {table}{_did_you_mean(key, ctx.ranks[keys])}")
+                if key in properties:
+                    properties[key](item, child, ctx)
+                    continue
+                if values is not None:
+                    values(item, child, ctx)
+                if additional == 'warn' and key not in suggest:
+                    ctx.warning(path, f"unknown key '{key}'{_did_you_mean(key, suggest)}")
+        elif isinstance(value, list):
+            if unique and len(set(map(json.dumps, value))) != len(value):
+                ctx.error(path, "contains duplicates")
+            if items is not None:
+                for i, item in enumerate(value):
+                    items(item, f"{path}[{i}]", ctx)
+
+    return check
+
+
+@lru_cache(maxsize=None)
+def compiled(name):
+    """Compiled check for a named schema; built once per process."""
+    return compile_spec(SCHEMAS[name])
+
+
+_decoder = json.JSONDecoder()
+_SPACE_RE = re.compile(r'\s*')
+_ID_FIRST_RE = re.compile(r'\{\s*"id"\s*:')
+
+
+def record_lines(text, keys):
+    """{key: [line of record i]} for the top-level arrays named in keys.
+
+    A record's line is that of its own "id" key, or of its opening brace if
+    it has none. Only the record's own keys are looked at, never ids nested
+    deeper (STOCK_SHIPS defaultMods entries, ...), and records are matched
+    by position, so repeated ids each get their own line. Values are skipped
+    with the C decoder's raw_decode rather than tokenized here.
+    """
+    lines = {}
+    # Count newlines from the previous record only, so large files stay linear
+    line, pos = 1, 0
+
+    def line_at(i):
+        nonlocal line, pos
+        line += text.count('\n', pos, i)
+        pos = i
+        return line
+
+    def skip(i, separator=None):
+        i = _SPACE_RE.match(text, i).end()
+        if separator and text.startswith(separator, i):
+            i = _SPACE_RE.match(text, i + 1).end()
+        return i
+
+    def members(i):
+        """(key, key start, value start) of each member of the object at i, then the index past it."""
+        i = skip(i + 1)
+        while text.startswith('"', i):
+            key, end = _decoder.raw_decode(text, i)
+            value = skip(skip(end), ':')
+            yield key, i, value
+            i = skip(_decoder.raw_decode(text, value)[1], ',')
+        yield None, i + 1, None
+
+    try:
+        i = skip(0)
+        if not text.startswith('{', i):
+            return lines
+        for key, _, i in members(i):
+            if key not in keys or not text.startswith('[', i):
+                continue
+            records = lines[key] = []
+            i = skip(i + 1)
+            while i < len(text) and text[i] != ']':
+                records.append(line_at(i))
+                match = _ID_FIRST_RE.match(text, i)
+                if match:
+                    # The usual layout, "id" first: no need to walk the keys
+                    records[-1] = line_at(match.end() - 1)
+                elif text[i] == '{':
+                    for member, start, _ in members(i):
+                        if member == 'id':
+                            records[-1] = line_at(start)
+                            break
+                i = skip(_decoder.raw_decode(text, i)[1], ',')
+    except (ValueError, IndexError):
+        # Text that does not match the parsed data only costs the line numbers
+        pass
+    return lines
+
+
+def validate(data, text='', base=None):
+    """Return every Problem in a data.json (or exported library) dict, sorted by line.
+
+    A library is checked against base (the data.json dict it extends), so its
+    ships may use core components and its components the core size ranks.
+    """
+    is_library = 'components' in data and 'EQUIPMENT' not in data
+    ctx = Context(base if is_library and base else data)
+    compiled('library' if is_library else 'data')(data, '$', ctx)
+
+    lines = record_lines(text, [library_key if is_library else collection
+                                for collection, (_, library_key) in COLLECTIONS.items()])
+    index = {}
+    if is_library and base:
+        for collection in COLLECTIONS:
+            index[collection] = {item['id']: f"data.json {collection}" for item in base.get(collection, [])
+                                 if isinstance(item, dict) and 'id' in item}
+    exclusive_groups = {}
+    if is_library and base:
+        for item in base.get('EQUIPMENT', []):
+            if isinstance(item, dict) and item.get('exclusiveGroup'):
+                exclusive_groups.setdefault(item['exclusiveGroup'], []).append(('data.json', None))
+    for collection, (schema, library_key) in COLLECTIONS.items():
+        key = library_key if is_library else collection
+        if not key or not isinstance(data.get(key), list):
+            continue
+        check = compiled(schema)
+        ids = index.setdefault(collection, {})
+        for i, record in enumerate(data[key]):
+            record_id = record.get('id') if isinstance(record, dict) else None
+            path = f"{key}[{i}]" + (f" ({record_id})" if record_id else '')
+            ctx.line = lines[key][i] if i < len(lines.get(key, ())) else None
+
+            check(record, path, ctx)
+            if isinstance(record_id, str):
+                # Libraries may deliberately override core ids
+                if record_id in ids and not ids[record_id].startswith('data.json'):
+                    ctx.error(path, f"duplicate id '{record_id}' (first defined at {ids[record_id]})")
+                ids.setdefault(record_id, f"{key}[{i}]")
+            if collection == 'EQUIPMENT' and isinstance(record, dict) and record.get('exclusiveGroup'):
+                exclusive_groups.setdefault(record['exclusiveGroup'], []).append((path, ctx.line))
+    ctx.line = None
+
+    # Cross-references, resolved through the id index
+    for collection, ref_id, path, line in ctx.refs:
+        known = index.get(collection, {})
+        if ref_id not in known:
+            ctx.error(path, f"unknown {collection} id '{ref_id}'{_did_you_mean(ref_id, known)}", line)
+
+    # An exclusiveGroup with a single member never excludes anything: usually a typo
+    for group, members in exclusive_groups.items():
+        path, line = members[0]
+        if len(members) == 1 and path != 'data.json':
+            others = [g for g in exclusive_groups if g != group]
+            ctx.warning(path, f"exclusiveGroup '{group}' has no other members{_did_you_mean(group, others)}", line)
+
+    return sorted(ctx.problems, key=lambda p: (p.line or 0, p.severity != 'error'))
+
+
+def validate_file(path, base_path=DATA_FILE):
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        return [Problem('error', '$', f"invalid JSON: {e}", getattr(e, 'lineno', None))]
+    base = None
+    if isinstance(data, dict) and 'EQUIPMENT' not in data:
+        try:
+            with open(base_path, encoding='utf-8') as f:
+                base = json.load(f)
+        except (OSError, ValueError):
+            pass
+    if not isinstance(data, dict):
+        return [Problem('error', '$', f"expected an object, got {type(data).__name__}")]
+    return validate(data, text, base)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate data.json and exported component libraries.")
+    parser.add_argument('paths', nargs='*', default=[DATA_FILE])
+    parser.add_argument('--strict', action='store_true', help="Treat warnings as errors")
+    parser.add_argument('--base', default=DATA_FILE, help="data.json that exported libraries are checked against")
+    args = parser.parse_args(argv)
+
+    errors = warnings = 0
+    for path in args.paths:
+        for problem in validate_file(path, args.base):
+            print(problem.format(path))
+            if problem.severity == 'error':
+                errors += 1
+            else:
+                warnings += 1
+
+    if errors or warnings:
+        print(f"{errors} error(s), {warnings} warning(s)", file=sys.stderr)
+    return 1 if errors or (args.strict and warnings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
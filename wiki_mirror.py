@@ -0,0 +1,366 @@
+"""Offline mirror of the wiki pages that EQUIPMENT items link to.
+
+Fetched pages go into a content-addressed store under .wiki_mirror/:
+
+    objects/ab/cdef...gz    gzip of the raw body, named by the sha256 of the body
+    index.json              url -> snapshots, oldest first:
+                            {"hash", "fetched_at", "checked_at", "status", "content_type", "etag", "last_modified"}
+
+Pages that answer with an error (404, 410, ...) get a snapshot too, with
+"hash" null and the "reason", so offline runs can still report them as
+missing. Connection failures and 5xx answers say nothing about the page
+and are not recorded.
+
+Identical bodies (redirect targets, repeated fetches) are stored once. A
+re-fetch only adds a snapshot when the body changed, and it is a
+conditional GET, so an unchanged page costs a 304. Because
+MirrorStore.checker() plugs into link_checker.check_urls, crawling reuses
+its per-host rate limiting, worker pool and checkpointing.
+
+    python wiki_mirror.py crawl                       fetch every EQUIPMENT wiki link into the mirror
+    python wiki_mirror.py serve --port 8001           re-serve mirrored pages offline (http://localhost:8001/wiki/...)
+    python wiki_mirror.py diff <url>                  unified diff of the last two snapshots of a page
+    python wiki_mirror.py history <url>
+    python wiki_mirror.py stats
+    python wiki_mirror.py gc                          drop objects no snapshot refers to
+"""
+import argparse
+import difflib
+import gzip
+import hashlib
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from link_checker import DEFAULT_HEADERS, check_urls
+
+DATA_FILE = 'public/swse/data.json'
+MIRROR_DIR = '.wiki_mirror'
+DEFAULT_BASE = 'https://swse.miraheze.org'
+NOT_MIRRORED = "not mirrored"
+
+
+def fetch_page(url, extra_headers=None, timeout=20):
+    """GET url; return (status, reason, headers, body). body is None unless status is 200."""
+    headers = {**DEFAULT_HEADERS, **(extra_headers or {})}
+    try:
+        req = urllib.request.Request(url, method='GET', headers=headers)
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return response.status, "OK", dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.reason, dict(e.headers or {}), None
+    except Exception as e:
+        return 0, str(e), {}, None
+
+
+class MirrorStore:
+    """Content-addressed, gzip-compressed page store with per-URL snapshot history."""
+
+    def __init__(self, root=MIRROR_DIR, clock=time.time):
+        self.root = root
+        self.clock = clock
+        self.index_path = os.path.join(root, 'index.json')
+        self.index = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest[2:] + '.gz')
+
+    def _write_object(self, body):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                # mtime=0 keeps the compressed bytes a pure function of the body
+                f.write(gzip.compress(body, compresslevel=9, mtime=0))
+            os.replace(tmp, path)
+        return digest
+
+    def read_object(self, digest):
+        with open(self._object_path(digest), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def put(self, url, body, headers=None, status=200):
+        """Store a fetched body; returns (digest, changed)."""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        digest = self._write_object(body)
+        now = self.clock()
+        with self._lock:
+            snapshots = self.index.setdefault(url, [])
+            latest = snapshots[-1] if snapshots else None
+            changed = latest is None or latest['hash'] != digest
+            if changed:
+                snapshots.append({'hash': digest, 'fetched_at': now, 'checked_at': now, 'status': status,
+                                  'content_type': headers.get('content-type'), 'etag': headers.get('etag'),
+                                  'last_modified': headers.get('last-modified')})
+            else:
+                latest['checked_at'] = now
+                latest['etag'] = headers.get('etag', latest.get('etag'))
+                latest['last_modified'] = headers.get('last-modified', latest.get('last_modified'))
+        return digest, changed
+
+    def put_status(self, url, status, reason, headers=None):
+        """Record a page that answered without a body (404, ...); returns whether that is news."""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        now = self.clock()
+        with self._lock:
+            snapshots = self.index.setdefault(url, [])
+            latest = snapshots[-1] if snapshots else None
+            changed = latest is None or latest['hash'] is not None or latest['status'] != status
+            if changed:
+                snapshots.append({'hash': None, 'fetched_at': now, 'checked_at': now, 'status': status,
+                                  'reason': str(reason), 'content_type': headers.get('content-type'),
+                                  'etag': None, 'last_modified': None})
+            else:
+                latest['checked_at'] = now
+        return changed
+
+    def touch(self, url):
+        """Record that url was revalidated (304) without a new body."""
+        with self._lock:
+            if self.index.get(url):
+                self.index[url][-1]['checked_at'] = self.clock()
+
+    def latest(self, url):
+        snapshots = self.index.get(url)
+        return snapshots[-1] if snapshots else None
+
+    def get(self, url, snapshot=-1):
+        """Body of a snapshot of url (latest by default), or None if it was never mirrored or had no body."""
+        snapshots = self.index.get(url)
+        if not snapshots or snapshots[snapshot]['hash'] is None:
+            return None
+        return self.read_object(snapshots[snapshot]['hash'])
+
+    def history(self, url):
+        return list(self.index.get(url) or [])
+
+    def diff(self, url, old=-2, new=-1, context=3):
+        """Unified diff between two snapshots of url ('' when there is nothing to compare)."""
+        snapshots = self.index.get(url) or []
+        if len(snapshots) < 2:
+            return ''
+        a, b = snapshots[old], snapshots[new]
+        return ''.join(difflib.unified_diff(
+            _text(self.get(url, old) or b'').splitlines(keepends=True),
+            _text(self.get(url, new) or b'').splitlines(keepends=True),
+            f"{url} @ {_stamp(a['fetched_at'])}", f"{url} @ {_stamp(b['fetched_at'])}", n=context))
+
+    def conditional_headers(self, url):
+        latest = self.latest(url) or {}
+        headers = {}
+        if latest.get('etag'):
+            headers['If-None-Match'] = latest['etag']
+        if latest.get('last_modified'):
+            headers['If-Modified-Since'] = latest['last_modified']
+        return headers
+
+    def checker(self, fetch=fetch_page, on_change=None):
+        """A check_urls checker that GETs each page and mirrors its body.
+
+        Returns (status, reason, headers) like link_checker.fetch_status.
+        A 304 is reported as the mirrored page's status, so checkpoints and
+        status caches see the page as it is. Error pages are recorded with
+        put_status.
+        on_change(url, digest) is called whenever a page's content is new.
+        """
+        def check(url):
+            status, reason, headers, body = fetch(url, self.conditional_headers(url))
+            if status == 304 and self.latest(url):
+                self.touch(url)
+                return self.latest(url)['status'], "OK", headers
+            if status == 200 and body is not None:
+                digest, changed = self.put(url, body, headers, status)
+                if changed and on_change:
+                    on_change(url, digest)
+            elif 0 < status < 500 and status != 304:
+                self.put_status(url, status, reason, headers)
+            return status, reason, headers
+        return check
+
+    def offline_checker(self):
+        """A check_urls checker answering from the mirror alone, without touching the network.
+
+        Pages the mirror has never seen come back as (0, NOT_MIRRORED).
+        """
+        def check(url):
+            latest = self.latest(url)
+            if latest is None:
+                return 0, NOT_MIRRORED, {}
+            if latest['hash'] is None:
+                return latest['status'], f"{latest.get('reason', '')} (mirror)".lstrip(), {}
+            return latest['status'], "OK (mirror)", {}
+        return check
+
+    def save(self):
+        with self._lock:
+            tmp = self.index_path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.index_path)
+
+    def stats(self):
+        referenced = {s['hash'] for snapshots in self.index.values() for s in snapshots if s['hash']}
+        stored = raw = 0
+        for digest in referenced:
+            path = self._object_path(digest)
+            if os.path.exists(path):
+                stored += os.path.getsize(path)
+                raw += len(self.read_object(digest))
+        snapshots = sum(len(s) for s in self.index.values())
+        return {'urls': len(self.index), 'snapshots': snapshots, 'objects': len(referenced),
+                'raw_bytes': raw, 'stored_bytes': stored}
+
+    def gc(self):
+        """Delete objects that no snapshot refers to; returns how many were removed."""
+        referenced = {s['hash'] for snapshots in self.index.values() for s in snapshots if s['hash']}
+        removed = 0
+        objects = os.path.join(self.root, 'objects')
+        for prefix in os.listdir(objects):
+            for name in os.listdir(os.path.join(objects, prefix)):
+                if name.endswith('.gz') and prefix + name[:-3] not in referenced:
+                    os.remove(os.path.join(objects, prefix, name))
+                    removed += 1
+        return removed
+
+
+def _text(body):
+    return body.decode('utf-8', errors='replace')
+
+
+def _stamp(ts):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(ts))
+
+
+def make_server(store, base=DEFAULT_BASE, host='127.0.0.1', port=8001):
+    """HTTP server answering /<path> with the mirrored copy of <base>/<path>."""
+    base = base.rstrip('/')
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _respond(self, send_body):
+            url = base + self.path
+            latest = store.latest(url)
+            if latest is None or latest['hash'] is None:
+                self.send_response(latest['status'] if latest else 404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            etag = f'"{latest["hash"]}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            body = store.get(url)
+            self.send_response(latest['status'])
+            self.send_header('Content-Type', latest.get('content_type') or 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def do_HEAD(self):
+            self._respond(False)
+
+        def do_GET(self):
+            self._respond(True)
+
+    return http.server.ThreadingHTTPServer((host, port), Handler)
+
+
+def wiki_urls(data_path=DATA_FILE):
+    with open(data_path, encoding='utf-8') as f:
+        data = json.load(f)
+    return [item['wiki'] for item in data.get('EQUIPMENT', []) if item.get('wiki')]
+
+
+def crawl(store, urls, workers=4, interval=1.0, log=print):
+    changed = []
+    check = store.checker(on_change=lambda url, digest: changed.append(url))
+
+    def report(url, status, reason, cached):
+        log(f"{status} {url}{' (changed)' if url in changed else ''}")
+
+    try:
+        results = check_urls(urls, workers=workers, interval=interval, checker=check, on_result=report)
+    finally:
+        store.save()
+    return results, changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mirror, serve and diff the wiki pages components link to.")
+    parser.add_argument('--mirror', default=MIRROR_DIR, help="Mirror directory (default: %(default)s)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('crawl', help="Fetch pages into the mirror")
+    p.add_argument('urls', nargs='*', help="Pages to fetch (default: every EQUIPMENT wiki link)")
+    p.add_argument('--data', default=DATA_FILE)
+    p.add_argument('--workers', type=int, default=4)
+    p.add_argument('--interval', type=float, default=1.0, help="Minimum seconds between requests to the same host")
+
+    p = sub.add_parser('serve', help="Serve mirrored pages offline")
+    p.add_argument('--base', default=DEFAULT_BASE, help="Site whose paths are served (default: %(default)s)")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8001)
+
+    p = sub.add_parser('diff', help="Diff two snapshots of a page")
+    p.add_argument('url')
+    p.add_argument('--old', type=int, default=-2, help="Snapshot index (default: previous)")
+    p.add_argument('--new', type=int, default=-1, help="Snapshot index (default: latest)")
+
+    p = sub.add_parser('history', help="List the snapshots of a page")
+    p.add_argument('url')
+
+    sub.add_parser('stats', help="Mirror size and deduplication")
+    sub.add_parser('gc', help="Delete unreferenced objects")
+    args = parser.parse_args(argv)
+
+    store = MirrorStore(args.mirror)
+    if args.command == 'crawl':
+        urls = args.urls or wiki_urls(args.data)
+        results, changed = crawl(store, urls, args.workers, args.interval)
+        failed = sum(1 for status, _ in results.values() if status != 200)
+        print(f"{len(results)} pages checked, {len(changed)} new or changed, {failed} not mirrored")
+    elif args.command == 'serve':
+        server = make_server(store, args.base, args.host, args.port)
+        print(f"Serving {len(store.index)} mirrored pages of {args.base} on http://{args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    elif args.command == 'diff':
+        text = store.diff(args.url, args.old, args.new)
+        sys.stdout.write(text or "No differences (or fewer than two snapshots).\n")
+    elif args.command == 'history':
+        for i, snapshot in enumerate(store.history(args.url)):
+            print(f"{i:>3}  {_stamp(snapshot['fetched_at'])}  {(snapshot['hash'] or str(snapshot['status']))[:12]:<12}  "
+                  f"last checked {_stamp(snapshot['checked_at'])}")
+    elif args.command == 'stats':
+        s = store.stats()
+        ratio = s['stored_bytes'] / s['raw_bytes'] if s['raw_bytes'] else 0
+        print(f"{s['urls']} URLs, {s['snapshots']} snapshots, {s['objects']} objects; "
+              f"{s['raw_bytes']:,} bytes stored as {s['stored_bytes']:,} ({ratio:.0%})")
+    elif args.command == 'gc':
+        print(f"Removed {store.gc()} unreferenced objects")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())